@@ -3,13 +3,14 @@
 from typing import Dict, Any, Optional
 from langchain.tools import BaseTool
 from langchain_openai import ChatOpenAI
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import select
 import uuid
 from datetime import datetime
 
 from db.models import Document, Practice
 from db.models.documents import DocumentAgentState
+from db.document_text import load_document_text
 
 from .states import AgentState, DOCUMENT_CATEGORIES
 from .workflow import create_document_processing_workflow
@@ -130,7 +131,7 @@ class DocumentProcessingAgent:
                 messages=[],
                 current_node="classify_document",
                 document_id=str(self.document_id),
-                extracted_text=self.document.raw_extracted_text or "",
+                extracted_text=load_document_text(self.db_session, self.document_id),
                 document_metadata={
                     "filename": self.document.filename,
                     "mime_type": self.document.mime_type,
@@ -159,7 +160,7 @@ class DocumentProcessingAgent:
             try:
                 # Reload document in new transaction
                 self.document = self.db_session.execute(
-                    select(Document).where(Document.id == self.document_id)
+                    select(Document).options(undefer_group("agent_blobs")).where(Document.id == self.document_id)
                 ).scalar_one_or_none()
                 
                 if not self.document:
@@ -184,6 +185,8 @@ class DocumentProcessingAgent:
                         "classified_at": datetime.utcnow().isoformat()
                     }
                 }
+                self.document.agent_confidence_score = classification["confidence"]
+                self.document.agent_processing_notes = None
                 
                 # Update state based on client assignment
                 if final_state.get("whatsapp_message_sent"):
@@ -229,12 +232,13 @@ class DocumentProcessingAgent:
                 
                 # Reload document
                 self.document = self.db_session.execute(
-                    select(Document).where(Document.id == self.document_id)
+                    select(Document).options(undefer_group("agent_blobs")).where(Document.id == self.document_id)
                 ).scalar_one_or_none()
                 
                 if self.document:
                     # Update document state to failed
                     self.document.agent_state = DocumentAgentState.failed
+                    self.document.agent_processing_notes = f"Processing failed: {e}"
                     self.document.agent_metadata = {
                         **(self.document.agent_metadata or {}),
                         "processing_error": str(e),
@@ -1,6 +1,6 @@
 """Invoice processing nodes for document processing workflow."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -13,6 +13,20 @@ from langchain_core.messages import HumanMessage
 from db.models import Document, Invoice, InvoiceLineItem, ChartOfAccount
 from ..states import AgentState
 
+def existing_invoice_for(db_session: Session, document_id) -> Optional[Invoice]:
+    """
+    The invoice already created for a document, if any.
+
+    Idempotency guard for the invoice and receipt nodes (receipts are stored as invoices
+    too): a retried workflow must not create a second invoice for the document.
+    """
+    invoice = db_session.execute(
+        select(Invoice).where(Invoice.document_id == document_id)
+    ).scalars().first()
+    if invoice:
+        print(f"Invoice {invoice.id} already exists for document {document_id}, skipping extraction")
+    return invoice
+
 def process_invoice_node(state: AgentState, db_session: Session, llm: ChatOpenAI) -> AgentState:
     """Node to extract invoice/receipt data and save it to the database."""
     document_type = state["classification_result"]["document_category"]
@@ -29,6 +43,12 @@ def process_invoice_node(state: AgentState, db_session: Session, llm: ChatOpenAI
             state["current_node"] = "end"
             return state
         
+        existing_invoice = existing_invoice_for(db_session, document.id)
+        if existing_invoice:
+            state["invoice_id"] = str(existing_invoice.id)
+            state["current_node"] = "end"
+            return state
+        
         # Load client's chart of accounts
         chart_of_accounts = db_session.execute(
             select(ChartOfAccount).where(ChartOfAccount.client_id == document.client_id)
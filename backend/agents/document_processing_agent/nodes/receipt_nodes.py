@@ -12,6 +12,7 @@ from langchain_core.messages import HumanMessage
 
 from db.models import Document, Invoice, InvoiceLineItem, ChartOfAccount
 from ..states import AgentState
+from .invoice_nodes import existing_invoice_for
 
 def process_receipt_node(state: AgentState, db_session: Session, llm: ChatOpenAI) -> AgentState:
     """Node to extract receipt data and save it to the database."""
@@ -29,6 +30,12 @@ def process_receipt_node(state: AgentState, db_session: Session, llm: ChatOpenAI
             state["current_node"] = "end"
             return state
         
+        existing_invoice = existing_invoice_for(db_session, document.id)
+        if existing_invoice:
+            state["invoice_id"] = str(existing_invoice.id)
+            state["current_node"] = "end"
+            return state
+        
         # Load client's chart of accounts
         chart_of_accounts = db_session.execute(
             select(ChartOfAccount).where(ChartOfAccount.client_id == document.client_id)
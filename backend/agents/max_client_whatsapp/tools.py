@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 from db.models import Individual, Practice, Message, Document
 from db.models.message import MessageDirection, MessageStatus, MessageType, MessageSender
+from services.realtime_events import publish_event_sync, message_event_data, MESSAGE_CREATED
 
 class SendMessageInput(BaseModel):
     """Input for sending WhatsApp messages."""
@@ -83,6 +84,7 @@ class WhatsAppTools:
                 self.db_session.add(msg)
                 self.db_session.commit()
                 print(f"✅ Message record created in database: {msg.id}")
+                publish_event_sync(self.practice.id, MESSAGE_CREATED, message_event_data(msg))
                 
                 return {
                     "success": True,
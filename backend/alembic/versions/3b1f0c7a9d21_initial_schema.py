@@ -0,0 +1,649 @@
+"""initial schema
+
+Revision ID: 3b1f0c7a9d21
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3b1f0c7a9d21'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created before migrations were introduced already have this schema
+    # (built by Base.metadata.create_all at startup), so only create it on an empty database.
+    # Offline (--sql) there is no database to inspect; the script is for an empty one.
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table('practices'):
+        return
+
+    op.create_table('practices',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('whatsapp_number', sa.String(), nullable=True),
+    sa.Column('main_phone', sa.String(), nullable=True),
+    sa.Column('main_email', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_practices_id'), 'practices', ['id'], unique=False)
+    op.create_index(op.f('ix_practices_name'), 'practices', ['name'], unique=False)
+    op.create_table('properties',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('property_name', sa.String(), nullable=False),
+    sa.Column('property_type', sa.Enum('residential', 'commercial', 'industrial', 'land', 'mixed_use', 'other', name='propertytype'), nullable=False),
+    sa.Column('property_status', sa.Enum('owned', 'leased', 'rented_out', 'vacant', 'under_renovation', 'for_sale', 'sold', name='propertystatus'), nullable=False),
+    sa.Column('address_line_1', sa.String(), nullable=False),
+    sa.Column('address_line_2', sa.String(), nullable=True),
+    sa.Column('town', sa.String(), nullable=False),
+    sa.Column('county', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('post_code', sa.String(), nullable=False),
+    sa.Column('purchase_price', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('current_value', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('monthly_rental_income', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('annual_rental_income', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('bedrooms', sa.String(), nullable=True),
+    sa.Column('bathrooms', sa.String(), nullable=True),
+    sa.Column('property_size', sa.String(), nullable=True),
+    sa.Column('is_rental_property', sa.Boolean(), nullable=True),
+    sa.Column('tenant_name', sa.String(), nullable=True),
+    sa.Column('lease_start_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('lease_end_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_properties_id'), 'properties', ['id'], unique=False)
+    op.create_index(op.f('ix_properties_post_code'), 'properties', ['post_code'], unique=False)
+    op.create_index(op.f('ix_properties_property_name'), 'properties', ['property_name'], unique=False)
+    op.create_table('services',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('service_code', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_services_id'), 'services', ['id'], unique=False)
+    op.create_index(op.f('ix_services_practice_id'), 'services', ['practice_id'], unique=False)
+    op.create_index(op.f('ix_services_service_code'), 'services', ['service_code'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('password_hash', sa.String(), nullable=False),
+    sa.Column('first_name', sa.String(), nullable=True),
+    sa.Column('last_name', sa.String(), nullable=True),
+    sa.Column('role', sa.Enum('practice_owner', 'accountant', 'bookkeeper', 'payroll', 'client', name='userrole'), nullable=False),
+    sa.Column('practice_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('clients',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('client_code', sa.String(), nullable=False),
+    sa.Column('business_name', sa.String(), nullable=False),
+    sa.Column('business_type', sa.Enum('ltd', 'llp', 'nti', 'ntj', 'ntt', 'ptb', 'stb', 'tio', 'ttt', name='businesstype'), nullable=False),
+    sa.Column('nature_of_business', sa.String(), nullable=True),
+    sa.Column('company_number', sa.String(), nullable=True),
+    sa.Column('date_of_incorporation', sa.Date(), nullable=True),
+    sa.Column('crn_authentication_code', sa.String(), nullable=True),
+    sa.Column('currently_incorporated', sa.Boolean(), nullable=True),
+    sa.Column('crn_statement_confirmed', sa.Boolean(), nullable=True),
+    sa.Column('registered_address_different_from_trading', sa.Boolean(), nullable=True),
+    sa.Column('registered_address_line1', sa.String(), nullable=True),
+    sa.Column('registered_address_line2', sa.String(), nullable=True),
+    sa.Column('registered_city', sa.String(), nullable=True),
+    sa.Column('registered_county', sa.String(), nullable=True),
+    sa.Column('registered_country', sa.String(), nullable=True),
+    sa.Column('registered_postcode', sa.String(), nullable=True),
+    sa.Column('trading_address_line1', sa.String(), nullable=True),
+    sa.Column('trading_address_line2', sa.String(), nullable=True),
+    sa.Column('trading_city', sa.String(), nullable=True),
+    sa.Column('trading_county', sa.String(), nullable=True),
+    sa.Column('trading_country', sa.String(), nullable=True),
+    sa.Column('trading_postcode', sa.String(), nullable=True),
+    sa.Column('mlr_status', sa.Enum('pending', 'in_progress', 'complete', 'failed', 'expired', name='clientmlrstatus'), nullable=True),
+    sa.Column('accounting_software', sa.Enum('xero', 'quickbooks', 'sage', 'odoo', 'manual_excel', 'other', name='accountingsoftware'), nullable=True),
+    sa.Column('billing_frequency', sa.Enum('monthly', 'quarterly', 'annually', 'one_time', 'custom', name='billingfrequency'), nullable=True),
+    sa.Column('payment_method', sa.Enum('direct_debit', 'bank_transfer', 'cheque', 'cash', 'card', 'other', name='paymentmethod'), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('debit_credit_account_line', sa.String(), nullable=True),
+    sa.Column('client_primary_contact_id', sa.UUID(), nullable=True),
+    sa.Column('reference_manager_id', sa.UUID(), nullable=True),
+    sa.Column('payroll_manager_id', sa.UUID(), nullable=True),
+    sa.Column('client_source', sa.String(), nullable=True),
+    sa.Column('engagement_letter_status', sa.Enum('pending', 'sent', 'signed', 'expired', 'declined', name='engagementletterstatus'), nullable=True),
+    sa.Column('engagement_letter_last_review', sa.Date(), nullable=True),
+    sa.Column('corporation_tax_utr', sa.String(), nullable=True),
+    sa.Column('vat_number', sa.String(), nullable=True),
+    sa.Column('vat_registration_date', sa.Date(), nullable=True),
+    sa.Column('vat_scheme', sa.String(), nullable=True),
+    sa.Column('payroll_scheme_reference', sa.String(), nullable=True),
+    sa.Column('employer_reference_number', sa.String(), nullable=True),
+    sa.Column('construction_industry_scheme', sa.Boolean(), nullable=True),
+    sa.Column('main_phone', sa.String(), nullable=True),
+    sa.Column('main_email', sa.String(), nullable=True),
+    sa.Column('website', sa.String(), nullable=True),
+    sa.Column('business_bank_name', sa.String(), nullable=True),
+    sa.Column('business_bank_sort_code', sa.String(), nullable=True),
+    sa.Column('business_bank_account_number', sa.String(), nullable=True),
+    sa.Column('business_bank_account_name', sa.String(), nullable=True),
+    sa.Column('year_end_date', sa.Date(), nullable=True),
+    sa.Column('annual_turnover', sa.String(), nullable=True),
+    sa.Column('number_of_employees', sa.Integer(), nullable=True),
+    sa.Column('company_status', sa.String(), nullable=True),
+    sa.Column('companies_house_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('last_companies_house_update', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('current_accountant', sa.String(), nullable=True),
+    sa.Column('previous_accountant', sa.String(), nullable=True),
+    sa.Column('solicitor', sa.String(), nullable=True),
+    sa.Column('bank_manager', sa.String(), nullable=True),
+    sa.Column('insurance_broker', sa.String(), nullable=True),
+    sa.Column('services_required', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('risk_assessment', sa.Text(), nullable=True),
+    sa.Column('aml_status', sa.String(), nullable=True),
+    sa.Column('due_diligence_completed', sa.Boolean(), nullable=True),
+    sa.Column('bookkeeping_prepared_by_client', sa.Boolean(), nullable=True),
+    sa.Column('bookkeeping_format', sa.Enum('online', 'offline', name='bookkeepingformat'), nullable=True),
+    sa.Column('bookkeeping_record', sa.Text(), nullable=True),
+    sa.Column('vat_registration_required', sa.Boolean(), nullable=True),
+    sa.Column('vat_registration_applied', sa.Boolean(), nullable=True),
+    sa.Column('vat_registration_completed', sa.Boolean(), nullable=True),
+    sa.Column('vat_online_code', sa.String(), nullable=True),
+    sa.Column('vat_online_code_applied', sa.Boolean(), nullable=True),
+    sa.Column('vat_online_code_completed', sa.Boolean(), nullable=True),
+    sa.Column('vat_64_8_applied', sa.Boolean(), nullable=True),
+    sa.Column('vat_64_8_completed', sa.Boolean(), nullable=True),
+    sa.Column('paye_registration_required', sa.Boolean(), nullable=True),
+    sa.Column('paye_registration_applied', sa.Boolean(), nullable=True),
+    sa.Column('paye_registration_completed', sa.Boolean(), nullable=True),
+    sa.Column('paye_online_code', sa.String(), nullable=True),
+    sa.Column('paye_online_code_applied', sa.Boolean(), nullable=True),
+    sa.Column('paye_online_code_completed', sa.Boolean(), nullable=True),
+    sa.Column('paye_64_8_applied', sa.Boolean(), nullable=True),
+    sa.Column('paye_64_8_completed', sa.Boolean(), nullable=True),
+    sa.Column('payroll_run_by_client', sa.Boolean(), nullable=True),
+    sa.Column('payroll_frequency', sa.Enum('weekly', 'fortnightly', 'monthly', 'quarterly', 'annually', name='payrollfrequency'), nullable=True),
+    sa.Column('payroll_type', sa.Enum('full_service', 'processing_only', 'admin_only', 'custom', name='payrolltype'), nullable=True),
+    sa.Column('last_payroll_done_date', sa.Date(), nullable=True),
+    sa.Column('p32_report', sa.Text(), nullable=True),
+    sa.Column('auto_enrollment_staging_date', sa.Date(), nullable=True),
+    sa.Column('auto_enrollment_administration', sa.Boolean(), nullable=True),
+    sa.Column('details_of_ae_administration', sa.Text(), nullable=True),
+    sa.Column('p11d', sa.Boolean(), nullable=True),
+    sa.Column('eps_reports', sa.Boolean(), nullable=True),
+    sa.Column('responsible_for_p32_payments', sa.Boolean(), nullable=True),
+    sa.Column('payroll_ceased_date', sa.Date(), nullable=True),
+    sa.Column('cis_contractor_registration_required', sa.Boolean(), nullable=True),
+    sa.Column('cis_contractor_registration_applied', sa.Boolean(), nullable=True),
+    sa.Column('cis_contractor_registration_completed', sa.Boolean(), nullable=True),
+    sa.Column('cis_online_code', sa.String(), nullable=True),
+    sa.Column('cis_online_code_applied', sa.Boolean(), nullable=True),
+    sa.Column('cis_online_code_completed', sa.Boolean(), nullable=True),
+    sa.Column('cis_64_8_applied', sa.Boolean(), nullable=True),
+    sa.Column('cis_64_8_completed', sa.Boolean(), nullable=True),
+    sa.Column('cis_subcontractor_registered', sa.Boolean(), nullable=True),
+    sa.Column('responsible_for_cis_return', sa.Boolean(), nullable=True),
+    sa.Column('setup_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_edited', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_edited_by_id', sa.UUID(), nullable=True),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['client_primary_contact_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['last_edited_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['payroll_manager_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.ForeignKeyConstraint(['reference_manager_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('corporation_tax_utr'),
+    sa.UniqueConstraint('vat_number')
+    )
+    op.create_index(op.f('ix_clients_business_name'), 'clients', ['business_name'], unique=False)
+    op.create_index(op.f('ix_clients_client_code'), 'clients', ['client_code'], unique=True)
+    op.create_index(op.f('ix_clients_client_primary_contact_id'), 'clients', ['client_primary_contact_id'], unique=False)
+    op.create_index(op.f('ix_clients_company_number'), 'clients', ['company_number'], unique=True)
+    op.create_index(op.f('ix_clients_id'), 'clients', ['id'], unique=False)
+    op.create_index(op.f('ix_clients_registered_postcode'), 'clients', ['registered_postcode'], unique=False)
+    op.create_index(op.f('ix_clients_trading_postcode'), 'clients', ['trading_postcode'], unique=False)
+    op.create_table('individuals',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('first_name', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('middle_name', sa.String(), nullable=True),
+    sa.Column('last_name', sa.String(), nullable=False),
+    sa.Column('date_of_birth', sa.Date(), nullable=True),
+    sa.Column('deceased_date', sa.Date(), nullable=True),
+    sa.Column('marital_status', sa.Enum('single', 'married', 'divorced', 'widowed', 'separated', 'civil_partnership', 'dissolved_civil_partnership', name='maritalstatus'), nullable=True),
+    sa.Column('gender', sa.Enum('male', 'female', 'other', 'prefer_not_to_say', name='gender'), nullable=True),
+    sa.Column('nationality', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('secondary_email', sa.String(), nullable=True),
+    sa.Column('primary_mobile', sa.String(), nullable=True),
+    sa.Column('secondary_mobile', sa.String(), nullable=True),
+    sa.Column('address_line_1', sa.String(), nullable=True),
+    sa.Column('address_line_2', sa.String(), nullable=True),
+    sa.Column('town', sa.String(), nullable=True),
+    sa.Column('county', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('post_code', sa.String(), nullable=True),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('setup_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_edited', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_edited_by_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['last_edited_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_individuals_email'), 'individuals', ['email'], unique=False)
+    op.create_index(op.f('ix_individuals_first_name'), 'individuals', ['first_name'], unique=False)
+    op.create_index(op.f('ix_individuals_id'), 'individuals', ['id'], unique=False)
+    op.create_index(op.f('ix_individuals_last_name'), 'individuals', ['last_name'], unique=False)
+    op.create_index(op.f('ix_individuals_practice_id'), 'individuals', ['practice_id'], unique=False)
+    op.create_table('chart_of_accounts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('client_id', sa.UUID(), nullable=False),
+    sa.Column('code', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('account_type', sa.Enum('ASSET', 'LIABILITY', 'EQUITY', 'REVENUE', 'EXPENSE', name='accounttype'), nullable=False),
+    sa.Column('external_id', sa.String(), nullable=True),
+    sa.Column('source', sa.Enum('XERO', 'QUICKBOOKS', 'ODOO', 'MANUAL', name='accountsource'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('sync_status', sa.Enum('PENDING', 'SYNCED', 'FAILED', 'CONFLICT', name='syncstatus'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('client_id', 'code', name='uq_client_coa_code')
+    )
+    op.create_index(op.f('ix_chart_of_accounts_client_id'), 'chart_of_accounts', ['client_id'], unique=False)
+    op.create_index(op.f('ix_chart_of_accounts_code'), 'chart_of_accounts', ['code'], unique=False)
+    op.create_index(op.f('ix_chart_of_accounts_id'), 'chart_of_accounts', ['id'], unique=False)
+    op.create_table('client_services',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('client_id', sa.UUID(), nullable=False),
+    sa.Column('service_id', sa.UUID(), nullable=False),
+    sa.Column('is_enabled', sa.Boolean(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=True, comment='Custom price for this client-service combination'),
+    sa.Column('assigned_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('client_id', 'service_id', name='uq_client_service')
+    )
+    op.create_index(op.f('ix_client_services_client_id'), 'client_services', ['client_id'], unique=False)
+    op.create_index(op.f('ix_client_services_id'), 'client_services', ['id'], unique=False)
+    op.create_index(op.f('ix_client_services_is_enabled'), 'client_services', ['is_enabled'], unique=False)
+    op.create_index(op.f('ix_client_services_service_id'), 'client_services', ['service_id'], unique=False)
+    op.create_table('companies_house_profiles',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('client_id', sa.UUID(), nullable=False),
+    sa.Column('company_number', sa.String(), nullable=False),
+    sa.Column('company_name', sa.String(), nullable=True),
+    sa.Column('company_status', sa.String(), nullable=True),
+    sa.Column('companies_house_data', postgresql.JSONB(astext_type=sa.Text()), nullable=False, comment='Complete Companies House API response'),
+    sa.Column('last_synced', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('sync_status', sa.String(), nullable=True),
+    sa.Column('sync_error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_companies_house_profiles_client_id'), 'companies_house_profiles', ['client_id'], unique=True)
+    op.create_index(op.f('ix_companies_house_profiles_company_name'), 'companies_house_profiles', ['company_name'], unique=False)
+    op.create_index(op.f('ix_companies_house_profiles_company_number'), 'companies_house_profiles', ['company_number'], unique=True)
+    op.create_index(op.f('ix_companies_house_profiles_company_status'), 'companies_house_profiles', ['company_status'], unique=False)
+    op.create_index(op.f('ix_companies_house_profiles_id'), 'companies_house_profiles', ['id'], unique=False)
+    op.create_table('customers',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('individual_id', sa.UUID(), nullable=False),
+    sa.Column('ni_number', sa.String(), nullable=True),
+    sa.Column('personal_utr_number', sa.String(), nullable=True),
+    sa.Column('status', sa.Enum('active', 'inactive', 'suspended', 'archived', name='customerstatus'), nullable=False),
+    sa.Column('do_they_own_sa', sa.Boolean(), nullable=True),
+    sa.Column('sa_client_relation_id', sa.UUID(), nullable=True),
+    sa.Column('primary_accounting_contact_id', sa.UUID(), nullable=True),
+    sa.Column('acting_from', sa.Date(), nullable=True),
+    sa.Column('mlr_status', sa.Enum('pending', 'in_progress', 'complete', 'not_required', name='mlrstatus'), nullable=True),
+    sa.Column('mlr_date_complete', sa.Date(), nullable=True),
+    sa.Column('passport_number', sa.String(), nullable=True),
+    sa.Column('driving_license', sa.String(), nullable=True),
+    sa.Column('uk_home_telephone', sa.String(), nullable=True),
+    sa.Column('comments', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('setup_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_edited', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_edited_by_id', sa.UUID(), nullable=True),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['individual_id'], ['individuals.id'], ),
+    sa.ForeignKeyConstraint(['last_edited_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.ForeignKeyConstraint(['primary_accounting_contact_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['sa_client_relation_id'], ['clients.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_customers_id'), 'customers', ['id'], unique=False)
+    op.create_index(op.f('ix_customers_individual_id'), 'customers', ['individual_id'], unique=False)
+    op.create_index(op.f('ix_customers_ni_number'), 'customers', ['ni_number'], unique=True)
+    op.create_index(op.f('ix_customers_personal_utr_number'), 'customers', ['personal_utr_number'], unique=True)
+    op.create_index(op.f('ix_customers_sa_client_relation_id'), 'customers', ['sa_client_relation_id'], unique=False)
+    op.create_table('incomes',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('individual_id', sa.UUID(), nullable=False),
+    sa.Column('income_type', sa.Enum('self_employment', 'employment', 'rental', 'dividend', 'interest', 'foreign_income', 'pension', 'child_benefit', 'tax_universal_credits', 'other', name='incometype'), nullable=False),
+    sa.Column('income_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['individual_id'], ['individuals.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_incomes_id'), 'incomes', ['id'], unique=False)
+    op.create_index(op.f('ix_incomes_income_type'), 'incomes', ['income_type'], unique=False)
+    op.create_index(op.f('ix_incomes_individual_id'), 'incomes', ['individual_id'], unique=False)
+    op.create_table('individual_relationships',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('from_individual_id', sa.UUID(), nullable=False),
+    sa.Column('to_individual_id', sa.UUID(), nullable=False),
+    sa.Column('relationship_type', sa.Enum('spouse', 'partner', 'parent', 'child', 'sibling', 'grandparent', 'grandchild', 'aunt_uncle', 'niece_nephew', 'cousin', 'friend', 'guardian', 'dependent', 'other', name='individualrelationtype'), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['from_individual_id'], ['individuals.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.ForeignKeyConstraint(['to_individual_id'], ['individuals.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_individual_relationships_from_individual_id'), 'individual_relationships', ['from_individual_id'], unique=False)
+    op.create_index(op.f('ix_individual_relationships_id'), 'individual_relationships', ['id'], unique=False)
+    op.create_index(op.f('ix_individual_relationships_practice_id'), 'individual_relationships', ['practice_id'], unique=False)
+    op.create_index(op.f('ix_individual_relationships_to_individual_id'), 'individual_relationships', ['to_individual_id'], unique=False)
+    op.create_table('messages',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('individual_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('message_type', sa.Enum('whatsapp', 'email', 'sms', name='messagetype'), nullable=False),
+    sa.Column('direction', sa.Enum('incoming', 'outgoing', name='messagedirection'), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'sent', 'delivered', 'read', 'failed', name='messagestatus'), nullable=False),
+    sa.Column('sender', sa.Enum('human', 'ai', 'client', 'system', name='messagesender'), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('from_address', sa.String(), nullable=False),
+    sa.Column('to_address', sa.String(), nullable=False),
+    sa.Column('twilio_sid', sa.String(), nullable=True),
+    sa.Column('error_message', sa.String(), nullable=True),
+    sa.Column('message_metadata', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['individual_id'], ['individuals.id'], ),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('property_individual_relationships',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('property_id', sa.UUID(), nullable=False),
+    sa.Column('individual_id', sa.UUID(), nullable=False),
+    sa.Column('ownership_type', sa.Enum('sole_owner', 'joint_owner', 'beneficial_owner', 'trustee', 'tenant', 'other', name='ownershiptype'), nullable=False),
+    sa.Column('ownership_percentage', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('start_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('end_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_primary_owner', sa.Boolean(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['individual_id'], ['individuals.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_property_individual_relationships_id'), 'property_individual_relationships', ['id'], unique=False)
+    op.create_index(op.f('ix_property_individual_relationships_individual_id'), 'property_individual_relationships', ['individual_id'], unique=False)
+    op.create_index(op.f('ix_property_individual_relationships_property_id'), 'property_individual_relationships', ['property_id'], unique=False)
+    op.create_table('customer_client_associations',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('customer_id', sa.UUID(), nullable=False),
+    sa.Column('client_id', sa.UUID(), nullable=False),
+    sa.Column('relationship_type', sa.Enum('director', 'shareholder', 'partner', 'son', 'daughter', 'spouse', 'parent', 'sibling', 'investor', 'employee', 'consultant', 'secretary', 'accountant', 'solicitor', 'beneficial_owner', 'trustee', 'guarantor', 'other', name='relationshiptype'), nullable=False),
+    sa.Column('percentage_ownership', sa.String(), nullable=True),
+    sa.Column('appointment_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('resignation_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_active', sa.String(), nullable=True),
+    sa.Column('is_primary_contact', sa.Boolean(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_client_primary_contact_unique', 'customer_client_associations', ['client_id'], unique=True, postgresql_where=sa.text('is_primary_contact = true'))
+    op.create_index(op.f('ix_customer_client_associations_client_id'), 'customer_client_associations', ['client_id'], unique=False)
+    op.create_index(op.f('ix_customer_client_associations_customer_id'), 'customer_client_associations', ['customer_id'], unique=False)
+    op.create_index(op.f('ix_customer_client_associations_id'), 'customer_client_associations', ['id'], unique=False)
+    op.create_index(op.f('ix_customer_client_associations_is_primary_contact'), 'customer_client_associations', ['is_primary_contact'], unique=False)
+    op.create_index(op.f('ix_customer_client_associations_relationship_type'), 'customer_client_associations', ['relationship_type'], unique=False)
+    op.create_table('documents',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('individual_id', sa.UUID(), nullable=True),
+    sa.Column('customer_id', sa.UUID(), nullable=True),
+    sa.Column('client_id', sa.UUID(), nullable=True),
+    sa.Column('message_id', sa.UUID(), nullable=True),
+    sa.Column('uploaded_by_user_id', sa.UUID(), nullable=True),
+    sa.Column('validated_by_user_id', sa.UUID(), nullable=True),
+    sa.Column('archived_by_user_id', sa.UUID(), nullable=True),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('original_filename', sa.String(), nullable=True),
+    sa.Column('document_url', sa.String(), nullable=False),
+    sa.Column('file_size', sa.String(), nullable=True),
+    sa.Column('mime_type', sa.String(), nullable=True),
+    sa.Column('document_type', sa.Enum('pdf', 'image', 'word_doc', 'excel', 'powerpoint', 'text', 'csv', 'other', name='documenttype'), nullable=False),
+    sa.Column('document_source', sa.Enum('whatsapp', 'email', 'upload', 'scan', 'other', name='documentsource'), nullable=False),
+    sa.Column('document_category', sa.String(), nullable=True),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('raw_extracted_text', sa.Text(), nullable=True),
+    sa.Column('agent_state', sa.Enum('pending', 'processing', 'processed', 'failed', 'rejected', 'awaiting_client_selection', name='documentagentstate'), nullable=True),
+    sa.Column('agent_metadata', sa.JSON(), nullable=True),
+    sa.Column('upload_source_details', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['archived_by_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['individual_id'], ['individuals.id'], ),
+    sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.ForeignKeyConstraint(['uploaded_by_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['validated_by_user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('invoices',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('client_id', sa.UUID(), nullable=False),
+    sa.Column('document_id', sa.UUID(), nullable=True),
+    sa.Column('invoice_number', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('draft', 'sent', 'paid', 'overdue', 'cancelled', 'void', name='invoicestatus'), nullable=False),
+    sa.Column('issue_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_invoices_client_id'), 'invoices', ['client_id'], unique=False)
+    op.create_index(op.f('ix_invoices_id'), 'invoices', ['id'], unique=False)
+    op.create_index(op.f('ix_invoices_invoice_number'), 'invoices', ['invoice_number'], unique=False)
+    op.create_index(op.f('ix_invoices_practice_id'), 'invoices', ['practice_id'], unique=False)
+    op.create_table('invoice_line_items',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('invoice_id', sa.UUID(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('tax_rate', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('total', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('account_id', sa.UUID(), nullable=True),
+    sa.Column('account_code', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['chart_of_accounts.id'], ),
+    sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_invoice_line_items_account_id'), 'invoice_line_items', ['account_id'], unique=False)
+    op.create_index(op.f('ix_invoice_line_items_id'), 'invoice_line_items', ['id'], unique=False)
+    op.create_index(op.f('ix_invoice_line_items_invoice_id'), 'invoice_line_items', ['invoice_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_invoice_line_items_invoice_id'), table_name='invoice_line_items')
+    op.drop_index(op.f('ix_invoice_line_items_id'), table_name='invoice_line_items')
+    op.drop_index(op.f('ix_invoice_line_items_account_id'), table_name='invoice_line_items')
+    op.drop_table('invoice_line_items')
+    op.drop_index(op.f('ix_invoices_practice_id'), table_name='invoices')
+    op.drop_index(op.f('ix_invoices_invoice_number'), table_name='invoices')
+    op.drop_index(op.f('ix_invoices_id'), table_name='invoices')
+    op.drop_index(op.f('ix_invoices_client_id'), table_name='invoices')
+    op.drop_table('invoices')
+    op.drop_table('documents')
+    op.drop_index(op.f('ix_customer_client_associations_relationship_type'), table_name='customer_client_associations')
+    op.drop_index(op.f('ix_customer_client_associations_is_primary_contact'), table_name='customer_client_associations')
+    op.drop_index(op.f('ix_customer_client_associations_id'), table_name='customer_client_associations')
+    op.drop_index(op.f('ix_customer_client_associations_customer_id'), table_name='customer_client_associations')
+    op.drop_index(op.f('ix_customer_client_associations_client_id'), table_name='customer_client_associations')
+    op.drop_index('ix_client_primary_contact_unique', table_name='customer_client_associations', postgresql_where=sa.text('is_primary_contact = true'))
+    op.drop_table('customer_client_associations')
+    op.drop_index(op.f('ix_property_individual_relationships_property_id'), table_name='property_individual_relationships')
+    op.drop_index(op.f('ix_property_individual_relationships_individual_id'), table_name='property_individual_relationships')
+    op.drop_index(op.f('ix_property_individual_relationships_id'), table_name='property_individual_relationships')
+    op.drop_table('property_individual_relationships')
+    op.drop_table('messages')
+    op.drop_index(op.f('ix_individual_relationships_to_individual_id'), table_name='individual_relationships')
+    op.drop_index(op.f('ix_individual_relationships_practice_id'), table_name='individual_relationships')
+    op.drop_index(op.f('ix_individual_relationships_id'), table_name='individual_relationships')
+    op.drop_index(op.f('ix_individual_relationships_from_individual_id'), table_name='individual_relationships')
+    op.drop_table('individual_relationships')
+    op.drop_index(op.f('ix_incomes_individual_id'), table_name='incomes')
+    op.drop_index(op.f('ix_incomes_income_type'), table_name='incomes')
+    op.drop_index(op.f('ix_incomes_id'), table_name='incomes')
+    op.drop_table('incomes')
+    op.drop_index(op.f('ix_customers_sa_client_relation_id'), table_name='customers')
+    op.drop_index(op.f('ix_customers_personal_utr_number'), table_name='customers')
+    op.drop_index(op.f('ix_customers_ni_number'), table_name='customers')
+    op.drop_index(op.f('ix_customers_individual_id'), table_name='customers')
+    op.drop_index(op.f('ix_customers_id'), table_name='customers')
+    op.drop_table('customers')
+    op.drop_index(op.f('ix_companies_house_profiles_id'), table_name='companies_house_profiles')
+    op.drop_index(op.f('ix_companies_house_profiles_company_status'), table_name='companies_house_profiles')
+    op.drop_index(op.f('ix_companies_house_profiles_company_number'), table_name='companies_house_profiles')
+    op.drop_index(op.f('ix_companies_house_profiles_company_name'), table_name='companies_house_profiles')
+    op.drop_index(op.f('ix_companies_house_profiles_client_id'), table_name='companies_house_profiles')
+    op.drop_table('companies_house_profiles')
+    op.drop_index(op.f('ix_client_services_service_id'), table_name='client_services')
+    op.drop_index(op.f('ix_client_services_is_enabled'), table_name='client_services')
+    op.drop_index(op.f('ix_client_services_id'), table_name='client_services')
+    op.drop_index(op.f('ix_client_services_client_id'), table_name='client_services')
+    op.drop_table('client_services')
+    op.drop_index(op.f('ix_chart_of_accounts_id'), table_name='chart_of_accounts')
+    op.drop_index(op.f('ix_chart_of_accounts_code'), table_name='chart_of_accounts')
+    op.drop_index(op.f('ix_chart_of_accounts_client_id'), table_name='chart_of_accounts')
+    op.drop_table('chart_of_accounts')
+    op.drop_index(op.f('ix_individuals_practice_id'), table_name='individuals')
+    op.drop_index(op.f('ix_individuals_last_name'), table_name='individuals')
+    op.drop_index(op.f('ix_individuals_id'), table_name='individuals')
+    op.drop_index(op.f('ix_individuals_first_name'), table_name='individuals')
+    op.drop_index(op.f('ix_individuals_email'), table_name='individuals')
+    op.drop_table('individuals')
+    op.drop_index(op.f('ix_clients_trading_postcode'), table_name='clients')
+    op.drop_index(op.f('ix_clients_registered_postcode'), table_name='clients')
+    op.drop_index(op.f('ix_clients_id'), table_name='clients')
+    op.drop_index(op.f('ix_clients_company_number'), table_name='clients')
+    op.drop_index(op.f('ix_clients_client_primary_contact_id'), table_name='clients')
+    op.drop_index(op.f('ix_clients_client_code'), table_name='clients')
+    op.drop_index(op.f('ix_clients_business_name'), table_name='clients')
+    op.drop_table('clients')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_services_service_code'), table_name='services')
+    op.drop_index(op.f('ix_services_practice_id'), table_name='services')
+    op.drop_index(op.f('ix_services_id'), table_name='services')
+    op.drop_table('services')
+    op.drop_index(op.f('ix_properties_property_name'), table_name='properties')
+    op.drop_index(op.f('ix_properties_post_code'), table_name='properties')
+    op.drop_index(op.f('ix_properties_id'), table_name='properties')
+    op.drop_table('properties')
+    op.drop_index(op.f('ix_practices_name'), table_name='practices')
+    op.drop_index(op.f('ix_practices_id'), table_name='practices')
+    op.drop_table('practices')
+    # Enum types are created implicitly with their tables but not dropped with them
+    sa.Enum(name='accountingsoftware').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='accountsource').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='accounttype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='billingfrequency').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='bookkeepingformat').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='businesstype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='clientmlrstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='customerstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='documentagentstate').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='documentsource').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='documenttype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='engagementletterstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='gender').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='incometype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='individualrelationtype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='invoicestatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='maritalstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='messagedirection').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='messagesender').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='messagestatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='messagetype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='mlrstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='ownershiptype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='paymentmethod').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='payrollfrequency').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='payrolltype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='propertystatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='propertytype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='relationshiptype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='syncstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
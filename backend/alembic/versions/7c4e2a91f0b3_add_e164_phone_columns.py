@@ -0,0 +1,101 @@
+"""add normalised E.164 phone columns for webhook sender resolution
+
+Revision ID: 7c4e2a91f0b3
+Revises: 3b1f0c7a9d21
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+import re
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7c4e2a91f0b3'
+down_revision = '3b1f0c7a9d21'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of services.phone_numbers.normalize_phone_number as of this revision, so
+# the backfill does not change when the application's normaliser does
+DEFAULT_COUNTRY_CODE = "44"
+_SEPARATORS = re.compile(r"[\s\-().]")
+
+
+def normalize_phone_number(phone_number):
+    if not phone_number:
+        return None
+
+    number = phone_number.strip().replace("(0)", "")
+    if number.lower().startswith("whatsapp:"):
+        number = number[len("whatsapp:"):]
+    number = _SEPARATORS.sub("", number)
+
+    if number.startswith("+"):
+        digits = number[1:]
+    elif number.startswith("00"):
+        digits = number[2:]
+    elif number.startswith("0"):
+        digits = DEFAULT_COUNTRY_CODE + number[1:]
+    else:
+        digits = number
+
+    if not digits.isdigit() or not 7 <= len(digits) <= 15:
+        return None
+
+    return f"+{digits}"
+
+
+def _backfill(table_name: str, source: str, target: str) -> None:
+    """Fill `target` with the normalised value of `source` for existing rows."""
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.UUID()), sa.column(source, sa.String()), sa.column(target, sa.String()))
+    rows = bind.execute(sa.select(table.c.id, table.c[source]).where(table.c[source].isnot(None))).all()
+    updates = [
+        {'row_id': row_id, 'normalised': normalize_phone_number(value)}
+        for row_id, value in rows
+    ]
+    if updates:
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('row_id')).values({target: sa.bindparam('normalised')}),
+            updates
+        )
+
+
+def _check_unique_practice_numbers() -> None:
+    """
+    Fail with the offending practices listed if two of them stored the same WhatsApp
+    number in different formats, rather than with a bare unique violation from the index.
+    """
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT whatsapp_number_e164, string_agg(id::text || ' (' || whatsapp_number || ')', ', ' ORDER BY id) "
+        "FROM practices WHERE whatsapp_number_e164 IS NOT NULL "
+        "GROUP BY whatsapp_number_e164 HAVING count(*) > 1"
+    )).all()
+    if duplicates:
+        details = "; ".join(f"{number}: {practices}" for number, practices in duplicates)
+        raise RuntimeError(
+            "Practices share a WhatsApp number once normalised to E.164, set a distinct "
+            f"whatsapp_number on all but one of them and re-run the migration: {details}"
+        )
+
+
+def upgrade() -> None:
+    op.add_column('individuals', sa.Column('primary_mobile_e164', sa.String(), nullable=True))
+    op.add_column('practices', sa.Column('whatsapp_number_e164', sa.String(), nullable=True))
+
+    # Offline (--sql) scripts are for an empty database (see the initial schema)
+    if not context.is_offline_mode():
+        _backfill('individuals', 'primary_mobile', 'primary_mobile_e164')
+        _backfill('practices', 'whatsapp_number', 'whatsapp_number_e164')
+        _check_unique_practice_numbers()
+
+    op.create_index('ix_individuals_primary_mobile_e164_practice', 'individuals', ['primary_mobile_e164', 'practice_id'], unique=False)
+    op.create_index(op.f('ix_practices_whatsapp_number_e164'), 'practices', ['whatsapp_number_e164'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_practices_whatsapp_number_e164'), table_name='practices')
+    op.drop_index('ix_individuals_primary_mobile_e164_practice', table_name='individuals')
+    op.drop_column('practices', 'whatsapp_number_e164')
+    op.drop_column('individuals', 'primary_mobile_e164')
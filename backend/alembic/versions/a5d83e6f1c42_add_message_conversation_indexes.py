@@ -0,0 +1,50 @@
+"""add message conversation and twilio sid indexes
+
+Revision ID: a5d83e6f1c42
+Revises: 7c4e2a91f0b3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from db.message_partitions import is_messages_partitioned, create_partitioned_index, drop_partitioned_index
+
+# revision identifiers, used by Alembic.
+revision = 'a5d83e6f1c42'
+down_revision = '7c4e2a91f0b3'
+branch_labels = None
+depends_on = None
+
+
+def _messages_partitioned() -> bool:
+    # Converted with `python -m db.message_partitions convert`; offline scripts assume a plain table
+    return not context.is_offline_mode() and is_messages_partitioned(op.get_bind())
+
+
+def upgrade() -> None:
+    # Build the indexes without blocking writes to a large messages table
+    with op.get_context().autocommit_block():
+        if _messages_partitioned():
+            create_partitioned_index(op.get_bind(), 'ix_messages_individual_id_created_at', 'individual_id, created_at DESC')
+            create_partitioned_index(op.get_bind(), 'ix_messages_twilio_sid', 'twilio_sid')
+            return
+        op.create_index(
+            'ix_messages_individual_id_created_at', 'messages',
+            ['individual_id', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_messages_twilio_sid', 'messages', ['twilio_sid'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        if _messages_partitioned():
+            drop_partitioned_index(op.get_bind(), 'ix_messages_twilio_sid')
+            drop_partitioned_index(op.get_bind(), 'ix_messages_individual_id_created_at')
+            return
+        op.drop_index('ix_messages_twilio_sid', table_name='messages', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_messages_individual_id_created_at', table_name='messages', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,54 @@
+"""add document processing summary columns
+
+Revision ID: a9d4c7e2b815
+Revises: f4b2d8e61a07
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4c7e2b815'
+down_revision = 'f4b2d8e61a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('extracted_text_length', sa.Integer(), nullable=True))
+    op.add_column('documents', sa.Column('agent_processing_started_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('documents', sa.Column('agent_confidence_score', sa.Float(), nullable=True))
+    op.add_column('documents', sa.Column('agent_processing_notes', sa.Text(), nullable=True))
+    op.add_column('documents', sa.Column('is_validated', sa.Boolean(), server_default='false', nullable=False))
+    op.add_column('documents', sa.Column('validated_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('documents', sa.Column('is_archived', sa.Boolean(), server_default='false', nullable=False))
+    op.add_column('documents', sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill from the text and agent_metadata the summary is derived from
+    op.execute("""
+        UPDATE documents SET
+            extracted_text_length = length(raw_extracted_text),
+            agent_confidence_score = CASE
+                WHEN jsonb_typeof(agent_metadata #> '{classification,confidence}') = 'number'
+                THEN (agent_metadata #>> '{classification,confidence}')::float
+            END,
+            agent_processing_notes = coalesce(agent_metadata ->> 'processing_error', agent_metadata #>> '{ocr_processing,error}'),
+            is_validated = validated_by_user_id IS NOT NULL,
+            is_archived = archived_by_user_id IS NOT NULL
+        WHERE raw_extracted_text IS NOT NULL
+           OR agent_metadata IS NOT NULL
+           OR validated_by_user_id IS NOT NULL
+           OR archived_by_user_id IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'archived_at')
+    op.drop_column('documents', 'is_archived')
+    op.drop_column('documents', 'validated_at')
+    op.drop_column('documents', 'is_validated')
+    op.drop_column('documents', 'agent_processing_notes')
+    op.drop_column('documents', 'agent_confidence_score')
+    op.drop_column('documents', 'agent_processing_started_at')
+    op.drop_column('documents', 'extracted_text_length')
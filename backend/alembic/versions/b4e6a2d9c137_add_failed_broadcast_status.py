@@ -0,0 +1,26 @@
+"""add failed broadcast status
+
+Revision ID: b4e6a2d9c137
+Revises: e3c9b7a2d416
+Create Date: 2026-10-20 02:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b4e6a2d9c137'
+down_revision = 'e3c9b7a2d416'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A new enum value cannot be used in the transaction that adds it
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE broadcaststatus ADD VALUE IF NOT EXISTS 'failed'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop an enum value; the value stays, unused once failed broadcasts
+    # are shown as cancelled
+    op.execute("UPDATE message_broadcasts SET status = 'cancelled' WHERE status = 'failed'")
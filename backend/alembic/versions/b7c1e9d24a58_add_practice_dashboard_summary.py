@@ -0,0 +1,71 @@
+"""add practice dashboard summary materialised view
+
+Revision ID: b7c1e9d24a58
+Revises: e81c5b3a7f60
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b7c1e9d24a58'
+down_revision = 'e81c5b3a7f60'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of db.dashboard_summary.DASHBOARD_SUMMARY_SELECT at this revision
+DASHBOARD_SUMMARY_SELECT = """
+WITH companies_house AS (
+    SELECT c.practice_id,
+           coalesce((p.companies_house_data #>> '{accounts,next_accounts,overdue}')::boolean, false) AS accounts_overdue,
+           coalesce((p.companies_house_data #>> '{confirmation_statement,overdue}')::boolean, false) AS confirmation_overdue
+    FROM companies_house_profiles p
+    JOIN clients c ON c.id = p.client_id
+),
+rental_properties AS (
+    -- A property owned by several individuals of the practice is counted once
+    SELECT DISTINCT i.practice_id, p.id, p.annual_rental_income
+    FROM properties p
+    JOIN property_individual_relationships r ON r.property_id = p.id
+    JOIN individuals i ON i.id = r.individual_id
+    WHERE p.is_rental_property OR p.annual_rental_income IS NOT NULL
+),
+summary AS (
+    SELECT practice_id, 'customers_by_status' AS metric, status::text AS bucket,
+           count(*) AS item_count, NULL::numeric AS total_amount
+    FROM customers GROUP BY practice_id, status
+    UNION ALL
+    SELECT practice_id, 'clients_by_business_type', business_type::text, count(*), NULL
+    FROM clients GROUP BY practice_id, business_type
+    UNION ALL
+    SELECT i.practice_id, 'income_by_type', inc.income_type::text, count(*), sum(inc.income_amount)
+    FROM incomes inc JOIN individuals i ON i.id = inc.individual_id
+    GROUP BY i.practice_id, inc.income_type
+    UNION ALL
+    SELECT practice_id, 'rental_income', 'annual', count(*), coalesce(sum(annual_rental_income), 0)
+    FROM rental_properties GROUP BY practice_id
+    UNION ALL
+    SELECT practice_id, 'overdue_filings', 'accounts', count(*) FILTER (WHERE accounts_overdue), NULL
+    FROM companies_house GROUP BY practice_id
+    UNION ALL
+    SELECT practice_id, 'overdue_filings', 'confirmation_statement', count(*) FILTER (WHERE confirmation_overdue), NULL
+    FROM companies_house GROUP BY practice_id
+    UNION ALL
+    SELECT practice_id, 'overdue_filings', 'any', count(*) FILTER (WHERE accounts_overdue OR confirmation_overdue), NULL
+    FROM companies_house GROUP BY practice_id
+)
+SELECT practice_id, metric, bucket, item_count, total_amount, now() AS refreshed_at FROM summary
+"""
+
+
+def upgrade() -> None:
+    op.execute(f"CREATE MATERIALIZED VIEW practice_dashboard_summary AS {DASHBOARD_SUMMARY_SELECT}")
+    # Unique index required by REFRESH MATERIALIZED VIEW CONCURRENTLY; also serves reads by practice
+    op.execute(
+        "CREATE UNIQUE INDEX ix_practice_dashboard_summary_practice_metric_bucket "
+        "ON practice_dashboard_summary (practice_id, metric, bucket)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS practice_dashboard_summary")
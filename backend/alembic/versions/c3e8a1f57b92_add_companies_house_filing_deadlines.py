@@ -0,0 +1,54 @@
+"""add companies house filing deadline columns
+
+Revision ID: c3e8a1f57b92
+Revises: b7c1e9d24a58
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a1f57b92'
+down_revision = 'b7c1e9d24a58'
+branch_labels = None
+depends_on = None
+
+
+# Companies House dates are YYYY-MM-DD; anything else is left NULL rather than failing the upgrade
+def _json_date(path: str) -> str:
+    value = f"companies_house_data #>> '{path}'"
+    return f"CASE WHEN {value} ~ '^\\d{{4}}-\\d{{2}}-\\d{{2}}$' THEN ({value})::date END"
+
+
+def upgrade() -> None:
+    op.add_column('companies_house_profiles', sa.Column('next_accounts_due', sa.Date(), nullable=True))
+    op.add_column('companies_house_profiles', sa.Column('next_confirmation_due', sa.Date(), nullable=True))
+    op.add_column('companies_house_profiles', sa.Column('accounts_overdue', sa.Boolean(), server_default='false', nullable=False))
+    op.add_column('companies_house_profiles', sa.Column('confirmation_overdue', sa.Boolean(), server_default='false', nullable=False))
+
+    # Backfill with the same rules as CompaniesHouseProfile._sync_filing_deadlines
+    op.execute(f"""
+        UPDATE companies_house_profiles SET
+            next_accounts_due = coalesce({_json_date('{accounts,next_accounts,due_on}')}, {_json_date('{accounts,next_due}')}),
+            next_confirmation_due = {_json_date('{confirmation_statement,next_due}')},
+            accounts_overdue = coalesce((companies_house_data #>> '{{accounts,next_accounts,overdue}}')::boolean, false),
+            confirmation_overdue = coalesce((companies_house_data #>> '{{confirmation_statement,overdue}}')::boolean, false)
+    """)
+
+    op.create_index('ix_companies_house_profiles_next_accounts_due', 'companies_house_profiles', ['next_accounts_due'], unique=False)
+    op.create_index('ix_companies_house_profiles_next_confirmation_due', 'companies_house_profiles', ['next_confirmation_due'], unique=False)
+    op.create_index(
+        'ix_companies_house_profiles_filing_overdue', 'companies_house_profiles', ['client_id'],
+        unique=False, postgresql_where=sa.text('accounts_overdue OR confirmation_overdue')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_companies_house_profiles_filing_overdue', table_name='companies_house_profiles')
+    op.drop_index('ix_companies_house_profiles_next_confirmation_due', table_name='companies_house_profiles')
+    op.drop_index('ix_companies_house_profiles_next_accounts_due', table_name='companies_house_profiles')
+    op.drop_column('companies_house_profiles', 'confirmation_overdue')
+    op.drop_column('companies_house_profiles', 'accounts_overdue')
+    op.drop_column('companies_house_profiles', 'next_confirmation_due')
+    op.drop_column('companies_house_profiles', 'next_accounts_due')
@@ -0,0 +1,111 @@
+"""move extracted text from documents to a compressed per-page document_text table
+
+Revision ID: c6f1e3a8d590
+Revises: a9d4c7e2b815
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+import re
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import zstandard
+
+# revision identifiers, used by Alembic.
+revision = 'c6f1e3a8d590'
+down_revision = 'a9d4c7e2b815'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+ZSTD_LEVEL = 9
+PAGE_MARKER = re.compile(r"\n--- Page (\d+) ---\n")
+
+
+def _split_pages(text):
+    parts = PAGE_MARKER.split(text)
+    return [text] if len(parts) == 1 else parts[2::2]
+
+
+def _join_pages(pages):
+    if len(pages) == 1:
+        return pages[0]
+    return "".join(f"\n--- Page {number} ---\n{page}" for number, page in enumerate(pages, start=1))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_text',
+        sa.Column('document_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('page_number', sa.Integer(), nullable=False),
+        sa.Column('text_zstd', sa.LargeBinary(), nullable=False),
+        sa.Column('layout_zstd', sa.LargeBinary(), nullable=True),
+        sa.Column('char_count', sa.Integer(), nullable=False),
+        sa.Column('extraction_method', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('document_id', 'page_number')
+    )
+    # The values are zstd-compressed already: keep them out of line without pglz
+    op.execute("ALTER TABLE document_text ALTER COLUMN text_zstd SET STORAGE EXTERNAL")
+    op.execute("ALTER TABLE document_text ALTER COLUMN layout_zstd SET STORAGE EXTERNAL")
+    op.add_column('documents', sa.Column('extracted_page_count', sa.Integer(), nullable=True))
+
+    # Move the existing text, page by page (skipped offline: --sql scripts are for an
+    # empty database, see the initial schema)
+    if not context.is_offline_mode():
+        conn = op.get_bind()
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        document_text = sa.table(
+            'document_text',
+            sa.column('document_id'), sa.column('page_number'), sa.column('text_zstd', sa.LargeBinary),
+            sa.column('char_count'), sa.column('extraction_method')
+        )
+        last_id = None
+        while True:
+            rows = conn.execute(sa.text(
+                "SELECT id, raw_extracted_text, agent_metadata #>> '{ocr_processing,processing_method}' "
+                "FROM documents WHERE raw_extracted_text IS NOT NULL"
+                + (" AND id > :last_id" if last_id else "")
+                + " ORDER BY id LIMIT :batch"
+            ), {"last_id": last_id, "batch": BATCH_SIZE}).all()
+            if not rows:
+                break
+            pages = []
+            for document_id, text, method in rows:
+                for number, page in enumerate(_split_pages(text), start=1):
+                    pages.append({
+                        "document_id": document_id, "page_number": number,
+                        "text_zstd": compressor.compress(page.encode("utf-8")),
+                        "char_count": len(page), "extraction_method": method
+                    })
+            conn.execute(document_text.insert(), pages)
+            last_id = rows[-1][0]
+
+        op.execute("""
+            UPDATE documents d SET extracted_page_count = t.pages, extracted_text_length = t.chars
+            FROM (SELECT document_id, count(*) AS pages, sum(char_count) AS chars FROM document_text GROUP BY document_id) t
+            WHERE t.document_id = d.id
+        """)
+    # Frees the space once the table is next rewritten (VACUUM FULL / pg_repack)
+    op.drop_column('documents', 'raw_extracted_text')
+
+
+def downgrade() -> None:
+    op.add_column('documents', sa.Column('raw_extracted_text', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    decompressor = zstandard.ZstdDecompressor()
+    document_ids = [] if context.is_offline_mode() else conn.execute(
+        sa.text("SELECT DISTINCT document_id FROM document_text")
+    ).scalars().all()
+    for document_id in document_ids:
+        pages = conn.execute(sa.text(
+            "SELECT text_zstd FROM document_text WHERE document_id = :id ORDER BY page_number"
+        ), {"id": document_id}).scalars().all()
+        text = _join_pages([decompressor.decompress(page).decode("utf-8") for page in pages])
+        conn.execute(sa.text("UPDATE documents SET raw_extracted_text = :text WHERE id = :id"), {"text": text, "id": document_id})
+
+    op.drop_column('documents', 'extracted_page_count')
+    op.drop_table('document_text')
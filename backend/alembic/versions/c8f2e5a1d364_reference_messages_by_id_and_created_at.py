@@ -0,0 +1,67 @@
+"""reference messages from documents by (id, created_at)
+
+Revision ID: c8f2e5a1d364
+Revises: b4e6a2d9c137
+Create Date: 2026-10-20 03:00:00.000000
+
+A partitioned messages table (db/message_partitions.py) can only be referenced through
+a unique key that includes created_at, so documents carry the message's created_at and
+reference (id, created_at). The same key works on a plain messages table, so the schema
+is the same whether or not messages has been converted.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from db.message_partitions import is_messages_partitioned, create_partitioned_index, drop_partitioned_index
+
+# revision identifiers, used by Alembic.
+revision = 'c8f2e5a1d364'
+down_revision = 'b4e6a2d9c137'
+branch_labels = None
+depends_on = None
+
+
+def _messages_partitioned() -> bool:
+    # Converted with `python -m db.message_partitions convert`; offline scripts assume a plain table
+    return not context.is_offline_mode() and is_messages_partitioned(op.get_bind())
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('message_created_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE documents SET message_created_at = messages.created_at "
+        "FROM messages WHERE messages.id = documents.message_id"
+    )
+    # Only possible on a converted table, whose conversion dropped the old foreign key
+    op.execute("UPDATE documents SET message_id = NULL WHERE message_id IS NOT NULL AND message_created_at IS NULL")
+
+    with op.get_context().autocommit_block():
+        if _messages_partitioned():
+            create_partitioned_index(op.get_bind(), 'ix_messages_id_created_at', 'id, created_at', unique=True)
+        else:
+            op.create_index(
+                'ix_messages_id_created_at', 'messages', ['id', 'created_at'],
+                unique=True, postgresql_concurrently=True, if_not_exists=True
+            )
+
+    op.execute("ALTER TABLE documents DROP CONSTRAINT IF EXISTS documents_message_id_fkey")
+    # NOT VALID, then VALIDATE: existing rows are checked without blocking writes to documents
+    op.create_foreign_key(
+        'documents_message_fkey', 'documents', 'messages',
+        ['message_id', 'message_created_at'], ['id', 'created_at'],
+        match='FULL', postgresql_not_valid=True
+    )
+    op.execute("ALTER TABLE documents VALIDATE CONSTRAINT documents_message_fkey")
+
+
+def downgrade() -> None:
+    op.drop_constraint('documents_message_fkey', 'documents', type_='foreignkey')
+    if not _messages_partitioned():
+        # A partitioned table has no unique key on id alone to reference
+        op.create_foreign_key('documents_message_id_fkey', 'documents', 'messages', ['message_id'], ['id'])
+    with op.get_context().autocommit_block():
+        if _messages_partitioned():
+            drop_partitioned_index(op.get_bind(), 'ix_messages_id_created_at')
+        else:
+            op.drop_index('ix_messages_id_created_at', table_name='messages', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('documents', 'message_created_at')
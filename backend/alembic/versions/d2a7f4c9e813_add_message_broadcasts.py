@@ -0,0 +1,70 @@
+"""add message broadcasts for bulk WhatsApp sends
+
+Revision ID: d2a7f4c9e813
+Revises: a5d83e6f1c42
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from db.message_partitions import is_messages_partitioned, create_partitioned_index, drop_partitioned_index
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7f4c9e813'
+down_revision = 'a5d83e6f1c42'
+branch_labels = None
+depends_on = None
+
+
+def _messages_partitioned() -> bool:
+    # Converted with `python -m db.message_partitions convert`; offline scripts assume a plain table
+    return not context.is_offline_mode() and is_messages_partitioned(op.get_bind())
+
+
+def upgrade() -> None:
+    op.create_table('message_broadcasts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('practice_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('body_template', sa.Text(), nullable=False),
+    sa.Column('audience', sa.JSON(), nullable=True),
+    sa.Column('status', sa.Enum('queued', 'sending', 'completed', 'cancelled', name='broadcaststatus'), nullable=False),
+    sa.Column('total_recipients', sa.Integer(), nullable=False),
+    sa.Column('skipped_recipients', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['practice_id'], ['practices.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_message_broadcasts_id'), 'message_broadcasts', ['id'], unique=False)
+    op.create_index(op.f('ix_message_broadcasts_practice_id'), 'message_broadcasts', ['practice_id'], unique=False)
+
+    # Nullable column without a default: a catalog-only change, no table rewrite
+    op.add_column('messages', sa.Column('broadcast_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key('messages_broadcast_id_fkey', 'messages', 'message_broadcasts', ['broadcast_id'], ['id'])
+    with op.get_context().autocommit_block():
+        if _messages_partitioned():
+            create_partitioned_index(op.get_bind(), 'ix_messages_broadcast_id_status', 'broadcast_id, status')
+        else:
+            op.create_index(
+                'ix_messages_broadcast_id_status', 'messages', ['broadcast_id', 'status'],
+                unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        if _messages_partitioned():
+            drop_partitioned_index(op.get_bind(), 'ix_messages_broadcast_id_status')
+        else:
+            op.drop_index('ix_messages_broadcast_id_status', table_name='messages', postgresql_concurrently=True, if_exists=True)
+    op.drop_constraint('messages_broadcast_id_fkey', 'messages', type_='foreignkey')
+    op.drop_column('messages', 'broadcast_id')
+    op.drop_index(op.f('ix_message_broadcasts_practice_id'), table_name='message_broadcasts')
+    op.drop_index(op.f('ix_message_broadcasts_id'), table_name='message_broadcasts')
+    op.drop_table('message_broadcasts')
+    sa.Enum(name='broadcaststatus').drop(op.get_bind(), checkfirst=True)
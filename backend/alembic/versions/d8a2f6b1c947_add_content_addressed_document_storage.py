@@ -0,0 +1,40 @@
+"""add content-addressed document storage
+
+Revision ID: d8a2f6b1c947
+Revises: c6f1e3a8d590
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd8a2f6b1c947'
+down_revision = 'c6f1e3a8d590'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stored_files',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('mime_type', sa.String(), nullable=True),
+        sa.Column('refcount', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+    op.add_column('documents', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        'documents_content_sha256_fkey', 'documents', 'stored_files', ['content_sha256'], ['sha256']
+    )
+    op.create_index('ix_documents_content_sha256', 'documents', ['content_sha256'])
+    # Existing documents keep their local paths until `python -m services.document_storage import-legacy`
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_content_sha256', table_name='documents')
+    op.drop_constraint('documents_content_sha256_fkey', 'documents', type_='foreignkey')
+    op.drop_column('documents', 'content_sha256')
+    op.drop_table('stored_files')
@@ -0,0 +1,33 @@
+"""add document thumbnail and preview files
+
+Revision ID: e3c9b7a2d416
+Revises: d8a2f6b1c947
+Create Date: 2026-10-20 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e3c9b7a2d416'
+down_revision = 'd8a2f6b1c947'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('thumbnail_sha256', 'preview_sha256')
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.add_column('documents', sa.Column(column, sa.String(length=64), nullable=True))
+        op.create_foreign_key(f'documents_{column}_fkey', 'documents', 'stored_files', [column], ['sha256'])
+        op.create_index(f'ix_documents_{column}', 'documents', [column])
+    # Existing documents get previews when they are next OCR'd
+
+
+def downgrade() -> None:
+    for column in COLUMNS:
+        op.drop_index(f'ix_documents_{column}', table_name='documents')
+        op.drop_constraint(f'documents_{column}_fkey', 'documents', type_='foreignkey')
+        op.drop_column('documents', column)
+    # The preview files stay in storage until `python -m services.document_storage gc`
@@ -0,0 +1,42 @@
+"""add typeahead name indexes on clients and individuals
+
+Revision ID: e81c5b3a7f60
+Revises: d2a7f4c9e813
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e81c5b3a7f60'
+down_revision = 'd2a7f4c9e813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # lower(name) COLLATE "C" serves both prefix LIKE and ORDER BY (see db.models.base.name_search_key)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_clients_practice_id_business_name_key', 'clients',
+            ['practice_id', sa.text('(lower(business_name) COLLATE "C")'), 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_individuals_practice_id_last_name_key', 'individuals',
+            ['practice_id', sa.text('(lower(last_name) COLLATE "C")'), sa.text('(lower(first_name) COLLATE "C")'), 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_individuals_practice_id_first_name_key', 'individuals',
+            ['practice_id', sa.text('(lower(first_name) COLLATE "C")')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_individuals_practice_id_first_name_key', table_name='individuals', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_individuals_practice_id_last_name_key', table_name='individuals', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_clients_practice_id_business_name_key', table_name='clients', postgresql_concurrently=True, if_exists=True)
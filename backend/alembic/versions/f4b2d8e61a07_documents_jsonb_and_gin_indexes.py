@@ -0,0 +1,56 @@
+"""documents json columns to jsonb with gin and expression indexes
+
+Revision ID: f4b2d8e61a07
+Revises: c3e8a1f57b92
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'f4b2d8e61a07'
+down_revision = 'c3e8a1f57b92'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = ['tags', 'agent_metadata', 'upload_source_details']
+
+
+def upgrade() -> None:
+    # Rewrites documents under an exclusive lock; run in a maintenance window on large tables
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'documents', column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=sa.JSON(),
+            postgresql_using=f'{column}::jsonb'
+        )
+
+    op.create_index(
+        'ix_documents_tags', 'documents', ['tags'],
+        unique=False, postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_documents_agent_metadata', 'documents', ['agent_metadata'],
+        unique=False, postgresql_using='gin', postgresql_ops={'agent_metadata': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_documents_practice_id_financial_document_type', 'documents',
+        ['practice_id', sa.text("(agent_metadata #>> '{financial_document_processing,document_type}')")],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_practice_id_financial_document_type', table_name='documents')
+    op.drop_index('ix_documents_agent_metadata', table_name='documents')
+    op.drop_index('ix_documents_tags', table_name='documents')
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'documents', column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f'{column}::json'
+        )
@@ -3,8 +3,10 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.database import get_db
-from db.schemas.user import UserCreate, User, Token, UserLogin
-from services.auth_service import authenticate_user, create_user_token
+from api.users import get_current_user
+from db.schemas.user import UserCreate, User, Token, UserLogin, UrlToken
+from config.settings import settings
+from services.auth_service import authenticate_user, create_user_token, create_url_token
 from services.user_service import create_user
 
 router = APIRouter()
@@ -53,4 +55,13 @@ async def login_for_access_token(
         )
     
     access_token = create_user_token(user)
-    return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"} 
+
+@router.post("/url-token", response_model=UrlToken)
+async def get_url_token(current_user: User = Depends(get_current_user)):
+    """
+    Short-lived token for the URLs browsers request without headers: document files,
+    thumbnails and previews, and the events stream. Pass it as `?token=`; the access
+    token itself never goes in a URL.
+    """
+    return {"token": create_url_token(current_user), "expires_in": settings.url_token_expire_minutes * 60}
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, load_only
 import uuid
 import logging
-from typing import Optional
+from typing import Optional, List
 
 from config.database import get_db
+from db.projection import model_fields, parse_fields, projection_columns, rows_to_dicts
 from db.models import Client, Customer, UserRole, Service, ClientService
 from db.models.client import BusinessType
 from db.models.companies_house_profile import CompaniesHouseProfile
@@ -20,19 +21,80 @@ from db.schemas.customer_client_association import (
     CustomerClientAssociationWithCustomer
 )
 from api.users import get_current_user
-from services.companies_house_service import companies_house_service
+from api.responses import FastJSONResponse, ModelListSerializer
+from services.client_detail_service import client_detail_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+CLIENT_LIST_SERIALIZER = ModelListSerializer(ClientListItem)
+
+# Fields available to GET /clients?fields=...
+CLIENT_LIST_FIELDS = model_fields(Client)
+
+# Largest page GET /clients returns; without `limit` every client of the practice is returned
+MAX_CLIENTS_LIMIT = 1000
+
+
+@router.get("/", response_model=List[ClientListItem])
+async def get_clients(
+    fields: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_CLIENTS_LIMIT),
+    offset: int = Query(0, ge=0),
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get all client businesses for current user's practice, ordered by name.
+    
+    Only the ClientListItem columns are read, never the Companies House or services JSON.
+    `fields=id,business_name,...` returns just those fields instead.
+    """
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view clients"
+        )
+    
+    if not current_user.practice_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
+    
+    try:
+        selected = parse_fields(fields, CLIENT_LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if selected:
+        query = select(*projection_columns(selected, CLIENT_LIST_FIELDS))
+    else:
+        query = select(Client).options(load_only(*[
+            getattr(Client, name) for name in ClientListItem.model_fields
+        ]))
+    query = query.filter(Client.practice_id == current_user.practice_id).order_by(Client.business_name, Client.id).offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    
+    result = await db.execute(query)
+    if selected:
+        return FastJSONResponse(rows_to_dicts(result))
+    return CLIENT_LIST_SERIALIZER.response(result.scalars().all())
+
+
 @router.get("/{client_id}")
 async def get_client_details(
     client_id: uuid.UUID,
+    include_companies_house_data: bool = False,
     current_user: UserSchema = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get detailed information about a client business."""
+    """
+    Get detailed information about a client business.
+    
+    `companies_house_profile` holds a summary of the Companies House data; pass
+    `include_companies_house_data=true` or use GET /clients/{id}/companies-house for the
+    complete stored response.
+    """
     
     # Check permissions
     if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
@@ -41,24 +103,17 @@ async def get_client_details(
             detail="Not enough permissions to view client details"
         )
     
-    # Get client with customer associations, Companies House profile, and services
-    result = await db.execute(
-        select(Client)
-        .options(
-            selectinload(Client.customer_associations),
-            selectinload(Client.companies_house_profile),
-            selectinload(Client.client_services).selectinload(ClientService.service)
-        )
-        .where(Client.id == client_id)
-    )
-    client = result.scalar_one_or_none()
+    # Client, service matrix, associations and Companies House summary in one query
+    detail = await client_detail_service.get_client_detail(db, client_id, include_companies_house_data)
     
-    if not client:
+    if not detail:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Client not found"
         )
     
+    client = detail["client"]
+    
     # Check if user has access to this client's practice
     if client.practice_id != current_user.practice_id:
         raise HTTPException(
@@ -66,52 +121,6 @@ async def get_client_details(
             detail="Not enough permissions to access this client"
         )
     
-    # Get all available services for this practice
-    services_result = await db.execute(
-        select(Service).where(Service.practice_id == client.practice_id)
-    )
-    all_services = services_result.scalars().all()
-    
-    # Prepare services data showing enabled/disabled status
-    services_data = []
-    for service in all_services:
-        # Find if client has this service assigned
-        client_service = next(
-            (cs for cs in client.client_services if cs.service_id == service.id), 
-            None
-        )
-        
-        services_data.append({
-            "service_id": str(service.id),
-            "service_code": service.service_code,
-            "name": service.name,
-            "description": service.description,
-            "is_enabled": client_service.is_enabled if client_service else False,
-            "price": float(client_service.price) if client_service and client_service.price else None,
-            "assigned_at": client_service.assigned_at.isoformat() if client_service and client_service.assigned_at else None,
-            "updated_at": client_service.updated_at.isoformat() if client_service and client_service.updated_at else None
-        })
-    
-    # Prepare Companies House data (complete JSON for easy frontend consumption)
-    companies_house_data = None
-    if client.companies_house_profile:
-        ch_profile = client.companies_house_profile
-        
-        # Start with the complete JSON data from Companies House API
-        companies_house_data = ch_profile.companies_house_data.copy() if ch_profile.companies_house_data else {}
-        
-        # Add our metadata and computed fields for convenience
-        companies_house_data.update({
-            "_profile_metadata": {
-                "profile_id": str(ch_profile.id),
-                "last_synced": ch_profile.last_synced.isoformat() if ch_profile.last_synced else None,
-                "sync_status": ch_profile.sync_status,
-                "linking_status": ch_profile.get_linking_status(),
-                "is_active": ch_profile.is_active,
-                "is_filing_overdue": ch_profile.is_filing_overdue
-            }
-        })
-
     return {
         "id": str(client.id),
         "business_name": client.business_name,
@@ -151,18 +160,49 @@ async def get_client_details(
         "notes": client.notes,
         "created_at": client.created_at.isoformat() if client.created_at else None,
         "updated_at": client.updated_at.isoformat() if client.updated_at else None,
-        "customer_associations": [
-            {
-                "customer_id": str(assoc.customer_id),
-                "relationship_type": assoc.relationship_type.value,
-                "percentage_ownership": assoc.percentage_ownership,
-                "is_active": assoc.is_active,
-                "is_primary_contact": assoc.is_primary_contact
-            }
-            for assoc in client.customer_associations
-        ] if client.customer_associations else [],
-        "services": services_data,
-        "companies_house_profile": companies_house_data
+        "customer_associations": detail["customer_associations"],
+        "services": detail["services"],
+        "companies_house_profile": detail["companies_house_profile"]
+    }
+
+@router.get("/{client_id}/companies-house")
+async def get_client_companies_house_data(
+    client_id: uuid.UUID,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the complete stored Companies House response for a client."""
+    
+    # Check permissions
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view client details"
+        )
+    
+    result = await db.execute(
+        select(
+            CompaniesHouseProfile.id,
+            CompaniesHouseProfile.companies_house_data,
+            CompaniesHouseProfile.last_synced,
+            CompaniesHouseProfile.sync_status
+        )
+        .join(Client, Client.id == CompaniesHouseProfile.client_id)
+        .where(Client.id == client_id, Client.practice_id == current_user.practice_id)
+    )
+    profile = result.one_or_none()
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No Companies House profile for this client"
+        )
+    
+    return {
+        "profile_id": str(profile.id),
+        "last_synced": profile.last_synced.isoformat() if profile.last_synced else None,
+        "sync_status": profile.sync_status,
+        "companies_house_data": profile.companies_house_data
     }
 
 @router.post("/", response_model=ClientResponse)
@@ -284,6 +324,7 @@ async def create_client(
         # Auto-fill from Companies House if requested and company number provided
         if auto_fill_companies_house and client.company_number:
             try:
+                from services.companies_house_service import companies_house_service
                 await companies_house_service.create_or_update_companies_house_profile(
                     db=db,
                     client_id=client.id,
@@ -573,6 +614,7 @@ async def trigger_companies_house_auto_fill(
     
     try:
         # Auto-fill using the client's companies_house_number
+        from services.companies_house_service import companies_house_service
         ch_profile = await companies_house_service.create_or_update_companies_house_profile(
             db=db,
             client_id=client_id,
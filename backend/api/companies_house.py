@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, or_, not_, false
 from typing import Optional, Dict, Any
 from uuid import UUID
+from datetime import date, timedelta
 
 from config.database import get_db
-from services.companies_house_service import companies_house_service
 from api.users import get_current_user
-from db.models import User, Client
+from db.models import User, Client, UserRole
 from db.models.companies_house_profile import CompaniesHouseProfile
+from db.schemas.companies_house import FilingDeadlinesPage
 from sqlalchemy.orm import selectinload
 
 router = APIRouter()
 
+FILING_KINDS = ["accounts", "confirmation_statement", "any"]
+
 @router.get("/search")
 async def search_companies(
     q: str = Query(..., description="Search query for company name or number"),
@@ -35,6 +38,8 @@ async def search_companies(
         List of matching companies with basic details
     """
     try:
+        # Imported on first use so API processes don't load httpx and the client at boot
+        from services.companies_house_service import companies_house_service
         search_results = await companies_house_service.search_companies(
             query=q,
             items_per_page=items_per_page,
@@ -81,6 +86,96 @@ async def search_companies(
             detail=str(e)
         )
 
+@router.get("/deadlines", response_model=FilingDeadlinesPage)
+async def get_filing_deadlines(
+    within_days: int = Query(30, ge=0, le=366, description="Deadlines up to this many days from today"),
+    filing: str = Query("any", description="accounts, confirmation_statement or any"),
+    include_overdue: bool = Query(True, description="Also return filings already overdue"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    📅 Clients of the practice with accounts or a confirmation statement due within
+    `within_days`, earliest deadline first.
+    
+    Reads the indexed deadline columns of the stored Companies House profiles, never the
+    JSON. A filing counts as overdue if Companies House flagged it at the last sync or
+    its due date has passed since. With include_overdue=false, clients with any of the
+    requested filings overdue are left out.
+    """
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view clients"
+        )
+    
+    if not current_user.practice_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
+    
+    if filing not in FILING_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown filing: {filing}. Available: {', '.join(FILING_KINDS)}"
+        )
+    
+    today = date.today()
+    due_before = today + timedelta(days=within_days)
+    
+    profile = CompaniesHouseProfile
+    accounts_overdue = profile.accounts_overdue | func.coalesce(profile.next_accounts_due < today, false())
+    confirmation_overdue = profile.confirmation_overdue | func.coalesce(profile.next_confirmation_due < today, false())
+    
+    def due(due_column, overdue):
+        if include_overdue:
+            return or_(due_column <= due_before, overdue)
+        return due_column.between(today, due_before)
+    
+    conditions, deadlines, overdue_filings = [], [], []
+    if filing in ("accounts", "any"):
+        conditions.append(due(profile.next_accounts_due, accounts_overdue))
+        deadlines.append(profile.next_accounts_due)
+        overdue_filings.append(accounts_overdue)
+    if filing in ("confirmation_statement", "any"):
+        conditions.append(due(profile.next_confirmation_due, confirmation_overdue))
+        deadlines.append(profile.next_confirmation_due)
+        overdue_filings.append(confirmation_overdue)
+    next_deadline = func.least(*deadlines) if len(deadlines) > 1 else deadlines[0]
+    
+    filters = [Client.practice_id == current_user.practice_id, or_(*conditions)]
+    if not include_overdue:
+        # The whole client is left out, not just its overdue filing
+        filters.append(not_(or_(*overdue_filings)))
+    
+    result = await db.execute(
+        select(
+            Client.id.label("client_id"),
+            Client.client_code,
+            Client.business_name,
+            profile.company_number,
+            profile.company_status,
+            profile.next_accounts_due,
+            profile.next_confirmation_due,
+            accounts_overdue.label("accounts_overdue"),
+            confirmation_overdue.label("confirmation_overdue"),
+            next_deadline.label("next_deadline"),
+            profile.last_synced
+        )
+        .join(Client, Client.id == profile.client_id)
+        .where(*filters)
+        .order_by(next_deadline.asc().nulls_last(), Client.business_name, Client.id)
+        .limit(limit + 1)
+        .offset(offset)
+    )
+    rows = result.all()
+    
+    return {
+        "due_before": due_before,
+        "items": rows[:limit],
+        "has_more": len(rows) > limit
+    }
+
 @router.post("/clients/{client_id}/auto-fill")
 async def auto_fill_client_details(
     client_id: UUID,
@@ -126,6 +221,7 @@ async def auto_fill_client_details(
             )
         
         # Auto-fill using the client's companies_house_number
+        from services.companies_house_service import companies_house_service
         ch_profile = await companies_house_service.create_or_update_companies_house_profile(
             db=db,
             client_id=client_id,
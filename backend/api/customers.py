@@ -1,21 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
-from sqlalchemy.orm import selectinload
-from typing import List, Dict
+from sqlalchemy import select, func
+from sqlalchemy.orm import selectinload, load_only, noload
+from typing import List, Dict, Optional
 from uuid import UUID
 from datetime import datetime
 import logging
 
 from config.database import get_db
-from db.models import Customer, Individual, Income, Property, CustomerClientAssociation, Document
+from db.projection import model_fields, parse_fields, projection_columns, rows_to_dicts
+from db.models import Customer, Individual, Income, Property, CustomerClientAssociation
 from db.models.customer_client_association import RelationshipType
-from db.models.property_individual_relationship import PropertyIndividualRelationship
 from db.models.customer import CustomerStatus, MLRStatus
 from db.models.individual_relationship import IndividualRelationship
 from db.schemas.customer import (
     CustomerCreateRequest, CustomerUpdateRequest,
-    CustomerResponse, CustomerListItem, CustomerAccountingInfoUpdate, CustomerMLRInfoUpdate
+    CustomerResponse, CustomerListItem, CustomerAccountingInfoUpdate, CustomerMLRInfoUpdate,
+    AvailableClientsPage, AvailableIndividualsPage
 )
 from db.schemas.customer_tabs import (
     CustomerInfoTabResponse,
@@ -34,6 +36,15 @@ from db.schemas.individual_relationship import (
 )
 from db.schemas.user import User as UserSchema
 from api.users import get_current_user
+from api.responses import FastJSONResponse, ModelListSerializer, dumps
+from services.customer_service import customer_service
+from services.customer_overview_service import (
+    customer_overview_service, CUSTOMER_OVERVIEW_SECTIONS,
+    DEFAULT_DOCUMENTS_LIMIT, MAX_DOCUMENTS_LIMIT, DEFAULT_OVERVIEW_DOCUMENTS_LIMIT
+)
+from services.customer_typeahead_service import (
+    customer_typeahead_service, DEFAULT_TYPEAHEAD_LIMIT, MAX_TYPEAHEAD_LIMIT
+)
 
 router = APIRouter(tags=["customers"])
 
@@ -67,22 +78,63 @@ async def get_individual_relationship_types():
     from db.models.individual_relationship import IndividualRelationType
     return [{"value": r.value, "label": r.value.replace("_", " ").title()} for r in IndividualRelationType]
 
+CUSTOMER_LIST_SERIALIZER = ModelListSerializer(CustomerListItem)
+
+# Fields available to GET /customers?fields=...; individual_* come from a join, not a nested load
+CUSTOMER_LIST_FIELDS = {
+    **model_fields(Customer),
+    "individual_first_name": Individual.first_name,
+    "individual_last_name": Individual.last_name,
+    "individual_email": Individual.email,
+    "individual_mobile": Individual.primary_mobile,
+}
+
+
 @router.get("/", response_model=List[CustomerListItem])
 async def get_customers(
+    fields: Optional[str] = None,
     current_user: UserSchema = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all customers for current user's practice"""
+    """
+    Get all customers for current user's practice.
+    
+    `fields=id,status,individual_first_name,...` returns only those fields, selected as
+    plain columns without loading the nested individual, incomes or properties.
+    """
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
+    try:
+        selected = parse_fields(fields, CUSTOMER_LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if selected:
+        query = select(*projection_columns(selected, CUSTOMER_LIST_FIELDS)).filter(
+            Customer.practice_id == current_user.practice_id
+        )
+        if any(name.startswith("individual_") and name != "individual_id" for name in selected):
+            query = query.join(Individual, Individual.id == Customer.individual_id)
+        result = await db.execute(query)
+        return FastJSONResponse(rows_to_dicts(result))
+    
+    # Only the columns and relationships CustomerListItem serialises
     query = select(Customer).options(
-        selectinload(Customer.individual).selectinload(Individual.incomes),
-        selectinload(Customer.individual).selectinload(Individual.properties)
+        load_only(
+            Customer.id, Customer.individual_id, Customer.status, Customer.ni_number,
+            Customer.personal_utr_number, Customer.mlr_status, Customer.created_at, Customer.updated_at
+        ),
+        selectinload(Customer.individual).options(
+            selectinload(Individual.incomes),
+            selectinload(Individual.property_relationships),
+            noload(Individual.relationships_from),
+            noload(Individual.relationships_to)
+        )
     ).filter(Customer.practice_id == current_user.practice_id)
     
     result = await db.execute(query)
-    return result.scalars().all()
+    return CUSTOMER_LIST_SERIALIZER.response(result.scalars().all())
 
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
@@ -95,44 +147,11 @@ async def get_customer(
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    # First check if customer exists at all
-    exists_query = select(Customer).filter(Customer.id == customer_id)
-    exists_result = await db.execute(exists_query)
-    customer_exists = exists_result.scalar_one_or_none()
-    
-    # Load all relationships in a single query with joined loading
-    customer_query = (
-        select(Customer)
-        .options(
-            selectinload(Customer.individual).selectinload(Individual.incomes),
-            selectinload(Customer.individual).selectinload(Individual.properties),
-            selectinload(Customer.client_associations).selectinload(CustomerClientAssociation.client),
-            selectinload(Customer.primary_accounting_contact),
-            selectinload(Customer.last_edited_by),
-            selectinload(Customer.sa_client_relation)
-        )
-        .filter(
-            Customer.id == customer_id,
-            Customer.practice_id == current_user.practice_id
-        )
-    )
-    
-    customer_result = await db.execute(customer_query)
-    customer = customer_result.unique().scalar_one_or_none()
-    
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id, profile="detail")
     if not customer:
-        # Create detailed debug message for the exception
-        debug_info = {
-            "customer_id": str(customer_id),
-            "customer_exists": customer_exists is not None,
-            "user_practice_id": str(current_user.practice_id) if current_user.practice_id else None,
-            "customer_practice_id": str(customer_exists.practice_id) if customer_exists else None,
-            "practice_match": customer_exists.practice_id == current_user.practice_id if customer_exists else False
-        }
-        
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail=f"Customer not found. Debug info: {debug_info}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=await customer_service.not_found_detail(db, customer_id, current_user.practice_id)
         )
     
     return customer
@@ -220,8 +239,7 @@ async def create_customer(
     customer = Customer(**{k: v for k, v in customer_data.items() if v is not None})
     db.add(customer)
     await db.commit()
-    await db.refresh(customer)
-    return customer
+    return await customer_service.load_customer(db, customer.id, current_user.practice_id, profile="detail", reload=True)
 
 
 @router.put("/{customer_id}", response_model=CustomerResponse)
@@ -235,12 +253,7 @@ async def update_customer(
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    customer_query = select(Customer).filter(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
-    )
-    customer_result = await db.execute(customer_query)
-    customer = customer_result.scalars().first()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
@@ -280,8 +293,7 @@ async def update_customer(
         setattr(customer, field, value)
     
     await db.commit()
-    await db.refresh(customer)
-    return customer
+    return await customer_service.load_customer(db, customer_id, current_user.practice_id, profile="detail", reload=True)
 
 
 @router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -294,12 +306,7 @@ async def delete_customer(
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    customer_query = select(Customer).filter(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
-    )
-    customer_result = await db.execute(customer_query)
-    customer = customer_result.scalars().first()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
@@ -319,19 +326,7 @@ async def get_customer_info(
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    query = select(Customer).options(
-        selectinload(Customer.individual).selectinload(Individual.incomes),
-        selectinload(Customer.individual).selectinload(Individual.property_relationships).selectinload(PropertyIndividualRelationship.property),
-        selectinload(Customer.primary_accounting_contact),
-        selectinload(Customer.last_edited_by)
-    ).where(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
-    )
-    
-    result = await db.execute(query)
-    customer = result.scalar_one_or_none()
-    
+    customer = await customer_overview_service.load_info(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
@@ -347,32 +342,11 @@ async def get_customer_mlr(
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    # Check if customer exists and get MLR data
-    query = select(Customer).options(
-        selectinload(Customer.last_edited_by)
-    ).where(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
-    )
-    
-    result = await db.execute(query)
-    customer = result.scalar_one_or_none()
-    
-    if not customer:
+    mlr = await customer_overview_service.load_mlr(db, customer_id, current_user.practice_id)
+    if not mlr:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    # Create response manually without using from_orm to avoid relationship loading issues
-    return CustomerMLRTabResponse(
-        id=customer.id,
-        mlr_status=customer.mlr_status,
-        mlr_date_complete=customer.mlr_date_complete,
-        passport_number=customer.passport_number,
-        driving_license=customer.driving_license,
-        uk_home_telephone=customer.uk_home_telephone,
-        last_edited=customer.last_edited,
-        last_edited_by_id=customer.last_edited_by_id,
-        last_edited_by=customer.last_edited_by
-    )
+    return mlr
 
 @router.get("/{customer_id}/relationships", response_model=CustomerRelationshipsTabResponse)
 async def get_customer_relationships(
@@ -384,141 +358,84 @@ async def get_customer_relationships(
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    # Check if customer exists and get relationship data
-    query = select(Customer).options(
-        selectinload(Customer.client_associations).selectinload(CustomerClientAssociation.client)
-    ).where(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
-    )
-    
-    result = await db.execute(query)
-    customer = result.scalar_one_or_none()
-    
-    if not customer:
+    scope = await customer_overview_service.get_customer_scope(db, customer_id, current_user.practice_id)
+    if not scope:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    # Get individual relationships with related individuals loaded, filtered by practice
-    try:
-        individual_relationships_query = select(IndividualRelationship).options(
-            selectinload(IndividualRelationship.from_individual),
-            selectinload(IndividualRelationship.to_individual)
-        ).where(
-            IndividualRelationship.practice_id == current_user.practice_id,
-            (IndividualRelationship.from_individual_id == customer.individual_id) |
-            (IndividualRelationship.to_individual_id == customer.individual_id)
-        )
-        individual_relationships_result = await db.execute(individual_relationships_query)
-        individual_relationships = individual_relationships_result.scalars().all()
-    except Exception as e:
-        logging.error(f"Error loading individual relationships: {e}")
-        individual_relationships = []
-    
-    # Create response manually by converting SQLAlchemy objects to dicts
-    try:
-        # Convert client associations to response format
-        client_associations_data = []
-        for assoc in customer.client_associations:
-            client_associations_data.append({
-                "id": assoc.id,
-                "customer_id": assoc.customer_id,
-                "client_id": assoc.client_id,
-                "relationship_type": assoc.relationship_type.value if assoc.relationship_type else None,
-                "percentage_ownership": assoc.percentage_ownership,
-                "appointment_date": assoc.appointment_date.isoformat() if assoc.appointment_date else None,
-                "resignation_date": assoc.resignation_date.isoformat() if assoc.resignation_date else None,
-                "is_active": assoc.is_active,
-                "is_primary_contact": assoc.is_primary_contact,
-                "notes": assoc.notes,
-                "created_at": assoc.created_at.isoformat() if assoc.created_at else None,
-                "updated_at": assoc.updated_at.isoformat() if assoc.updated_at else None,
-                "client": {
-                    "id": assoc.client.id,
-                    "business_name": assoc.client.business_name,
-                    "business_type": assoc.client.business_type.value if assoc.client.business_type else None,
-                    "main_phone": assoc.client.main_phone,
-                    "main_email": assoc.client.main_email
-                }
-            })
-        
-        # Convert individual relationships to response format
-        individual_relationships_data = []
-        for rel in individual_relationships:
-            individual_relationships_data.append({
-                "id": rel.id,
-                "from_individual_id": rel.from_individual_id,
-                "to_individual_id": rel.to_individual_id,
-                "relationship_type": rel.relationship_type.value if rel.relationship_type else None,
-                "description": rel.description,
-                "from_individual": {
-                    "id": rel.from_individual.id,
-                    "first_name": rel.from_individual.first_name,
-                    "last_name": rel.from_individual.last_name,
-                    "full_name": rel.from_individual.full_name,
-                    "email": rel.from_individual.email
-                } if rel.from_individual else None,
-                "to_individual": {
-                    "id": rel.to_individual.id,
-                    "first_name": rel.to_individual.first_name,
-                    "last_name": rel.to_individual.last_name,
-                    "full_name": rel.to_individual.full_name,
-                    "email": rel.to_individual.email
-                } if rel.to_individual else None,
-                "created_at": rel.created_at.isoformat() if rel.created_at else None,
-                "updated_at": rel.updated_at.isoformat() if rel.updated_at else None
-            })
-        
-        return CustomerRelationshipsTabResponse(
-            id=customer.id,
-            client_associations=client_associations_data,
-            individual_relationships=individual_relationships_data
-        )
-    except Exception as e:
-        logging.error(f"Error creating response: {e}")
-        # Return a minimal response in case of serialization issues
-        return CustomerRelationshipsTabResponse(
-            id=customer.id,
-            client_associations=[],
-            individual_relationships=[]
-        )
+    return await customer_overview_service.load_relationships(
+        db, scope.id, scope.individual_id, current_user.practice_id
+    )
 
 @router.get("/{customer_id}/documents", response_model=CustomerDocumentsTabResponse)
 async def get_customer_documents(
     customer_id: UUID,
+    limit: int = Query(DEFAULT_DOCUMENTS_LIMIT, ge=1, le=MAX_DOCUMENTS_LIMIT),
+    offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
     current_user: UserSchema = Depends(get_current_user)
 ):
-    """Get customer documents tab data"""
+    """Get customer documents tab data (newest first, one page with the total count)"""
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    # Check if customer exists
-    customer_query = select(Customer).where(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
+    scope = await customer_overview_service.get_customer_scope(db, customer_id, current_user.practice_id)
+    if not scope:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    
+    return await customer_overview_service.load_documents(
+        db, scope.id, scope.individual_id, limit=limit, offset=offset
     )
-    customer_result = await db.execute(customer_query)
-    customer = customer_result.scalar_one_or_none()
+
+@router.get("/{customer_id}/overview")
+async def get_customer_overview(
+    customer_id: UUID,
+    sections: Optional[str] = None,
+    documents_limit: int = Query(DEFAULT_OVERVIEW_DOCUMENTS_LIMIT, ge=1, le=MAX_DOCUMENTS_LIMIT),
+    stream: bool = True,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Info, MLR, relationships and documents tab data in one request.
+    
+    The customer is checked once, then each section is loaded concurrently on its own
+    connection. By default the response is NDJSON, one `{"section": ..., "data": ...}`
+    line per section in the order they finish (`"error"` instead of `"data"` if a
+    section failed or timed out). `stream=false` returns all sections in one object.
+    `sections=info,mlr` limits the sections loaded.
+    """
+    if not current_user.practice_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
-    if not customer:
+    requested = CUSTOMER_OVERVIEW_SECTIONS
+    if sections:
+        requested = [section.strip() for section in sections.split(",") if section.strip()]
+        unknown = [section for section in requested if section not in CUSTOMER_OVERVIEW_SECTIONS]
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown sections: {', '.join(unknown)}. Available: {', '.join(CUSTOMER_OVERVIEW_SECTIONS)}"
+            )
+        requested = list(dict.fromkeys(requested))
+    
+    scope = await customer_overview_service.get_customer_scope(db, customer_id, current_user.practice_id)
+    if not scope:
         raise HTTPException(status_code=404, detail="Customer not found")
+    # The sections use their own sessions; release this one's connection for the rest of the request
+    await db.close()
     
-    # Get all documents associated with either the customer directly or their individual
-    documents_query = select(Document).where(
-        or_(
-            Document.customer_id == customer_id,
-            Document.individual_id == customer.individual_id
-        )
-    ).order_by(Document.created_at.desc())
+    if not stream:
+        return FastJSONResponse(await customer_overview_service.load_overview(
+            scope.id, scope.individual_id, current_user.practice_id, requested, documents_limit
+        ))
     
-    documents_result = await db.execute(documents_query)
-    documents = documents_result.scalars().all()
+    async def ndjson():
+        async for section in customer_overview_service.stream_overview(
+            scope.id, scope.individual_id, current_user.practice_id, requested, documents_limit
+        ):
+            yield dumps(section) + b"\n"
     
-    # Create response manually without using from_orm to avoid relationship loading issues
-    return CustomerDocumentsTabResponse(
-        id=customer.id,
-        documents=documents
-    )
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 @router.put("/{customer_id}/accounting-info", response_model=CustomerInfoTabResponse)
 async def update_customer_accounting_info(
@@ -532,19 +449,7 @@ async def update_customer_accounting_info(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Get customer
-    query = select(Customer).options(
-        selectinload(Customer.individual).selectinload(Individual.incomes),
-        selectinload(Customer.individual).selectinload(Individual.property_relationships).selectinload(PropertyIndividualRelationship.property),
-        selectinload(Customer.primary_accounting_contact),
-        selectinload(Customer.last_edited_by)
-    ).where(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
-    )
-    
-    result = await db.execute(query)
-    customer = result.scalar_one_or_none()
-    
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id, profile="info")
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
@@ -566,8 +471,7 @@ async def update_customer_accounting_info(
     
     try:
         await db.commit()
-        await db.refresh(customer)
-        return customer
+        return await customer_service.load_customer(db, customer_id, current_user.practice_id, profile="info", reload=True)
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
@@ -590,13 +494,7 @@ async def create_customer_client_association(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Verify customer exists and belongs to practice
-    customer = await db.execute(
-        select(Customer).where(
-            Customer.id == customer_id,
-            Customer.practice_id == current_user.practice_id
-        )
-    )
-    customer = customer.scalar_one_or_none()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
@@ -780,13 +678,7 @@ async def create_customer_individual_relationship(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Verify customer exists and belongs to practice
-    customer = await db.execute(
-        select(Customer).where(
-            Customer.id == customer_id,
-            Customer.practice_id == current_user.practice_id
-        )
-    )
-    customer = customer.scalar_one_or_none()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
@@ -846,13 +738,7 @@ async def update_customer_individual_relationship(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Verify customer exists and belongs to practice
-    customer = await db.execute(
-        select(Customer).where(
-            Customer.id == customer_id,
-            Customer.practice_id == current_user.practice_id
-        )
-    )
-    customer = customer.scalar_one_or_none()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
@@ -899,13 +785,7 @@ async def delete_customer_individual_relationship(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Verify customer exists and belongs to practice
-    customer = await db.execute(
-        select(Customer).where(
-            Customer.id == customer_id,
-            Customer.practice_id == current_user.practice_id
-        )
-    )
-    customer = customer.scalar_one_or_none()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
@@ -928,108 +808,59 @@ async def delete_customer_individual_relationship(
 # HELPER ENDPOINTS FOR DROPDOWNS
 # ==========================================
 
-@router.get("/{customer_id}/available-clients")
+@router.get("/{customer_id}/available-clients", response_model=AvailableClientsPage)
 async def get_available_clients_for_customer(
     customer_id: UUID,
+    q: Optional[str] = None,
+    limit: int = Query(DEFAULT_TYPEAHEAD_LIMIT, ge=1, le=MAX_TYPEAHEAD_LIMIT),
+    cursor: Optional[str] = None,
     current_user: UserSchema = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get available clients for customer association"""
+    """
+    Typeahead of clients the customer is not yet associated with.
+    
+    `q` matches the start of the business name; page on with `cursor=<next_cursor>`.
+    """
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Verify customer exists and belongs to practice
-    customer = await db.execute(
-        select(Customer).where(
-            Customer.id == customer_id,
-            Customer.practice_id == current_user.practice_id
-        )
-    )
-    customer = customer.scalar_one_or_none()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
-    # Get all clients in practice excluding those already associated
-    from db.models import Client
-    existing_associations = await db.execute(
-        select(CustomerClientAssociation.client_id).where(
-            CustomerClientAssociation.customer_id == customer_id
-        )
-    )
-    existing_client_ids = [row[0] for row in existing_associations.fetchall()]
-    
-    available_clients_query = select(Client).where(
-        Client.practice_id == current_user.practice_id
-    )
-    if existing_client_ids:
-        available_clients_query = available_clients_query.where(
-            Client.id.notin_(existing_client_ids)
-        )
-    
-    result = await db.execute(available_clients_query)
-    clients = result.scalars().all()
-    
-    return [
-        {
-            "id": str(client.id),
-            "business_name": client.business_name,
-            "business_type": client.business_type.value if client.business_type else None,
-            "main_email": client.main_email,
-            "main_phone": client.main_phone
-        }
-        for client in clients
-    ]
+    try:
+        return await customer_typeahead_service.available_clients(db, customer, q=q, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-@router.get("/{customer_id}/available-individuals")
+@router.get("/{customer_id}/available-individuals", response_model=AvailableIndividualsPage)
 async def get_available_individuals_for_customer(
     customer_id: UUID,
+    q: Optional[str] = None,
+    limit: int = Query(DEFAULT_TYPEAHEAD_LIMIT, ge=1, le=MAX_TYPEAHEAD_LIMIT),
+    cursor: Optional[str] = None,
     current_user: UserSchema = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get available individuals for relationship"""
+    """
+    Typeahead of individuals the customer has no relationship to yet.
+    
+    `q` matches the start of the first or last name; page on with `cursor=<next_cursor>`.
+    """
     if not current_user.practice_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Verify customer exists and belongs to practice
-    customer = await db.execute(
-        select(Customer).where(
-            Customer.id == customer_id,
-            Customer.practice_id == current_user.practice_id
-        )
-    )
-    customer = customer.scalar_one_or_none()
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     
-    # Get all individuals in practice excluding the customer themselves and those already related
-    existing_relationships = await db.execute(
-        select(IndividualRelationship.to_individual_id).where(
-            IndividualRelationship.from_individual_id == customer.individual_id
-        )
-    )
-    existing_individual_ids = [row[0] for row in existing_relationships.fetchall()]
-    
-    # Also exclude the customer's own individual
-    excluded_ids = existing_individual_ids + [customer.individual_id]
-    
-    available_individuals_query = select(Individual).where(
-        Individual.practice_id == current_user.practice_id,
-        Individual.id.notin_(excluded_ids)
-    )
-    
-    result = await db.execute(available_individuals_query)
-    individuals = result.scalars().all()
-    
-    return [
-        {
-            "id": str(individual.id),
-            "first_name": individual.first_name,
-            "last_name": individual.last_name,
-            "full_name": individual.full_name,
-            "email": individual.email
-        }
-        for individual in individuals
-    ]
+    try:
+        return await customer_typeahead_service.available_individuals(db, customer, q=q, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.put("/{customer_id}/mlr-info", response_model=CustomerMLRTabResponse)
 async def update_customer_mlr_info(
@@ -1043,16 +874,7 @@ async def update_customer_mlr_info(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
     
     # Get customer
-    query = select(Customer).options(
-        selectinload(Customer.last_edited_by)
-    ).where(
-        Customer.id == customer_id,
-        Customer.practice_id == current_user.practice_id
-    )
-    
-    result = await db.execute(query)
-    customer = result.scalar_one_or_none()
-    
+    customer = await customer_service.load_customer(db, customer_id, current_user.practice_id, profile="mlr")
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
@@ -1074,7 +896,7 @@ async def update_customer_mlr_info(
     
     try:
         await db.commit()
-        await db.refresh(customer)
+        customer = await customer_service.load_customer(db, customer_id, current_user.practice_id, profile="mlr", reload=True)
         
         # Return updated MLR data
         return CustomerMLRTabResponse(
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import get_db
+from db.schemas.dashboard import DashboardSummary
+from db.schemas.user import User as UserSchema
+from api.users import get_current_user
+from services.dashboard_service import dashboard_service
+
+router = APIRouter()
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Practice-wide counts and totals for the dashboard: customers by status, clients by
+    business type, incomes by type, rental income and overdue Companies House filings.
+    Figures are as of `refreshed_at` (see DASHBOARD_SUMMARY_REFRESH_SECONDS).
+    """
+    if not current_user.practice_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must be assigned to a practice")
+
+    return await dashboard_service.get_summary(db, current_user.practice_id)
@@ -1,29 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse, FileResponse, Response
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from typing import List, Optional
+from sqlalchemy.orm import defer, undefer_group, load_only
+from typing import Iterator, List, Optional, Tuple
+from contextlib import closing
+from urllib.parse import quote
+import asyncio
+import json
+import os
 import uuid
 
-from config.database import get_db
-from db.models import User, UserRole, Document, DocumentType, DocumentSource, DocumentAgentState
+from config.database import get_db, AsyncSessionLocal
+from db.document_text import page_payload
+from db.projection import model_fields, parse_fields, projection_columns, rows_to_dicts
+from db.models import User, UserRole, Document, DocumentType, DocumentSource, DocumentAgentState, DocumentTextPage, StoredFile
+from db.models.documents import financial_document_type as financial_document_type_of
 from db.schemas.user import User as UserSchema
-from api.users import get_current_user
+from api.users import get_current_user, get_current_user_from_url
+from api.responses import FastJSONResponse, dumps
+from services.document_storage import document_storage_service
 
 router = APIRouter()
 
+# Pages read and decompressed per query while streaming a document's text
+DOCUMENT_TEXT_BATCH_PAGES = 10
+
+# A document's files never change (they are addressed by content), so browsers may keep
+# them a day and then revalidate with the ETag
+DOCUMENT_FILE_CACHE_CONTROL = "private, max-age=86400"
+DOCUMENT_FILE_CHUNK_SIZE = 64 * 1024
+
+# Fields available to GET /documents?fields=..., and those returned when none are requested
+DOCUMENT_FIELDS = model_fields(Document)
+DOCUMENT_LIST_FIELDS = [
+    "id", "filename", "original_filename", "document_url", "file_size", "mime_type",
+    "document_type", "document_source", "document_category", "title", "description", "tags",
+    "practice_id", "customer_id", "client_id", "message_id", "agent_state", "thumbnail_sha256",
+    "agent_processing_started_at", "processed_at", "agent_confidence_score", "agent_processing_notes",
+    "extracted_text_length", "extracted_page_count", "is_validated", "is_archived", "created_at", "updated_at",
+]
+
 @router.get("/")
 async def list_documents(
     client_id: Optional[str] = None,
     document_source: Optional[DocumentSource] = None,
     document_type: Optional[DocumentType] = None,
     agent_state: Optional[DocumentAgentState] = None,
+    tag: Optional[str] = None,
+    financial_document_type: Optional[str] = None,
+    metadata: Optional[str] = None,
+    fields: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
     current_user: UserSchema = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """List documents with optional filtering."""
+    """
+    List documents with optional filtering.
+    
+    `tag=whatsapp` keeps documents tagged so, `financial_document_type=receipt` those the
+    agent processed as that kind of financial document, and `metadata={"ocr_processing":
+    {"status": "failed"}}` those whose agent_metadata contains the given JSON. Each is
+    served by an index on the JSONB columns.
+    
+    `fields=id,filename,...` limits each document to those fields (any Document column,
+    including agent_metadata and upload_source_details which are left out by default).
+    The extracted text is read with GET /documents/{id}/text.
+    """
     
     # Check permissions
     if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
@@ -33,8 +78,13 @@ async def list_documents(
         )
     
     try:
+        try:
+            selected = parse_fields(fields, DOCUMENT_FIELDS) or DOCUMENT_LIST_FIELDS
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
         # Build query
-        query = select(Document).where(Document.practice_id == current_user.practice_id)
+        query = select(*projection_columns(selected, DOCUMENT_FIELDS)).where(Document.practice_id == current_user.practice_id)
         
         # Apply filters
         if client_id:
@@ -56,53 +106,37 @@ async def list_documents(
         if agent_state:
             query = query.where(Document.agent_state == agent_state)
         
+        if tag:
+            query = query.where(Document.tags.contains([tag]))
+        
+        if financial_document_type:
+            query = query.where(financial_document_type_of(Document.agent_metadata) == financial_document_type)
+        
+        if metadata:
+            try:
+                metadata_filter = json.loads(metadata)
+            except ValueError:
+                metadata_filter = None
+            if not isinstance(metadata_filter, dict):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="metadata must be a JSON object"
+                )
+            query = query.where(Document.agent_metadata.contains(metadata_filter))
+        
         # Add ordering and pagination
         query = query.order_by(Document.created_at.desc()).offset(offset).limit(limit)
         
-        # Execute query
+        # Execute query; only the listed columns are read, no Document objects are built
         result = await db.execute(query)
-        documents = result.scalars().all()
-        
-        # Convert to dict format for response
-        documents_data = []
-        for doc in documents:
-            documents_data.append({
-                "id": str(doc.id),
-                "filename": doc.filename,
-                "original_filename": doc.original_filename,
-                "document_url": doc.document_url,
-                "file_size": doc.file_size,
-                "mime_type": doc.mime_type,
-                "document_type": doc.document_type,
-                "document_source": doc.document_source,
-                "document_category": doc.document_category,
-                "title": doc.title,
-                "description": doc.description,
-                "tags": doc.tags,
-                "practice_id": str(doc.practice_id),
-                "customer_id": str(doc.customer_id) if doc.customer_id else None,
-                "client_id": str(doc.client_id) if doc.client_id else None,
-                "message_id": str(doc.message_id) if doc.message_id else None,
-                "agent_state": doc.agent_state,
-                "agent_processing_started_at": doc.agent_processing_started_at.isoformat() if doc.agent_processing_started_at else None,
-                "agent_processing_completed_at": doc.agent_processing_completed_at.isoformat() if doc.agent_processing_completed_at else None,
-                "agent_confidence_score": doc.agent_confidence_score,
-                "is_validated": doc.is_validated,
-                "is_sensitive": doc.is_sensitive,
-                "access_level": doc.access_level,
-                "is_active": doc.is_active,
-                "is_archived": doc.is_archived,
-                "upload_source_details": doc.upload_source_details,
-                "created_at": doc.created_at.isoformat(),
-                "updated_at": doc.updated_at.isoformat() if doc.updated_at else None
-            })
+        documents_data = rows_to_dicts(result)
         
-        return {
+        return FastJSONResponse({
             "documents": documents_data,
             "total_count": len(documents_data),
             "limit": limit,
             "offset": offset
-        }
+        })
         
     except HTTPException:
         raise
@@ -125,6 +159,7 @@ async def list_whatsapp_documents(
     return await list_documents(
         client_id=client_id,
         document_source=DocumentSource.whatsapp,
+        fields=None,
         limit=limit,
         offset=offset,
         current_user=current_user,
@@ -144,6 +179,7 @@ async def list_pending_documents(
     return await list_documents(
         client_id=client_id,
         agent_state=DocumentAgentState.pending,
+        fields=None,
         limit=limit,
         offset=offset,
         current_user=current_user,
@@ -175,9 +211,9 @@ async def get_document(
         )
     
     try:
-        # Get document
+        # Get document with its agent metadata; the text is in document_text
         result = await db.execute(
-            select(Document).where(
+            select(Document).options(undefer_group("agent_blobs")).where(
                 and_(
                     Document.id == doc_uuid,
                     Document.practice_id == current_user.practice_id
@@ -197,6 +233,9 @@ async def get_document(
             "filename": document.filename,
             "original_filename": document.original_filename,
             "document_url": document.document_url,
+            "content_sha256": document.content_sha256,
+            "thumbnail_sha256": document.thumbnail_sha256,
+            "preview_sha256": document.preview_sha256,
             "file_size": document.file_size,
             "mime_type": document.mime_type,
             "document_type": document.document_type,
@@ -210,15 +249,19 @@ async def get_document(
             "client_id": str(document.client_id) if document.client_id else None,
             "message_id": str(document.message_id) if document.message_id else None,
             "agent_state": document.agent_state,
+            "agent_processing_started_at": document.agent_processing_started_at.isoformat() if document.agent_processing_started_at else None,
+            "processed_at": document.processed_at.isoformat() if document.processed_at else None,
             "agent_processing_notes": document.agent_processing_notes,
             "agent_confidence_score": document.agent_confidence_score,
-            "extracted_data": document.extracted_data,
-            "extracted_text": document.extracted_text,
+            "agent_metadata": document.agent_metadata,
+            "extracted_data": ((document.agent_metadata or {}).get("financial_document_processing") or {}).get("extracted_data"),
+            "extracted_text_length": document.extracted_text_length,
+            "extracted_page_count": document.extracted_page_count,
             "is_validated": document.is_validated,
-            "is_sensitive": document.is_sensitive,
-            "access_level": document.access_level,
-            "is_active": document.is_active,
+            "validated_by_user_id": str(document.validated_by_user_id) if document.validated_by_user_id else None,
+            "validated_at": document.validated_at.isoformat() if document.validated_at else None,
             "is_archived": document.is_archived,
+            "archived_at": document.archived_at.isoformat() if document.archived_at else None,
             "upload_source_details": document.upload_source_details,
             "created_at": document.created_at.isoformat(),
             "updated_at": document.updated_at.isoformat() if document.updated_at else None
@@ -230,4 +273,294 @@ async def get_document(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving document: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+async def _get_practice_document_id(db: AsyncSession, document_id: str, current_user: UserSchema) -> uuid.UUID:
+    """Check the caller may read the document's text; returns its id."""
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view documents"
+        )
+    
+    try:
+        doc_uuid = uuid.UUID(document_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid document ID format"
+        )
+    
+    exists = (await db.execute(
+        select(Document.id).where(Document.id == doc_uuid, Document.practice_id == current_user.practice_id)
+    )).scalar_one_or_none()
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    return doc_uuid
+
+@router.get("/{document_id}/text")
+async def stream_document_text(
+    document_id: str,
+    start_page: int = Query(1, ge=1),
+    end_page: Optional[int] = Query(None, ge=1),
+    include_layout: bool = False,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Extracted text of a document as NDJSON, one `{"page", "char_count", "text"}` line per
+    page in page order (`"layout"` too with `include_layout=true`).
+    
+    Pages are read and decompressed a few at a time, so large documents stream without
+    being held in memory. `start_page`/`end_page` limit the pages returned.
+    """
+    doc_uuid = await _get_practice_document_id(db, document_id, current_user)
+    # Pages are read on a session of their own while streaming; release this one
+    await db.close()
+    
+    async def ndjson():
+        next_page = start_page
+        async with AsyncSessionLocal() as text_db:
+            while end_page is None or next_page <= end_page:
+                query = select(DocumentTextPage).where(
+                    DocumentTextPage.document_id == doc_uuid,
+                    DocumentTextPage.page_number >= next_page
+                )
+                if end_page is not None:
+                    query = query.where(DocumentTextPage.page_number <= end_page)
+                if not include_layout:
+                    query = query.options(defer(DocumentTextPage.layout_zstd))
+                pages = (await text_db.execute(
+                    query.order_by(DocumentTextPage.page_number).limit(DOCUMENT_TEXT_BATCH_PAGES)
+                )).scalars().all()
+                for page in pages:
+                    yield dumps(page_payload(page, include_layout)) + b"\n"
+                if len(pages) < DOCUMENT_TEXT_BATCH_PAGES:
+                    break
+                next_page = pages[-1].page_number + 1
+                # Drop the batch's compressed values before reading the next one
+                text_db.expunge_all()
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.get("/{document_id}/text/pages/{page_number}")
+async def get_document_text_page(
+    document_id: str,
+    page_number: int,
+    include_layout: bool = False,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """One page of a document's extracted text."""
+    doc_uuid = await _get_practice_document_id(db, document_id, current_user)
+    
+    page = (await db.execute(
+        select(DocumentTextPage).where(
+            DocumentTextPage.document_id == doc_uuid,
+            DocumentTextPage.page_number == page_number
+        )
+    )).scalar_one_or_none()
+    if not page:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Page not found"
+        )
+    
+    return FastJSONResponse(page_payload(page, include_layout))
+
+async def _get_file_document(db: AsyncSession, document_id: str, current_user: UserSchema) -> Document:
+    """The document whose file is requested, checked against the caller's practice."""
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper] or not current_user.practice_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view documents"
+        )
+    
+    try:
+        doc_uuid = uuid.UUID(document_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid document ID format"
+        )
+    
+    document = (await db.execute(
+        select(Document).options(load_only(
+            Document.filename, Document.original_filename, Document.document_url, Document.mime_type,
+            Document.content_sha256, Document.thumbnail_sha256, Document.preview_sha256
+        )).where(Document.id == doc_uuid, Document.practice_id == current_user.practice_id)
+    )).scalar_one_or_none()
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    return document
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    return if_none_match.strip() == "*" or etag in [
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ]
+
+def _requested_range(request: Request, etag: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    The (start, end) byte range, inclusive, of a single-range Range header, or None to send
+    the whole file (no, malformed or multiple ranges, or If-Range for another version).
+    """
+    range_header = request.headers.get("range")
+    if not range_header or request.headers.get("if-range", etag) != etag:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start, end = int(first), min(int(last) if last else size - 1, size - 1)
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+def _content_disposition(disposition: str, filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+def _read_chunks(stream, length: int) -> Iterator[bytes]:
+    """Up to `length` bytes of an open storage stream, which is closed afterwards."""
+    with closing(stream):
+        while length > 0:
+            chunk = stream.read(min(DOCUMENT_FILE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+async def _stored_file_response(
+    request: Request,
+    db: AsyncSession,
+    sha256: str,
+    media_type: Optional[str],
+    filename: str,
+    disposition: str
+) -> Response:
+    """
+    A stored file with its SHA-256 as the ETag. If-None-Match gets 304 and Range gets 206.
+    Local files go through FileResponse, which handles Range itself (Starlette 0.39+,
+    hence the FastAPI floor in requirements.txt) and uses the server's zero-copy file
+    sending (the ASGI pathsend extension) where it has one; remote files are streamed.
+    """
+    etag = f'"{sha256}"'
+    headers = {"ETag": etag, "Cache-Control": DOCUMENT_FILE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        await db.close()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    local_path = document_storage_service.local_path(sha256)
+    if local_path:
+        await db.close()
+        if not os.path.isfile(local_path):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document file not found")
+        return FileResponse(
+            local_path,
+            headers=headers,
+            media_type=media_type or "application/octet-stream",
+            filename=filename,
+            content_disposition_type=disposition
+        )
+    
+    size = (await db.execute(select(StoredFile.size).where(StoredFile.sha256 == sha256))).scalar_one()
+    await db.close()
+    byte_range = _requested_range(request, etag, size)
+    start, end = byte_range or (0, size - 1)
+    headers.update({
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": _content_disposition(disposition, filename)
+    })
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    stream = await asyncio.to_thread(document_storage_service.open_stored, sha256, start, end)
+    return StreamingResponse(
+        _read_chunks(stream, end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=media_type or "application/octet-stream",
+        headers=headers
+    )
+
+@router.get("/{document_id}/download")
+async def download_document(
+    document_id: str,
+    request: Request,
+    inline: bool = False,
+    current_user: UserSchema = Depends(get_current_user_from_url),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    The document's file, with Range requests (PDF viewers fetch pages this way) and
+    conditional GET: the ETag is the SHA-256 of the content. `inline=true` displays it in
+    the browser instead of saving it.
+    
+    Documents saved before content-addressed storage are sent from their path, with
+    Range support but a modification-time ETag.
+    """
+    document = await _get_file_document(db, document_id, current_user)
+    filename = document.original_filename or document.filename
+    disposition = "inline" if inline else "attachment"
+    if document.content_sha256:
+        return await _stored_file_response(request, db, document.content_sha256, document.mime_type, filename, disposition)
+    
+    await db.close()
+    if not os.path.isfile(document.document_url):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document file not found")
+    return FileResponse(
+        document.document_url,
+        headers={"Cache-Control": DOCUMENT_FILE_CACHE_CONTROL},
+        media_type=document.mime_type or "application/octet-stream",
+        filename=filename,
+        content_disposition_type=disposition
+    )
+
+@router.get("/{document_id}/thumbnail")
+async def get_document_thumbnail(
+    document_id: str,
+    request: Request,
+    current_user: UserSchema = Depends(get_current_user_from_url),
+    db: AsyncSession = Depends(get_db)
+):
+    """JPEG thumbnail (256px) of the document's first page, made when the document was OCR'd."""
+    document = await _get_file_document(db, document_id, current_user)
+    if not document.thumbnail_sha256:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document has no thumbnail")
+    return await _stored_file_response(
+        request, db, document.thumbnail_sha256, "image/jpeg", f"{document.id}_thumbnail.jpg", "inline"
+    )
+
+@router.get("/{document_id}/preview")
+async def get_document_preview(
+    document_id: str,
+    request: Request,
+    current_user: UserSchema = Depends(get_current_user_from_url),
+    db: AsyncSession = Depends(get_db)
+):
+    """JPEG preview (1024px) of the document's first page, made when the document was OCR'd."""
+    document = await _get_file_document(db, document_id, current_user)
+    if not document.preview_sha256:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document has no preview")
+    return await _stored_file_response(
+        request, db, document.preview_sha256, "image/jpeg", f"{document.id}_preview.jpg", "inline"
+    )
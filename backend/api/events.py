@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from api.users import get_current_user_from_url
+from config.database import get_db
+from db.models import UserRole
+from db.schemas.user import User as UserSchema
+from services.realtime_events import stream_practice_events
+
+router = APIRouter()
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: UserSchema = Depends(get_current_user_from_url),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-Sent Events stream of new messages, message status changes and document state
+    changes for the current user's practice.
+
+    EventSource cannot send headers, so it authenticates with a URL token
+    (POST /auth/url-token) as `token`. The token is checked when the stream opens, so a
+    reconnect after it expires needs a new one. Reconnects resume from the `Last-Event-ID`
+    header (sent automatically by EventSource) or the `last_event_id` parameter.
+    """
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper] or not current_user.practice_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to receive practice events"
+        )
+    practice_id = current_user.practice_id
+    # The long-lived stream must not hold a DB connection
+    await db.close()
+
+    async def event_source():
+        async for chunk in stream_practice_events(practice_id, last_event_id_header or last_event_id):
+            if await request.is_disconnected():
+                break
+            yield chunk
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Stop nginx buffering the stream
+        }
+    )
@@ -11,10 +11,12 @@ from db.models import User, UserRole, Message, MessageType, Document, DocumentTy
 from db.schemas.user import User as UserSchema
 from db.schemas.message import (
     MessageSend, MessageListItem, Message as MessageSchema, 
-    MessageResponse, ConversationResponse
+    MessageResponse, ConversationResponse, ConversationDeltaResponse,
+    MessageBroadcastCreate, MessageBroadcastProgress
 )
 from api.users import get_current_user
-from services.message_service import message_service
+from services.message_service import message_service, MessageService
+from services.message_broadcast_service import message_broadcast_service
 from services.twilio_service import twilio_service
 
 router = APIRouter()
@@ -69,16 +71,113 @@ async def send_message(
             detail=f"Error sending message: {str(e)}"
         )
 
+@router.post("/broadcasts", response_model=MessageBroadcastProgress, status_code=status.HTTP_202_ACCEPTED)
+async def create_broadcast(
+    broadcast_data: MessageBroadcastCreate,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Send a templated WhatsApp message to many individuals.
+    
+    Recipients are explicit `individual_ids` and/or customer filters, e.g.
+    `{"self_assessment": true, "customer_status": "active"}` for every active customer with
+    an SA return. Messages are created at once and sent in the background within the
+    practice number's rate limit; poll GET /messages/broadcasts/{id} for progress.
+    """
+    
+    # Check permissions
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to send messages"
+        )
+    
+    try:
+        broadcast = await message_broadcast_service.create_broadcast(
+            db=db,
+            broadcast_data=broadcast_data,
+            practice_id=current_user.practice_id,
+            user_id=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return await message_broadcast_service.get_broadcast_progress(db, broadcast.id, current_user.practice_id)
+
+@router.get("/broadcasts/{broadcast_id}", response_model=MessageBroadcastProgress)
+async def get_broadcast(
+    broadcast_id: uuid.UUID,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a broadcast's status and its message counts per delivery status."""
+    
+    # Check permissions
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view messages"
+        )
+    
+    progress = await message_broadcast_service.get_broadcast_progress(db, broadcast_id, current_user.practice_id)
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Broadcast not found"
+        )
+    return progress
+
+@router.post("/broadcasts/{broadcast_id}/cancel", response_model=MessageBroadcastProgress)
+async def cancel_broadcast(
+    broadcast_id: uuid.UUID,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Cancel a broadcast. Messages already sent are not affected."""
+    
+    # Check permissions
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to send messages"
+        )
+    
+    progress = await message_broadcast_service.get_broadcast_progress(db, broadcast_id, current_user.practice_id)
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Broadcast not found"
+        )
+    
+    if not await message_broadcast_service.cancel_broadcast(db, broadcast_id, current_user.practice_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Broadcast is already {progress['status'].value}"
+        )
+    
+    return await message_broadcast_service.get_broadcast_progress(db, broadcast_id, current_user.practice_id)
+
 @router.get("/individual/{individual_id}", response_model=ConversationResponse)
 async def get_individual_messages(
     individual_id: str,
     message_type: Optional[MessageType] = None,
     limit: int = 50,
     offset: int = 0,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
     current_user: UserSchema = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all messages for a specific individual with pagination."""
+    """
+    Get messages for a specific individual, newest first.
+    
+    Page with `before=<next_cursor>` for older messages and `after=<latest_cursor>` for
+    newer ones. Cursor pages skip the total count; `offset` paging is kept for existing clients.
+    """
     
     # Check permissions
     if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
@@ -96,6 +195,21 @@ async def get_individual_messages(
             detail="Invalid individual ID format"
         )
     
+    if before and after:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either before or after, not both"
+        )
+    
+    if before or after:
+        try:
+            cursor_created_at, cursor_id, _ = MessageService.decode_cursor(before or after)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
     try:
         # Get individual info
         individual_result = await db.execute(
@@ -121,20 +235,38 @@ async def get_individual_messages(
         if message_type:
             base_query = base_query.where(Message.message_type == message_type)
 
-        # Get total count efficiently using COUNT
-        count_query = select(func.count()).select_from(base_query)
-        total_count = await db.scalar(count_query) or 0
+        total_count = None
+        newest_first = (Message.created_at.desc(), Message.id.desc())
+        if before:
+            messages_query = base_query.where(
+                MessageService.older_than(cursor_created_at, cursor_id)
+            ).order_by(*newest_first)
+        elif after:
+            messages_query = base_query.where(
+                MessageService.newer_than(cursor_created_at, cursor_id)
+            ).order_by(Message.created_at, Message.id)
+        else:
+            # Get total count efficiently using COUNT
+            count_query = select(func.count()).select_from(base_query)
+            total_count = await db.scalar(count_query) or 0
+            messages_query = base_query.order_by(*newest_first).offset(offset)
 
-        # Get paginated messages
-        messages_query = base_query.order_by(Message.created_at.desc()).offset(offset).limit(limit)
-        result = await db.execute(messages_query)
-        messages = result.scalars().all()
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(messages_query.limit(limit + 1))
+        messages = list(result.scalars().all())
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if after:
+            messages.reverse()
         
         return ConversationResponse(
             individual_id=individual_uuid,
             individual_name=individual.full_name,
             messages=messages,
-            total_count=total_count
+            total_count=total_count,
+            has_more=has_more,
+            next_cursor=MessageService.message_cursor(messages[-1]) if messages else None,
+            latest_cursor=MessageService.message_cursor(messages[0]) if messages else after
         )
         
     except HTTPException:
@@ -145,6 +277,47 @@ async def get_individual_messages(
             detail=f"Error retrieving messages: {str(e)}"
         )
 
+@router.get("/individual/{individual_id}/since", response_model=ConversationDeltaResponse)
+async def get_individual_messages_since(
+    individual_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Poll a conversation for changes since `cursor` (a conversation's `latest_cursor` or
+    the `cursor` of the previous poll). Returns only new messages and status changes.
+    """
+    
+    # Check permissions
+    if current_user.role not in [UserRole.practice_owner, UserRole.accountant, UserRole.bookkeeper]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view messages"
+        )
+    
+    # Parse UUID
+    try:
+        individual_uuid = uuid.UUID(individual_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid individual ID format"
+        )
+    
+    try:
+        delta = await MessageService.get_conversation_delta(
+            db, individual_uuid, current_user.practice_id, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return ConversationDeltaResponse(individual_id=individual_uuid, **delta)
+
 
 
 @router.post("/webhook/twilio")
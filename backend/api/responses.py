@@ -0,0 +1,60 @@
+"""
+JSON responses encoded with orjson.
+
+FastJSONResponse is the app's default response class. Endpoints that build large payloads
+return it directly, which skips FastAPI's jsonable_encoder pass: orjson writes UUIDs,
+datetimes, dates and enums natively and Decimals through `_default`. List endpoints
+with a response_model use a ModelListSerializer, a TypeAdapter built once at import,
+to validate ORM objects and write JSON in one pydantic-core call.
+"""
+
+from decimal import Decimal
+from uuid import UUID
+from typing import Any, Iterable, List, Type
+
+import orjson
+from fastapi.encoders import decimal_encoder
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse, Response
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not encode itself, converted the way jsonable_encoder does."""
+    if isinstance(obj, UUID):
+        # asyncpg returns its own UUID subclass, which orjson does not recognise
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return decimal_encoder(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as JSON bytes."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelListSerializer:
+    """Pre-built serializer for a list of ORM objects returned as `List[model]`."""
+
+    def __init__(self, model: Type[BaseModel]):
+        self.adapter = TypeAdapter(List[model])
+
+    def render(self, objects: Iterable[Any]) -> bytes:
+        """Validate the objects' attributes against the model and encode them as JSON."""
+        return self.adapter.dump_json(self.adapter.validate_python(list(objects), from_attributes=True))
+
+    def response(self, objects: Iterable[Any]) -> Response:
+        return Response(content=self.render(objects), media_type="application/json")
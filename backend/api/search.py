@@ -9,6 +9,7 @@ from config.database import get_db
 from db.models import Customer, Client, Individual, UserRole
 from db.schemas.user import User as UserSchema
 from api.users import get_current_user
+from api.responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -153,4 +154,4 @@ async def search_customers_and_clients(
     
     results["total"] = len(results["customers"]) + len(results["clients"])
     
-    return results 
\ No newline at end of file
+    return FastJSONResponse(results) 
\ No newline at end of file
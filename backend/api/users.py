@@ -1,15 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 import uuid
 
 from config.database import get_db
 from db.schemas.user import User, TokenData, UserListItem, UserCreate
 from db.models import User as UserModel, UserRole
-from services.auth_service import verify_token
+from services.auth_service import verify_token, URL_TOKEN_SCOPE
 from services.user_service import get_user_by_id
 
 router = APIRouter()
@@ -30,6 +30,35 @@ async def get_current_user(
         )
     return user
 
+async def get_current_user_from_url(
+    token: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    get_current_user for URLs the browser requests itself (<img>, links, EventSource),
+    which cannot send headers: takes a URL token (POST /auth/url-token) as `token`, or an
+    access token in the Authorization header.
+    """
+    if token:
+        token_data = verify_token(token, scope=URL_TOKEN_SCOPE)
+    elif authorization and authorization.lower().startswith("bearer "):
+        token_data = verify_token(authorization[7:])
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = await get_user_by_id(db, token_data.user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
 @router.get("/me", response_model=User, status_code=status.HTTP_200_OK)
 async def read_users_me(current_user: User = Depends(get_current_user)):
     """Get current user profile."""
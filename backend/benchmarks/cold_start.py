@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+API cold start benchmark for AgentBooks
+
+Starts fresh API processes and reports, per DB_STARTUP_SCHEMA mode:
+  - import:  seconds to `import main` in a new interpreter
+  - ready:   seconds from launching uvicorn until GET / answers (imports, startup
+             hook with the schema check or create_all, first request)
+
+Needs a migrated database (`alembic upgrade head`); create_all does not change it.
+
+Usage:
+    python benchmarks/cold_start.py --runs 5
+    python benchmarks/cold_start.py --modes verify create_all off --runs 10
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_TIMEOUT_SECONDS = 60
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def measure_ready(env) -> float:
+    """Seconds until a new uvicorn process answers GET /."""
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--workers", "1"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < READY_TIMEOUT_SECONDS:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {process.returncode} (is the database migrated?)")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.02)
+        raise RuntimeError(f"uvicorn did not answer within {READY_TIMEOUT_SECONDS}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def report(label: str, timings):
+    print(
+        f"    {label:6}: median {statistics.median(timings):6.2f}s  min {min(timings):6.2f}s  "
+        f"max {max(timings):6.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["verify", "create_all"],
+                        choices=["verify", "create_all", "off"], help="DB_STARTUP_SCHEMA values to compare")
+    parser.add_argument("--runs", type=int, default=5, help="Processes started per mode")
+    args = parser.parse_args()
+
+    print(f"🏁 {args.runs} cold starts per mode")
+    imports = [measure_import(dict(os.environ)) for _ in range(args.runs)]
+    report("import", imports)
+    for mode in args.modes:
+        env = {**os.environ, "DB_STARTUP_SCHEMA": mode}
+        print(f"  {mode}")
+        report("ready", [measure_ready(env) for _ in range(args.runs)])
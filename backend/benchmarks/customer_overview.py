@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Customer screen load benchmark for AgentBooks
+
+Loads a fixture practice with one customer that has documents, client associations and
+individual relationships, then calls the API in-process and reports latency and the
+number of SQL statements per page load:
+  - tabs:      GET /customers/{id}/info, /mlr, /relationships and /documents one after another
+  - overview:  GET /customers/{id}/overview (NDJSON stream of the same four sections)
+  - gathered:  GET /customers/{id}/overview?stream=false
+
+Run against a scratch database; the fixture is removed with --cleanup.
+
+Usage:
+    python benchmarks/customer_overview.py --documents 500 --associations 20
+    python benchmarks/customer_overview.py --skip-seed --samples 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from config.database import sync_engine, engine
+
+FIXTURE_PRACTICE_NAME = "Load test practice (customer overview benchmark)"
+FIXTURE_USER_EMAIL = "overview-benchmark@agentbooks.invalid"
+TAB_PATHS = ["info", "mlr", "relationships", "documents"]
+
+
+def fixture_practice_id(conn):
+    return conn.execute(text("SELECT id FROM practices WHERE name = :name"), {"name": FIXTURE_PRACTICE_NAME}).scalar()
+
+
+def seed_fixture(documents: int, associations: int):
+    """Create the fixture practice, user and customer with its documents and relationships."""
+    start = time.perf_counter()
+    with sync_engine.begin() as conn:
+        practice_id = conn.execute(text(
+            "INSERT INTO practices (id, name) VALUES (gen_random_uuid(), :name) RETURNING id"
+        ), {"name": FIXTURE_PRACTICE_NAME}).scalar()
+        params = {"practice_id": practice_id, "documents": documents, "associations": associations}
+        conn.execute(text(
+            "INSERT INTO users (id, email, password_hash, role, practice_id) "
+            "VALUES (gen_random_uuid(), :email, 'x', 'practice_owner', :practice_id)"
+        ), {"email": FIXTURE_USER_EMAIL, "practice_id": practice_id})
+        conn.execute(text(
+            "INSERT INTO individuals (id, practice_id, first_name, last_name, email) "
+            "SELECT gen_random_uuid(), :practice_id, 'Overview', 'Test ' || g, 'overview' || g || '@example.com' "
+            "FROM generate_series(0, :associations) g"
+        ), params)
+        customer_id, individual_id = conn.execute(text(
+            "INSERT INTO customers (id, practice_id, individual_id, status, mlr_status, do_they_own_sa) "
+            "SELECT gen_random_uuid(), :practice_id, id, 'active', 'pending', false FROM individuals "
+            "WHERE practice_id = :practice_id AND last_name = 'Test 0' RETURNING id, individual_id"
+        ), params).one()
+        params.update(customer_id=customer_id, individual_id=individual_id)
+        conn.execute(text(
+            "INSERT INTO individual_relationships (id, practice_id, from_individual_id, to_individual_id, relationship_type) "
+            "SELECT gen_random_uuid(), :practice_id, :individual_id, id, 'spouse' FROM individuals "
+            "WHERE practice_id = :practice_id AND id <> :individual_id"
+        ), params)
+        conn.execute(text(
+            "INSERT INTO clients (id, practice_id, client_code, business_name, business_type, mlr_status, engagement_letter_status) "
+            "SELECT gen_random_uuid(), :practice_id, 'OV' || lpad(g::text, 7, '0'), 'Overview Test ' || g || ' Ltd', "
+            "       'ltd', 'pending', 'pending' "
+            "FROM generate_series(1, :associations) g"
+        ), params)
+        conn.execute(text(
+            "INSERT INTO customer_client_associations (id, customer_id, client_id, relationship_type, is_active, is_primary_contact) "
+            "SELECT gen_random_uuid(), :customer_id, id, 'director', 'active', false FROM clients WHERE practice_id = :practice_id"
+        ), params)
+        conn.execute(text(
+            "INSERT INTO documents (id, practice_id, customer_id, filename, document_url, document_type, "
+            "                       document_source, agent_state, extracted_text_length, extracted_page_count) "
+            "SELECT gen_random_uuid(), :practice_id, :customer_id, 'doc_' || g || '.pdf', "
+            "       'https://storage.invalid/doc_' || g || '.pdf', 'pdf', 'upload', 'processed', 10000, 1 "
+            "FROM generate_series(1, :documents) g"
+        ), params)
+    print(f"✅ Seeded a customer with {documents:,} documents and {associations} associations in {time.perf_counter() - start:.1f}s")
+
+
+def cleanup_fixture():
+    with sync_engine.begin() as conn:
+        practice_id = fixture_practice_id(conn)
+        if practice_id:
+            conn.execute(text(
+                "DELETE FROM customer_client_associations WHERE customer_id IN "
+                "(SELECT id FROM customers WHERE practice_id = :id)"
+            ), {"id": practice_id})
+            for table in ("documents", "individual_relationships", "clients", "customers", "individuals", "users"):
+                conn.execute(text(f"DELETE FROM {table} WHERE practice_id = :id"), {"id": practice_id})
+            conn.execute(text("DELETE FROM practices WHERE id = :id"), {"id": practice_id})
+    print("🧹 Fixture removed")
+
+
+def _percentile(timings, percentile: float) -> float:
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+class StatementCounter:
+    """Counts SQL statements sent by the API's async engine."""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def measure(client: TestClient, paths, samples: int, counter: StatementCounter):
+    """Time `samples` page loads (all of `paths`), in milliseconds; returns (timings, bytes, statements)."""
+    timings = []
+    size = statements = 0
+    for _ in range(samples):
+        counter.count = 0
+        size = 0
+        start = time.perf_counter()
+        for path in paths:
+            response = client.get(path)
+            response.raise_for_status()
+            size += len(response.content)
+        timings.append((time.perf_counter() - start) * 1000)
+        statements = counter.count
+    return timings, size, statements
+
+
+def report(label: str, requests: int, timings, size: int, statements: int):
+    print(
+        f"  {label:9}: {requests} request(s)  {statements:3} statements  {size / 1024:8.1f} KiB  "
+        f"p50 {_percentile(timings, 0.5):8.2f}ms  p95 {_percentile(timings, 0.95):8.2f}ms  "
+        f"mean {statistics.mean(timings):8.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=500, help="Documents of the fixture customer")
+    parser.add_argument("--associations", type=int, default=20, help="Client associations and individual relationships")
+    parser.add_argument("--samples", type=int, default=20, help="Page loads timed per variant")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an existing fixture")
+    parser.add_argument("--cleanup", action="store_true", help="Remove the fixture when done")
+    args = parser.parse_args()
+
+    with sync_engine.connect() as conn:
+        existing = fixture_practice_id(conn)
+    if not args.skip_seed or not existing:
+        if existing:
+            cleanup_fixture()
+        seed_fixture(args.documents, args.associations)
+
+    with sync_engine.connect() as conn:
+        practice_id = fixture_practice_id(conn)
+        user_id = conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": FIXTURE_USER_EMAIL}).scalar()
+        customer_id = conn.execute(text("SELECT id FROM customers WHERE practice_id = :id"), {"id": practice_id}).scalar()
+
+    from main import app
+    from services.auth_service import create_access_token
+
+    token = create_access_token({
+        "sub": FIXTURE_USER_EMAIL, "user_id": str(user_id), "role": "practice_owner",
+        "practice_id": str(practice_id), "client_ids": [],
+    })
+    counter = StatementCounter()
+    variants = [
+        ("tabs", [f"/customers/{customer_id}/{tab}" for tab in TAB_PATHS]),
+        ("overview", [f"/customers/{customer_id}/overview"]),
+        ("gathered", [f"/customers/{customer_id}/overview?stream=false"]),
+    ]
+    with TestClient(app) as client:
+        client.headers["Authorization"] = f"Bearer {token}"
+        print(f"🏁 {args.samples} page loads per variant")
+        for label, paths in variants:
+            measure(client, paths, 1, counter)  # warm up
+            report(label, len(paths), *measure(client, paths, args.samples, counter))
+
+    if args.cleanup:
+        cleanup_fixture()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+JSON serialisation benchmark for AgentBooks
+
+Uses the list_projection.py fixture (customers, clients and documents in one practice)
+and measures, on a single core:
+  - encode: payloads of the list endpoints encoded the way FastAPI does by default
+            (pydantic to Python objects or jsonable_encoder, then json.dumps) against
+            api/responses.py (ModelListSerializer / orjson)
+  - serve:  requests per second and per CPU second of this process for the list
+            endpoints called in-process (database time excluded from the CPU figure)
+
+Run against a scratch database; the fixture is removed with --cleanup.
+
+Usage:
+    python benchmarks/json_serialisation.py --rows 1000
+    python benchmarks/json_serialisation.py --skip-seed --samples 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload, load_only, noload
+
+from benchmarks.list_projection import (
+    FIXTURE_USER_EMAIL, fixture_practice_id, seed_fixture, cleanup_fixture
+)
+from config.database import sync_engine, get_sync_session
+
+SERVE_PATHS = ["/customers/", "/clients/", "/documents/?limit=200", "/search/?q=load&limit=50"]
+
+
+def load_payloads(practice_id):
+    """ORM objects and rows exactly as the list endpoints load them."""
+    from db.models import Customer, Client, Document, Individual
+    from api.documents import DOCUMENT_FIELDS, DOCUMENT_LIST_FIELDS
+    from db.projection import projection_columns, rows_to_dicts
+    from db.schemas.client import ClientListItem
+
+    db = get_sync_session()
+    try:
+        customers = db.execute(select(Customer).options(
+            selectinload(Customer.individual).options(
+                selectinload(Individual.incomes),
+                selectinload(Individual.property_relationships),
+                noload(Individual.relationships_from),
+                noload(Individual.relationships_to)
+            )
+        ).where(Customer.practice_id == practice_id)).scalars().all()
+        clients = db.execute(select(Client).options(
+            load_only(*[getattr(Client, name) for name in ClientListItem.model_fields])
+        ).where(Client.practice_id == practice_id)).scalars().all()
+        documents = rows_to_dicts(db.execute(
+            select(*projection_columns(DOCUMENT_LIST_FIELDS, DOCUMENT_FIELDS))
+            .where(Document.practice_id == practice_id).limit(200)
+        ))
+        db.expunge_all()
+        return customers, clients, {"documents": documents, "total_count": len(documents), "limit": 200, "offset": 0}
+    finally:
+        db.close()
+
+
+def starlette_dumps(content) -> bytes:
+    """starlette.responses.JSONResponse.render"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def rate(fn, seconds: float):
+    """Calls per CPU second of `fn` and the size of its output."""
+    output = fn()
+    calls = 0
+    start = time.process_time()
+    while time.process_time() - start < seconds:
+        fn()
+        calls += 1
+    return calls / (time.process_time() - start), len(output)
+
+
+def report_encode(name: str, before, after):
+    (before_rate, size), (after_rate, _) = before, after
+    print(
+        f"    {name:10}: {size / 1024:8.1f} KiB  default {before_rate:8.1f}/s  "
+        f"orjson {after_rate:8.1f}/s  ({after_rate / before_rate:4.1f}x)"
+    )
+
+
+def measure_encode(practice_id, seconds: float):
+    from api.responses import ModelListSerializer, dumps
+    from db.schemas.customer import CustomerListItem
+    from db.schemas.client import ClientListItem
+
+    customers, clients, documents = load_payloads(practice_id)
+    print(f"  encode (payloads per CPU second, {len(customers)} customers, {len(clients)} clients, {len(documents['documents'])} documents)")
+    for name, model, objects in (("customers", CustomerListItem, customers), ("clients", ClientListItem, clients)):
+        adapter = TypeAdapter(List[model])
+        serializer = ModelListSerializer(model)
+        before = rate(lambda: starlette_dumps(
+            adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+        ), seconds)
+        report_encode(name, before, rate(lambda: serializer.render(objects), seconds))
+    report_encode(
+        "documents",
+        rate(lambda: starlette_dumps(jsonable_encoder(documents)), seconds),
+        rate(lambda: dumps(documents), seconds)
+    )
+
+
+def measure_serve(practice_id, user_id, samples: int):
+    from main import app
+    from services.auth_service import create_access_token
+
+    token = create_access_token({
+        "sub": FIXTURE_USER_EMAIL, "user_id": str(user_id), "role": "practice_owner",
+        "practice_id": str(practice_id), "client_ids": [],
+    })
+    print(f"  serve ({samples} requests each)")
+    with TestClient(app) as client:
+        client.headers["Authorization"] = f"Bearer {token}"
+        for path in SERVE_PATHS:
+            client.get(path).raise_for_status()  # warm up
+            wall, cpu = time.perf_counter(), time.process_time()
+            for _ in range(samples):
+                client.get(path)
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            print(f"    {path:24}: {samples / wall:8.1f} req/s  {samples / cpu:8.1f} req per CPU second")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000, help="Customers, clients and documents to seed")
+    parser.add_argument("--seconds", type=float, default=2.0, help="CPU time spent per encode measurement")
+    parser.add_argument("--samples", type=int, default=50, help="Requests per endpoint")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an existing fixture")
+    parser.add_argument("--cleanup", action="store_true", help="Remove the fixture when done")
+    args = parser.parse_args()
+
+    with sync_engine.connect() as conn:
+        existing = fixture_practice_id(conn)
+    if not args.skip_seed or not existing:
+        if existing:
+            cleanup_fixture()
+        seed_fixture(args.rows)
+
+    with sync_engine.connect() as conn:
+        practice_id = fixture_practice_id(conn)
+        user_id = conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": FIXTURE_USER_EMAIL}).scalar()
+
+    print("🏁 Single core")
+    measure_encode(practice_id, args.seconds)
+    measure_serve(practice_id, user_id, args.samples)
+
+    if args.cleanup:
+        cleanup_fixture()
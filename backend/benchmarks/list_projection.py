@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+List endpoint payload benchmark for AgentBooks
+
+Loads a fixture practice with customers, clients carrying a full Companies House JSON
+blob and documents carrying extracted text and agent metadata, then calls the list
+endpoints in-process and reports response size and latency:
+  - default:  GET /customers/, /clients/, /documents/
+  - fields:   the same with ?fields= selecting what a list/typeahead view shows
+
+Run against a scratch database; the fixture is removed with --cleanup.
+
+Usage:
+    python benchmarks/list_projection.py --rows 1000
+    python benchmarks/list_projection.py --skip-seed --samples 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from config.database import sync_engine
+from db.document_text import compress_text
+
+FIXTURE_PRACTICE_NAME = "Load test practice (list benchmark)"
+FIXTURE_USER_EMAIL = "list-benchmark@agentbooks.invalid"
+
+# (label, path, fields) of each list request; the ?fields= variant is timed next to the default
+ENDPOINTS = [
+    ("customers", "/customers/", "id,status,individual_first_name,individual_last_name"),
+    ("clients", "/clients/", "id,client_code,business_name,company_status"),
+    ("documents", "/documents/?limit=200", "id,filename,document_type,agent_state,created_at"),
+]
+
+# Roughly the size of a stored Companies House company profile response
+COMPANIES_HOUSE_DATA = {
+    "company_name": "LOAD TEST LIMITED",
+    "company_status": "active",
+    "type": "ltd",
+    "date_of_creation": "2015-04-01",
+    "jurisdiction": "england-wales",
+    "registered_office_address": {"address_line_1": "1 High Street", "locality": "London", "postal_code": "EC1A 1AA"},
+    "sic_codes": ["69201", "69202"],
+    "accounts": {"next_due": "2025-12-31", "overdue": False, "accounting_reference_date": {"day": "31", "month": "03"}},
+    "confirmation_statement": {"next_due": "2025-04-15", "overdue": False},
+    "previous_company_names": [{"name": f"OLD NAME {i} LIMITED", "ceased_on": "2014-01-01"} for i in range(20)],
+    "links": {"self": "/company/00000000", "filing_history": "/company/00000000/filing-history"},
+    "officers": [{"name": f"OFFICER {i}", "officer_role": "director", "appointed_on": "2015-04-01"} for i in range(30)],
+}
+UPLOAD_SOURCE_DETAILS = {"twilio_media_sid": "ME" + "0" * 32, "from": "whatsapp:+447700900000", "headers": {"x": "y" * 512}}
+AGENT_METADATA = {"extraction": {f"field_{i}": "value " * 10 for i in range(100)}}
+EXTRACTED_TEXT = "Invoice line item " * 2000
+
+
+def fixture_practice_id(conn):
+    return conn.execute(text("SELECT id FROM practices WHERE name = :name"), {"name": FIXTURE_PRACTICE_NAME}).scalar()
+
+
+def seed_fixture(rows: int):
+    """Create the fixture practice, user, customers, clients and documents with set-based inserts."""
+    start = time.perf_counter()
+    params = {"rows": rows}
+    with sync_engine.begin() as conn:
+        practice_id = conn.execute(text(
+            "INSERT INTO practices (id, name) VALUES (gen_random_uuid(), :name) RETURNING id"
+        ), {"name": FIXTURE_PRACTICE_NAME}).scalar()
+        params["practice_id"] = practice_id
+        conn.execute(text(
+            "INSERT INTO users (id, email, password_hash, role, practice_id) "
+            "VALUES (gen_random_uuid(), :email, 'x', 'practice_owner', :practice_id)"
+        ), {"email": FIXTURE_USER_EMAIL, "practice_id": practice_id})
+        conn.execute(text(
+            "INSERT INTO individuals (id, practice_id, first_name, last_name, email, primary_mobile) "
+            "SELECT gen_random_uuid(), :practice_id, 'Load', 'Test ' || g, 'load' || g || '@example.com', "
+            "       '+44770' || lpad(g::text, 7, '0') "
+            "FROM generate_series(1, :rows) g"
+        ), params)
+        conn.execute(text(
+            "INSERT INTO customers (id, practice_id, individual_id, status, mlr_status) "
+            "SELECT gen_random_uuid(), :practice_id, id, 'active', 'pending' FROM individuals WHERE practice_id = :practice_id"
+        ), params)
+        conn.execute(text(
+            "INSERT INTO clients (id, practice_id, client_code, business_name, business_type, mlr_status, "
+            "                     engagement_letter_status, companies_house_data) "
+            "SELECT gen_random_uuid(), :practice_id, 'LB' || lpad(g::text, 7, '0'), 'Load Test ' || g || ' Ltd', "
+            "       'ltd', 'pending', 'pending', CAST(:ch_data AS jsonb) "
+            "FROM generate_series(1, :rows) g"
+        ), {**params, "ch_data": json.dumps(COMPANIES_HOUSE_DATA)})
+        conn.execute(text(
+            "INSERT INTO documents (id, practice_id, filename, original_filename, document_url, file_size, mime_type, "
+            "                       document_type, document_source, agent_state, extracted_text_length, "
+            "                       extracted_page_count, agent_metadata, upload_source_details) "
+            "SELECT gen_random_uuid(), :practice_id, 'doc_' || g || '.pdf', 'Invoice ' || g || '.pdf', "
+            "       'https://storage.invalid/doc_' || g || '.pdf', 250000, 'application/pdf', 'pdf', 'whatsapp', "
+            "       'processed', :extracted_text_length, 1, CAST(:agent_metadata AS jsonb), CAST(:upload_source_details AS jsonb) "
+            "FROM generate_series(1, :rows) g"
+        ), {
+            **params,
+            "extracted_text_length": len(EXTRACTED_TEXT),
+            "agent_metadata": json.dumps(AGENT_METADATA),
+            "upload_source_details": json.dumps(UPLOAD_SOURCE_DETAILS),
+        })
+        conn.execute(text(
+            "INSERT INTO document_text (document_id, page_number, text_zstd, char_count) "
+            "SELECT id, 1, :text_zstd, :char_count FROM documents WHERE practice_id = :practice_id"
+        ), {**params, "text_zstd": compress_text(EXTRACTED_TEXT), "char_count": len(EXTRACTED_TEXT)})
+    print(f"✅ Seeded {rows:,} customers, clients and documents in {time.perf_counter() - start:.1f}s")
+
+
+def cleanup_fixture():
+    with sync_engine.begin() as conn:
+        practice_id = fixture_practice_id(conn)
+        if practice_id:
+            for table in ("documents", "clients", "customers", "individuals", "users"):
+                conn.execute(text(f"DELETE FROM {table} WHERE practice_id = :id"), {"id": practice_id})
+            conn.execute(text("DELETE FROM practices WHERE id = :id"), {"id": practice_id})
+    print("🧹 Fixture removed")
+
+
+def _percentile(timings, percentile: float) -> float:
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+def measure(client: TestClient, path: str, samples: int):
+    """Time `samples` requests to `path`, in milliseconds; returns (timings, response bytes, items)."""
+    timings = []
+    response = None
+    for _ in range(samples):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    body = response.json()
+    items = body["documents"] if isinstance(body, dict) else body
+    return timings, len(response.content), len(items)
+
+
+def report(label: str, timings, size: int, items: int):
+    print(
+        f"    {label:8}: {size / 1024:9.1f} KiB ({items} items)  p50 {_percentile(timings, 0.5):8.2f}ms  "
+        f"p95 {_percentile(timings, 0.95):8.2f}ms  mean {statistics.mean(timings):8.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000, help="Customers, clients and documents to seed")
+    parser.add_argument("--samples", type=int, default=20, help="Requests timed per endpoint and variant")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an existing fixture")
+    parser.add_argument("--cleanup", action="store_true", help="Remove the fixture when done")
+    args = parser.parse_args()
+
+    with sync_engine.connect() as conn:
+        existing = fixture_practice_id(conn)
+    if not args.skip_seed or not existing:
+        if existing:
+            cleanup_fixture()
+        seed_fixture(args.rows)
+
+    with sync_engine.connect() as conn:
+        practice_id = fixture_practice_id(conn)
+        user_id = conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": FIXTURE_USER_EMAIL}).scalar()
+
+    from main import app
+    from services.auth_service import create_access_token
+
+    token = create_access_token({
+        "sub": FIXTURE_USER_EMAIL, "user_id": str(user_id), "role": "practice_owner",
+        "practice_id": str(practice_id), "client_ids": [],
+    })
+    with TestClient(app) as client:
+        client.headers["Authorization"] = f"Bearer {token}"
+        print(f"🏁 {args.samples} requests per variant")
+        for name, path, fields in ENDPOINTS:
+            print(f"  {name}")
+            client.get(path)  # warm up
+            report("default", *measure(client, path, args.samples))
+            separator = "&" if "?" in path else "?"
+            report("fields", *measure(client, f"{path}{separator}fields={fields}", args.samples))
+
+    if args.cleanup:
+        cleanup_fixture()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Conversation page latency benchmark for AgentBooks
+
+Loads a fixture practice with millions of WhatsApp messages spread over a few thousand
+individuals, then times the queries behind GET /messages/individual/{id} (COUNT plus an
+ORDER BY created_at DESC page) and the Twilio status-callback lookup by SID:
+  - before: with the message indexes dropped (inside a transaction that is rolled back)
+  - after:  with ix_messages_individual_id_created_at and ix_messages_twilio_sid
+
+Works on both plain and partitioned (db/message_partitions.py) messages tables.
+Run against a scratch database; the fixture is removed with --cleanup.
+
+Usage:
+    python benchmarks/message_conversation_latency.py --messages 2000000 --individuals 2000
+    python benchmarks/message_conversation_latency.py --skip-seed --samples 500
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from config.database import sync_engine
+
+FIXTURE_PRACTICE_NAME = "Load test practice (message benchmark)"
+MESSAGE_INDEXES = ["ix_messages_individual_id_created_at", "ix_messages_twilio_sid"]
+SEED_BATCH_SIZE = 500_000
+
+CONVERSATION_COUNT = text(
+    "SELECT count(*) FROM messages WHERE individual_id = :individual_id AND practice_id = :practice_id"
+)
+CONVERSATION_PAGE = text(
+    "SELECT * FROM messages WHERE individual_id = :individual_id AND practice_id = :practice_id "
+    "ORDER BY created_at DESC LIMIT :limit OFFSET :offset"
+)
+STATUS_CALLBACK_LOOKUP = text("SELECT * FROM messages WHERE twilio_sid = :twilio_sid")
+
+
+def fixture_practice_id(conn):
+    return conn.execute(text("SELECT id FROM practices WHERE name = :name"), {"name": FIXTURE_PRACTICE_NAME}).scalar()
+
+
+def seed_fixture(messages: int, individuals: int, days: int):
+    """Create the fixture practice, individuals and messages with set-based inserts."""
+    with sync_engine.begin() as conn:
+        practice_id = conn.execute(text(
+            "INSERT INTO practices (id, name) VALUES (gen_random_uuid(), :name) RETURNING id"
+        ), {"name": FIXTURE_PRACTICE_NAME}).scalar()
+        conn.execute(text(
+            "INSERT INTO individuals (id, practice_id, first_name, last_name, primary_mobile) "
+            "SELECT gen_random_uuid(), :practice_id, 'Load', 'Test ' || g, '+44770' || lpad(g::text, 7, '0') "
+            "FROM generate_series(1, :individuals) g"
+        ), {"practice_id": practice_id, "individuals": individuals})
+
+    print(f"🌱 Seeding {messages:,} messages over {individuals:,} individuals and {days} days...")
+    start = time.perf_counter()
+    for batch_start in range(0, messages, SEED_BATCH_SIZE):
+        batch_size = min(SEED_BATCH_SIZE, messages - batch_start)
+        with sync_engine.begin() as conn:
+            conn.execute(text(
+                "WITH people AS (SELECT array_agg(id) AS ids FROM individuals WHERE practice_id = :practice_id) "
+                "INSERT INTO messages (id, practice_id, individual_id, message_type, direction, status, sender, "
+                "                      body, from_address, to_address, twilio_sid, created_at) "
+                "SELECT gen_random_uuid(), :practice_id, people.ids[1 + floor(random() * array_length(people.ids, 1))::int], "
+                "       'whatsapp', CASE WHEN g % 2 = 0 THEN 'incoming' ELSE 'outgoing' END::messagedirection, "
+                "       'delivered', CASE WHEN g % 2 = 0 THEN 'client' ELSE 'human' END::messagesender, "
+                "       'Load test message ' || g, 'whatsapp:+447700000000', 'whatsapp:+14155238886', "
+                "       'SM' || md5(g::text), now() - random() * make_interval(days => :days) "
+                "FROM people, generate_series(:first, :last) g"
+            ), {"practice_id": practice_id, "days": days, "first": batch_start + 1, "last": batch_start + batch_size})
+        print(f"  {batch_start + batch_size:,} messages")
+    with sync_engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE messages"))
+    print(f"✅ Seeded in {time.perf_counter() - start:.1f}s")
+
+
+def cleanup_fixture():
+    with sync_engine.begin() as conn:
+        practice_id = fixture_practice_id(conn)
+        if practice_id:
+            conn.execute(text("DELETE FROM messages WHERE practice_id = :id"), {"id": practice_id})
+            conn.execute(text("DELETE FROM individuals WHERE practice_id = :id"), {"id": practice_id})
+            conn.execute(text("DELETE FROM practices WHERE id = :id"), {"id": practice_id})
+    print("🧹 Fixture removed")
+
+
+def _percentile(timings, percentile: float) -> float:
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+def measure(conn, practice_id, individual_ids, sids, page_size: int, pages: int):
+    """Time conversation pages (count + page) and status-callback lookups, in milliseconds."""
+    page_timings, lookup_timings = [], []
+    for individual_id, sid in zip(individual_ids, sids):
+        params = {"individual_id": individual_id, "practice_id": practice_id}
+        start = time.perf_counter()
+        conn.execute(CONVERSATION_COUNT, params).scalar()
+        offset = random.randrange(pages) * page_size
+        conn.execute(CONVERSATION_PAGE, {**params, "limit": page_size, "offset": offset}).all()
+        page_timings.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        conn.execute(STATUS_CALLBACK_LOOKUP, {"twilio_sid": sid}).all()
+        lookup_timings.append((time.perf_counter() - start) * 1000)
+    return page_timings, lookup_timings
+
+
+def report(label: str, page_timings, lookup_timings):
+    print(f"  {label}")
+    for name, timings in (("conversation page", page_timings), ("status callback  ", lookup_timings)):
+        print(
+            f"    {name}: p50 {_percentile(timings, 0.5):8.2f}ms  p95 {_percentile(timings, 0.95):8.2f}ms  "
+            f"mean {statistics.mean(timings):8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2_000_000)
+    parser.add_argument("--individuals", type=int, default=2_000)
+    parser.add_argument("--days", type=int, default=730, help="Spread messages over this many days")
+    parser.add_argument("--samples", type=int, default=200, help="Conversation pages timed per run")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=3, help="Pick a random page among the first N")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an existing fixture")
+    parser.add_argument("--cleanup", action="store_true", help="Remove the fixture when done")
+    args = parser.parse_args()
+
+    with sync_engine.connect() as conn:
+        existing = fixture_practice_id(conn)
+    if not args.skip_seed or not existing:
+        if existing:
+            cleanup_fixture()
+        seed_fixture(args.messages, args.individuals, args.days)
+
+    with sync_engine.connect() as conn:
+        practice_id = fixture_practice_id(conn)
+        individual_ids = conn.execute(
+            text("SELECT id FROM individuals WHERE practice_id = :id ORDER BY random() LIMIT :n"),
+            {"id": practice_id, "n": args.samples}
+        ).scalars().all()
+        sids = conn.execute(
+            text("SELECT twilio_sid FROM messages WHERE practice_id = :id LIMIT :n"),
+            {"id": practice_id, "n": len(individual_ids)}
+        ).scalars().all()
+        conn.rollback()
+
+        print(f"🏁 {len(individual_ids)} samples, page size {args.page_size}")
+
+        # Before: drop the indexes inside a transaction and roll back afterwards
+        transaction = conn.begin()
+        for index_name in MESSAGE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        report("before (no message indexes)", *measure(conn, practice_id, individual_ids, sids, args.page_size, args.pages))
+        transaction.rollback()
+
+        report("after (with message indexes)", *measure(conn, practice_id, individual_ids, sids, args.page_size, args.pages))
+        conn.rollback()
+
+    if args.cleanup:
+        cleanup_fixture()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Worker DB throughput benchmark for AgentBooks
+
+Compares tasks per second for worker-style tasks that each run a few queries and
+wait on simulated upstream I/O, using:
+  - the sync path: get_sync_session() in a thread pool (one blocking task per thread)
+  - the async runtime: coroutines on the worker event loop sharing the asyncpg pool
+
+Usage:
+    python benchmarks/worker_db_throughput.py --tasks 500 --concurrency 8 --io-ms 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, func, text
+
+from config.database import get_sync_session
+from db.models import Document, Message
+
+
+def sync_task(io_seconds: float) -> int:
+    """One sync task: two queries around a blocking upstream call."""
+    db = get_sync_session()
+    try:
+        count = db.execute(select(func.count(Document.id))).scalar_one()
+        time.sleep(io_seconds)  # e.g. an OCR or LLM HTTP call
+        db.execute(select(Message.id).order_by(Message.created_at.desc()).limit(1)).first()
+        db.execute(text("SELECT 1"))
+        return count
+    finally:
+        db.close()
+
+
+async def async_task(io_seconds: float) -> int:
+    """The same task on the async runtime."""
+    from workers.async_runtime import get_async_session
+    async with get_async_session() as db:
+        count = (await db.execute(select(func.count(Document.id)))).scalar_one()
+        await asyncio.sleep(io_seconds)
+        (await db.execute(select(Message.id).order_by(Message.created_at.desc()).limit(1))).first()
+        await db.execute(text("SELECT 1"))
+        return count
+
+
+def run_sync(tasks: int, concurrency: int, io_seconds: float) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: sync_task(io_seconds), range(tasks)))
+    return tasks / (time.perf_counter() - start)
+
+
+def run_async_runtime(tasks: int, concurrency: int, io_seconds: float) -> float:
+    from workers.async_runtime import run_async
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded():
+            async with semaphore:
+                return await async_task(io_seconds)
+
+        await asyncio.gather(*(bounded() for _ in range(tasks)))
+
+    start = time.perf_counter()
+    run_async(run_all())
+    return tasks / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8, help="Worker concurrency (threads / in-flight coroutines)")
+    parser.add_argument("--io-ms", type=float, default=50.0, help="Simulated upstream latency per task")
+    args = parser.parse_args()
+
+    # Size the async runtime pool as a threads-pool worker with this concurrency would
+    os.environ["CELERY_POOL"] = "threads"
+    os.environ["CELERY_CONCURRENCY"] = str(args.concurrency)
+    io_seconds = args.io_ms / 1000
+
+    print(f"🏁 {args.tasks} tasks, concurrency {args.concurrency}, {args.io_ms:.0f}ms simulated I/O per task")
+    sync_tps = run_sync(args.tasks, args.concurrency, io_seconds)
+    print(f"  sync  (get_sync_session + threads): {sync_tps:8.1f} tasks/s")
+    async_tps = run_async_runtime(args.tasks, args.concurrency, io_seconds)
+    print(f"  async (worker event loop + asyncpg): {async_tps:8.1f} tasks/s")
+    print(f"  speed-up: {async_tps / sync_tps:.2f}x")
@@ -2,18 +2,65 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import NullPool
+from uuid import uuid4
 from config.settings import settings
 
 # Convert database URL to async format
 async_database_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
 
+def _pool_options(**overrides) -> dict:
+    """
+    Connection pool options from settings.
+    
+    In PgBouncer mode PgBouncer does the pooling, so connections are not pooled
+    client-side and pool sizing options don't apply.
+    """
+    if settings.db_pgbouncer_mode:
+        return {"poolclass": NullPool}
+    
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    options.update(overrides)
+    return options
+
+def _asyncpg_connect_args() -> dict:
+    """asyncpg connection arguments, with prepared statement caching off in PgBouncer mode."""
+    if settings.db_pgbouncer_mode:
+        # Transaction pooling may hand each transaction a different server connection,
+        # so prepared statements must neither be cached nor reuse asyncpg's numbered names
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+
+def create_async_db_engine(**pool_options):
+    """
+    Create an async (asyncpg) engine for the application database.
+    
+    Used for the API engine below and for the per-process engines of the Celery
+    async runtime (workers/async_runtime.py), which pass pool sizes tuned to
+    worker concurrency.
+    """
+    return create_async_engine(
+        async_database_url,
+        connect_args=_asyncpg_connect_args(),
+        echo=False,
+        **_pool_options(**pool_options)
+    )
+
 # Async database engine
-engine = create_async_engine(
-    async_database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False
-)
+engine = create_async_db_engine()
 
 # Async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -25,9 +72,8 @@ AsyncSessionLocal = async_sessionmaker(
 # Sync database engine for Celery tasks
 sync_engine = create_engine(
     settings.database_url.replace("postgresql://", "postgresql+psycopg2://"),
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False
+    echo=False,
+    **_pool_options()
 )
 
 # Sync session factory for Celery tasks
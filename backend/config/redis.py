@@ -0,0 +1,27 @@
+"""Shared Redis clients for API processes (asyncio) and Celery workers (sync)."""
+
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from config.settings import settings
+
+_async_redis: Optional[aioredis.Redis] = None
+_sync_redis: Optional[redis.Redis] = None
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Process-wide asyncio Redis client (decoded responses)."""
+    global _async_redis
+    if _async_redis is None:
+        _async_redis = aioredis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return _async_redis
+
+
+def get_sync_redis() -> redis.Redis:
+    """Process-wide blocking Redis client (decoded responses)."""
+    global _sync_redis
+    if _sync_redis is None:
+        _sync_redis = redis.Redis.from_url(settings.redis_url, decode_responses=True, socket_timeout=2)
+    return _sync_redis
@@ -0,0 +1,112 @@
+"""
+Per-practice dashboard aggregates, kept in the practice_dashboard_summary materialised view.
+
+The view holds one row per (practice, metric, bucket), for example
+('customers_by_status', 'active') with a count, or ('income_by_type', 'rental') with a
+count and total. GET /dashboard/summary reads a practice's rows (a few dozen) through the
+unique index, however many customers, clients and incomes the practice has.
+
+The `refresh_dashboard_summary` periodic task recomputes the view every
+DASHBOARD_SUMMARY_REFRESH_SECONDS with REFRESH MATERIALIZED VIEW CONCURRENTLY, so reads
+are never blocked and figures lag writes by at most that interval. To refresh by hand:
+
+    python -m db.dashboard_summary refresh
+"""
+
+import argparse
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+DASHBOARD_SUMMARY_VIEW = "practice_dashboard_summary"
+
+# Metrics (the `metric` column) and what their buckets are
+CUSTOMERS_BY_STATUS = "customers_by_status"            # CustomerStatus name
+CLIENTS_BY_BUSINESS_TYPE = "clients_by_business_type"  # BusinessType name
+INCOME_BY_TYPE = "income_by_type"                      # IncomeType name, with total_amount
+RENTAL_INCOME = "rental_income"                        # 'annual': rental properties and Property.annual_rental_income total
+OVERDUE_FILINGS = "overdue_filings"                    # 'accounts', 'confirmation_statement' or 'any'
+
+# The same checks as CompaniesHouseProfile.is_filing_overdue
+DASHBOARD_SUMMARY_SELECT = """
+WITH companies_house AS (
+    SELECT c.practice_id,
+           coalesce((p.companies_house_data #>> '{accounts,next_accounts,overdue}')::boolean, false) AS accounts_overdue,
+           coalesce((p.companies_house_data #>> '{confirmation_statement,overdue}')::boolean, false) AS confirmation_overdue
+    FROM companies_house_profiles p
+    JOIN clients c ON c.id = p.client_id
+),
+rental_properties AS (
+    -- A property owned by several individuals of the practice is counted once
+    SELECT DISTINCT i.practice_id, p.id, p.annual_rental_income
+    FROM properties p
+    JOIN property_individual_relationships r ON r.property_id = p.id
+    JOIN individuals i ON i.id = r.individual_id
+    WHERE p.is_rental_property OR p.annual_rental_income IS NOT NULL
+),
+summary AS (
+    SELECT practice_id, 'customers_by_status' AS metric, status::text AS bucket,
+           count(*) AS item_count, NULL::numeric AS total_amount
+    FROM customers GROUP BY practice_id, status
+    UNION ALL
+    SELECT practice_id, 'clients_by_business_type', business_type::text, count(*), NULL
+    FROM clients GROUP BY practice_id, business_type
+    UNION ALL
+    SELECT i.practice_id, 'income_by_type', inc.income_type::text, count(*), sum(inc.income_amount)
+    FROM incomes inc JOIN individuals i ON i.id = inc.individual_id
+    GROUP BY i.practice_id, inc.income_type
+    UNION ALL
+    SELECT practice_id, 'rental_income', 'annual', count(*), coalesce(sum(annual_rental_income), 0)
+    FROM rental_properties GROUP BY practice_id
+    UNION ALL
+    SELECT practice_id, 'overdue_filings', 'accounts', count(*) FILTER (WHERE accounts_overdue), NULL
+    FROM companies_house GROUP BY practice_id
+    UNION ALL
+    SELECT practice_id, 'overdue_filings', 'confirmation_statement', count(*) FILTER (WHERE confirmation_overdue), NULL
+    FROM companies_house GROUP BY practice_id
+    UNION ALL
+    SELECT practice_id, 'overdue_filings', 'any', count(*) FILTER (WHERE accounts_overdue OR confirmation_overdue), NULL
+    FROM companies_house GROUP BY practice_id
+)
+SELECT practice_id, metric, bucket, item_count, total_amount, now() AS refreshed_at FROM summary
+"""
+
+
+def create_dashboard_summary_view(conn: Connection) -> None:
+    """Create and populate the view and its unique index if they do not exist (create_all databases)."""
+    conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {DASHBOARD_SUMMARY_VIEW} AS {DASHBOARD_SUMMARY_SELECT}"))
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{DASHBOARD_SUMMARY_VIEW}_practice_metric_bucket "
+        f"ON {DASHBOARD_SUMMARY_VIEW} (practice_id, metric, bucket)"
+    ))
+
+
+def refresh_dashboard_summary(conn: Connection) -> Optional[datetime]:
+    """
+    Recompute the view. Concurrent refreshes (which need the unique index and a populated
+    view) let dashboard reads continue meanwhile; the first refresh of a view created
+    WITH NO DATA is a plain one. Returns the new refreshed_at, or None if the view is empty.
+    """
+    populated = conn.execute(
+        text("SELECT relispopulated FROM pg_class WHERE oid = to_regclass(:view)"),
+        {"view": DASHBOARD_SUMMARY_VIEW}
+    ).scalar()
+    if populated is None:
+        raise RuntimeError(f"{DASHBOARD_SUMMARY_VIEW} does not exist, run `alembic upgrade head`")
+    concurrently = "CONCURRENTLY " if populated else ""
+    conn.execute(text(f"REFRESH MATERIALIZED VIEW {concurrently}{DASHBOARD_SUMMARY_VIEW}"))
+    return conn.execute(text(f"SELECT max(refreshed_at) FROM {DASHBOARD_SUMMARY_VIEW}")).scalar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Practice dashboard summary view")
+    parser.add_argument("command", choices=["refresh"])
+    args = parser.parse_args()
+
+    from config.database import sync_engine
+
+    with sync_engine.begin() as conn:
+        refreshed_at = refresh_dashboard_summary(conn)
+    print(f"✅ {DASHBOARD_SUMMARY_VIEW} refreshed at {refreshed_at}")
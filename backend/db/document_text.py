@@ -0,0 +1,110 @@
+"""
+Extracted document text, stored per page in the document_text table.
+
+Each page's text (and layout, when the extractor provides one) is compressed with zstd
+before it is written, so the bytea values PostgreSQL keeps out of line in TOAST are
+already small. The columns use STORAGE EXTERNAL so PostgreSQL does not try to compress
+them again.
+
+Workers write and read with the sync helpers here. The API streams pages with
+page_payload (GET /documents/{id}/text).
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+import zstandard
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from db.models.document_text import DocumentTextPage
+
+ZSTD_LEVEL = 9
+
+# How pages were joined in documents.raw_extracted_text, and still are in join_pages
+PAGE_MARKER = re.compile(r"\n--- Page (\d+) ---\n")
+
+
+def compress_text(value: str) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(value.encode("utf-8"))
+
+
+def decompress_text(value: bytes) -> str:
+    return zstandard.ZstdDecompressor().decompress(value).decode("utf-8")
+
+
+def compress_layout(layout: Any) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(orjson.dumps(layout))
+
+
+def decompress_layout(value: Optional[bytes]) -> Any:
+    if value is None:
+        return None
+    return orjson.loads(zstandard.ZstdDecompressor().decompress(value))
+
+
+def join_pages(pages: Sequence[str]) -> str:
+    """The whole text, one `--- Page N ---` header per page (what the agents are given)."""
+    if len(pages) == 1:
+        return pages[0]
+    return "".join(f"\n--- Page {number} ---\n{page}" for number, page in enumerate(pages, start=1))
+
+
+def split_pages(text: str) -> List[str]:
+    """Inverse of join_pages, for text stored before pages were kept separately."""
+    parts = PAGE_MARKER.split(text)
+    if len(parts) == 1:
+        return [text]
+    # parts: [preamble, "1", page 1, "2", page 2, ...]
+    return parts[2::2]
+
+
+def page_payload(page: DocumentTextPage, include_layout: bool = False) -> Dict[str, Any]:
+    """A page as returned by the API."""
+    payload = {
+        "page": page.page_number,
+        "char_count": page.char_count,
+        "text": decompress_text(page.text_zstd),
+    }
+    if include_layout:
+        payload["layout"] = decompress_layout(page.layout_zstd)
+    return payload
+
+
+def save_document_text(
+    db: Session,
+    document,
+    pages: Sequence[str],
+    layouts: Optional[Sequence[Any]] = None,
+    extraction_method: Optional[str] = None
+) -> None:
+    """Replace a document's pages and update its text summary columns (not committed)."""
+    db.execute(delete(DocumentTextPage).where(DocumentTextPage.document_id == document.id))
+    for index, page_text in enumerate(pages):
+        layout = layouts[index] if layouts and index < len(layouts) else None
+        db.add(DocumentTextPage(
+            document_id=document.id,
+            page_number=index + 1,
+            text_zstd=compress_text(page_text),
+            layout_zstd=compress_layout(layout) if layout is not None else None,
+            char_count=len(page_text),
+            extraction_method=extraction_method
+        ))
+    document.extracted_text_length = sum(len(page_text) for page_text in pages)
+    document.extracted_page_count = len(pages)
+
+
+def load_document_pages(db: Session, document_id) -> List[str]:
+    """A document's page texts in page order (empty if it has none)."""
+    rows = db.execute(
+        select(DocumentTextPage.text_zstd)
+        .where(DocumentTextPage.document_id == document_id)
+        .order_by(DocumentTextPage.page_number)
+    ).scalars()
+    return [decompress_text(value) for value in rows]
+
+
+def load_document_text(db: Session, document_id) -> str:
+    """A document's whole text, as join_pages formats it."""
+    return join_pages(load_document_pages(db, document_id))
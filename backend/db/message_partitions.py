@@ -0,0 +1,204 @@
+"""
+Optional monthly range partitioning of the messages table by created_at.
+
+Partitioning is opt-in for deployments with very large message volumes. Convert an
+existing database once (it rewrites the table, so run it in a maintenance window):
+
+    python -m db.message_partitions convert
+
+After conversion the `ensure_message_partitions` periodic task keeps partitions created
+a few months ahead. It does nothing on databases that were not converted.
+
+Postgres requires the partition key in every unique constraint, so the primary key of a
+partitioned messages table is (id, created_at). Foreign keys *to* messages therefore
+reference (id, created_at) on every database, converted or not: documents carry
+message_created_at next to message_id (documents_message_fkey, backed by the unique
+ix_messages_id_created_at index). The conversion keeps those foreign keys, re-pointing
+them at the partitioned table, and refuses to run while one references id alone. The
+ORM still identifies messages by id alone.
+"""
+
+import argparse
+from datetime import date, datetime, timezone
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+MESSAGES_TABLE = "messages"
+DEFAULT_PARTITION = "messages_default"
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + 1, 1, 1) if value.month == 12 else date(value.year, value.month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding messages created in `month`, e.g. messages_y2025m01."""
+    return f"{MESSAGES_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def is_messages_partitioned(conn: Connection) -> bool:
+    """Return True if the messages table has been converted to a partitioned table."""
+    return bool(conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": MESSAGES_TABLE}
+    ).scalar())
+
+
+def create_month_partition(conn: Connection, month: date) -> str:
+    """Create the partition for one calendar month (UTC) if it does not exist yet."""
+    start = _month_start(month)
+    end = _next_month(start)
+    name = partition_name(start)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {MESSAGES_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+    ))
+    return name
+
+
+def ensure_message_partitions(conn: Connection, months_ahead: int = 3) -> List[str]:
+    """Create partitions for the current month and the next `months_ahead` months."""
+    month = _month_start(datetime.now(timezone.utc).date())
+    names = []
+    for _ in range(months_ahead + 1):
+        names.append(create_month_partition(conn, month))
+        month = _next_month(month)
+    return names
+
+
+def message_partitions(conn: Connection) -> List[str]:
+    """Names of the partitions of a partitioned messages table."""
+    return list(conn.execute(text(
+        "SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass(:table) ORDER BY 1"
+    ), {"table": MESSAGES_TABLE}).scalars())
+
+
+def create_partitioned_index(conn: Connection, name: str, columns: str, unique: bool = False) -> None:
+    """
+    Create index `name` on a partitioned messages table without blocking writes.
+
+    CREATE INDEX CONCURRENTLY is not supported on partitioned tables, so the index is
+    created invalid on the parent only, built concurrently on each partition and attached;
+    the parent index becomes valid once every partition is attached. Run it outside a
+    transaction (e.g. in an Alembic autocommit_block). `columns` is the SQL column list.
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON ONLY {MESSAGES_TABLE} ({columns})"))
+    for partition in message_partitions(conn):
+        partition_index = name.replace(MESSAGES_TABLE, partition, 1)
+        conn.execute(text(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} ({columns})"))
+        attached = conn.execute(text(
+            "SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:child) AND inhparent = to_regclass(:parent)"
+        ), {"child": partition_index, "parent": name}).scalar()
+        if not attached:
+            conn.execute(text(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"))
+
+
+def drop_partitioned_index(conn: Connection, name: str) -> None:
+    """Drop an index of a partitioned messages table, with its partition indexes."""
+    # DROP INDEX CONCURRENTLY is not supported on partitioned indexes either
+    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def convert_messages_to_partitioned(conn: Connection, months_ahead: int = 3) -> List[str]:
+    """
+    Rebuild messages as a table range-partitioned by month on created_at.
+
+    Runs in the caller's transaction: the old table is renamed, a partitioned copy with
+    the same columns, foreign keys and indexes is created, partitions covering every
+    existing row (plus `months_ahead`) are added, rows are copied, the old table dropped
+    and the foreign keys referencing messages re-created against the new table.
+    """
+    if is_messages_partitioned(conn):
+        return []
+
+    # Foreign keys referencing messages are dropped for the rebuild and added back at the end;
+    # only those that include created_at can reference the partitioned table
+    referencing = conn.execute(text(
+        "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid), "
+        "EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = confrelid AND attnum = ANY (confkey) "
+        "AND attname = 'created_at') FROM pg_constraint "
+        "WHERE contype = 'f' AND confrelid = to_regclass(:table)"
+    ), {"table": MESSAGES_TABLE}).all()
+    by_id_alone = [f"{table_name}.{constraint_name}" for table_name, constraint_name, _, keyed in referencing if not keyed]
+    if by_id_alone:
+        raise RuntimeError(
+            f"Foreign keys reference {MESSAGES_TABLE} without created_at: {', '.join(by_id_alone)}. "
+            "Run the database migrations before converting."
+        )
+    for table_name, constraint_name, _, _ in referencing:
+        conn.execute(text(f'ALTER TABLE {table_name} DROP CONSTRAINT "{constraint_name}"'))
+
+    # Recreate the table's own foreign keys on the partitioned table
+    foreign_keys = conn.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE contype = 'f' AND conrelid = to_regclass(:table)"
+    ), {"table": MESSAGES_TABLE}).all()
+    indexes = conn.execute(text(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = :table AND indexname <> :pkey"
+    ), {"table": MESSAGES_TABLE, "pkey": f"{MESSAGES_TABLE}_pkey"}).all()
+
+    legacy = f"{MESSAGES_TABLE}_unpartitioned"
+    conn.execute(text(f"ALTER TABLE {MESSAGES_TABLE} RENAME TO {legacy}"))
+    conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {MESSAGES_TABLE}_pkey TO {legacy}_pkey"))
+    for constraint_name, _ in foreign_keys:
+        conn.execute(text(f'ALTER TABLE {legacy} RENAME CONSTRAINT "{constraint_name}" TO "{constraint_name}_unpartitioned"'))
+    for index_name, _ in indexes:
+        conn.execute(text(f"ALTER INDEX {index_name} RENAME TO {index_name}_unpartitioned"))
+
+    conn.execute(text(
+        f"CREATE TABLE {MESSAGES_TABLE} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE (created_at)"
+    ))
+    conn.execute(text(f"ALTER TABLE {MESSAGES_TABLE} ADD CONSTRAINT {MESSAGES_TABLE}_pkey PRIMARY KEY (id, created_at)"))
+    for constraint_name, definition in foreign_keys:
+        conn.execute(text(f'ALTER TABLE {MESSAGES_TABLE} ADD CONSTRAINT "{constraint_name}" {definition}'))
+    for _, index_definition in indexes:
+        # Definitions were read before the rename, so they target the new table; indexes
+        # on the parent are created on every partition
+        conn.execute(text(index_definition))
+
+    oldest = conn.execute(text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+    names = []
+    if oldest is not None:
+        month = _month_start(oldest.astimezone(timezone.utc).date())
+        current = _month_start(datetime.now(timezone.utc).date())
+        while month < current:
+            names.append(create_month_partition(conn, month))
+            month = _next_month(month)
+    names.extend(ensure_message_partitions(conn, months_ahead))
+    # Catches rows outside the monthly ranges (e.g. clock skew) instead of failing inserts
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {MESSAGES_TABLE} DEFAULT"))
+
+    conn.execute(text(f"INSERT INTO {MESSAGES_TABLE} SELECT * FROM {legacy}"))
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    # The definitions name the messages table, which is now the partitioned one
+    for table_name, constraint_name, definition, _ in referencing:
+        conn.execute(text(f'ALTER TABLE {table_name} ADD CONSTRAINT "{constraint_name}" {definition}'))
+    return names
+
+
+if __name__ == "__main__":
+    from config.database import sync_engine
+
+    parser = argparse.ArgumentParser(description="Monthly partitioning of the messages table")
+    parser.add_argument("action", choices=["convert", "ensure"], help="convert the table, or create upcoming partitions")
+    parser.add_argument("--months-ahead", type=int, default=3)
+    args = parser.parse_args()
+
+    with sync_engine.begin() as conn:
+        if args.action == "convert":
+            created = convert_messages_to_partitioned(conn, args.months_ahead)
+            print(f"✅ messages partitioned ({len(created)} monthly partitions)" if created else "ℹ️ messages is already partitioned")
+        elif not is_messages_partitioned(conn):
+            print("ℹ️ messages is not partitioned, nothing to do")
+        else:
+            created = ensure_message_partitions(conn, args.months_ahead)
+            print(f"✅ Partitions up to date: {', '.join(created)}")
@@ -9,7 +9,10 @@ from .customer_client_association import CustomerClientAssociation, Relationship
 from .service import Service
 from .client_service import ClientService
 from .message import Message, MessageType, MessageDirection, MessageStatus, MessageSender
+from .message_broadcast import MessageBroadcast, BroadcastStatus
 from .documents import Document, DocumentType, DocumentSource, DocumentAgentState
+from .document_text import DocumentTextPage
+from .stored_file import StoredFile
 from .individuals import Individual, Gender, MaritalStatus
 from .income import Income, IncomeType
 from .property import Property, PropertyType, PropertyStatus
@@ -47,10 +50,14 @@ __all__ = [
     'MessageDirection',
     'MessageStatus',
     'MessageSender',
+    'MessageBroadcast',
+    'BroadcastStatus',
     'Document',
     'DocumentType',
     'DocumentSource',
     'DocumentAgentState',
+    'DocumentTextPage',
+    'StoredFile',
     'Individual',
     'Gender',
     'MaritalStatus',
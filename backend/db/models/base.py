@@ -1,4 +1,15 @@
+from sqlalchemy import func
+
 from config.database import Base
 
+
+def name_search_key(column):
+    """
+    lower(column) COLLATE "C": the expression the typeahead name indexes are built on.
+    Under the C collation a btree index serves both `LIKE 'prefix%'` and ORDER BY.
+    """
+    return func.lower(column).collate("C")
+
+
 # Re-export Base for other models to use
-__all__ = ['Base'] 
\ No newline at end of file
+__all__ = ['Base', 'name_search_key']
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, DateTime, Date, Integer, Text, Boolean, Numeric
+from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, DateTime, Date, Integer, Text, Boolean, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 import uuid
 
-from .base import Base
+from .base import Base, name_search_key
 
 # Enum for business type
 class BusinessType(str, enum.Enum):
@@ -270,6 +270,11 @@ class Client(Base):
     invoices = relationship("Invoice", back_populates="client")
     chart_of_accounts = relationship("ChartOfAccount", back_populates="client", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Client typeahead: name prefix search and keyset pages in name order within a practice
+        Index('ix_clients_practice_id_business_name_key', practice_id, name_search_key(business_name), id),
+    )
+    
     def __repr__(self):
         return f"<Client(id={self.id}, business_name='{self.business_name}', client_code='{self.client_code}')>"
     
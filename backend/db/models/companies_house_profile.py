@@ -1,7 +1,9 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Index
+from sqlalchemy import Column, String, ForeignKey, DateTime, Date, Boolean, Text, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
+from datetime import date, datetime
+from typing import Optional
 import uuid
 
 from .base import Base
@@ -27,6 +29,13 @@ class CompaniesHouseProfile(Base):
     # Complete Companies House API response
     companies_house_data = Column(JSONB, nullable=False, comment="Complete Companies House API response")
     
+    # Filing deadlines copied out of companies_house_data (set whenever it is assigned) so
+    # deadline queries can use indexes instead of reading every profile's JSON
+    next_accounts_due = Column(Date, index=True)
+    next_confirmation_due = Column(Date, index=True)
+    accounts_overdue = Column(Boolean, nullable=False, default=False, server_default="false")
+    confirmation_overdue = Column(Boolean, nullable=False, default=False, server_default="false")
+    
     # Sync tracking
     last_synced = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     sync_status = Column(String, default="success")  # success, error, partial
@@ -39,7 +48,27 @@ class CompaniesHouseProfile(Base):
     # Relationships
     client = relationship("Client", back_populates="companies_house_profile", uselist=False)
     
-
+    __table_args__ = (
+        # Clients with an overdue filing, flagged by Companies House at the last sync
+        Index(
+            'ix_companies_house_profiles_filing_overdue', 'client_id',
+            postgresql_where=(accounts_overdue | confirmation_overdue)
+        ),
+    )
+    
+    @validates("companies_house_data")
+    def _sync_filing_deadlines(self, key, data):
+        """Keep the deadline columns in step with the JSON they are copied from."""
+        data = data or {}
+        accounts = data.get("accounts") or {}
+        next_accounts = accounts.get("next_accounts") or {}
+        confirmation = data.get("confirmation_statement") or {}
+        
+        self.next_accounts_due = _parse_date(next_accounts.get("due_on") or accounts.get("next_due"))
+        self.next_confirmation_due = _parse_date(confirmation.get("next_due"))
+        self.accounts_overdue = bool(next_accounts.get("overdue", False))
+        self.confirmation_overdue = bool(confirmation.get("overdue", False))
+        return data
     
     def __repr__(self):
         return f"<CompaniesHouseProfile(company_number='{self.company_number}', company_name='{self.company_name}')>"
@@ -54,14 +83,7 @@ class CompaniesHouseProfile(Base):
     @property
     def is_filing_overdue(self) -> bool:
         """Check if any filings are overdue."""
-        data = self.companies_house_data or {}
-        accounts = data.get("accounts", {})
-        confirmation = data.get("confirmation_statement", {})
-        
-        accounts_overdue = accounts.get("next_accounts", {}).get("overdue", False)
-        confirmation_overdue = confirmation.get("overdue", False)
-        
-        return accounts_overdue or confirmation_overdue
+        return bool(self.accounts_overdue or self.confirmation_overdue)
     
     @property
     def registered_office_address(self) -> dict:
@@ -114,11 +136,28 @@ class CompaniesHouseProfile(Base):
         """
         Check if this profile is properly linked to its client.
         
-        Verifies that the client's companies_house_number matches this profile's company_number.
+        Verifies that the client's company_number matches this profile's company_number.
         """
         if not self.client:
             return False
-        return self.client.companies_house_number == self.company_number
+        return self.client.company_number == self.company_number
+    
+    @staticmethod
+    def linking_status(client_number, profile_number) -> dict:
+        """Linking status for a client's and a profile's company numbers."""
+        if client_number == profile_number:
+            return {
+                "status": "linked",
+                "message": "Client and profile company numbers match",
+                "client_company_number": client_number,
+                "profile_company_number": profile_number
+            }
+        return {
+            "status": "mismatch",
+            "message": f"Company numbers don't match: Client='{client_number}', Profile='{profile_number}'",
+            "client_company_number": client_number,
+            "profile_company_number": profile_number
+        }
     
     def get_linking_status(self) -> dict:
         """
@@ -135,20 +174,14 @@ class CompaniesHouseProfile(Base):
                 "profile_company_number": self.company_number
             }
         
-        client_number = self.client.companies_house_number
-        profile_number = self.company_number
-        
-        if client_number == profile_number:
-            return {
-                "status": "linked",
-                "message": "Client and profile company numbers match",
-                "client_company_number": client_number,
-                "profile_company_number": profile_number
-            }
-        else:
-            return {
-                "status": "mismatch",
-                "message": f"Company numbers don't match: Client='{client_number}', Profile='{profile_number}'",
-                "client_company_number": client_number,
-                "profile_company_number": profile_number
-            } 
\ No newline at end of file
+        return self.linking_status(self.client.company_number, self.company_number)
+
+
+def _parse_date(value) -> Optional[date]:
+    """A Companies House YYYY-MM-DD date, or None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
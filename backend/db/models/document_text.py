@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, LargeBinary, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from .base import Base
+
+class DocumentTextPage(Base):
+    """
+    Extracted text of one page of a document, zstd-compressed (see db/document_text.py).
+
+    Kept out of `documents` so that loading documents never touches OCR text; read it
+    through GET /documents/{id}/text or db.document_text.load_document_text.
+    """
+    __tablename__ = "document_text"
+
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    page_number = Column(Integer, primary_key=True)  # 1-based
+
+    text_zstd = Column(LargeBinary, nullable=False)
+    layout_zstd = Column(LargeBinary, nullable=True)  # JSON text blocks with bounding boxes, when the extractor has them
+    char_count = Column(Integer, nullable=False)
+    extraction_method = Column(String)  # e.g. embedded_text_extraction, mistral_ocr_scanned_pdf
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    document = relationship("Document", back_populates="text_pages")
+
+    def __repr__(self):
+        return f"<DocumentTextPage(document_id={self.document_id}, page={self.page_number}, chars={self.char_count})>"
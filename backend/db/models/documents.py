@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, JSON, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, ForeignKey, ForeignKeyConstraint, Text, Enum, Index, Integer, Float, Boolean, func, literal_column
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship, deferred
 import uuid
 import enum
 
@@ -32,6 +32,15 @@ class DocumentAgentState(str, enum.Enum):
     rejected = "rejected"  # When individual is not a customer
     awaiting_client_selection = "awaiting_client_selection"  # When waiting for client selection via WhatsApp
 
+def financial_document_type(agent_metadata):
+    """
+    agent_metadata #>> '{financial_document_processing,document_type}' ('invoice', 'receipt', ...).
+    The path is a literal, not a bound parameter, so queries match the expression index.
+    """
+    return agent_metadata.op("#>>", return_type=Text)(
+        literal_column("'{financial_document_processing,document_type}'")
+    )
+
 class Document(Base):
     __tablename__ = "documents"
 
@@ -40,7 +49,10 @@ class Document(Base):
     individual_id = Column(UUID(as_uuid=True), ForeignKey("individuals.id"), nullable=True)  # Optional, for documents from individuals
     customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=True)  # Optional, for customer-specific documents
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True)  # Optional, for client-specific documents
-    message_id = Column(UUID(as_uuid=True), ForeignKey("messages.id"), nullable=True)  # Optional, for documents from messages
+    # Optional, for documents from messages. Messages are referenced by (id, created_at), the
+    # key a partitioned messages table can be referenced by (see db/message_partitions.py)
+    message_id = Column(UUID(as_uuid=True), nullable=True)
+    message_created_at = Column(DateTime(timezone=True), nullable=True)
     
     # User associations
     uploaded_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
@@ -50,7 +62,11 @@ class Document(Base):
     # Document metadata
     filename = Column(String, nullable=False)
     original_filename = Column(String)
-    document_url = Column(String, nullable=False)  # Could be local path or cloud storage URL
+    document_url = Column(String, nullable=False)  # Storage URL of the file; a local path for documents saved before content_sha256
+    content_sha256 = Column(String(64), ForeignKey("stored_files.sha256"), index=True)  # File in document storage
+    # JPEG thumbnail and first-page preview in document storage, made by the OCR worker
+    thumbnail_sha256 = Column(String(64), ForeignKey("stored_files.sha256"), index=True)
+    preview_sha256 = Column(String(64), ForeignKey("stored_files.sha256"), index=True)
     file_size = Column(String)  # Store as string to handle large sizes
     mime_type = Column(String)
     
@@ -62,15 +78,29 @@ class Document(Base):
     # Document details
     title = Column(String)
     description = Column(Text)
-    tags = Column(JSON)  # Array of strings
+    tags = Column(JSONB)  # Array of strings
     
-    # OCR and processing
-    raw_extracted_text = Column(Text, nullable=True)  # Raw OCR extracted text
+    # OCR and processing. The text itself is in document_text (DocumentTextPage); the JSON
+    # blobs are deferred: loading a Document reads them only when accessed, or up front
+    # with undefer_group("agent_blobs")
+    extracted_text_length = Column(Integer)  # Characters of extracted text, all pages
+    extracted_page_count = Column(Integer)  # Rows in document_text
     
     # Processing state
     agent_state = Column(Enum(DocumentAgentState), default=DocumentAgentState.pending)
-    agent_metadata = Column(JSON)  # Store agent processing results
-    upload_source_details = Column(JSON)
+    agent_metadata = deferred(Column(JSONB), group="agent_blobs")  # Store agent processing results
+    upload_source_details = deferred(Column(JSONB), group="agent_blobs")
+    
+    # Processing summary for list views, set alongside agent_metadata
+    agent_processing_started_at = Column(DateTime(timezone=True))
+    agent_confidence_score = Column(Float)  # Classification confidence, 0.0-1.0
+    agent_processing_notes = Column(Text)  # Short note, e.g. the last processing error
+    
+    # Review
+    is_validated = Column(Boolean, nullable=False, default=False, server_default="false")
+    validated_at = Column(DateTime(timezone=True))
+    is_archived = Column(Boolean, nullable=False, default=False, server_default="false")
+    archived_at = Column(DateTime(timezone=True))
     
     # System fields
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -83,12 +113,40 @@ class Document(Base):
     customer = relationship("Customer", back_populates="documents")
     client = relationship("Client", back_populates="documents")
     message = relationship("Message", back_populates="documents")
+    stored_file = relationship("StoredFile", foreign_keys=[content_sha256], back_populates="documents")
     
     # User relationships
     uploaded_by = relationship("User", foreign_keys=[uploaded_by_user_id], back_populates="uploaded_documents")
     validated_by = relationship("User", foreign_keys=[validated_by_user_id], back_populates="validated_documents")
     archived_by = relationship("User", foreign_keys=[archived_by_user_id], back_populates="archived_documents")
     invoice = relationship("Invoice", back_populates="document", uselist=False)
+    # Never loaded implicitly; read pages with db.document_text helpers or the text endpoint
+    text_pages = relationship(
+        "DocumentTextPage", back_populates="document", order_by="DocumentTextPage.page_number",
+        passive_deletes=True, lazy="raise"
+    )
     
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [message_id, message_created_at], ["messages.id", "messages.created_at"],
+            name="documents_message_fkey", match="FULL"
+        ),
+    )
+
     def __repr__(self):
-        return f"<Document(id={self.id}, filename='{self.filename}', type={self.document_type})>" 
\ No newline at end of file
+        return f"<Document(id={self.id}, filename='{self.filename}', type={self.document_type})>"
+
+
+# Declared after the class because deferred() attributes are not Columns inside the class body
+# GET /documents?tag=: tags @> '["whatsapp"]'
+Index('ix_documents_tags', Document.tags, postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'})
+# GET /documents?metadata=: agent_metadata @> '{...}'
+Index(
+    'ix_documents_agent_metadata', Document.agent_metadata,
+    postgresql_using='gin', postgresql_ops={'agent_metadata': 'jsonb_path_ops'}
+)
+# GET /documents?financial_document_type=
+Index(
+    'ix_documents_practice_id_financial_document_type',
+    Document.practice_id, financial_document_type(Document.agent_metadata.expression)
+) 
\ No newline at end of file
@@ -1,11 +1,12 @@
-from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, DateTime, Date, Text
+from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, DateTime, Date, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 import enum
 import uuid
 
-from .base import Base
+from .base import Base, name_search_key
+from services.phone_numbers import normalize_phone_number
 
 # Enum for Gender
 class Gender(str, enum.Enum):
@@ -44,6 +45,7 @@ class Individual(Base):
     email = Column(String, index=True)
     secondary_email = Column(String)
     primary_mobile = Column(String)
+    primary_mobile_e164 = Column(String)  # Normalised primary_mobile for webhook sender lookups
     secondary_mobile = Column(String)
     
     # Personal Address
@@ -90,6 +92,21 @@ class Individual(Base):
                                  cascade="all, delete-orphan",
                                  lazy="selectin")
     
+    __table_args__ = (
+        # Resolves WhatsApp senders (see MessageService.resolve_whatsapp_participants)
+        Index('ix_individuals_primary_mobile_e164_practice', 'primary_mobile_e164', 'practice_id'),
+        # Individual typeahead: keyset pages in (last, first) name order and prefix search on
+        # either name within a practice
+        Index('ix_individuals_practice_id_last_name_key', practice_id, name_search_key(last_name), name_search_key(first_name), id),
+        Index('ix_individuals_practice_id_first_name_key', practice_id, name_search_key(first_name)),
+    )
+    
+    @validates('primary_mobile')
+    def _sync_primary_mobile_e164(self, key, value):
+        """Keep primary_mobile_e164 in sync whenever primary_mobile is set."""
+        self.primary_mobile_e164 = normalize_phone_number(value)
+        return value
+    
     def __repr__(self):
         return f"<Individual(id={self.id}, name='{self.first_name} {self.last_name}', email='{self.email}')>"
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text, JSON, func
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text, JSON, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -36,6 +36,7 @@ class Message(Base):
     practice_id = Column(UUID(as_uuid=True), ForeignKey("practices.id"), nullable=False)
     individual_id = Column(UUID(as_uuid=True), ForeignKey("individuals.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)  # The staff member who sent the message
+    broadcast_id = Column(UUID(as_uuid=True), ForeignKey("message_broadcasts.id"), nullable=True)  # Set for bulk broadcast messages
     
     message_type = Column(Enum(MessageType), nullable=False)
     direction = Column(Enum(MessageDirection), nullable=False)
@@ -60,6 +61,18 @@ class Message(Base):
     individual = relationship("Individual", back_populates="messages")
     user = relationship("User", back_populates="messages")
     documents = relationship("Document", back_populates="message")
+    broadcast = relationship("MessageBroadcast", back_populates="messages")
+
+    __table_args__ = (
+        # Conversation pages: WHERE individual_id = ? ORDER BY created_at DESC LIMIT ?
+        Index('ix_messages_individual_id_created_at', individual_id, created_at.desc()),
+        # Twilio status callbacks look messages up by SID
+        Index('ix_messages_twilio_sid', twilio_sid),
+        # Broadcast dispatch (pending rows) and progress counts by status
+        Index('ix_messages_broadcast_id_status', broadcast_id, status),
+        # Referenced by documents: a partitioned messages table has no unique key on id alone
+        Index('ix_messages_id_created_at', id, created_at, unique=True),
+    )
 
     def __repr__(self):
         return f"<Message(id={self.id}, type={self.message_type}, direction={self.direction}, status={self.status}, sender={self.sender})>" 
\ No newline at end of file
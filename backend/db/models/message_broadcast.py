@@ -0,0 +1,42 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Enum, Text, JSON, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+import uuid
+import enum
+
+from .base import Base
+
+class BroadcastStatus(str, enum.Enum):
+    """Status of a bulk WhatsApp broadcast."""
+    queued = "queued"
+    sending = "sending"
+    completed = "completed"
+    cancelled = "cancelled"
+    failed = "failed"  # Dispatch gave up; messages still pending were marked failed
+
+class MessageBroadcast(Base):
+    """A templated WhatsApp message sent to many individuals; one Message row per recipient."""
+    __tablename__ = "message_broadcasts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    practice_id = Column(UUID(as_uuid=True), ForeignKey("practices.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)  # The staff member who started it
+
+    body_template = Column(Text, nullable=False)
+    audience = Column(JSON, nullable=True)  # The recipient filter the broadcast was created with
+    status = Column(Enum(BroadcastStatus), nullable=False, default=BroadcastStatus.queued)
+
+    total_recipients = Column(Integer, nullable=False, default=0)
+    skipped_recipients = Column(Integer, nullable=False, default=0)  # Matched but without a usable mobile number
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    practice = relationship("Practice")
+    user = relationship("User")
+    messages = relationship("Message", back_populates="broadcast")
+
+    def __repr__(self):
+        return f"<MessageBroadcast(id={self.id}, status={self.status}, recipients={self.total_recipients})>"
@@ -1,10 +1,11 @@
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 import uuid
 
 from .base import Base
+from services.phone_numbers import normalize_phone_number
 
 class Practice(Base):
     __tablename__ = "practices"
@@ -14,6 +15,7 @@ class Practice(Base):
     
     # Communication settings - each practice has their own numbers/emails
     whatsapp_number = Column(String)  # Format: whatsapp:+14155238886
+    whatsapp_number_e164 = Column(String, unique=True, index=True)  # Normalised whatsapp_number, one practice per number
     main_phone = Column(String)
     main_email = Column(String)
     
@@ -31,5 +33,11 @@ class Practice(Base):
     documents = relationship("Document", back_populates="practice")
     invoices = relationship("Invoice", back_populates="practice")
     
+    @validates('whatsapp_number')
+    def _sync_whatsapp_number_e164(self, key, value):
+        """Keep whatsapp_number_e164 in sync whenever whatsapp_number is set."""
+        self.whatsapp_number_e164 = normalize_phone_number(value)
+        return value
+    
     def __repr__(self):
         return f"<Practice(id={self.id}, name={self.name})>" 
\ No newline at end of file
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, func
+from sqlalchemy.orm import relationship
+
+from .base import Base
+
+class StoredFile(Base):
+    """
+    A file in document storage, addressed by the SHA-256 of its content (see
+    services/document_storage.py).
+
+    Identical uploads share one stored file; `refcount` is the number of references from
+    documents (as their file, thumbnail or preview). Only `python -m
+    services.document_storage gc` corrects it and removes files no document references.
+    """
+    __tablename__ = "stored_files"
+
+    sha256 = Column(String(64), primary_key=True)  # Hex digest, also the storage key
+    size = Column(BigInteger, nullable=False)
+    mime_type = Column(String)  # As first uploaded
+    refcount = Column(Integer, nullable=False, default=0, server_default="0")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    documents = relationship("Document", foreign_keys="Document.content_sha256", back_populates="stored_file", lazy="raise")
+
+    def __repr__(self):
+        return f"<StoredFile(sha256={self.sha256}, size={self.size}, refcount={self.refcount})>"
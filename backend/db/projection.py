@@ -0,0 +1,52 @@
+"""
+Sparse fieldsets (`?fields=a,b,c`) for list endpoints.
+
+Each endpoint declares the fields it can return as a mapping of field name to column
+expression. The requested names are validated against it and selected as plain columns,
+so unrequested columns (JSON blobs especially) are never read from the database and no
+ORM objects or relationships are loaded.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import inspect
+
+
+def model_fields(model, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Field map of every column attribute of a model, keyed by attribute name."""
+    excluded = set(exclude)
+    return {
+        attr.key: getattr(model, attr.key)
+        for attr in inspect(model).column_attrs
+        if attr.key not in excluded
+    }
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Mapping[str, Any],
+    required: Sequence[str] = ("id",)
+) -> Optional[List[str]]:
+    """
+    Parse a comma-separated `fields` parameter.
+
+    Returns None when no fields were requested, otherwise the requested names (with
+    `required` prepended) in request order. Raises ValueError for unknown names.
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}")
+    return list(dict.fromkeys([*required, *requested]))
+
+
+def projection_columns(names: Sequence[str], allowed: Mapping[str, Any]) -> list:
+    """Labelled column expressions for a SELECT of the given fields."""
+    return [allowed[name].label(name) for name in names]
+
+
+def rows_to_dicts(rows) -> List[Dict[str, Any]]:
+    """Result rows of a projection as dicts keyed by field name."""
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,90 @@
+"""
+Startup check that the database schema is at the Alembic revision this code expects.
+
+Migrations are applied by `alembic upgrade head` before the API starts (see
+docker-entrypoint.sh), so API processes no longer run `create_all` on boot. Instead each
+process reads `alembic_version` with one query and compares it to the heads of
+alembic/versions. The revision graph is read from the migration files' `revision` and
+`down_revision` assignments with `ast`, which avoids importing Alembic (and Mako) in
+every API process.
+"""
+
+import ast
+import os
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic", "versions")
+
+
+class SchemaRevisionError(RuntimeError):
+    """The database schema is missing or older than the code's migrations."""
+
+
+def _revision_assignments(path: str) -> Dict[str, object]:
+    """The `revision` and `down_revision` values assigned in a migration file."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    values = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name) and target.id in ("revision", "down_revision"):
+                values[target.id] = ast.literal_eval(value)
+    return values
+
+
+def migration_revisions(versions_dir: str = VERSIONS_DIR) -> Tuple[Set[str], Set[str]]:
+    """All revisions in the migrations directory and the heads among them."""
+    revisions, parents = set(), set()
+    for filename in os.listdir(versions_dir):
+        if not filename.endswith(".py") or filename.startswith("__"):
+            continue
+        values = _revision_assignments(os.path.join(versions_dir, filename))
+        if "revision" not in values:
+            continue
+        revisions.add(values["revision"])
+        down_revision = values.get("down_revision")
+        if isinstance(down_revision, (tuple, list)):
+            parents.update(down_revision)
+        elif down_revision:
+            parents.add(down_revision)
+    return revisions, revisions - parents
+
+
+async def verify_schema_revision(engine: AsyncEngine, versions_dir: Optional[str] = None) -> None:
+    """
+    Check the database's Alembic revision against the migrations shipped with the code.
+
+    Raises SchemaRevisionError when the database has not been migrated or is behind. A
+    revision the code does not know means the database was migrated by a newer release
+    (e.g. during a rolling deploy); that is logged and allowed.
+    """
+    revisions, heads = migration_revisions(versions_dir or VERSIONS_DIR)
+    try:
+        async with engine.connect() as conn:
+            current = set((await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars())
+    except ProgrammingError as e:
+        if "alembic_version" not in str(e):
+            raise
+        raise SchemaRevisionError("Database has no alembic_version table, run `alembic upgrade head`") from e
+
+    if current == heads:
+        print(f"✅ Database schema at revision {', '.join(sorted(current))}")
+        return
+    unknown = current - revisions
+    if unknown:
+        print(f"⚠️ Database schema at revision {', '.join(sorted(unknown))}, which this release does not know (newer migrations?)")
+        return
+    raise SchemaRevisionError(
+        f"Database schema is at revision {', '.join(sorted(current)) or 'none'}, expected "
+        f"{', '.join(sorted(heads))}. Run `alembic upgrade head`."
+    )
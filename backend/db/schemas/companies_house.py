@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import date, datetime
+from uuid import UUID
 
 class CompaniesHouseAddress(BaseModel):
     """Companies House address schema."""
@@ -95,4 +96,28 @@ class CompaniesHouseSearchRequest(BaseModel):
 
 class CompaniesHouseCompanyRequest(BaseModel):
     """Schema for Companies House company lookup request."""
-    company_number: str = Field(..., min_length=1, description="Company registration number") 
\ No newline at end of file
+    company_number: str = Field(..., min_length=1, description="Company registration number")
+
+
+class FilingDeadlineItem(BaseModel):
+    """A client's next Companies House filing deadlines (GET /companies-house/deadlines)."""
+    client_id: UUID
+    client_code: str
+    business_name: str
+    company_number: str
+    company_status: Optional[str] = None
+    next_accounts_due: Optional[date] = None
+    next_confirmation_due: Optional[date] = None
+    accounts_overdue: bool
+    confirmation_overdue: bool
+    next_deadline: Optional[date] = None
+    last_synced: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class FilingDeadlinesPage(BaseModel):
+    """Clients with a filing due by `due_before` (or overdue), earliest deadline first."""
+    due_before: date
+    items: List[FilingDeadlineItem]
+    has_more: bool
@@ -213,4 +213,28 @@ class CustomerMLRInfoUpdate(BaseModel):
     mlr_date_complete: Optional[date] = None
     passport_number: Optional[str] = None
     driving_license: Optional[str] = None
-    uk_home_telephone: Optional[str] = None 
\ No newline at end of file
+    uk_home_telephone: Optional[str] = None 
+# Typeahead candidates for new client associations / individual relationships
+class AvailableClient(BaseModel):
+    id: UUID
+    business_name: str
+    business_type: Optional[str] = None
+    main_email: Optional[str] = None
+    main_phone: Optional[str] = None
+
+class AvailableClientsPage(BaseModel):
+    items: List[AvailableClient]
+    has_more: bool
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
+
+class AvailableIndividual(BaseModel):
+    id: UUID
+    first_name: str
+    last_name: str
+    full_name: str
+    email: Optional[str] = None
+
+class AvailableIndividualsPage(BaseModel):
+    items: List[AvailableIndividual]
+    has_more: bool
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
@@ -80,6 +80,14 @@ class DocumentResponse(BaseModel):
     description: Optional[str] = None
     tags: Optional[List[str]] = None
     agent_state: DocumentAgentState
+    agent_processing_started_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
+    agent_confidence_score: Optional[float] = None
+    extracted_text_length: Optional[int] = None
+    extracted_page_count: Optional[int] = None
+    thumbnail_sha256: Optional[str] = None
+    is_validated: bool = False
+    is_archived: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
     uploaded_by_user_id: Optional[UUID] = None
@@ -158,6 +166,8 @@ class CustomerDocumentsTabResponse(BaseModel):
     
     # Document list
     documents: List[DocumentResponse] = []
+    # Documents of the customer in total (the list is one page of them)
+    total_count: int = 0
     
     class Config:
         from_attributes = True 
\ No newline at end of file
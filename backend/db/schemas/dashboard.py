@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+from decimal import Decimal
+
+
+# Count and total of one income type
+class IncomeTypeSummary(BaseModel):
+    count: int = 0
+    total: Decimal = Decimal("0")
+
+
+# Rental properties of the practice's individuals and their annual rental income
+class RentalIncomeSummary(BaseModel):
+    properties: int = 0
+    annual_total: Decimal = Decimal("0")
+
+
+# Clients with a Companies House filing overdue (`any`: accounts or confirmation statement)
+class OverdueFilingsSummary(BaseModel):
+    accounts: int = 0
+    confirmation_statement: int = 0
+    any: int = 0
+
+
+# Dashboard summary response; the dicts are keyed by enum value and list every value
+class DashboardSummary(BaseModel):
+    customers_total: int = 0
+    customers_by_status: Dict[str, int]
+    clients_total: int = 0
+    clients_by_business_type: Dict[str, int]
+    income_by_type: Dict[str, IncomeTypeSummary]
+    rental_income: RentalIncomeSummary
+    overdue_filings: OverdueFilingsSummary
+    refreshed_at: Optional[datetime] = None
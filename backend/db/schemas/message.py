@@ -2,6 +2,8 @@ from pydantic import BaseModel, UUID4
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from db.models.message import MessageType, MessageDirection, MessageStatus, MessageSender
+from db.models.message_broadcast import BroadcastStatus
+from db.models.customer import CustomerStatus
 
 
 # Message schemas
@@ -83,4 +85,51 @@ class ConversationResponse(BaseModel):
     individual_id: UUID4
     individual_name: str
     messages: List[MessageListItem]
-    total_count: int 
\ No newline at end of file
+    total_count: Optional[int] = None  # Only computed for offset pages, not for cursor pages
+    has_more: bool = False
+    next_cursor: Optional[str] = None    # Pass as `before` to load older messages
+    latest_cursor: Optional[str] = None  # Pass as `after` or to /since to poll for newer messages
+
+
+class MessageStatusChange(BaseModel):
+    id: UUID4
+    status: MessageStatus
+    updated_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+    read_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+
+
+class ConversationDeltaResponse(BaseModel):
+    individual_id: UUID4
+    messages: List[MessageListItem]      # New messages, oldest first
+    updated: List[MessageStatusChange]   # Status changes of messages already seen
+    cursor: Optional[str] = None         # Pass on the next poll
+    has_more: bool = False
+
+
+# Broadcast schemas
+class BroadcastAudience(BaseModel):
+    """Recipients of a broadcast: explicit individuals and/or customer filters (combined with AND)."""
+    individual_ids: Optional[List[UUID4]] = None
+    self_assessment: Optional[bool] = None             # Customers who have an SA return (do_they_own_sa)
+    customer_status: Optional[CustomerStatus] = None
+    service_code: Optional[str] = None                  # Customers linked to a client with this service enabled
+
+
+class MessageBroadcastCreate(BaseModel):
+    # Placeholders: {first_name}, {last_name}, {full_name}, {practice_name}
+    body: str
+    audience: BroadcastAudience
+
+
+class MessageBroadcastProgress(BaseModel):
+    id: UUID4
+    status: BroadcastStatus
+    body_template: str
+    total_recipients: int
+    skipped_recipients: int
+    status_counts: Dict[MessageStatus, int]  # Messages per delivery status
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
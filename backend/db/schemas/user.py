@@ -59,6 +59,11 @@ class Token(BaseModel):
     token_type: str
 
 
+class UrlToken(BaseModel):
+    token: str
+    expires_in: int  # Seconds
+
+
 class TokenData(BaseModel):
     email: Optional[str] = None
     user_id: Optional[UUID] = None
@@ -32,9 +32,23 @@ case "$SERVICE_TYPE" in
         exec uvicorn main:app --host 0.0.0.0 --port 8000 --reload
         ;;
     "worker")
-        echo "Starting Celery worker..."
+        # Queue, pool and prefetch settings are per worker service (see docker-compose.yml).
+        # Defaults consume every queue so a single worker still handles all tasks.
+        CELERY_QUEUES=${CELERY_QUEUES:-celery,ocr,llm,whatsapp,periodic,broadcast}
+        CELERY_POOL=${CELERY_POOL:-prefork}
+        CELERY_CONCURRENCY=${CELERY_CONCURRENCY:-2}
+        CELERY_PREFETCH_MULTIPLIER=${CELERY_PREFETCH_MULTIPLIER:-1}
+        CELERY_WORKER_NAME=${CELERY_WORKER_NAME:-worker}
+        # Read by workers/async_runtime.py to size per-process connection pools
+        export CELERY_POOL CELERY_CONCURRENCY
+        echo "Starting Celery worker $CELERY_WORKER_NAME (queues=$CELERY_QUEUES, pool=$CELERY_POOL, concurrency=$CELERY_CONCURRENCY)..."
         export PYTHONPATH=/app:$PYTHONPATH
-        exec celery -A workers.celery_app worker --loglevel=info --concurrency=2
+        exec celery -A workers.celery_app worker --loglevel=info \
+            --queues="$CELERY_QUEUES" \
+            --pool="$CELERY_POOL" \
+            --concurrency="$CELERY_CONCURRENCY" \
+            --prefetch-multiplier="$CELERY_PREFETCH_MULTIPLIER" \
+            --hostname="$CELERY_WORKER_NAME@%h"
         ;;
     "beat")
         echo "Starting Celery beat scheduler..."
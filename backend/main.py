@@ -13,19 +13,27 @@ from api.properties import router as properties_router
 from api.search import router as search_router
 from api.companies_house import router as companies_house_router
 from api.incomes import router as incomes_router
+from api.events import router as events_router
+from api.dashboard import router as dashboard_router
+from api.responses import FastJSONResponse
 from config.database import engine
-from db.models import Base
+from config.settings import settings
+from db.schema_revision import verify_schema_revision
+from services.realtime_events import event_hub
 
-# Create tables
+# Create tables (DB_STARTUP_SCHEMA=create_all, local development only; use Alembic otherwise)
 async def create_tables():
+    from db.models import Base
+    from db.dashboard_summary import create_dashboard_summary_view
     async with engine.begin() as conn:
-        # In production, you'd want to use Alembic for migrations
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_dashboard_summary_view)
 
 app = FastAPI(
     title="AgentBooks API",
     description="Practice management system for accounting practices",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -49,6 +57,8 @@ app.include_router(properties_router, prefix="/properties", tags=["Properties"])
 app.include_router(search_router, prefix="/search", tags=["Search"])
 app.include_router(companies_house_router, prefix="/companies-house", tags=["Companies House"])
 app.include_router(incomes_router, prefix="/incomes", tags=["Incomes"])
+app.include_router(events_router, prefix="/events", tags=["Events"])
+app.include_router(dashboard_router, prefix="/dashboard", tags=["Dashboard"])
 
 @app.get("/")
 async def root():
@@ -56,7 +66,14 @@ async def root():
 
 @app.on_event("startup")
 async def startup_event():
-    await create_tables()
+    if settings.db_startup_schema == "create_all":
+        await create_tables()
+    elif settings.db_startup_schema == "verify":
+        await verify_schema_revision(engine)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await event_hub.close()
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
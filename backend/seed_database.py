@@ -13,8 +13,9 @@ sys.path.append('/app')
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import delete, text
+from alembic import command
+from alembic.config import Config
 from config.settings import settings
-from db.models.base import Base  # Import Base to access metadata
 from db.models import (
     Practice, User, Individual, Customer, Client, CustomerClientAssociation, 
     Service, ClientService, Income, Property, PropertyIndividualRelationship,
@@ -53,11 +54,13 @@ async def create_sample_data():
                 await conn.execute(text("CREATE SCHEMA public;"))
             print("✅ All tables dropped")
             
-            # Create all tables from current models
-            print("🏗️  Creating all tables from current models...")
-            async with engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
-            print("✅ All tables created from models")
+            # Create all tables through the migrations so the database is stamped at head
+            print("🏗️  Creating all tables from migrations...")
+            alembic_config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+            alembic_config.set_main_option("script_location", os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic"))
+            os.environ.setdefault("DATABASE_URL", settings.database_url)
+            await asyncio.to_thread(command.upgrade, alembic_config, "head")
+            print("✅ All tables created from migrations")
             
             # Create Practice with WhatsApp number
             practice = Practice(
@@ -14,6 +14,9 @@ from db.schemas.user import TokenData
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Scope of tokens that only authorise URLs the browser requests itself
+URL_TOKEN_SCOPE = "url"
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -65,8 +68,26 @@ def create_user_token(user: User) -> str:
     )
     return access_token
 
-def verify_token(token: str) -> TokenData:
-    """Verify and decode a JWT token."""
+def create_url_token(user: User) -> str:
+    """
+    Create a short-lived token for URLs the browser requests itself (<img>, links,
+    EventSource), which cannot send an Authorization header. It is only accepted by those
+    endpoints, so one left in an access log or the browser history cannot call the API,
+    and it expires after `url_token_expire_minutes`.
+    """
+    token_data = {
+        "sub": user.email,
+        "user_id": str(user.id),
+        "role": user.role.value,
+        "practice_id": str(user.practice_id) if user.practice_id else None,
+        "scope": URL_TOKEN_SCOPE
+    }
+    return create_access_token(
+        data=token_data, expires_delta=timedelta(minutes=settings.url_token_expire_minutes)
+    )
+
+def verify_token(token: str, scope: Optional[str] = None) -> TokenData:
+    """Verify and decode a JWT token; `scope` must match the token's (None for access tokens)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -80,7 +101,7 @@ def verify_token(token: str) -> TokenData:
         practice_id: str = payload.get("practice_id")
         client_ids: list = payload.get("client_ids", [])
         
-        if email is None or user_id is None:
+        if email is None or user_id is None or payload.get("scope") != scope:
             raise credentials_exception
             
         # Convert role string back to enum
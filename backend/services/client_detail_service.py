@@ -0,0 +1,143 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, literal, false, cast
+from sqlalchemy.dialects.postgresql import aggregate_order_by, JSONB
+from sqlalchemy.types import JSON
+from typing import Optional, Dict, Any
+from uuid import UUID
+
+from db.models import Client, Service, ClientService
+from db.models.companies_house_profile import CompaniesHouseProfile
+from db.models.customer_client_association import CustomerClientAssociation
+
+# Top-level Companies House fields included in client details; the rest of the stored API
+# response (links, previous names, ...) is served by GET /clients/{id}/companies-house
+COMPANIES_HOUSE_SUMMARY_KEYS = [
+    "company_name",
+    "company_number",
+    "company_status",
+    "type",
+    "date_of_creation",
+    "jurisdiction",
+    "registered_office_address",
+    "sic_codes",
+    "accounts",
+    "confirmation_statement",
+]
+
+
+class ClientDetailService:
+
+    @staticmethod
+    def services_matrix_subquery(client_id):
+        """Every practice service with the client's enabled state and price (LEFT JOIN), as a JSON array."""
+        row = func.json_build_object(
+            "service_id", Service.id,
+            "service_code", Service.service_code,
+            "name", Service.name,
+            "description", Service.description,
+            "is_enabled", func.coalesce(ClientService.is_enabled, false()),
+            "price", ClientService.price,
+            "assigned_at", ClientService.assigned_at,
+            "updated_at", ClientService.updated_at,
+        )
+        return (
+            select(func.coalesce(func.json_agg(aggregate_order_by(row, Service.name)), cast(literal("[]"), JSON)))
+            .select_from(Service)
+            .outerjoin(
+                ClientService,
+                and_(ClientService.service_id == Service.id, ClientService.client_id == client_id)
+            )
+            .where(Service.practice_id == Client.practice_id)
+            .correlate(Client)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def associations_subquery(client_id):
+        """The client's customer associations as a JSON array."""
+        row = func.json_build_object(
+            "customer_id", CustomerClientAssociation.customer_id,
+            "relationship_type", CustomerClientAssociation.relationship_type,
+            "percentage_ownership", CustomerClientAssociation.percentage_ownership,
+            "is_active", CustomerClientAssociation.is_active,
+            "is_primary_contact", CustomerClientAssociation.is_primary_contact,
+        )
+        return (
+            select(func.coalesce(func.json_agg(row), cast(literal("[]"), JSON)))
+            .where(CustomerClientAssociation.client_id == client_id)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def companies_house_summary():
+        """Projection of the stored Companies House JSON to COMPANIES_HOUSE_SUMMARY_KEYS."""
+        data = CompaniesHouseProfile.companies_house_data
+        pairs = []
+        for key in COMPANIES_HOUSE_SUMMARY_KEYS:
+            pairs.extend([literal(key), data[key]])
+        return func.jsonb_strip_nulls(func.jsonb_build_object(*pairs), type_=JSONB)
+
+    @staticmethod
+    def filing_overdue():
+        """SQL version of CompaniesHouseProfile.is_filing_overdue."""
+        return CompaniesHouseProfile.accounts_overdue | CompaniesHouseProfile.confirmation_overdue
+
+    @staticmethod
+    async def get_client_detail(
+        db: AsyncSession,
+        client_id: UUID,
+        include_companies_house_data: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a client with its service matrix, customer associations and Companies House
+        summary in one statement.
+
+        Returns None if the client does not exist. With `include_companies_house_data` the
+        complete stored Companies House response replaces the summary.
+        """
+        companies_house_json = (
+            CompaniesHouseProfile.companies_house_data if include_companies_house_data
+            else ClientDetailService.companies_house_summary()
+        )
+        result = await db.execute(
+            select(
+                Client,
+                ClientDetailService.services_matrix_subquery(Client.id).label("services"),
+                ClientDetailService.associations_subquery(Client.id).label("customer_associations"),
+                CompaniesHouseProfile.id.label("ch_profile_id"),
+                CompaniesHouseProfile.company_number.label("ch_company_number"),
+                CompaniesHouseProfile.company_status.label("ch_company_status"),
+                CompaniesHouseProfile.last_synced.label("ch_last_synced"),
+                CompaniesHouseProfile.sync_status.label("ch_sync_status"),
+                ClientDetailService.filing_overdue().label("ch_is_filing_overdue"),
+                companies_house_json.label("ch_data"),
+            )
+            .outerjoin(CompaniesHouseProfile, CompaniesHouseProfile.client_id == Client.id)
+            .where(Client.id == client_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        companies_house_data = None
+        if row.ch_profile_id is not None:
+            companies_house_data = dict(row.ch_data or {})
+            companies_house_data["_profile_metadata"] = {
+                "profile_id": str(row.ch_profile_id),
+                "last_synced": row.ch_last_synced.isoformat() if row.ch_last_synced else None,
+                "sync_status": row.ch_sync_status,
+                "linking_status": CompaniesHouseProfile.linking_status(row.Client.company_number, row.ch_company_number),
+                "is_active": row.ch_company_status == "active",
+                "is_filing_overdue": row.ch_is_filing_overdue,
+            }
+
+        return {
+            "client": row.Client,
+            "services": row.services,
+            "customer_associations": row.customer_associations,
+            "companies_house_profile": companies_house_data,
+        }
+
+
+# Create service instance
+client_detail_service = ClientDetailService()
@@ -0,0 +1,294 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, or_, func
+from sqlalchemy.orm import selectinload, load_only
+from typing import AsyncIterator, Dict, Any, List, Optional
+from uuid import UUID
+import asyncio
+import logging
+
+from config.database import AsyncSessionLocal
+from config.settings import settings
+from db.models import Customer, Document, CustomerClientAssociation
+from db.models.individual_relationship import IndividualRelationship
+from db.schemas.customer_tabs import (
+    CustomerInfoTabResponse,
+    CustomerMLRTabResponse,
+    CustomerRelationshipsTabResponse,
+    CustomerDocumentsTabResponse,
+    DocumentResponse
+)
+from services.customer_service import customer_service
+
+CUSTOMER_OVERVIEW_SECTIONS = ["info", "mlr", "relationships", "documents"]
+DEFAULT_DOCUMENTS_LIMIT = 100
+MAX_DOCUMENTS_LIMIT = 500
+DEFAULT_OVERVIEW_DOCUMENTS_LIMIT = 50
+
+
+class CustomerOverviewService:
+    """
+    Data for the customer screen's tabs.
+
+    Each tab endpoint calls one loader. The overview endpoint checks the customer once
+    with get_customer_scope and then runs the loaders concurrently, each on its own
+    session (and so its own connection), returning sections as they finish.
+    """
+
+    @staticmethod
+    async def get_customer_scope(db: AsyncSession, customer_id: UUID, practice_id: UUID):
+        """The customer's (id, individual_id) if it belongs to the practice, else None."""
+        result = await db.execute(
+            select(Customer.id, Customer.individual_id).where(
+                Customer.id == customer_id,
+                Customer.practice_id == practice_id
+            )
+        )
+        return result.one_or_none()
+
+    @staticmethod
+    async def load_info(db: AsyncSession, customer_id: UUID, practice_id: UUID) -> Optional[Customer]:
+        """Customer with its individual, incomes, properties and contacts for the info tab."""
+        return await customer_service.load_customer(db, customer_id, practice_id, profile="info")
+
+    @staticmethod
+    async def load_mlr(db: AsyncSession, customer_id: UUID, practice_id: UUID) -> Optional[CustomerMLRTabResponse]:
+        """MLR tab data, or None if the customer is not in the practice."""
+        customer = await customer_service.load_customer(db, customer_id, practice_id, profile="mlr")
+        if not customer:
+            return None
+
+        # Create response manually without using from_orm to avoid relationship loading issues
+        return CustomerMLRTabResponse(
+            id=customer.id,
+            mlr_status=customer.mlr_status,
+            mlr_date_complete=customer.mlr_date_complete,
+            passport_number=customer.passport_number,
+            driving_license=customer.driving_license,
+            uk_home_telephone=customer.uk_home_telephone,
+            last_edited=customer.last_edited,
+            last_edited_by_id=customer.last_edited_by_id,
+            last_edited_by=customer.last_edited_by
+        )
+
+    @staticmethod
+    async def load_relationships(
+        db: AsyncSession,
+        customer_id: UUID,
+        individual_id: UUID,
+        practice_id: UUID
+    ) -> CustomerRelationshipsTabResponse:
+        """Client associations and individual relationships of a customer already checked with get_customer_scope."""
+        associations_result = await db.execute(
+            select(CustomerClientAssociation).options(
+                selectinload(CustomerClientAssociation.client)
+            ).where(CustomerClientAssociation.customer_id == customer_id)
+        )
+        client_associations = associations_result.scalars().all()
+
+        # Get individual relationships with related individuals loaded, filtered by practice
+        try:
+            individual_relationships_query = select(IndividualRelationship).options(
+                selectinload(IndividualRelationship.from_individual),
+                selectinload(IndividualRelationship.to_individual)
+            ).where(
+                IndividualRelationship.practice_id == practice_id,
+                (IndividualRelationship.from_individual_id == individual_id) |
+                (IndividualRelationship.to_individual_id == individual_id)
+            )
+            individual_relationships_result = await db.execute(individual_relationships_query)
+            individual_relationships = individual_relationships_result.scalars().all()
+        except Exception as e:
+            logging.error(f"Error loading individual relationships: {e}")
+            individual_relationships = []
+
+        # Create response manually by converting SQLAlchemy objects to dicts
+        try:
+            # Convert client associations to response format
+            client_associations_data = []
+            for assoc in client_associations:
+                client_associations_data.append({
+                    "id": assoc.id,
+                    "customer_id": assoc.customer_id,
+                    "client_id": assoc.client_id,
+                    "relationship_type": assoc.relationship_type.value if assoc.relationship_type else None,
+                    "percentage_ownership": assoc.percentage_ownership,
+                    "appointment_date": assoc.appointment_date.isoformat() if assoc.appointment_date else None,
+                    "resignation_date": assoc.resignation_date.isoformat() if assoc.resignation_date else None,
+                    "is_active": assoc.is_active,
+                    "is_primary_contact": assoc.is_primary_contact,
+                    "notes": assoc.notes,
+                    "created_at": assoc.created_at.isoformat() if assoc.created_at else None,
+                    "updated_at": assoc.updated_at.isoformat() if assoc.updated_at else None,
+                    "client": {
+                        "id": assoc.client.id,
+                        "business_name": assoc.client.business_name,
+                        "business_type": assoc.client.business_type.value if assoc.client.business_type else None,
+                        "main_phone": assoc.client.main_phone,
+                        "main_email": assoc.client.main_email
+                    }
+                })
+
+            # Convert individual relationships to response format
+            individual_relationships_data = []
+            for rel in individual_relationships:
+                individual_relationships_data.append({
+                    "id": rel.id,
+                    "from_individual_id": rel.from_individual_id,
+                    "to_individual_id": rel.to_individual_id,
+                    "relationship_type": rel.relationship_type.value if rel.relationship_type else None,
+                    "description": rel.description,
+                    "from_individual": {
+                        "id": rel.from_individual.id,
+                        "first_name": rel.from_individual.first_name,
+                        "last_name": rel.from_individual.last_name,
+                        "full_name": rel.from_individual.full_name,
+                        "email": rel.from_individual.email
+                    } if rel.from_individual else None,
+                    "to_individual": {
+                        "id": rel.to_individual.id,
+                        "first_name": rel.to_individual.first_name,
+                        "last_name": rel.to_individual.last_name,
+                        "full_name": rel.to_individual.full_name,
+                        "email": rel.to_individual.email
+                    } if rel.to_individual else None,
+                    "created_at": rel.created_at.isoformat() if rel.created_at else None,
+                    "updated_at": rel.updated_at.isoformat() if rel.updated_at else None
+                })
+
+            return CustomerRelationshipsTabResponse(
+                id=customer_id,
+                client_associations=client_associations_data,
+                individual_relationships=individual_relationships_data
+            )
+        except Exception as e:
+            logging.error(f"Error creating response: {e}")
+            # Return a minimal response in case of serialization issues
+            return CustomerRelationshipsTabResponse(
+                id=customer_id,
+                client_associations=[],
+                individual_relationships=[]
+            )
+
+    @staticmethod
+    async def load_documents(
+        db: AsyncSession,
+        customer_id: UUID,
+        individual_id: UUID,
+        limit: int = DEFAULT_DOCUMENTS_LIMIT,
+        offset: int = 0
+    ) -> CustomerDocumentsTabResponse:
+        """Newest documents of the customer or their individual, with the total count."""
+        # Documents associated with either the customer directly or their individual
+        condition = or_(
+            Document.customer_id == customer_id,
+            Document.individual_id == individual_id
+        )
+        documents_result = await db.execute(
+            select(Document).options(
+                load_only(*[getattr(Document, name) for name in DocumentResponse.model_fields])
+            ).where(condition).order_by(Document.created_at.desc(), Document.id).limit(limit).offset(offset)
+        )
+        documents = documents_result.scalars().all()
+        if offset == 0 and len(documents) < limit:
+            total_count = len(documents)
+        else:
+            total_count = (await db.execute(select(func.count(Document.id)).where(condition))).scalar()
+
+        return CustomerDocumentsTabResponse(
+            id=customer_id,
+            documents=documents,
+            total_count=total_count
+        )
+
+    @staticmethod
+    async def _load_section(
+        db: AsyncSession,
+        section: str,
+        customer_id: UUID,
+        individual_id: UUID,
+        practice_id: UUID,
+        documents_limit: int
+    ):
+        if section == "info":
+            customer = await CustomerOverviewService.load_info(db, customer_id, practice_id)
+            return CustomerInfoTabResponse.model_validate(customer) if customer else None
+        if section == "mlr":
+            return await CustomerOverviewService.load_mlr(db, customer_id, practice_id)
+        if section == "relationships":
+            return await CustomerOverviewService.load_relationships(db, customer_id, individual_id, practice_id)
+        if section == "documents":
+            return await CustomerOverviewService.load_documents(db, customer_id, individual_id, limit=documents_limit)
+        raise ValueError(f"Unknown customer overview section: {section}")
+
+    @staticmethod
+    async def run_section(
+        section: str,
+        customer_id: UUID,
+        individual_id: UUID,
+        practice_id: UUID,
+        documents_limit: int = DEFAULT_OVERVIEW_DOCUMENTS_LIMIT
+    ) -> Dict[str, Any]:
+        """
+        Load one overview section on its own session, bounded by
+        settings.customer_overview_section_timeout. Failures are reported in the section
+        instead of failing the whole overview.
+        """
+        async with AsyncSessionLocal() as db:
+            try:
+                data = await asyncio.wait_for(
+                    CustomerOverviewService._load_section(
+                        db, section, customer_id, individual_id, practice_id, documents_limit
+                    ),
+                    timeout=settings.customer_overview_section_timeout
+                )
+                if data is None:
+                    return {"section": section, "error": "Customer not found"}
+                return {"section": section, "data": data}
+            except asyncio.TimeoutError:
+                print(f"⚠️ Customer overview section {section} timed out for customer {customer_id}")
+                return {"section": section, "error": "Timed out"}
+            except Exception as e:
+                print(f"❌ Error loading customer overview section {section} for customer {customer_id}: {e}")
+                return {"section": section, "error": "Failed to load"}
+
+    @staticmethod
+    async def load_overview(
+        customer_id: UUID,
+        individual_id: UUID,
+        practice_id: UUID,
+        sections: List[str],
+        documents_limit: int = DEFAULT_OVERVIEW_DOCUMENTS_LIMIT
+    ) -> Dict[str, Any]:
+        """All requested sections at once (asyncio.gather), keyed by section name."""
+        results = await asyncio.gather(*[
+            CustomerOverviewService.run_section(section, customer_id, individual_id, practice_id, documents_limit)
+            for section in sections
+        ])
+        return {"id": customer_id, "sections": {result.pop("section"): result for result in results}}
+
+    @staticmethod
+    async def stream_overview(
+        customer_id: UUID,
+        individual_id: UUID,
+        practice_id: UUID,
+        sections: List[str],
+        documents_limit: int = DEFAULT_OVERVIEW_DOCUMENTS_LIMIT
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """The requested sections in the order they finish loading."""
+        tasks = [
+            asyncio.create_task(
+                CustomerOverviewService.run_section(section, customer_id, individual_id, practice_id, documents_limit)
+            )
+            for section in sections
+        ]
+        try:
+            for next_section in asyncio.as_completed(tasks):
+                yield await next_section
+        finally:
+            # The client went away mid-stream: stop the remaining queries
+            for task in tasks:
+                task.cancel()
+
+
+# Create service instance
+customer_overview_service = CustomerOverviewService()
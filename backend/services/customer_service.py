@@ -0,0 +1,100 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, noload
+from typing import Optional
+from uuid import UUID
+
+from config.settings import settings
+from db.models import Customer, Individual, CustomerClientAssociation
+from db.models.property_individual_relationship import PropertyIndividualRelationship
+
+# Eager-load options per use of a customer. Pick the smallest profile that covers the
+# response model, so an endpoint never lazy-loads (which fails under asyncio) or loads
+# relationships it does not return.
+CUSTOMER_LOAD_PROFILES = {
+    # Ownership checks and updates of the customer's own columns
+    "bare": (),
+    # CustomerResponse: GET/PUT/POST /customers
+    "detail": (
+        selectinload(Customer.individual).options(
+            selectinload(Individual.incomes),
+            selectinload(Individual.property_relationships).selectinload(PropertyIndividualRelationship.property),
+            noload(Individual.relationships_from),
+            noload(Individual.relationships_to)
+        ),
+        selectinload(Customer.client_associations).selectinload(CustomerClientAssociation.client),
+        selectinload(Customer.primary_accounting_contact),
+        selectinload(Customer.last_edited_by),
+        selectinload(Customer.sa_client_relation)
+    ),
+    # CustomerInfoTabResponse: info tab and accounting-info updates
+    "info": (
+        selectinload(Customer.individual).options(
+            selectinload(Individual.incomes),
+            selectinload(Individual.property_relationships).selectinload(PropertyIndividualRelationship.property),
+            noload(Individual.relationships_from),
+            noload(Individual.relationships_to)
+        ),
+        selectinload(Customer.primary_accounting_contact),
+        selectinload(Customer.last_edited_by)
+    ),
+    # CustomerMLRTabResponse: MLR tab and mlr-info updates
+    "mlr": (
+        selectinload(Customer.last_edited_by),
+    ),
+}
+
+
+class CustomerService:
+
+    @staticmethod
+    async def load_customer(
+        db: AsyncSession,
+        customer_id: UUID,
+        practice_id: UUID,
+        profile: str = "bare",
+        reload: bool = False
+    ) -> Optional[Customer]:
+        """
+        A practice's customer with the relationships of an eager-load profile, in one
+        query plus one per eager-loaded relationship. None if the customer does not exist
+        in the practice.
+
+        `reload=True` overwrites an instance already in the session with the database
+        state (server defaults, func.now() values) and reloads its relationships; use it
+        after a commit instead of db.refresh, which leaves relationships to lazy loads.
+        """
+        query = select(Customer).options(*CUSTOMER_LOAD_PROFILES[profile]).where(
+            Customer.id == customer_id,
+            Customer.practice_id == practice_id
+        )
+        if reload:
+            query = query.execution_options(populate_existing=True)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def not_found_detail(db: AsyncSession, customer_id: UUID, practice_id: UUID) -> str:
+        """
+        404 detail for a customer missing from the practice. With settings.debug it also
+        says whether the customer exists in another practice, at the cost of one query on
+        the miss path only.
+        """
+        if not settings.debug:
+            return "Customer not found"
+
+        customer_practice_id = (await db.execute(
+            select(Customer.practice_id).where(Customer.id == customer_id)
+        )).scalar_one_or_none()
+        debug_info = {
+            "customer_id": str(customer_id),
+            "customer_exists": customer_practice_id is not None,
+            "user_practice_id": str(practice_id),
+            "customer_practice_id": str(customer_practice_id) if customer_practice_id else None,
+            "practice_match": customer_practice_id == practice_id
+        }
+        return f"Customer not found. Debug info: {debug_info}"
+
+
+# Create service instance
+customer_service = CustomerService()
@@ -0,0 +1,150 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, or_, exists, tuple_
+from typing import List, Optional, Dict, Any
+from uuid import UUID
+import base64
+import json
+
+from db.models import Client, Customer, CustomerClientAssociation, Individual
+from db.models.base import name_search_key
+from db.models.individual_relationship import IndividualRelationship
+
+DEFAULT_TYPEAHEAD_LIMIT = 20
+MAX_TYPEAHEAD_LIMIT = 100
+
+
+class CustomerTypeaheadService:
+    """
+    Candidates for a customer's new client associations and individual relationships.
+
+    Already linked rows are excluded with a NOT EXISTS anti-join, `q` is a
+    case-insensitive name prefix and pages are keyset pages in name order, all served
+    by the name_search_key indexes on clients and individuals.
+    """
+
+    @staticmethod
+    def encode_cursor(*values) -> str:
+        """Opaque cursor for the sort key (name keys..., id) of the last row of a page."""
+        return base64.urlsafe_b64encode(json.dumps([str(value) for value in values]).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, parts: int) -> List[str]:
+        """Decode a typeahead cursor. Raises ValueError if it is malformed."""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+            if not isinstance(values, list) or len(values) != parts:
+                raise ValueError("unexpected number of cursor parts")
+            UUID(values[-1])
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+        return values
+
+    @staticmethod
+    def prefix_pattern(q: str) -> str:
+        """LIKE pattern matching names that start with q (LIKE wildcards in q are literal)."""
+        escaped = q.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"{escaped}%"
+
+    @staticmethod
+    async def available_clients(
+        db: AsyncSession,
+        customer: Customer,
+        q: Optional[str] = None,
+        limit: int = DEFAULT_TYPEAHEAD_LIMIT,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Practice clients not yet associated with the customer, by business name."""
+        name_key = name_search_key(Client.business_name)
+        query = select(
+            Client.id, Client.business_name, Client.business_type, Client.main_email, Client.main_phone,
+            name_key.label("name_key")
+        ).where(
+            Client.practice_id == customer.practice_id,
+            ~exists().where(and_(
+                CustomerClientAssociation.client_id == Client.id,
+                CustomerClientAssociation.customer_id == customer.id
+            ))
+        )
+        if q and q.strip():
+            query = query.where(name_key.like(CustomerTypeaheadService.prefix_pattern(q), escape="\\"))
+        if cursor:
+            last_name_key, last_id = CustomerTypeaheadService.decode_cursor(cursor, 2)
+            query = query.where(tuple_(name_key, Client.id) > tuple_(last_name_key, UUID(last_id)))
+
+        rows = (await db.execute(query.order_by(name_key, Client.id).limit(limit + 1))).all()
+        page = rows[:limit]
+        return {
+            "items": [
+                {
+                    "id": row.id,
+                    "business_name": row.business_name,
+                    "business_type": row.business_type.value if row.business_type else None,
+                    "main_email": row.main_email,
+                    "main_phone": row.main_phone,
+                }
+                for row in page
+            ],
+            "has_more": len(rows) > limit,
+            "next_cursor": CustomerTypeaheadService.encode_cursor(page[-1].name_key, page[-1].id) if len(rows) > limit else None,
+        }
+
+    @staticmethod
+    async def available_individuals(
+        db: AsyncSession,
+        customer: Customer,
+        q: Optional[str] = None,
+        limit: int = DEFAULT_TYPEAHEAD_LIMIT,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Practice individuals the customer has no relationship to yet (excluding the
+        customer's own individual), by last then first name. `q` matches the start of
+        either name.
+        """
+        last_key = name_search_key(Individual.last_name)
+        first_key = name_search_key(Individual.first_name)
+        query = select(
+            Individual.id, Individual.title, Individual.first_name, Individual.middle_name,
+            Individual.last_name, Individual.email,
+            last_key.label("last_key"), first_key.label("first_key")
+        ).where(
+            Individual.practice_id == customer.practice_id,
+            Individual.id != customer.individual_id,
+            ~exists().where(and_(
+                IndividualRelationship.to_individual_id == Individual.id,
+                IndividualRelationship.from_individual_id == customer.individual_id
+            ))
+        )
+        if q and q.strip():
+            pattern = CustomerTypeaheadService.prefix_pattern(q)
+            query = query.where(or_(last_key.like(pattern, escape="\\"), first_key.like(pattern, escape="\\")))
+        if cursor:
+            last_last_key, last_first_key, last_id = CustomerTypeaheadService.decode_cursor(cursor, 3)
+            query = query.where(
+                tuple_(last_key, first_key, Individual.id) > tuple_(last_last_key, last_first_key, UUID(last_id))
+            )
+
+        rows = (await db.execute(query.order_by(last_key, first_key, Individual.id).limit(limit + 1))).all()
+        page = rows[:limit]
+        return {
+            "items": [
+                {
+                    "id": row.id,
+                    "first_name": row.first_name,
+                    "last_name": row.last_name,
+                    "full_name": " ".join(
+                        part for part in [row.title, row.first_name, row.middle_name, row.last_name] if part
+                    ),
+                    "email": row.email,
+                }
+                for row in page
+            ],
+            "has_more": len(rows) > limit,
+            "next_cursor": CustomerTypeaheadService.encode_cursor(
+                page[-1].last_key, page[-1].first_key, page[-1].id
+            ) if len(rows) > limit else None,
+        }
+
+
+# Create service instance
+customer_typeahead_service = CustomerTypeaheadService()
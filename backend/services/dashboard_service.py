@@ -0,0 +1,74 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from uuid import UUID
+
+from db.dashboard_summary import (
+    DASHBOARD_SUMMARY_VIEW,
+    CUSTOMERS_BY_STATUS,
+    CLIENTS_BY_BUSINESS_TYPE,
+    INCOME_BY_TYPE,
+    RENTAL_INCOME,
+    OVERDUE_FILINGS
+)
+from db.models.customer import CustomerStatus
+from db.models.client import BusinessType
+from db.models.income import IncomeType
+from db.schemas.dashboard import (
+    DashboardSummary,
+    IncomeTypeSummary,
+    RentalIncomeSummary,
+    OverdueFilingsSummary
+)
+
+
+class DashboardService:
+
+    @staticmethod
+    async def get_summary(db: AsyncSession, practice_id: UUID) -> DashboardSummary:
+        """
+        A practice's dashboard figures from the practice_dashboard_summary view: one
+        index range scan over a few dozen rows, as of the view's last refresh.
+        """
+        result = await db.execute(
+            text(
+                f"SELECT metric, bucket, item_count, total_amount, refreshed_at "
+                f"FROM {DASHBOARD_SUMMARY_VIEW} WHERE practice_id = :practice_id"
+            ),
+            {"practice_id": practice_id}
+        )
+
+        # The view stores enum names (the database enum labels); the API uses enum values
+        customers_by_status = {s.value: 0 for s in CustomerStatus}
+        clients_by_business_type = {b.value: 0 for b in BusinessType}
+        income_by_type = {i.value: IncomeTypeSummary() for i in IncomeType}
+        rental_income = RentalIncomeSummary()
+        overdue_filings = OverdueFilingsSummary()
+        refreshed_at = None
+
+        for metric, bucket, item_count, total_amount, row_refreshed_at in result.all():
+            refreshed_at = row_refreshed_at
+            if metric == CUSTOMERS_BY_STATUS and bucket in CustomerStatus.__members__:
+                customers_by_status[CustomerStatus[bucket].value] = item_count
+            elif metric == CLIENTS_BY_BUSINESS_TYPE and bucket in BusinessType.__members__:
+                clients_by_business_type[BusinessType[bucket].value] = item_count
+            elif metric == INCOME_BY_TYPE and bucket in IncomeType.__members__:
+                income_by_type[IncomeType[bucket].value] = IncomeTypeSummary(count=item_count, total=total_amount or 0)
+            elif metric == RENTAL_INCOME:
+                rental_income = RentalIncomeSummary(properties=item_count, annual_total=total_amount or 0)
+            elif metric == OVERDUE_FILINGS and bucket in OverdueFilingsSummary.model_fields:
+                setattr(overdue_filings, bucket, item_count)
+
+        return DashboardSummary(
+            customers_total=sum(customers_by_status.values()),
+            customers_by_status=customers_by_status,
+            clients_total=sum(clients_by_business_type.values()),
+            clients_by_business_type=clients_by_business_type,
+            income_by_type=income_by_type,
+            rental_income=rental_income,
+            overdue_filings=overdue_filings,
+            refreshed_at=refreshed_at
+        )
+
+
+# Create service instance
+dashboard_service = DashboardService()
@@ -0,0 +1,486 @@
+"""
+Content-addressed file storage for documents.
+
+Files are stored once per distinct content, under the SHA-256 of their bytes
+(sha256/ab/cd/abcd...). A stored_files row per file counts the documents pointing at it,
+so a duplicate upload only bumps the count. Nothing is deleted when documents go away:
+`gc` recounts the references and deletes files that have none, as well as files whose
+upload rolled back before its row was committed.
+
+The backend is chosen with DOCUMENT_STORAGE_BACKEND:
+  - local: files under DOCUMENT_STORAGE_PATH, a directory every API and worker container mounts
+  - s3:    a bucket on S3 or an S3-compatible service such as MinIO (set S3_ENDPOINT_URL)
+
+Code outside this module never treats document_url as a path: documents are saved with
+document_storage_service.store() (store_sync() in workers) and read back with
+open_document(), or served by GET /documents/{id}/download. Maintenance:
+
+    python -m services.document_storage import-legacy   # move path-based documents into storage
+    python -m services.document_storage gc              # fix reference counts, delete unreferenced files
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, update, delete, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from db.models import Document, StoredFile
+
+# Bytes per read/write when copying files in and out of storage
+STORAGE_CHUNK_SIZE = 1024 * 1024
+# Uploads and downloads up to this size are buffered in memory, larger ones in a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# Document columns holding a reference to a stored file
+DOCUMENT_FILE_COLUMNS = (Document.content_sha256, Document.thumbnail_sha256, Document.preview_sha256)
+# gc leaves files without a stored_files row alone for this long: their upload's
+# transaction may still be open
+ORPHAN_FILE_GRACE_SECONDS = 24 * 60 * 60
+# Files looked up in stored_files per query when gc sweeps storage
+GC_BATCH_SIZE = 500
+STORAGE_PREFIX = "sha256/"
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+def storage_key(sha256: str) -> str:
+    """Key of a file in storage; the two directory levels keep local directories small."""
+    return f"{STORAGE_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+class DocumentStorage(ABC):
+    """A storage backend: writes, reads and deletes files by key."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """What Document.document_url records for the file."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def put(self, key: str, file: BinaryIO) -> None:
+        """Write the file (read from its current position) under key."""
+
+    @abstractmethod
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> BinaryIO:
+        """
+        A streaming handle on the file from byte `start`; the caller closes it. `end`
+        (inclusive) is where the caller stops reading, so remote backends fetch no more.
+        """
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """The file's path on this machine, for backends that have one (the API sends those zero-copy)."""
+        return None
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete the file; deleting a missing file is not an error."""
+
+    @abstractmethod
+    def list_files(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        """Keys under `prefix` with their last modification time (Unix seconds), for gc."""
+
+
+class LocalDocumentStorage(DocumentStorage):
+    """Files in a local (or shared volume) directory, at root/sha256/ab/cd/<sha256>."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def url(self, key: str) -> str:
+        return str(self.path(key))
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def put(self, key: str, file: BinaryIO) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name and rename, so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(file, out, STORAGE_CHUNK_SIZE)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> BinaryIO:
+        file = open(self.path(key), "rb")
+        file.seek(start)
+        return file
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self.path(key)
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+    def list_files(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        # Includes temporary files left by interrupted writes
+        for directory, _, names in os.walk(self.root / prefix):
+            for name in names:
+                path = Path(directory) / name
+                yield path.relative_to(self.root).as_posix(), path.stat().st_mtime
+
+
+class S3DocumentStorage(DocumentStorage):
+    """Objects in an S3 bucket; endpoint_url points it at MinIO or another S3-compatible service."""
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None
+    ):
+        # boto3 is only needed with the S3 backend
+        import boto3
+        from botocore.exceptions import ClientError
+
+        self._client_error = ClientError
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key
+        )
+
+    def url(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except self._client_error as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put(self, key: str, file: BinaryIO) -> None:
+        # Multipart upload for large files
+        self.client.upload_fileobj(file, self.bucket, key)
+
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> BinaryIO:
+        if start or end is not None:
+            byte_range = f"bytes={start}-{'' if end is None else end}"
+            return self.client.get_object(Bucket=self.bucket, Key=key, Range=byte_range)["Body"]
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_files(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["LastModified"].timestamp()
+
+
+@lru_cache(maxsize=1)
+def get_document_storage() -> DocumentStorage:
+    """The configured backend, one per process."""
+    if settings.document_storage_backend == "s3":
+        return S3DocumentStorage(
+            settings.s3_bucket,
+            endpoint_url=settings.s3_endpoint_url,
+            region=settings.s3_region,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key
+        )
+    return LocalDocumentStorage(settings.document_storage_path)
+
+
+class SpooledUpload:
+    """
+    A file being received: buffered (in memory, then a temporary file past SPOOL_MAX_SIZE)
+    and hashed as chunks arrive, so its storage key is known once the last chunk is in.
+    """
+
+    def __init__(self):
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class DocumentStorageService:
+
+    @staticmethod
+    def url(sha256: str) -> str:
+        """document_url of a stored file."""
+        return get_document_storage().url(storage_key(sha256))
+
+    @staticmethod
+    def local_path(sha256: str) -> Optional[Path]:
+        """Path of a stored file on this machine, or None with a remote backend."""
+        return get_document_storage().local_path(storage_key(sha256))
+
+    @staticmethod
+    def open_stored(sha256: str, start: int = 0, end: Optional[int] = None) -> BinaryIO:
+        """A streaming handle on a stored file from byte `start` (see DocumentStorage.open)."""
+        return get_document_storage().open(storage_key(sha256), start, end)
+
+    @staticmethod
+    def _add_reference(upload: SpooledUpload, mime_type: Optional[str]):
+        return insert(StoredFile).values(
+            sha256=upload.sha256, size=upload.size, mime_type=mime_type, refcount=1
+        ).on_conflict_do_update(
+            index_elements=[StoredFile.sha256],
+            set_={"refcount": StoredFile.refcount + 1}
+        ).returning(StoredFile).execution_options(populate_existing=True)
+
+    @staticmethod
+    def _write_if_missing(upload: SpooledUpload, refcount: int) -> None:
+        storage = get_document_storage()
+        key = storage_key(upload.sha256)
+        # Checked on every store, not only for new content, so that a file missing from
+        # storage is written again by the next identical upload
+        if not storage.exists(key):
+            upload.file.seek(0)
+            storage.put(key, upload.file)
+            print(f"📦 Stored {upload.size:,} bytes as {key}")
+        else:
+            print(f"♻️ Duplicate upload, reusing {key} ({refcount} references)")
+
+    @staticmethod
+    async def store(db: AsyncSession, upload: SpooledUpload, mime_type: Optional[str] = None) -> StoredFile:
+        """
+        Add a reference to the upload's content for a new document, writing the file to
+        storage unless identical content is already there. Runs in the caller's
+        transaction, which should also add the document: the stored_files row stays locked
+        until commit, so gc cannot delete the file in between. If that transaction rolls
+        back, a newly written file is left without a row until gc sweeps it.
+        """
+        stored_file = (await db.execute(DocumentStorageService._add_reference(upload, mime_type))).scalar_one()
+        await asyncio.to_thread(DocumentStorageService._write_if_missing, upload, stored_file.refcount)
+        return stored_file
+
+    @staticmethod
+    def store_sync(db: Session, upload: SpooledUpload, mime_type: Optional[str] = None) -> StoredFile:
+        """store() for sync sessions (Celery workers)."""
+        stored_file = db.execute(DocumentStorageService._add_reference(upload, mime_type)).scalar_one()
+        DocumentStorageService._write_if_missing(upload, stored_file.refcount)
+        return stored_file
+
+    @staticmethod
+    @contextmanager
+    def open_document(document: Document) -> Iterator[BinaryIO]:
+        """
+        The document's file as a seekable binary handle, for workers. Local files are read
+        in place; S3 objects are streamed into a spooled temporary file, since PDF and
+        image libraries seek. Documents saved before content-addressed storage are opened
+        from their document_url path.
+        """
+        if not document.content_sha256:
+            with open(document.document_url, "rb") as file:
+                yield file
+        else:
+            with closing(get_document_storage().open(storage_key(document.content_sha256))) as stream:
+                if stream.seekable():
+                    yield stream
+                else:
+                    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as file:
+                        shutil.copyfileobj(stream, file, STORAGE_CHUNK_SIZE)
+                        file.seek(0)
+                        yield file
+
+
+async def import_legacy_documents(batch_size: int = 100) -> Tuple[int, int]:
+    """
+    Move documents saved as local paths (no content_sha256) into storage. The original
+    files are left in place. Returns (imported, missing file) counts.
+    """
+    from config.database import AsyncSessionLocal
+
+    imported = missing = 0
+    last_id = None
+    async with AsyncSessionLocal() as db:
+        while True:
+            query = select(Document).where(Document.content_sha256.is_(None)).order_by(Document.id).limit(batch_size)
+            if last_id:
+                query = query.where(Document.id > last_id)
+            documents = (await db.execute(query)).scalars().all()
+            if not documents:
+                break
+            last_id = documents[-1].id
+
+            for document in documents:
+                if not os.path.isfile(document.document_url):
+                    print(f"⚠️ Document {document.id}: file not found at {document.document_url}")
+                    missing += 1
+                    continue
+                with SpooledUpload() as upload:
+                    with open(document.document_url, "rb") as file:
+                        for chunk in iter(lambda: file.read(STORAGE_CHUNK_SIZE), b""):
+                            upload.write(chunk)
+                    stored_file = await DocumentStorageService.store(db, upload, document.mime_type)
+                document.content_sha256 = stored_file.sha256
+                document.document_url = DocumentStorageService.url(stored_file.sha256)
+                document.file_size = str(stored_file.size)
+                await db.commit()
+                imported += 1
+    return imported, missing
+
+
+def _reference_count(sha256):
+    """References to a stored file from documents, as a SQL expression."""
+    return sum(
+        select(func.count(Document.id)).where(column == sha256).scalar_subquery()
+        for column in DOCUMENT_FILE_COLUMNS
+    )
+
+
+async def _fix_reference_counts(db: AsyncSession) -> int:
+    """
+    Set each stored file's refcount to the number of references from documents (as file,
+    thumbnail or preview) and delete the files left with none. Returns the number deleted.
+    """
+    deleted = 0
+    candidates = (await db.execute(
+        select(StoredFile.sha256).where(or_(
+            StoredFile.refcount != _reference_count(StoredFile.sha256),
+            StoredFile.refcount <= 0
+        ))
+    )).scalars().all()
+    await db.rollback()
+
+    for sha256 in candidates:
+        # Lock the row first: a store in progress commits its document before the count
+        # below runs, and a store starting now waits for this transaction. The file is
+        # deleted before the commit, so such a store finds it gone and writes it again.
+        await db.execute(select(StoredFile.sha256).where(StoredFile.sha256 == sha256).with_for_update())
+        count = (await db.execute(select(_reference_count(sha256)))).scalar()
+        if count:
+            await db.execute(update(StoredFile).where(StoredFile.sha256 == sha256).values(refcount=count))
+        else:
+            await asyncio.to_thread(get_document_storage().delete, storage_key(sha256))
+            await db.execute(delete(StoredFile).where(StoredFile.sha256 == sha256))
+            deleted += 1
+        await db.commit()
+    return deleted
+
+
+async def _delete_orphan_keys(db: AsyncSession, keys: List[str]) -> int:
+    storage = get_document_storage()
+    by_sha256 = {key.rsplit("/", 1)[-1]: key for key in keys}
+    known = set((await db.execute(
+        select(StoredFile.sha256).where(StoredFile.sha256.in_(list(by_sha256)))
+    )).scalars())
+    await db.rollback()
+
+    deleted = 0
+    for sha256, key in by_sha256.items():
+        if sha256 in known:
+            continue
+        if _SHA256_HEX.fullmatch(sha256):
+            # Claim the content with a placeholder row: a store() of it that starts now
+            # waits for this transaction, then finds the file gone and writes it again
+            claimed = (await db.execute(
+                insert(StoredFile).values(sha256=sha256, size=0, refcount=0)
+                .on_conflict_do_nothing().returning(StoredFile.sha256)
+            )).scalar_one_or_none()
+            if not claimed:
+                await db.rollback()
+                continue
+            await asyncio.to_thread(storage.delete, key)
+            await db.execute(delete(StoredFile).where(StoredFile.sha256 == sha256))
+            await db.commit()
+        else:
+            # Not a content key: a temporary file left by an interrupted write
+            await asyncio.to_thread(storage.delete, key)
+        deleted += 1
+    return deleted
+
+
+async def _delete_orphan_files(db: AsyncSession, grace_seconds: float = ORPHAN_FILE_GRACE_SECONDS) -> int:
+    """
+    Delete files in storage that have no stored_files row, such as those written by a
+    store() whose transaction rolled back. Files newer than `grace_seconds` are kept.
+    Returns the number deleted.
+    """
+    storage = get_document_storage()
+    cutoff = time.time() - grace_seconds
+    deleted, batch = 0, []
+    for key, modified_at in await asyncio.to_thread(lambda: list(storage.list_files(STORAGE_PREFIX))):
+        if modified_at >= cutoff:
+            continue
+        batch.append(key)
+        if len(batch) == GC_BATCH_SIZE:
+            deleted += await _delete_orphan_keys(db, batch)
+            batch = []
+    if batch:
+        deleted += await _delete_orphan_keys(db, batch)
+    return deleted
+
+
+async def collect_garbage() -> Tuple[int, int]:
+    """
+    Fix reference counts, then delete unreferenced files and files without a row.
+    Returns (unreferenced, orphaned) counts of files deleted.
+    """
+    from config.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        unreferenced = await _fix_reference_counts(db)
+        orphaned = await _delete_orphan_files(db)
+    return unreferenced, orphaned
+
+
+# Create service instance
+document_storage_service = DocumentStorageService()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Document file storage")
+    parser.add_argument("command", choices=["import-legacy", "gc"])
+    args = parser.parse_args()
+
+    if args.command == "import-legacy":
+        imported, missing = asyncio.run(import_legacy_documents())
+        print(f"✅ Imported {imported} documents into {settings.document_storage_backend} storage, {missing} files missing")
+    else:
+        unreferenced, orphaned = asyncio.run(collect_garbage())
+        print(
+            f"✅ Deleted {unreferenced} unreferenced files and {orphaned} files without a stored_files row "
+            f"from {settings.document_storage_backend} storage"
+        )
@@ -0,0 +1,214 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, exists, insert, update, func
+from sqlalchemy.orm import load_only
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+
+from db.models import (
+    Customer, CustomerClientAssociation, ClientService, Service, Individual, Practice
+)
+from db.models.message import Message, MessageType, MessageDirection, MessageStatus, MessageSender
+from db.models.message_broadcast import MessageBroadcast, BroadcastStatus
+from db.schemas.message import MessageBroadcastCreate, BroadcastAudience
+
+# Upper bound on recipients per broadcast; larger audiences should be split up
+MAX_BROADCAST_RECIPIENTS = 10000
+
+
+class _TemplateValues(dict):
+    """Leaves unknown placeholders in the body as they are instead of failing."""
+
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+class MessageBroadcastService:
+
+    @staticmethod
+    def render_body(template: str, individual: Individual, practice: Practice) -> str:
+        """Fill a broadcast template's placeholders for one recipient."""
+        values = _TemplateValues(
+            first_name=individual.first_name or "",
+            last_name=individual.last_name or "",
+            full_name=" ".join(part for part in [individual.first_name, individual.last_name] if part),
+            practice_name=practice.name or "",
+        )
+        try:
+            return template.format_map(values)
+        except (ValueError, IndexError):
+            # Stray braces in a plain message, send it as written
+            return template
+
+    @staticmethod
+    def audience_query(practice_id: UUID, audience: BroadcastAudience):
+        """SELECT of the practice's individuals matching the audience filters (one query)."""
+        query = select(Individual).options(
+            load_only(Individual.id, Individual.first_name, Individual.last_name, Individual.primary_mobile_e164)
+        ).where(Individual.practice_id == practice_id)
+
+        if audience.individual_ids is not None:
+            query = query.where(Individual.id.in_(audience.individual_ids))
+
+        customer_conditions = []
+        if audience.self_assessment is not None:
+            customer_conditions.append(Customer.do_they_own_sa.is_(audience.self_assessment))
+        if audience.customer_status:
+            customer_conditions.append(Customer.status == audience.customer_status)
+        if audience.service_code:
+            customer_conditions.append(
+                exists().where(
+                    and_(
+                        CustomerClientAssociation.customer_id == Customer.id,
+                        ClientService.client_id == CustomerClientAssociation.client_id,
+                        ClientService.is_enabled.is_(True),
+                        Service.id == ClientService.service_id,
+                        Service.service_code == audience.service_code
+                    )
+                )
+            )
+        if customer_conditions:
+            query = query.where(
+                exists().where(and_(Customer.individual_id == Individual.id, *customer_conditions))
+            )
+
+        return query.order_by(Individual.last_name, Individual.first_name)
+
+    @staticmethod
+    async def create_broadcast(
+        db: AsyncSession,
+        broadcast_data: MessageBroadcastCreate,
+        practice_id: UUID,
+        user_id: Optional[UUID] = None
+    ) -> MessageBroadcast:
+        """
+        Create a broadcast and one pending Message per recipient with a single bulk INSERT.
+
+        Recipients without a usable mobile number are skipped, as are repeated numbers.
+        Delivery is left to the dispatch_message_broadcast task. Raises ValueError when the
+        practice cannot send or the audience is empty or too large.
+        """
+        audience = broadcast_data.audience
+        if audience.individual_ids is None and not any(
+            [audience.self_assessment is not None, audience.customer_status, audience.service_code]
+        ):
+            raise ValueError("Choose recipients with individual_ids or at least one filter")
+
+        practice = await db.get(Practice, practice_id)
+        if not practice or not practice.whatsapp_number_e164:
+            raise ValueError("Practice has no whatsapp_number")
+
+        result = await db.execute(MessageBroadcastService.audience_query(practice_id, audience))
+        individuals = result.scalars().all()
+
+        recipients: List[Tuple[Individual, str]] = []
+        seen_numbers = set()
+        for individual in individuals:
+            number = individual.primary_mobile_e164
+            if not number or number in seen_numbers:
+                continue
+            seen_numbers.add(number)
+            recipients.append((individual, number))
+
+        if not recipients:
+            raise ValueError("No recipients with a mobile number match this audience")
+        if len(recipients) > MAX_BROADCAST_RECIPIENTS:
+            raise ValueError(f"Broadcasts are limited to {MAX_BROADCAST_RECIPIENTS} recipients, this audience has {len(recipients)}")
+
+        broadcast = MessageBroadcast(
+            id=uuid4(),
+            practice_id=practice_id,
+            user_id=user_id,
+            body_template=broadcast_data.body,
+            audience=audience.model_dump(mode="json", exclude_none=True),
+            status=BroadcastStatus.queued,
+            total_recipients=len(recipients),
+            skipped_recipients=len(individuals) - len(recipients),
+        )
+        db.add(broadcast)
+        await db.flush()
+
+        from_address = f"whatsapp:{practice.whatsapp_number_e164}"
+        await db.execute(insert(Message), [
+            {
+                "id": uuid4(),
+                "practice_id": practice_id,
+                "individual_id": individual.id,
+                "user_id": user_id,
+                "broadcast_id": broadcast.id,
+                "message_type": MessageType.whatsapp,
+                "direction": MessageDirection.outgoing,
+                "status": MessageStatus.pending,
+                "sender": MessageSender.human,
+                "body": MessageBroadcastService.render_body(broadcast_data.body, individual, practice),
+                "from_address": from_address,
+                "to_address": f"whatsapp:{number}",
+            }
+            for individual, number in recipients
+        ])
+        await db.commit()
+
+        from workers.tasks.message_broadcast import dispatch_message_broadcast_task
+        dispatch_message_broadcast_task.delay(str(broadcast.id))
+        print(f"📣 Broadcast {broadcast.id} queued for {len(recipients)} recipients")
+        return broadcast
+
+    @staticmethod
+    async def get_broadcast_progress(
+        db: AsyncSession,
+        broadcast_id: UUID,
+        practice_id: UUID
+    ) -> Optional[Dict[str, Any]]:
+        """Broadcast with its message counts per delivery status (served from the broadcast index)."""
+        broadcast = (await db.execute(
+            select(MessageBroadcast).where(
+                and_(MessageBroadcast.id == broadcast_id, MessageBroadcast.practice_id == practice_id)
+            )
+        )).scalar_one_or_none()
+        if not broadcast:
+            return None
+
+        counts = await db.execute(
+            select(Message.status, func.count()).where(Message.broadcast_id == broadcast_id).group_by(Message.status)
+        )
+        status_counts = {status: 0 for status in MessageStatus}
+        status_counts.update({status: count for status, count in counts.all()})
+
+        return {
+            "id": broadcast.id,
+            "status": broadcast.status,
+            "body_template": broadcast.body_template,
+            "total_recipients": broadcast.total_recipients,
+            "skipped_recipients": broadcast.skipped_recipients,
+            "status_counts": status_counts,
+            "created_at": broadcast.created_at,
+            "started_at": broadcast.started_at,
+            "completed_at": broadcast.completed_at,
+        }
+
+    @staticmethod
+    async def cancel_broadcast(db: AsyncSession, broadcast_id: UUID, practice_id: UUID) -> bool:
+        """Stop a broadcast; messages not yet handed to Twilio are marked failed."""
+        result = await db.execute(
+            update(MessageBroadcast).where(
+                and_(
+                    MessageBroadcast.id == broadcast_id,
+                    MessageBroadcast.practice_id == practice_id,
+                    MessageBroadcast.status.in_([BroadcastStatus.queued, BroadcastStatus.sending])
+                )
+            ).values(status=BroadcastStatus.cancelled, completed_at=datetime.now(timezone.utc))
+        )
+        if not result.rowcount:
+            return False
+
+        await db.execute(
+            update(Message).where(
+                and_(Message.broadcast_id == broadcast_id, Message.status == MessageStatus.pending)
+            ).values(status=MessageStatus.failed, error_message="Broadcast cancelled")
+        )
+        await db.commit()
+        return True
+
+
+# Create service instance
+message_broadcast_service = MessageBroadcastService()
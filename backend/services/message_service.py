@@ -1,13 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc
-from sqlalchemy.orm import joinedload, selectinload
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select, and_, or_, desc, case, func
+from sqlalchemy.orm import joinedload, selectinload, lazyload
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
+import base64
 import os
+import time
 import aiohttp
 import mimetypes
-from pathlib import Path
 
 from db.models import Document, Client
 from db.models.message import Message, MessageType, MessageDirection, MessageStatus, MessageSender
@@ -16,12 +17,114 @@ from db.models.practice import Practice
 from db.models.documents import Document, DocumentType, DocumentSource, DocumentAgentState
 from db.schemas.message import MessageCreate, MessageUpdate, MessageSend
 from services.twilio_service import twilio_service
-from workers.tasks.whatsapp_processor import process_whatsapp_message_task
-from workers.tasks.document_processor import process_document_ocr
+from services.phone_numbers import normalize_phone_number
+from services.document_storage import document_storage_service, SpooledUpload
+from services.message_status_sink import (
+    is_status_callback, buffer_status_callback, apply_status_updates, status_entry
+)
+from services.realtime_events import (
+    publish_event, message_event_data, document_event_data,
+    MESSAGE_CREATED, MESSAGE_STATUS, DOCUMENT_STATE
+)
+from workers.tasks.whatsapp_processor import process_whatsapp_message_task, dispatch_attachment_pipeline
+
+
+class _ParticipantCache:
+    """Short-TTL in-process cache of (from, to) E.164 pairs to (individual_id, practice_id) for hot senders."""
+    
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, Tuple[UUID, UUID]]] = {}
+    
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[UUID, UUID]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+    
+    def set(self, key: Tuple[str, str], value: Tuple[UUID, UUID]) -> None:
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+    
+    def invalidate(self, key: Tuple[str, str]) -> None:
+        self._entries.pop(key, None)
+
+
+_participant_cache = _ParticipantCache()
+
+# Status changes are re-sent for this long after the last poll, so updates committed slightly
+# out of updated_at order are not missed (clients merge changes by message id)
+STATUS_CHANGES_OVERLAP = timedelta(seconds=5)
 
 
 class MessageService:
     
+    @staticmethod
+    async def resolve_whatsapp_participants(
+        db: AsyncSession,
+        from_phone: str,
+        to_phone: str
+    ) -> Tuple[Optional[Individual], Optional[Practice]]:
+        """
+        Resolve the individual and practice of a WhatsApp message in a single query.
+        
+        Works in both directions (individual → practice for incoming messages, practice →
+        individual for echoes of outgoing ones) using the normalised E.164 columns. The
+        individual must belong to the practice. When several individuals of the practice
+        share the mobile number, the one created first is used and the ambiguity logged.
+        Hot senders are served from a short-TTL cache of ids, which turns the lookup into a
+        primary-key fetch; the numbers are still checked, so a changed number stops
+        resolving straight away.
+        """
+        from_e164 = normalize_phone_number(from_phone)
+        to_e164 = normalize_phone_number(to_phone)
+        if not from_e164 or not to_e164:
+            return None, None
+        
+        cache_key = (from_e164, to_e164)
+        numbers = [from_e164, to_e164]
+        # Prefer the individual as the sender (incoming message)
+        direction = case((Individual.primary_mobile_e164 == from_e164, 0), else_=1)
+        query = (
+            select(Individual, Practice, direction)
+            .join(Practice, Individual.practice_id == Practice.id)
+            .where(
+                Individual.primary_mobile_e164.in_(numbers),
+                Practice.whatsapp_number_e164.in_(numbers),
+                Individual.primary_mobile_e164 != Practice.whatsapp_number_e164
+            )
+            # The webhook only needs the rows themselves, skip the individual's selectin collections
+            .options(lazyload("*"))
+        )
+        
+        cached = _participant_cache.get(cache_key)
+        if cached:
+            individual_id, practice_id = cached
+            query = query.where(Individual.id == individual_id, Practice.id == practice_id)
+        else:
+            # Two rows are enough to tell whether the number is shared
+            query = query.order_by(direction, Individual.created_at, Individual.id).limit(2)
+        
+        rows = (await db.execute(query)).all()
+        if not rows:
+            _participant_cache.invalidate(cache_key)
+            return None, None
+        
+        individual, practice, rank = rows[0]
+        if len(rows) > 1 and rows[1][2] == rank:
+            print(
+                f"⚠️ Several individuals share {individual.primary_mobile_e164} in practice "
+                f"{practice.id}, using the oldest ({individual.id})"
+            )
+        _participant_cache.set(cache_key, (individual.id, practice.id))
+        return individual, practice
+    
     @staticmethod
     async def _handle_interactive_reply(db: AsyncSession, webhook_data: Dict[str, Any], individual: Individual, practice: Practice) -> bool:
         """Handles a reply from an interactive WhatsApp message."""
@@ -69,6 +172,7 @@ class MessageService:
                 document_to_assign.processed_at = datetime.utcnow()
                 db.add(document_to_assign)
                 await db.commit()
+                await publish_event(practice.id, DOCUMENT_STATE, document_event_data(document_to_assign))
                 
                 print(f"✅ Successfully assigned Document {document_id} to Client {client.business_name}")
 
@@ -102,8 +206,122 @@ class MessageService:
         db.add(db_message)
         await db.commit()
         await db.refresh(db_message)
+        await publish_event(db_message.practice_id, MESSAGE_CREATED, message_event_data(db_message))
         return db_message
     
+    @staticmethod
+    def encode_cursor(created_at: datetime, message_id: UUID, changes_since: Optional[datetime] = None) -> str:
+        """
+        Encode an opaque conversation cursor for the message at (created_at, id).
+        Delta cursors also carry the status-change watermark.
+        """
+        parts = [created_at.isoformat(), str(message_id)]
+        if changes_since:
+            parts.append(changes_since.isoformat())
+        return base64.urlsafe_b64encode("|".join(parts).encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, UUID, Optional[datetime]]:
+        """Decode a conversation cursor. Raises ValueError if it is malformed."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            parts = raw.split("|")
+            if len(parts) not in (2, 3):
+                raise ValueError("unexpected number of cursor parts")
+            created_at = datetime.fromisoformat(parts[0])
+            message_id = UUID(parts[1])
+            changes_since = datetime.fromisoformat(parts[2]) if len(parts) == 3 else None
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+        return created_at, message_id, changes_since
+    
+    @staticmethod
+    def message_cursor(message: Message) -> str:
+        return MessageService.encode_cursor(message.created_at, message.id)
+    
+    @staticmethod
+    def older_than(created_at: datetime, message_id: UUID):
+        """Keyset condition for messages before (created_at, id) in conversation order."""
+        # Spelled out rather than a row comparison so the (individual_id, created_at) index bounds the scan
+        return and_(
+            Message.created_at <= created_at,
+            or_(Message.created_at < created_at, Message.id < message_id)
+        )
+    
+    @staticmethod
+    def newer_than(created_at: datetime, message_id: UUID):
+        """Keyset condition for messages after (created_at, id) in conversation order."""
+        return and_(
+            Message.created_at >= created_at,
+            or_(Message.created_at > created_at, Message.id > message_id)
+        )
+    
+    @staticmethod
+    async def get_conversation_delta(
+        db: AsyncSession,
+        individual_id: UUID,
+        practice_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Get what changed in a conversation since `cursor`.
+        
+        Returns messages created after the cursor (oldest first, at most `limit`) and the
+        status fields of already-seen messages updated since the cursor's watermark, plus
+        the cursor to pass on the next poll. Without a cursor the conversation is read
+        from the beginning.
+        """
+        conversation = and_(
+            Message.individual_id == individual_id,
+            Message.practice_id == practice_id
+        )
+        
+        new_query = select(Message).where(conversation)
+        last_created_at = last_id = changes_since = None
+        if cursor:
+            last_created_at, last_id, changes_since = MessageService.decode_cursor(cursor)
+            # Plain conversation cursors start watching for status changes from the cursor message
+            changes_since = changes_since or last_created_at
+            new_query = new_query.where(MessageService.newer_than(last_created_at, last_id))
+        
+        new_query = new_query.order_by(Message.created_at, Message.id).limit(limit + 1)
+        new_messages = list((await db.execute(new_query)).scalars().all())
+        has_more = len(new_messages) > limit
+        new_messages = new_messages[:limit]
+        
+        updated = []
+        if cursor:
+            changes_query = select(
+                Message.id, Message.status, Message.updated_at,
+                Message.delivered_at, Message.read_at, Message.error_message
+            ).where(
+                conversation,
+                Message.updated_at > changes_since - STATUS_CHANGES_OVERLAP,
+                # Messages the client already has; newer ones are returned in full above
+                ~MessageService.newer_than(last_created_at, last_id)
+            ).order_by(Message.updated_at)
+            updated = [dict(row._mapping) for row in (await db.execute(changes_query)).all()]
+        
+        # Advance the watermark over everything the client now has the latest state of
+        watermarks = [m["updated_at"] for m in updated] + [m.updated_at for m in new_messages if m.updated_at]
+        if changes_since:
+            watermarks.append(changes_since)
+        if new_messages:
+            last_created_at, last_id = new_messages[-1].created_at, new_messages[-1].id
+            watermarks.append(last_created_at)
+        
+        next_cursor = None
+        if last_created_at:
+            next_cursor = MessageService.encode_cursor(last_created_at, last_id, max(watermarks))
+        
+        return {
+            "messages": new_messages,
+            "updated": updated,
+            "cursor": next_cursor or cursor,
+            "has_more": has_more
+        }
+    
     @staticmethod
     async def get_message_by_id(db: AsyncSession, message_id: UUID) -> Optional[Message]:
         """Get a message by its ID"""
@@ -160,16 +378,15 @@ class MessageService:
             db, individual_id, practice_id, limit=limit, offset=offset
         )
         
-        # Get total count
-        count_result = await db.execute(
-            select(Message).where(
+        # Get total count (served from the individual_id/created_at index)
+        total_count = await db.scalar(
+            select(func.count()).select_from(Message).where(
                 and_(
                     Message.individual_id == individual_id,
                     Message.practice_id == practice_id
                 )
             )
-        )
-        total_count = len(count_result.scalars().all())
+        ) or 0
         
         return {
             "individual": individual,
@@ -253,6 +470,7 @@ class MessageService:
 
             await db.commit()
             await db.refresh(db_message)
+            await publish_event(practice_id, MESSAGE_STATUS, message_event_data(db_message))
 
             return {
                 "success": twilio_response["success"],
@@ -292,6 +510,7 @@ class MessageService:
         
         await db.commit()
         await db.refresh(message)
+        await publish_event(message.practice_id, MESSAGE_STATUS, message_event_data(message))
         return message
     
     @staticmethod
@@ -317,59 +536,31 @@ class MessageService:
             print(f"📱 Processing WhatsApp message from {clean_from_phone} to {clean_to_phone}")
 
             # Check if this is a status update
-            if message_status in ['sent', 'delivered', 'read', 'failed']:
-                # For status updates, find the message by SID and update its status
-                message_result = await db.execute(
-                    select(Message).where(Message.twilio_sid == message_sid)
-                )
-                existing_message = message_result.scalar_one_or_none()
+            if is_status_callback(message_status):
+                # Buffered, coalesced per SID and written in bulk by flush_message_status_updates
+                if await buffer_status_callback(message_sid, message_status, webhook_data):
+                    return {"status": "success", "message": f"Message status {message_status} queued"}
                 
-                if existing_message:
-                    print(f"📝 Updating message status to {message_status}")
-                    existing_message.status = MessageStatus[message_status]
-                    if message_status == 'read':
-                        existing_message.read_at = datetime.utcnow()
-                    elif message_status == 'delivered':
-                        existing_message.delivered_at = datetime.utcnow()
-                    
-                    existing_message.message_metadata = {
-                        **(existing_message.message_metadata or {}),
-                        f"status_update_{message_status}": {
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "webhook_data": webhook_data
-                        }
-                    }
-                    
-                    await db.commit()
-                    return {"status": "success", "message": f"Message status updated to {message_status}"}
-                else:
-                    print(f"⚠️ No message found with SID {message_sid} for status update")
-                    return {"status": "warning", "message": "Message not found for status update"}
+                # Redis unavailable: apply this callback on its own with the same monotonic update
+                print(f"📝 Updating message status to {message_status}")
+                updated = await db.run_sync(
+                    lambda session: apply_status_updates(session, {message_sid: status_entry(message_status, webhook_data)})
+                )
+                for row in updated:
+                    await publish_event(row["practice_id"], MESSAGE_STATUS, {
+                        "message_id": str(row["id"]),
+                        "individual_id": str(row["individual_id"]),
+                        "direction": row["direction"],
+                        "sender": row["sender"],
+                        "status": row["status"],
+                    })
+                return {"status": "success", "message": f"Message status updated to {message_status}", "updated": len(updated)}
 
             # If not a status update, this is a new message
-            # Find individual and practice (for new messages, From is the sender)
-            individual_result = await db.execute(select(Individual).where(Individual.primary_mobile == clean_from_phone))
-            individual = individual_result.scalar_one_or_none()
-            
-            if not individual:
-                # Try finding practice first as this might be a message FROM the practice
-                practice_result = await db.execute(select(Practice).where(Practice.whatsapp_number == clean_from_phone))
-                practice = practice_result.scalar_one_or_none()
-                
-                if practice:
-                    # If the message is from the practice, then the recipient should be the individual
-                    individual_result = await db.execute(select(Individual).where(Individual.primary_mobile == clean_to_phone))
-                    individual = individual_result.scalar_one_or_none()
-                else:
-                    # Try one more time with the to_phone as some webhooks might have reversed numbers
-                    individual_result = await db.execute(select(Individual).where(Individual.primary_mobile == clean_to_phone))
-                    individual = individual_result.scalar_one_or_none()
-                    practice_result = await db.execute(select(Practice).where(Practice.whatsapp_number == clean_from_phone))
-                    practice = practice_result.scalar_one_or_none()
-            else:
-                # If we found the individual, look for the practice they're messaging
-                practice_result = await db.execute(select(Practice).where(Practice.whatsapp_number == clean_to_phone))
-                practice = practice_result.scalar_one_or_none()
+            # Find individual and practice in one query (for new messages, From is usually the sender)
+            individual, practice = await MessageService.resolve_whatsapp_participants(
+                db, clean_from_phone, clean_to_phone
+            )
 
             if not individual or not practice:
                 error_message = f"No individual or practice found for numbers: From={clean_from_phone}, To={clean_to_phone}"
@@ -407,20 +598,29 @@ class MessageService:
             await db.refresh(message)
             
             print(f"✅ Message saved with ID: {message.id}")
+            await publish_event(practice.id, MESSAGE_CREATED, message_event_data(message))
             
             # Process any media attachments
             if media_items:
                 print(f"📎 Processing {len(media_items)} media attachments...")
-                await MessageService._save_whatsapp_media_attachments(
+                document_ids = await MessageService._save_whatsapp_media_attachments(
                     db=db,
                     media_items=media_items,
-                    message_id=message.id,
+                    message=message,
                     individual=individual,
                     practice_id=practice.id,
                     twilio_sid=message_sid
                 )
                 print("✅ Media attachments processed")
                 
+                # OCR → workflow for every attachment, then notify the agent once all are done
+                dispatch_attachment_pipeline(
+                    document_ids=document_ids,
+                    message_id=str(message.id),
+                    individual_id=str(individual.id),
+                    practice_id=str(practice.id)
+                )
+                
                 # For media messages, we don't trigger the main agent, as the document workflow handles it
                 return {"status": "success", "message": "Media processed", "message_id": str(message.id)}
             
@@ -471,7 +671,10 @@ class MessageService:
             print(f"🔍 Looking for individual with phone number: {clean_phone}")
             
             individual_result = await db.execute(
-                select(Individual).where(Individual.primary_mobile == clean_phone)
+                select(Individual).where(
+                    Individual.primary_mobile_e164 == normalize_phone_number(clean_phone),
+                    Individual.practice_id == practice_id
+                )
             )
             individual = individual_result.scalar_one_or_none()
             
@@ -505,19 +708,29 @@ class MessageService:
             await db.commit()
             await db.refresh(message)
             print(f"✅ Message saved with ID: {message.id}")
+            await publish_event(practice_id, MESSAGE_CREATED, message_event_data(message))
             
             # Process any media attachments
             if media_items:
                 print(f"📎 Processing {len(media_items)} media attachments...")
-                await MessageService._save_whatsapp_media_attachments(
+                document_ids = await MessageService._save_whatsapp_media_attachments(
                     db=db,
                     media_items=media_items,
-                    message_id=message.id,
+                    message=message,
                     individual=individual,
                     practice_id=practice_id,
                     twilio_sid=twilio_sid
                 )
                 print("✅ Media attachments processed")
+                
+                # The agent is triggered below, so the pipeline callback doesn't need to notify it
+                dispatch_attachment_pipeline(
+                    document_ids=document_ids,
+                    message_id=str(message.id),
+                    individual_id=str(individual.id),
+                    practice_id=str(practice_id),
+                    notify_agent=False
+                )
             
             # Trigger Celery task for processing
             try:
@@ -566,20 +779,23 @@ class MessageService:
     async def _save_whatsapp_media_attachments(
         db: AsyncSession,
         media_items: List[Dict[str, Any]],
-        message_id: UUID,
+        message: Message,
         individual: Individual,
         practice_id: UUID,
         twilio_sid: str
-    ) -> None:
-        """Save WhatsApp media attachments as documents."""
+    ) -> List[str]:
+        """
+        Save WhatsApp media attachments as documents, with their files in document storage
+        (identical files are stored once).
+        
+        Returns the ids of the saved documents that need OCR processing; the caller
+        dispatches them as one pipeline (see dispatch_attachment_pipeline).
+        """
+        ocr_document_ids = []
+        # Read up front: a failed item's rollback expires the message
+        message_id, message_created_at = message.id, message.created_at
         try:
-            # Create directory structure
-            base_dir = Path("documents")
-            practice_dir = base_dir / str(practice_id)
-            individual_dir = practice_dir / str(individual.id)
             now = datetime.now()
-            date_dir = individual_dir / str(now.year) / f"{now.month:02d}"
-            date_dir.mkdir(parents=True, exist_ok=True)
             
             # Get Twilio credentials
             twilio_account_sid = os.getenv('TWILIO_ACCOUNT_SID')
@@ -605,19 +821,20 @@ class MessageService:
                             extension = mimetypes.guess_extension(content_type) or ".bin"
                             timestamp = now.strftime("%Y%m%d_%H%M%S")
                             filename = f"whatsapp_{timestamp}_{twilio_sid}_{media_index}{extension}"
-                            file_path = date_dir / filename
                             
-                            # Save file
-                            with open(file_path, 'wb') as f:
+                            # Save file, hashed as it downloads
+                            with SpooledUpload() as upload:
                                 async for chunk in response.content.iter_chunked(8192):
-                                    f.write(chunk)
+                                    upload.write(chunk)
+                                stored_file = await document_storage_service.store(db, upload, content_type)
                             
                             # Create document record
                             document = Document(
                                 filename=filename,
                                 original_filename=f"WhatsApp_Media_{media_index}{extension}",
-                                document_url=str(file_path),
-                                file_size=str(os.path.getsize(file_path)),
+                                document_url=document_storage_service.url(stored_file.sha256),
+                                content_sha256=stored_file.sha256,
+                                file_size=str(stored_file.size),
                                 mime_type=content_type,
                                 document_type=MessageService._get_document_type_from_mime(content_type),
                                 document_source=DocumentSource.whatsapp,
@@ -628,6 +845,7 @@ class MessageService:
                                 practice_id=practice_id,
                                 individual_id=individual.id,
                                 message_id=message_id,
+                                message_created_at=message_created_at,
                                 agent_state=DocumentAgentState.pending,
                                 upload_source_details={
                                     "source": "whatsapp",
@@ -641,15 +859,19 @@ class MessageService:
                             db.add(document)
                             await db.commit()
                             await db.refresh(document)
+                            await publish_event(practice_id, DOCUMENT_STATE, document_event_data(document))
                             
-                            # Trigger OCR processing for PDF and image documents
+                            # Queue PDF and image documents for OCR processing
                             if document.document_type in [DocumentType.pdf, DocumentType.image]:
-                                print(f"🔍 Triggering OCR processing for document {document.id}")
-                                process_document_ocr.delay(str(document.id))
+                                ocr_document_ids.append(str(document.id))
                             
                     except Exception as e:
                         print(f"Error saving media item {media_index}: {str(e)}")
+                        # Drop this item's storage reference along with the failed document
+                        await db.rollback()
                         continue
+            
+            return ocr_document_ids
                 
         except Exception as e:
             print(f"Error saving media attachments: {str(e)}")
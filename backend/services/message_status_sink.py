@@ -0,0 +1,248 @@
+"""
+Coalescing sink for Twilio message status callbacks.
+
+Twilio sends several callbacks per outbound message (sent, delivered, read...). Instead of
+a SELECT and a commit per callback, the webhook buffers each callback in a Redis hash
+keyed by SID, keeping only the most advanced status. The first callback of a window
+schedules a flush task, which applies the whole buffer with a single
+UPDATE ... FROM (VALUES ...) that never moves a message's status backwards.
+
+A flush renames the buffer to a processing key before writing it and deletes that key
+once written. Processing keys left behind by a flush that gave up (or whose worker died)
+are merged back into the buffer by a later flush, so those updates are applied late
+rather than lost.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import redis
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from config.redis import get_async_redis, get_sync_redis
+from db.models.message import MessageStatus
+
+# Seconds callbacks are buffered before they are written
+FLUSH_WINDOW_SECONDS = 2
+# Rows per UPDATE statement when a flush is very large
+FLUSH_BATCH_SIZE = 1000
+
+PENDING_KEY = "message_status:pending"
+PROCESSING_KEY_PREFIX = "message_status:processing:"
+# Sorted set of processing keys scored by when they were taken
+PROCESSING_INDEX_KEY = "message_status:processing_since"
+FLUSH_SCHEDULED_KEY = "message_status:flush_scheduled"
+# A processing key this old has outlived its flush's retries and is merged back
+STALE_PROCESSING_SECONDS = 600
+
+# Delivery progress; a status only replaces a lower-ranked one
+STATUS_RANKS = {
+    MessageStatus.pending: 0,
+    MessageStatus.sent: 1,
+    MessageStatus.delivered: 2,
+    MessageStatus.read: 3,
+    MessageStatus.failed: 4,
+}
+
+# Twilio MessageStatus values handled as status callbacks
+TWILIO_STATUSES = {
+    "queued": MessageStatus.pending,
+    "accepted": MessageStatus.pending,
+    "sending": MessageStatus.pending,
+    "sent": MessageStatus.sent,
+    "delivered": MessageStatus.delivered,
+    "read": MessageStatus.read,
+    "failed": MessageStatus.failed,
+    "undelivered": MessageStatus.failed,
+}
+
+# Keep the buffered entry with the highest rank for a SID (entries are "<rank>|<json>")
+_BUFFER_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current then
+    local current_rank = tonumber(string.match(current, '^(%d+)|'))
+    if current_rank >= tonumber(ARGV[2]) then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2] .. '|' .. ARGV[3])
+return 1
+"""
+
+# Move the buffer to a flush's processing key, unless a retry of that flush already did
+_TAKE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    redis.call('ZADD', KEYS[3], ARGV[1], KEYS[2])
+end
+return 1
+"""
+
+# Merge a processing key back into the buffer, keeping the higher-ranked entry per SID
+_REQUEUE_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[2])
+for i = 1, #entries, 2 do
+    local rank = tonumber(string.match(entries[i + 1], '^(%d+)|'))
+    local current = redis.call('HGET', KEYS[1], entries[i])
+    if not current or tonumber(string.match(current, '^(%d+)|')) < rank then
+        redis.call('HSET', KEYS[1], entries[i], entries[i + 1])
+    end
+end
+redis.call('DEL', KEYS[2])
+redis.call('ZREM', KEYS[3], KEYS[2])
+return #entries / 2
+"""
+
+
+def is_status_callback(twilio_status: Optional[str]) -> bool:
+    return twilio_status in TWILIO_STATUSES
+
+
+def status_entry(twilio_status: str, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Buffered form of a callback: the mapped status, when it arrived and any error."""
+    status = TWILIO_STATUSES[twilio_status]
+    entry = {
+        "status": status.value,
+        "twilio_status": twilio_status,
+        "received_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if webhook_data.get("ErrorCode"):
+        entry["error_code"] = webhook_data.get("ErrorCode")
+        entry["error_message"] = webhook_data.get("ErrorMessage")
+    return entry
+
+
+async def buffer_status_callback(message_sid: str, twilio_status: str, webhook_data: Dict[str, Any]) -> bool:
+    """
+    Buffer a status callback for the next flush.
+
+    Returns False if Redis is unavailable, in which case the caller should apply the
+    update directly. Callbacks that cannot advance a status (queued, sending) are dropped.
+    """
+    status = TWILIO_STATUSES[twilio_status]
+    rank = STATUS_RANKS[status]
+    if rank == 0:
+        return True
+
+    try:
+        client = get_async_redis()
+        entry = json.dumps(status_entry(twilio_status, webhook_data))
+        await client.eval(_BUFFER_SCRIPT, 1, PENDING_KEY, message_sid, rank, entry)
+        # First callback of the window schedules the flush
+        scheduled = await client.set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=FLUSH_WINDOW_SECONDS * 10)
+    except redis.RedisError as e:
+        print(f"⚠️ Could not buffer status callback for {message_sid}: {e}")
+        return False
+
+    if scheduled:
+        from workers.tasks.message_status import flush_message_status_updates_task
+        try:
+            flush_message_status_updates_task.apply_async(countdown=FLUSH_WINDOW_SECONDS)
+        except Exception as e:
+            # The flag expires, so the next callback after it will schedule the flush again
+            print(f"⚠️ Could not schedule status flush: {e}")
+    return True
+
+
+def requeue_stale_updates() -> int:
+    """
+    Merge processing keys older than STALE_PROCESSING_SECONDS back into the buffer.
+
+    Applying an update twice is harmless (a status never moves backwards), so a key is
+    requeued even if its flush might still retry. Returns the number of entries requeued.
+    """
+    client = get_sync_redis()
+    requeued = 0
+    for processing_key in client.zrangebyscore(PROCESSING_INDEX_KEY, "-inf", time.time() - STALE_PROCESSING_SECONDS):
+        requeued += client.eval(_REQUEUE_SCRIPT, 3, PENDING_KEY, processing_key, PROCESSING_INDEX_KEY)
+    if requeued:
+        print(f"♻️ Requeued {requeued} status callbacks from abandoned flushes")
+    return requeued
+
+
+def take_buffered_updates(flush_id: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Atomically take the buffered callbacks for flushing.
+
+    The buffer is renamed to a per-flush key so callbacks arriving meanwhile start a new
+    window; a retried flush with the same id picks up the same entries. Stale processing
+    keys of earlier flushes are merged in first.
+    """
+    client = get_sync_redis()
+    processing_key = f"{PROCESSING_KEY_PREFIX}{flush_id}"
+    # Clear the flag first so a callback arriving from now on schedules the next flush
+    client.delete(FLUSH_SCHEDULED_KEY)
+    requeue_stale_updates()
+    if not client.eval(_TAKE_SCRIPT, 3, PENDING_KEY, processing_key, PROCESSING_INDEX_KEY, time.time()):
+        # Nothing buffered
+        return {}
+    entries = client.hgetall(processing_key)
+    return {sid: json.loads(value.split("|", 1)[1]) for sid, value in entries.items()}
+
+
+def release_buffered_updates(flush_id: str) -> None:
+    processing_key = f"{PROCESSING_KEY_PREFIX}{flush_id}"
+    client = get_sync_redis()
+    client.delete(processing_key)
+    client.zrem(PROCESSING_INDEX_KEY, processing_key)
+
+
+def _rank_case(column: str) -> str:
+    whens = " ".join(f"WHEN '{status.name}' THEN {rank}" for status, rank in STATUS_RANKS.items())
+    return f"CASE {column} {whens} ELSE 0 END"
+
+
+def apply_status_updates(db: Session, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply coalesced status updates with one UPDATE ... FROM (VALUES ...) per batch.
+
+    Only rows whose status would advance are written. Returns the updated messages
+    (id, practice_id, individual_id, status, direction, sender).
+    """
+    updated = []
+    items = list(updates.items())
+    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+        batch = items[start:start + FLUSH_BATCH_SIZE]
+        rows, params = [], {}
+        for i, (sid, entry) in enumerate(batch):
+            status = MessageStatus(entry["status"])
+            received_at = datetime.fromisoformat(entry["received_at"])
+            rows.append(
+                # Explicit casts so the statement also prepares under asyncpg (fallback path)
+                f"(CAST(:sid_{i} AS varchar), CAST(:status_{i} AS varchar), CAST(:rank_{i} AS integer), "
+                f"CAST(:delivered_{i} AS timestamptz), CAST(:read_{i} AS timestamptz), "
+                f"CAST(:error_{i} AS varchar), CAST(:metadata_{i} AS jsonb))"
+            )
+            params.update({
+                f"sid_{i}": sid,
+                f"status_{i}": status.name,
+                f"rank_{i}": STATUS_RANKS[status],
+                # A read receipt implies delivery, even if the delivered callback was coalesced away
+                f"delivered_{i}": received_at if status in (MessageStatus.delivered, MessageStatus.read) else None,
+                f"read_{i}": received_at if status == MessageStatus.read else None,
+                f"error_{i}": entry.get("error_message") or entry.get("error_code"),
+                f"metadata_{i}": json.dumps({f"status_update_{entry['twilio_status']}": entry}),
+            })
+
+        result = db.execute(text(f"""
+            UPDATE messages AS m SET
+                status = CAST(v.status AS messagestatus),
+                delivered_at = COALESCE(m.delivered_at, v.delivered_at),
+                read_at = COALESCE(m.read_at, v.read_at),
+                error_message = COALESCE(v.error_message, m.error_message),
+                message_metadata = CAST(COALESCE(CAST(m.message_metadata AS jsonb), '{{}}'::jsonb) || v.metadata AS json),
+                updated_at = now()
+            FROM (VALUES {", ".join(rows)}) AS v(twilio_sid, status, rank, delivered_at, read_at, error_message, metadata)
+            WHERE m.twilio_sid = v.twilio_sid
+              AND v.rank > {_rank_case("m.status::text")}
+            RETURNING m.id, m.practice_id, m.individual_id, m.status, m.direction, m.sender
+        """), params)
+        updated.extend(dict(row._mapping) for row in result)
+    db.commit()
+    return updated
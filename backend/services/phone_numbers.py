@@ -0,0 +1,39 @@
+import re
+from typing import Optional
+
+# Country calling code used for national-format numbers (practices are UK based)
+DEFAULT_COUNTRY_CODE = "44"
+
+_SEPARATORS = re.compile(r"[\s\-().]")
+
+
+def normalize_phone_number(phone_number: Optional[str], default_country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """
+    Normalise a phone number to E.164 (e.g. "+447700900123").
+
+    Accepts Twilio "whatsapp:" addresses, international numbers with "+" or "00",
+    and national numbers with a leading 0 (assumed to be in `default_country_code`).
+    Returns None if the value cannot be a valid E.164 number.
+    """
+    if not phone_number:
+        return None
+
+    number = phone_number.strip().replace("(0)", "")
+    if number.lower().startswith("whatsapp:"):
+        number = number[len("whatsapp:"):]
+    number = _SEPARATORS.sub("", number)
+
+    if number.startswith("+"):
+        digits = number[1:]
+    elif number.startswith("00"):
+        digits = number[2:]
+    elif number.startswith("0"):
+        digits = default_country_code + number[1:]
+    else:
+        digits = number
+
+    # E.164 allows at most 15 digits; anything under 7 is not a subscriber number
+    if not digits.isdigit() or not 7 <= len(digits) <= 15:
+        return None
+
+    return f"+{digits}"
@@ -0,0 +1,238 @@
+"""
+Real-time events for the practice portal.
+
+Events are scoped per practice. Publishing appends the event to a capped Redis stream
+(so clients can replay what they missed after a reconnect) and announces it on a pub/sub
+channel. Each API process runs a single pattern subscriber that fans events out to its
+connected SSE clients (see api/events.py) through bounded per-client queues.
+
+Events carry ids and states only; the portal fetches the data itself (e.g. with
+GET /messages/individual/{id}/since), so payloads stay small.
+"""
+
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+import redis
+
+from config.redis import get_async_redis, get_sync_redis
+
+# Event types
+MESSAGE_CREATED = "message.created"
+MESSAGE_STATUS = "message.status"
+DOCUMENT_STATE = "document.state"
+# Sent to a client whose cursor is older than the retained stream: it must refetch
+RESYNC = "resync"
+
+CHANNEL_PREFIX = "events:practice:"
+STREAM_MAXLEN = 1000         # Events kept per practice for reconnect replay
+CLIENT_QUEUE_SIZE = 100      # Events buffered per connection before it is dropped
+HEARTBEAT_SECONDS = 15
+
+
+def _channel(practice_id) -> str:
+    return f"{CHANNEL_PREFIX}{practice_id}"
+
+
+def _stream_key(practice_id) -> str:
+    return f"{CHANNEL_PREFIX}{practice_id}:stream"
+
+
+def _event_id_key(event_id: str) -> Tuple[int, int]:
+    """Sort key of a Redis stream id ("<ms>-<seq>")."""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def message_event_data(message) -> Dict[str, Any]:
+    return {
+        "message_id": str(message.id),
+        "individual_id": str(message.individual_id),
+        "direction": message.direction.value if message.direction else None,
+        "sender": message.sender.value if message.sender else None,
+        "status": message.status.value if message.status else None,
+    }
+
+
+def document_event_data(document) -> Dict[str, Any]:
+    return {
+        "document_id": str(document.id),
+        "agent_state": document.agent_state.value if document.agent_state else None,
+        "individual_id": str(document.individual_id) if document.individual_id else None,
+        "client_id": str(document.client_id) if document.client_id else None,
+    }
+
+
+def _encode(event_type: str, data: Dict[str, Any]) -> str:
+    return json.dumps({"type": event_type, "data": data}, default=str)
+
+
+async def publish_event(practice_id: UUID, event_type: str, data: Dict[str, Any]) -> Optional[str]:
+    """Publish an event to a practice's portal clients. Never raises; returns the event id."""
+    if not practice_id:
+        return None
+    payload = _encode(event_type, data)
+    try:
+        client = get_async_redis()
+        event_id = await client.xadd(_stream_key(practice_id), {"payload": payload}, maxlen=STREAM_MAXLEN, approximate=True)
+        await client.publish(_channel(practice_id), json.dumps({"id": event_id, "payload": payload}))
+        return event_id
+    except redis.RedisError as e:
+        print(f"⚠️ Failed to publish {event_type} event: {e}")
+        return None
+
+
+def publish_event_sync(practice_id: UUID, event_type: str, data: Dict[str, Any]) -> Optional[str]:
+    """Synchronous `publish_event` for Celery workers and agents."""
+    if not practice_id:
+        return None
+    payload = _encode(event_type, data)
+    try:
+        client = get_sync_redis()
+        event_id = client.xadd(_stream_key(practice_id), {"payload": payload}, maxlen=STREAM_MAXLEN, approximate=True)
+        client.publish(_channel(practice_id), json.dumps({"id": event_id, "payload": payload}))
+        return event_id
+    except redis.RedisError as e:
+        print(f"⚠️ Failed to publish {event_type} event: {e}")
+        return None
+
+
+class Subscription:
+    """A connected client: a bounded queue of (event_id, payload) for one practice."""
+
+    def __init__(self, practice_id: str):
+        self.practice_id = practice_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        # Set when the client fell behind or events may have been lost; the stream then
+        # ends and the client reconnects with its last event id to replay from Redis
+        self.lagging = False
+
+    def push(self, event_id: str, payload: str) -> None:
+        if self.lagging:
+            return
+        try:
+            self.queue.put_nowait((event_id, payload))
+        except asyncio.QueueFull:
+            self.lagging = True
+
+
+class EventHub:
+    """Per-process fan-out from the Redis pattern subscription to local subscriptions."""
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self, practice_id: UUID) -> Subscription:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        subscription = Subscription(str(practice_id))
+        self._subscriptions[subscription.practice_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.practice_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.practice_id]
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = get_async_redis().pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    practice_id = message["channel"][len(CHANNEL_PREFIX):]
+                    event = json.loads(message["data"])
+                    for subscription in list(self._subscriptions.get(practice_id, ())):
+                        subscription.push(event["id"], event["payload"])
+            except asyncio.CancelledError:
+                raise
+            except redis.RedisError as e:
+                print(f"⚠️ Event hub lost its Redis subscription: {e}")
+                # Events published meanwhile were missed, make every client replay
+                for subscriptions in self._subscriptions.values():
+                    for subscription in subscriptions:
+                        subscription.lagging = True
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, redis.RedisError):
+                pass
+            self._listener = None
+
+
+event_hub = EventHub()
+
+
+def _format_sse(event_id: Optional[str], payload: str) -> str:
+    event = json.loads(payload)
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event['data'])}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_practice_events(practice_id: UUID, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for a practice.
+
+    With `last_event_id` the events published since then are replayed from the Redis
+    stream first. If that id has already been trimmed, a `resync` event tells the client
+    to refetch its state. The stream ends when the client falls behind; EventSource then
+    reconnects with Last-Event-ID and catches up from the stream.
+    """
+    # Subscribe before reading the backlog so nothing published in between is lost
+    subscription = event_hub.subscribe(practice_id)
+    try:
+        yield "retry: 3000\n\n"
+
+        if last_event_id:
+            try:
+                _event_id_key(last_event_id)
+            except ValueError:
+                last_event_id = None
+                yield _format_sse(None, _encode(RESYNC, {"reason": "invalid cursor"}))
+
+        last_sent = last_event_id
+        if last_event_id:
+            client = get_async_redis()
+            try:
+                oldest = await client.xrange(_stream_key(practice_id), count=1)
+                if oldest and _event_id_key(oldest[0][0]) > _event_id_key(last_event_id):
+                    yield _format_sse(None, _encode(RESYNC, {"reason": "cursor expired"}))
+                backlog = await client.xrange(_stream_key(practice_id), min=f"({last_event_id}")
+            except redis.RedisError:
+                yield _format_sse(None, _encode(RESYNC, {"reason": "replay unavailable"}))
+                backlog = []
+            for event_id, fields in backlog:
+                yield _format_sse(event_id, fields["payload"])
+                last_sent = event_id
+
+        while not subscription.lagging:
+            try:
+                event_id, payload = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            # Skip events already replayed from the stream
+            if last_sent and _event_id_key(event_id) <= _event_id_key(last_sent):
+                continue
+            yield _format_sse(event_id, payload)
+            last_sent = event_id
+    finally:
+        event_hub.unsubscribe(subscription)
@@ -95,7 +95,8 @@ class TwilioService:
                 "success": False,
                 "error": str(e),
                 "error_code": getattr(e, 'code', None),
-                "error_message": getattr(e, 'msg', str(e))
+                "error_message": getattr(e, 'msg', str(e)),
+                "http_status": getattr(e, 'status', None)  # Set for REST API errors (429, 5xx...)
             }
         except Exception as e:
             return {
@@ -0,0 +1,104 @@
+"""
+Shared fixtures for the backend tests.
+
+The tests run against the services configured in settings (DATABASE_URL, REDIS_HOST...),
+with the database migrated to head. Tests that need a service which cannot be reached
+are skipped.
+
+Twilio is never called: the tests that send replace it with a fake, so dummy credentials
+are enough for the module-level twilio_service to be created.
+"""
+
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+import redis
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("TWILIO_ACCOUNT_SID", "ACtest")
+os.environ.setdefault("TWILIO_AUTH_TOKEN", "test")
+
+from config.database import sync_engine, async_database_url, _asyncpg_connect_args
+from config.redis import get_sync_redis
+from db.models import Practice, Individual
+
+
+@pytest.fixture
+def redis_client():
+    """The workers' Redis client, with the message status keys cleared around the test."""
+    client = get_sync_redis()
+    try:
+        client.ping()
+    except redis.RedisError as e:
+        pytest.skip(f"Redis unavailable: {e}")
+
+    def clear():
+        for key in client.scan_iter("message_status:*"):
+            client.delete(key)
+
+    clear()
+    yield client
+    clear()
+
+
+@pytest.fixture
+def db_session():
+    """
+    A sync session inside a transaction that is rolled back after the test.
+
+    Commits made by the code under test only release a savepoint, so nothing is left in
+    the database.
+    """
+    try:
+        connection = sync_engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"Database unavailable: {e}")
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest_asyncio.fixture
+async def async_db_session():
+    """db_session for async code. Unpooled, as each test runs in its own event loop."""
+    engine = create_async_engine(async_database_url, connect_args=_asyncpg_connect_args(), poolclass=NullPool)
+    try:
+        connection = await engine.connect()
+    except (OSError, OperationalError) as e:
+        await engine.dispose()
+        pytest.skip(f"Database unavailable: {e}")
+    transaction = await connection.begin()
+    session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+def practice(db_session):
+    practice = Practice(name="Test Practice", whatsapp_number=f"+4477009{uuid.uuid4().int % 100000:05d}")
+    db_session.add(practice)
+    db_session.flush()
+    return practice
+
+
+@pytest.fixture
+def individual(db_session, practice):
+    individual = Individual(practice_id=practice.id, first_name="Test", last_name="Client", primary_mobile="+447700900123")
+    db_session.add(individual)
+    db_session.flush()
+    return individual
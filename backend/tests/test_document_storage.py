@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import select
+
+from db.models import Document, DocumentType, DocumentSource, Practice, StoredFile
+from services import document_storage
+from services.document_storage import (
+    DocumentStorage, LocalDocumentStorage, SpooledUpload, document_storage_service, storage_key,
+    _fix_reference_counts, _delete_orphan_files,
+)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = LocalDocumentStorage(str(tmp_path))
+    monkeypatch.setattr(document_storage, "get_document_storage", lambda: storage)
+    return storage
+
+
+def upload(content: bytes) -> SpooledUpload:
+    spooled = SpooledUpload()
+    spooled.write(content)
+    return spooled
+
+
+def stored_keys(storage):
+    return sorted(key for key, _ in storage.list_files("sha256/"))
+
+
+def test_backends_implement_every_operation():
+    with pytest.raises(TypeError):
+        DocumentStorage()
+
+
+def test_identical_uploads_share_one_file(db_session, storage):
+    first = document_storage_service.store_sync(db_session, upload(b"receipt"), "application/pdf")
+    second = document_storage_service.store_sync(db_session, upload(b"receipt"), "application/pdf")
+
+    assert first.sha256 == second.sha256
+    assert db_session.get(StoredFile, first.sha256).refcount == 2
+    assert stored_keys(storage) == [storage_key(first.sha256)]
+
+
+def test_missing_file_is_written_again_by_the_next_identical_upload(db_session, storage):
+    stored = document_storage_service.store_sync(db_session, upload(b"receipt"))
+    storage.delete(storage_key(stored.sha256))
+
+    document_storage_service.store_sync(db_session, upload(b"receipt"))
+
+    assert storage.exists(storage_key(stored.sha256))
+
+
+async def add_document(db, sha256):
+    practice = Practice(name="Test Practice")
+    db.add(practice)
+    await db.flush()
+    document = Document(
+        practice_id=practice.id, filename="receipt.pdf", document_url=document_storage_service.url(sha256),
+        content_sha256=sha256, document_type=DocumentType.pdf, document_source=DocumentSource.upload,
+    )
+    db.add(document)
+    await db.flush()
+    return document
+
+
+@pytest.mark.asyncio
+async def test_gc_corrects_refcount_and_deletes_unreferenced_files(async_db_session, storage):
+    db = async_db_session
+    used = (await document_storage_service.store(db, upload(b"used"))).sha256
+    await document_storage_service.store(db, upload(b"used"))
+    unused = (await document_storage_service.store(db, upload(b"unused"))).sha256
+    await add_document(db, used)
+    await db.commit()
+
+    await _fix_reference_counts(db)
+
+    refcounts = dict((await db.execute(
+        select(StoredFile.sha256, StoredFile.refcount).where(StoredFile.sha256.in_([used, unused]))
+    )).all())
+    assert refcounts == {used: 1}
+    assert stored_keys(storage) == [storage_key(used)]
+
+
+@pytest.mark.asyncio
+async def test_gc_deletes_files_of_rolled_back_uploads(async_db_session, storage):
+    db = async_db_session
+    kept = (await document_storage_service.store(db, upload(b"kept"))).sha256
+    await db.commit()
+    rolled_back = (await document_storage_service.store(db, upload(b"rolled back"))).sha256
+    await db.rollback()
+    assert storage.exists(storage_key(rolled_back))
+
+    # Recent files may belong to a transaction that is still open
+    assert await _delete_orphan_files(db) == 0
+    assert await _delete_orphan_files(db, grace_seconds=0) == 1
+
+    assert stored_keys(storage) == [storage_key(kept)]
+
+
+@pytest.mark.asyncio
+async def test_gc_deletes_temporary_files_of_interrupted_writes(async_db_session, storage, tmp_path):
+    leftover = tmp_path / "sha256" / "ab" / "cd" / ".upload-x1y2z3"
+    leftover.parent.mkdir(parents=True)
+    leftover.write_bytes(b"partial")
+    hour_ago = time.time() - 3600
+    os.utime(leftover, (hour_ago, hour_ago))
+
+    assert await _delete_orphan_files(async_db_session, grace_seconds=60) == 1
+    assert not leftover.exists()
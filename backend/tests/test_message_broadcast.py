@@ -0,0 +1,119 @@
+import pytest
+
+from db.models import Message, MessageType, MessageDirection, MessageStatus, MessageBroadcast, BroadcastStatus
+from services.twilio_service import twilio_service
+from workers.retry_policy import TransientUpstreamError
+from workers.tasks import message_broadcast
+from workers.tasks.message_broadcast import send_broadcast_message, is_retryable_send_failure, dispatch_message_broadcast_task
+
+SENT = {"success": True, "sid": None, "status": "queued"}
+RATE_LIMITED = {"success": False, "error": "Too Many Requests", "error_code": 20429, "http_status": 429}
+REJECTED = {"success": False, "error": "Invalid 'To' number", "error_code": 21211, "http_status": 400}
+
+
+class FakeTwilio:
+    """Stands in for the Twilio API: answers with `responses` in turn, then accepts everything."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_to = []
+
+    async def send_whatsapp_message(self, to_phone, from_whatsapp_number, message_body):
+        response = dict(self.responses.pop(0) if self.responses else SENT)
+        if response["success"]:
+            self.sent_to.append(to_phone)
+            response["sid"] = f"SM{len(self.sent_to):032d}"
+        return response
+
+
+@pytest.fixture
+def broadcast(db_session, practice, individual):
+    broadcast = MessageBroadcast(practice_id=practice.id, body_template="Hello {first_name}", status=BroadcastStatus.sending)
+    db_session.add(broadcast)
+    db_session.flush()
+    for n in range(3):
+        db_session.add(Message(
+            practice_id=practice.id, individual_id=individual.id, broadcast_id=broadcast.id,
+            message_type=MessageType.whatsapp, direction=MessageDirection.outgoing, status=MessageStatus.pending,
+            body="Hello Test", from_address="whatsapp:+447700900000", to_address=f"+44770090010{n}",
+        ))
+    db_session.commit()
+    return broadcast
+
+
+def broadcast_messages(db_session, broadcast):
+    db_session.expire_all()
+    return db_session.query(Message).filter(Message.broadcast_id == broadcast.id).all()
+
+
+def use_twilio(monkeypatch, fake):
+    monkeypatch.setattr(twilio_service, "send_whatsapp_message", fake.send_whatsapp_message)
+    return fake
+
+
+def test_sent_message_survives_a_later_rate_limited_send(db_session, broadcast, monkeypatch):
+    use_twilio(monkeypatch, FakeTwilio(SENT, RATE_LIMITED))
+
+    assert send_broadcast_message(db_session, broadcast.id) == MessageStatus.sent
+    with pytest.raises(TransientUpstreamError):
+        send_broadcast_message(db_session, broadcast.id)
+
+    messages = broadcast_messages(db_session, broadcast)
+    sent = [message for message in messages if message.status == MessageStatus.sent]
+    assert len(sent) == 1 and sent[0].twilio_sid == "SM" + "1".zfill(32)
+    # The rate-limited message is left for the retry rather than failed
+    assert sum(message.status == MessageStatus.pending for message in messages) == 2
+
+
+def test_retry_only_sends_messages_that_were_never_sent(db_session, broadcast, monkeypatch):
+    twilio = use_twilio(monkeypatch, FakeTwilio(SENT, RATE_LIMITED))
+    send_broadcast_message(db_session, broadcast.id)
+    with pytest.raises(TransientUpstreamError):
+        send_broadcast_message(db_session, broadcast.id)
+
+    while send_broadcast_message(db_session, broadcast.id):
+        pass
+
+    assert sorted(twilio.sent_to) == ["+447700900100", "+447700900101", "+447700900102"]
+    assert all(message.status == MessageStatus.sent for message in broadcast_messages(db_session, broadcast))
+
+
+def test_rejected_send_fails_only_that_message(db_session, broadcast, monkeypatch):
+    use_twilio(monkeypatch, FakeTwilio(REJECTED))
+
+    assert send_broadcast_message(db_session, broadcast.id) == MessageStatus.failed
+    assert send_broadcast_message(db_session, broadcast.id) == MessageStatus.sent
+    assert send_broadcast_message(db_session, broadcast.id) == MessageStatus.sent
+    assert send_broadcast_message(db_session, broadcast.id) is None
+
+    failed = [message for message in broadcast_messages(db_session, broadcast) if message.status == MessageStatus.failed]
+    assert len(failed) == 1 and failed[0].error_message == REJECTED["error"]
+
+
+def test_broadcast_fails_when_retries_are_used_up(db_session, redis_client, broadcast, monkeypatch):
+    for key in redis_client.scan_iter("circuit:*"):
+        redis_client.delete(key)
+    use_twilio(monkeypatch, FakeTwilio(RATE_LIMITED))
+    monkeypatch.setattr(message_broadcast, "get_sync_session", lambda: db_session)
+    broadcast_id = broadcast.id  # The task closes the session
+
+    result = dispatch_message_broadcast_task.apply(args=[str(broadcast_id)], retries=5).get()
+
+    assert result["status"] == "failed" and result["failed"] == 3
+    assert db_session.get(MessageBroadcast, broadcast_id).status == BroadcastStatus.failed
+    messages = db_session.query(Message).filter(Message.broadcast_id == broadcast_id).all()
+    assert all(message.status == MessageStatus.failed for message in messages)
+    assert messages[0].error_message.startswith("Broadcast failed: twilio: Too Many Requests")
+    for key in redis_client.scan_iter("circuit:*"):
+        redis_client.delete(key)
+
+
+@pytest.mark.parametrize("response, retryable", [
+    (RATE_LIMITED, True),
+    ({"success": False, "error": "Service Unavailable", "http_status": 503}, True),
+    (REJECTED, False),
+    # No HTTP status: the request may have reached Twilio, so it is not sent again
+    ({"success": False, "error": "Unexpected error: Read timed out"}, False),
+])
+def test_is_retryable_send_failure(response, retryable):
+    assert is_retryable_send_failure(response) is retryable
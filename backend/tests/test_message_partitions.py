@@ -0,0 +1,141 @@
+"""
+Tests for the optional monthly partitioning of messages (db/message_partitions.py).
+
+The conversion runs inside the test's transaction, so the table is back to normal once
+it is rolled back.
+"""
+
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from db.message_partitions import (
+    DEFAULT_PARTITION, partition_name, is_messages_partitioned,
+    convert_messages_to_partitioned, ensure_message_partitions,
+)
+from db.models import Message, MessageType, MessageDirection, MessageStatus, Document, DocumentType, DocumentSource
+
+
+@pytest.fixture
+def conn(db_session):
+    connection = db_session.connection()
+    if is_messages_partitioned(connection):
+        pytest.skip("messages is already partitioned in this database")
+    return connection
+
+
+def add_message(db_session, individual, created_at):
+    message = Message(
+        practice_id=individual.practice_id, individual_id=individual.id,
+        message_type=MessageType.whatsapp, direction=MessageDirection.outgoing, status=MessageStatus.sent,
+        body="Hello", from_address="+447700900000", to_address=individual.primary_mobile,
+        created_at=created_at,
+    )
+    db_session.add(message)
+    db_session.flush()
+    return message.id
+
+
+def partition_of(conn, message_id):
+    return conn.execute(
+        text("SELECT tableoid::regclass::text FROM messages WHERE id = :id"), {"id": message_id}
+    ).scalar()
+
+
+@pytest.mark.parametrize("month, name", [
+    (date(2025, 1, 31), "messages_y2025m01"),
+    (date(2025, 12, 1), "messages_y2025m12"),
+])
+def test_partition_name(month, name):
+    assert partition_name(month) == name
+
+
+def test_convert_keeps_rows_in_their_month(db_session, conn, individual):
+    now = datetime.now(timezone.utc)
+    old_id = add_message(db_session, individual, datetime(2024, 11, 15, 23, 30, tzinfo=timezone.utc))
+    new_id = add_message(db_session, individual, now)
+    count_before = conn.execute(text("SELECT count(*) FROM messages")).scalar()
+
+    names = convert_messages_to_partitioned(conn, months_ahead=2)
+
+    assert is_messages_partitioned(conn)
+    # Every month from the oldest row up to two months ahead, across the year boundary
+    assert names[0] <= "messages_y2024m11"
+    assert {"messages_y2024m11", "messages_y2024m12", "messages_y2025m01", partition_name(now.date())} <= set(names)
+    assert conn.execute(text("SELECT count(*) FROM messages")).scalar() == count_before
+    assert partition_of(conn, old_id) == "messages_y2024m11"
+    assert partition_of(conn, new_id) == partition_name(now.date())
+    assert conn.execute(text("SELECT to_regclass('messages_unpartitioned')")).scalar() is None
+
+
+def test_convert_recreates_keys_and_indexes(db_session, conn, individual):
+    indexes_before = set(conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'messages'"
+    )).scalars())
+    foreign_keys_before = set(conn.execute(text(
+        "SELECT conname FROM pg_constraint WHERE contype = 'f' AND conrelid = 'messages'::regclass"
+    )).scalars())
+
+    convert_messages_to_partitioned(conn)
+
+    assert set(conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'messages'"
+    )).scalars()) == indexes_before
+    assert set(conn.execute(text(
+        "SELECT conname FROM pg_constraint WHERE contype = 'f' AND conrelid = 'messages'::regclass"
+    )).scalars()) == foreign_keys_before
+    assert conn.execute(text(
+        "SELECT pg_get_constraintdef(oid) FROM pg_constraint WHERE conname = 'messages_pkey'"
+    )).scalar() == "PRIMARY KEY (id, created_at)"
+    # The ORM still inserts by id alone
+    assert partition_of(conn, add_message(db_session, individual, datetime.now(timezone.utc)))
+
+
+def test_convert_keeps_foreign_keys_to_messages(db_session, conn, practice, individual):
+    message_id = add_message(db_session, individual, datetime(2024, 11, 15, tzinfo=timezone.utc))
+    message = db_session.get(Message, message_id)
+    document = Document(
+        practice_id=practice.id, filename="receipt.pdf", document_url="/documents/receipt.pdf", document_type=DocumentType.pdf,
+        document_source=DocumentSource.whatsapp, message_id=message.id, message_created_at=message.created_at,
+    )
+    db_session.add(document)
+    db_session.flush()
+
+    convert_messages_to_partitioned(conn)
+
+    assert conn.execute(text(
+        "SELECT conrelid::regclass::text FROM pg_constraint "
+        "WHERE conname = 'documents_message_fkey' AND confrelid = 'messages'::regclass"
+    )).scalar() == "documents"
+    with pytest.raises(IntegrityError), db_session.begin_nested():
+        conn.execute(text("DELETE FROM messages WHERE id = :id"), {"id": message_id})
+
+
+def test_convert_refuses_foreign_keys_by_id_alone(conn):
+    conn.execute(text("ALTER TABLE messages ADD CONSTRAINT messages_id_key UNIQUE (id)"))
+    conn.execute(text(
+        "ALTER TABLE documents ADD CONSTRAINT documents_message_id_fkey FOREIGN KEY (message_id) REFERENCES messages (id)"
+    ))
+
+    with pytest.raises(RuntimeError, match="documents.documents_message_id_fkey"):
+        convert_messages_to_partitioned(conn)
+
+
+def test_rows_outside_the_monthly_ranges_go_to_the_default_partition(db_session, conn, individual):
+    convert_messages_to_partitioned(conn, months_ahead=1)
+
+    message_id = add_message(db_session, individual, datetime(2099, 1, 1, tzinfo=timezone.utc))
+
+    assert partition_of(conn, message_id) == DEFAULT_PARTITION
+
+
+def test_convert_and_ensure_are_idempotent(conn):
+    names = convert_messages_to_partitioned(conn, months_ahead=3)
+
+    assert convert_messages_to_partitioned(conn) == []
+    assert ensure_message_partitions(conn, months_ahead=3) == names[-4:]
+    assert conn.execute(text(
+        "SELECT count(*) FROM pg_inherits WHERE inhparent = 'messages'::regclass"
+    )).scalar() == len(names) + 1
@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from db.models import Practice, Individual
+from services import message_service
+from services.message_service import MessageService
+
+
+@pytest_asyncio.fixture
+async def practice(async_db_session):
+    practice = Practice(name="Test Practice", whatsapp_number=f"+4477009{uuid.uuid4().int % 100000:05d}")
+    async_db_session.add(practice)
+    await async_db_session.flush()
+    return practice
+
+
+@pytest.fixture(autouse=True)
+def participant_cache(monkeypatch):
+    cache = message_service._ParticipantCache()
+    monkeypatch.setattr(message_service, "_participant_cache", cache)
+    return cache
+
+
+async def add_individual(db, practice, mobile, created_at):
+    individual = Individual(
+        practice_id=practice.id, first_name="Test", last_name="Client", primary_mobile=mobile, created_at=created_at
+    )
+    db.add(individual)
+    await db.flush()
+    return individual
+
+
+@pytest.mark.asyncio
+async def test_shared_mobile_resolves_to_the_oldest_individual(async_db_session, practice):
+    now = datetime.now(timezone.utc)
+    newer = await add_individual(async_db_session, practice, "+447700900123", now)
+    older = await add_individual(async_db_session, practice, "07700 900123", now - timedelta(days=30))
+
+    for _ in range(3):
+        individual, resolved_practice = await MessageService.resolve_whatsapp_participants(
+            async_db_session, "whatsapp:+447700900123", f"whatsapp:{practice.whatsapp_number}"
+        )
+        assert individual.id == older.id != newer.id and resolved_practice.id == practice.id
+
+
+@pytest.mark.asyncio
+async def test_cached_participants_stop_resolving_after_a_number_change(async_db_session, practice, participant_cache):
+    individual = await add_individual(async_db_session, practice, "+447700900123", datetime.now(timezone.utc))
+    from_phone, to_phone = "whatsapp:+447700900123", f"whatsapp:{practice.whatsapp_number}"
+
+    assert (await MessageService.resolve_whatsapp_participants(async_db_session, from_phone, to_phone))[0] is individual
+    assert participant_cache.get(("+447700900123", practice.whatsapp_number))
+
+    individual.primary_mobile = "+447700900999"
+    await async_db_session.flush()
+
+    assert await MessageService.resolve_whatsapp_participants(async_db_session, from_phone, to_phone) == (None, None)
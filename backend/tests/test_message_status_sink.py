@@ -0,0 +1,117 @@
+import json
+import uuid
+
+import pytest
+
+from db.models import Message, MessageType, MessageDirection, MessageStatus
+from services import message_status_sink
+from services.message_status_sink import (
+    PENDING_KEY, PROCESSING_KEY_PREFIX, PROCESSING_INDEX_KEY, STATUS_RANKS, TWILIO_STATUSES, _BUFFER_SCRIPT,
+    status_entry, take_buffered_updates, release_buffered_updates, apply_status_updates,
+)
+
+
+def buffer(client, sid, twilio_status, **webhook_data):
+    """Buffer a callback the way buffer_status_callback does, without scheduling a flush."""
+    rank = STATUS_RANKS[TWILIO_STATUSES[twilio_status]]
+    client.eval(_BUFFER_SCRIPT, 1, PENDING_KEY, sid, rank, json.dumps(status_entry(twilio_status, webhook_data)))
+
+
+def test_buffer_keeps_the_most_advanced_status(redis_client):
+    buffer(redis_client, "SM1", "delivered")
+    buffer(redis_client, "SM1", "sent")
+    buffer(redis_client, "SM2", "sent")
+    buffer(redis_client, "SM2", "read")
+
+    updates = take_buffered_updates("flush-1")
+
+    assert updates["SM1"]["twilio_status"] == "delivered"
+    assert updates["SM2"]["twilio_status"] == "read"
+
+
+def test_retried_flush_takes_the_same_entries(redis_client):
+    buffer(redis_client, "SM1", "sent")
+    first = take_buffered_updates("flush-1")
+    buffer(redis_client, "SM2", "delivered")
+
+    assert take_buffered_updates("flush-1") == first
+    # The callback that arrived meanwhile waits for the next flush
+    assert set(take_buffered_updates("flush-2")) == {"SM2"}
+
+
+def test_released_flush_leaves_nothing_behind(redis_client):
+    buffer(redis_client, "SM1", "sent")
+    take_buffered_updates("flush-1")
+    release_buffered_updates("flush-1")
+
+    assert not redis_client.exists(f"{PROCESSING_KEY_PREFIX}flush-1")
+    assert redis_client.zcard(PROCESSING_INDEX_KEY) == 0
+
+
+def test_flush_failing_after_the_rename_is_requeued(redis_client, monkeypatch):
+    buffer(redis_client, "SM1", "delivered")
+    buffer(redis_client, "SM2", "sent")
+    # The flush takes the buffer and then fails for good, without releasing it
+    take_buffered_updates("flush-1")
+    buffer(redis_client, "SM1", "sent")
+    buffer(redis_client, "SM2", "read")
+
+    # Not stale yet: the failed flush might still retry
+    assert set(take_buffered_updates("flush-2")) == {"SM1", "SM2"}
+    assert redis_client.exists(f"{PROCESSING_KEY_PREFIX}flush-1")
+    release_buffered_updates("flush-2")
+
+    buffer(redis_client, "SM1", "sent")
+    buffer(redis_client, "SM2", "read")
+    monkeypatch.setattr(message_status_sink, "STALE_PROCESSING_SECONDS", 0)
+    updates = take_buffered_updates("flush-3")
+
+    # Merged back by rank: the orphaned delivered beats the newer sent, read beats sent
+    assert updates["SM1"]["twilio_status"] == "delivered"
+    assert updates["SM2"]["twilio_status"] == "read"
+    assert not redis_client.exists(f"{PROCESSING_KEY_PREFIX}flush-1")
+    assert redis_client.zrange(PROCESSING_INDEX_KEY, 0, -1) == [f"{PROCESSING_KEY_PREFIX}flush-3"]
+
+
+@pytest.fixture
+def outbound_message(db_session, practice, individual):
+    def create(status):
+        message = Message(
+            practice_id=practice.id, individual_id=individual.id,
+            message_type=MessageType.whatsapp, direction=MessageDirection.outgoing, status=status,
+            body="Hello", from_address="whatsapp:+447700900000", to_address=individual.primary_mobile,
+            twilio_sid=f"SM{uuid.uuid4().hex}",
+        )
+        db_session.add(message)
+        db_session.flush()
+        return message
+    return create
+
+
+def test_apply_status_updates_never_moves_a_status_backwards(db_session, outbound_message):
+    sent = outbound_message(MessageStatus.sent)
+    read = outbound_message(MessageStatus.read)
+
+    updated = apply_status_updates(db_session, {
+        sent.twilio_sid: status_entry("delivered", {}),
+        read.twilio_sid: status_entry("delivered", {}),
+    })
+
+    assert [row["id"] for row in updated] == [sent.id]
+    db_session.refresh(sent)
+    db_session.refresh(read)
+    assert sent.status == MessageStatus.delivered and sent.delivered_at is not None
+    assert read.status == MessageStatus.read
+
+
+def test_apply_status_updates_records_failures(db_session, outbound_message):
+    message = outbound_message(MessageStatus.delivered)
+
+    apply_status_updates(db_session, {
+        message.twilio_sid: status_entry("undelivered", {"ErrorCode": "63016", "ErrorMessage": "Outside the session window"}),
+    })
+
+    db_session.refresh(message)
+    assert message.status == MessageStatus.failed
+    assert message.error_message == "Outside the session window"
+    assert message.message_metadata["status_update_undelivered"]["error_code"] == "63016"
@@ -0,0 +1,45 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from api.users import get_current_user_from_url
+from db.models import Practice, User, UserRole
+from services.auth_service import create_user_token, create_url_token, verify_token, URL_TOKEN_SCOPE
+
+
+def make_user(practice_id=None):
+    return User(
+        id=uuid.uuid4(), email=f"{uuid.uuid4().hex[:8]}@example.com", password_hash="x",
+        role=UserRole.accountant, practice_id=practice_id or uuid.uuid4(),
+    )
+
+
+def test_url_token_is_not_an_access_token():
+    user = make_user()
+
+    assert verify_token(create_url_token(user), scope=URL_TOKEN_SCOPE).user_id == user.id
+    with pytest.raises(HTTPException):
+        verify_token(create_url_token(user))
+    with pytest.raises(HTTPException):
+        verify_token(create_user_token(user), scope=URL_TOKEN_SCOPE)
+
+
+@pytest.mark.asyncio
+async def test_url_token_of_a_deleted_user_is_rejected(async_db_session):
+    db = async_db_session
+    practice = Practice(name="Test Practice", whatsapp_number=f"+4477009{uuid.uuid4().int % 100000:05d}")
+    db.add(practice)
+    await db.flush()
+    user = make_user(practice.id)
+    db.add(user)
+    await db.flush()
+    token = create_url_token(user)
+
+    assert (await get_current_user_from_url(token=token, authorization=None, db=db)).id == user.id
+
+    await db.delete(user)
+    await db.flush()
+    with pytest.raises(HTTPException) as rejected:
+        await get_current_user_from_url(token=token, authorization=None, db=db)
+    assert rejected.value.status_code == 401
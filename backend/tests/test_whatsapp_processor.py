@@ -0,0 +1,57 @@
+import pytest
+
+from db.models import Message, MessageType, MessageDirection, MessageStatus, MessageSender
+from workers.tasks import whatsapp_processor
+from workers.tasks.whatsapp_processor import claim_message_for_agent, _process_whatsapp_message_sync
+
+
+@pytest.fixture
+def message(db_session, individual):
+    message = Message(
+        practice_id=individual.practice_id, individual_id=individual.id,
+        message_type=MessageType.whatsapp, direction=MessageDirection.incoming, status=MessageStatus.delivered,
+        sender=MessageSender.client, body="Hi, is my return filed?",
+        from_address=individual.primary_mobile, to_address="+447700900000",
+        message_metadata={"webhook_data": {}},
+    )
+    db_session.add(message)
+    db_session.commit()
+    return message
+
+
+def test_message_is_claimed_once(db_session, message):
+    assert claim_message_for_agent(db_session, message.id)
+    assert not claim_message_for_agent(db_session, message.id)
+
+    db_session.refresh(message)
+    assert message.message_metadata["webhook_data"] == {}
+    assert message.message_metadata["agent_started_at"]
+
+
+def test_message_processed_before_claims_is_not_claimed(db_session, message):
+    message.message_metadata = {"agent_processed_at": "2026-01-01T00:00:00"}
+    db_session.commit()
+
+    assert not claim_message_for_agent(db_session, message.id)
+
+
+def test_failure_after_the_claim_is_not_retried(db_session, message, monkeypatch):
+    class FailingAgent:
+        def __init__(self, **kwargs):
+            pass
+
+        def process_message(self, message, documents):
+            raise ConnectionError("Connection reset after the reply was sent")
+
+    from agents.max_client_whatsapp import agent
+    monkeypatch.setattr(agent, "MaxClientWhatsAppAgent", FailingAgent)
+    monkeypatch.setattr(whatsapp_processor, "get_sync_session", lambda: db_session)
+    message_id = message.id  # The task closes the session
+    ids = [str(message_id), str(message.individual_id), str(message.practice_id)]
+
+    # A retryable error, but the reply may have gone out: recorded rather than raised
+    assert _process_whatsapp_message_sync(*ids)["success"] is False
+    assert _process_whatsapp_message_sync(*ids)["skipped"] is True
+
+    metadata = db_session.get(Message, message_id).message_metadata
+    assert metadata["agent_error"] == "Connection reset after the reply was sent"
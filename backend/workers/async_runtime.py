@@ -0,0 +1,122 @@
+"""Async runtime for Celery tasks.
+
+Each worker process gets one event loop, running in a background thread, and one
+asyncpg engine whose pool is sized to the worker's concurrency. Tasks written as
+coroutines (see `async_task`) run on that loop, so their DB queries and HTTP calls
+can overlap instead of blocking the worker like the sync `get_sync_session` path.
+
+The runtime is created lazily on first use and re-created after a fork, so it works
+with the prefork, threads and solo pools alike.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, AsyncIterator
+
+from celery.signals import worker_process_shutdown
+from celery.utils.log import get_task_logger
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from config.database import create_async_db_engine
+from workers.celery_app import celery_app
+
+logger = get_task_logger(__name__)
+
+
+def worker_pool_size() -> int:
+    """
+    Connections each worker process needs in its pool.
+
+    Prefork/solo children run one task at a time, so a single connection (plus overflow
+    for tasks that fan out with asyncio.gather) is enough. The threads pool runs
+    CELERY_CONCURRENCY tasks in one process and needs a connection per thread.
+    """
+    pool = os.getenv("CELERY_POOL", "prefork")
+    concurrency = int(os.getenv("CELERY_CONCURRENCY", "1"))
+    if pool == "threads":
+        return max(1, concurrency)
+    return 1
+
+
+class AsyncRuntime:
+    """Event loop thread and asyncpg engine owned by a single worker process."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="celery-async-runtime", daemon=True)
+        self._thread.start()
+
+        pool_size = worker_pool_size()
+        self.engine: AsyncEngine = create_async_db_engine(pool_size=pool_size, max_overflow=pool_size * 2)
+        self.session_factory = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        logger.info(f"Started async runtime in process {self.pid} (pool_size={pool_size})")
+
+    def run(self, coro: Awaitable) -> Any:
+        """Run a coroutine on the runtime loop and block the calling thread until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def shutdown(self) -> None:
+        try:
+            self.run(self.engine.dispose())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AsyncRuntime:
+    """Get the async runtime for the current process, creating it if needed."""
+    global _runtime
+    # A runtime inherited through fork has no running loop thread, start a fresh one
+    if _runtime is None or _runtime.pid != os.getpid():
+        with _runtime_lock:
+            if _runtime is None or _runtime.pid != os.getpid():
+                _runtime = AsyncRuntime()
+    return _runtime
+
+
+def run_async(coro: Awaitable) -> Any:
+    """Run a coroutine on the worker's event loop from synchronous task code."""
+    return get_runtime().run(coro)
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """Async session bound to the worker process's asyncpg engine."""
+    async with get_runtime().session_factory() as session:
+        yield session
+
+
+def async_task(*task_args, **task_options):
+    """
+    Register a coroutine function as a Celery task that runs on the worker's event loop.
+
+    Accepts the same arguments as `celery_app.task`. With `bind=True` the task instance
+    is passed as the first argument, as with regular tasks.
+
+        @async_task(bind=True, name="my_task")
+        async def my_task(self, document_id: str):
+            async with get_async_session() as db:
+                ...
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return run_async(fn(*args, **kwargs))
+        return celery_app.task(*task_args, **task_options)(wrapper)
+    return decorator
+
+
+@worker_process_shutdown.connect
+def _shutdown_runtime(**kwargs):
+    global _runtime
+    if _runtime is not None and _runtime.pid == os.getpid():
+        _runtime.shutdown()
+        _runtime = None
@@ -1,7 +1,18 @@
 from celery import Celery
+from celery.signals import worker_init
+from kombu import Queue
 from config.settings import settings
+import importlib
 import os
 
+# Queue names - each queue is consumed by its own worker pool (see docker-compose.yml)
+DEFAULT_QUEUE = "celery"
+OCR_QUEUE = "ocr"              # CPU-bound OCR / rasterisation (prefork)
+LLM_QUEUE = "llm"              # I/O-bound LLM agent workflows (threads, high concurrency)
+WHATSAPP_QUEUE = "whatsapp"    # Latency-critical WhatsApp replies
+PERIODIC_QUEUE = "periodic"    # Beat-scheduled maintenance work
+BROADCAST_QUEUE = "broadcast"  # Rate-limited bulk WhatsApp sends (long-running)
+
 # Create Celery app
 celery_app = Celery(
     "agentbooks_worker",
@@ -20,6 +31,29 @@ celery_app.conf.update(
     enable_utc=True,
     
     # Task routing and execution
+    task_queues=(
+        Queue(DEFAULT_QUEUE),
+        Queue(OCR_QUEUE),
+        Queue(LLM_QUEUE),
+        Queue(WHATSAPP_QUEUE),
+        Queue(PERIODIC_QUEUE),
+        Queue(BROADCAST_QUEUE),
+    ),
+    task_default_queue=DEFAULT_QUEUE,
+    task_routes={
+        "process_document_ocr": {"queue": OCR_QUEUE},
+        "process_document_workflow": {"queue": LLM_QUEUE},
+        "process_whatsapp_message": {"queue": WHATSAPP_QUEUE},
+        "process_whatsapp_attachments_complete": {"queue": WHATSAPP_QUEUE},
+        "flush_message_status_updates": {"queue": WHATSAPP_QUEUE},
+        # Rate-limited bulk sends wait on the token bucket for minutes at a time, so they get
+        # their own worker rather than blocking WhatsApp replies or the periodic tasks
+        "dispatch_message_broadcast": {"queue": BROADCAST_QUEUE},
+        "workers.tasks.exampletask.example_periodic_task": {"queue": PERIODIC_QUEUE},
+        "workers.tasks.exampletask.database_cleanup_task": {"queue": PERIODIC_QUEUE},
+        "ensure_message_partitions": {"queue": PERIODIC_QUEUE},
+        "refresh_dashboard_summary": {"queue": PERIODIC_QUEUE},
+    },
     task_always_eager=False,
     worker_prefetch_multiplier=1,
     task_acks_late=True,
@@ -42,6 +76,25 @@ celery_app.conf.update(
         "example-periodic-task": {
             "task": "workers.tasks.exampletask.example_periodic_task",
             "schedule": 300.0,  # Every 5 minutes
+            "options": {"queue": PERIODIC_QUEUE},
+        },
+        "ensure-message-partitions": {
+            "task": "ensure_message_partitions",
+            "schedule": 86400.0,  # Daily
+            "options": {"queue": PERIODIC_QUEUE},
+        },
+        "refresh-dashboard-summary": {
+            "task": "refresh_dashboard_summary",
+            "schedule": settings.dashboard_summary_refresh_seconds,
+            # A refresh that could not start within one interval is superseded by the next
+            "options": {"queue": PERIODIC_QUEUE, "expires": settings.dashboard_summary_refresh_seconds},
+        },
+        "flush-message-status-updates": {
+            "task": "flush_message_status_updates",
+            # Flushes are normally scheduled by incoming status callbacks; this one also
+            # picks up callbacks requeued from abandoned flushes when no new ones arrive
+            "schedule": 300.0,
+            "options": {"queue": WHATSAPP_QUEUE, "expires": 300.0},
         },
     },
 )
@@ -49,5 +102,21 @@ celery_app.conf.update(
 # Auto-discover tasks
 celery_app.autodiscover_tasks(["workers.tasks", "workers.tasks.whatsapp_processor"])
 
+# Imported inside the tasks that use them so the API, which imports the task modules
+# only to dispatch, boots without LangChain/OpenAI/pandas. Workers load them up front
+# instead, before the pool forks, so children share them and no task pays for the import.
+WORKER_PRELOAD_MODULES = [
+    "agents.max_client_whatsapp.agent",
+    "agents.document_processing_agent.document_processing_agent",
+    "pytesseract",
+    "openai",
+]
+
+
+@worker_init.connect
+def preload_worker_modules(**kwargs):
+    for module in WORKER_PRELOAD_MODULES:
+        importlib.import_module(module)
+
 if __name__ == "__main__":
     celery_app.start() 
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Token bucket rate limiting shared by all worker processes through Redis.
+
+Used to keep outbound sends within Twilio's per-sender throughput: every worker that
+sends from the same number draws from the same bucket, so adding workers does not
+increase the rate at which a number sends.
+"""
+
+import time
+
+import redis
+from celery.utils.log import get_task_logger
+
+from config.redis import get_sync_redis
+
+logger = get_task_logger(__name__)
+
+# Refill the bucket from the elapsed time (Redis clock) and take one token if available.
+# Returns the seconds to wait before a token will be available ("0" when one was taken).
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+if tokens < 1 then
+    return tostring((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens - 1, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return '0'
+"""
+
+
+class TokenBucket:
+    """
+    Redis token bucket allowing `rate` acquisitions per second with bursts of `capacity`.
+
+    When Redis is unavailable the bucket paces the calling process alone at `rate`
+    (it fails safe rather than open, unlike the circuit breaker).
+    """
+
+    def __init__(self, name: str, rate: float, capacity: int):
+        self.name = name
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._key = f"ratelimit:{name}"
+        self._last_local = 0.0
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; returns 0, or the seconds to wait before retrying."""
+        try:
+            return float(get_sync_redis().eval(_TOKEN_BUCKET_SCRIPT, 1, self._key, self.rate, self.capacity))
+        except redis.RedisError as e:
+            logger.warning(f"Rate limiter {self.name}: Redis unavailable ({e}), pacing locally")
+            wait = self._last_local + 1 / self.rate - time.monotonic()
+            if wait > 0:
+                return wait
+            self._last_local = time.monotonic()
+            return 0.0
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
@@ -0,0 +1,265 @@
+"""Shared retry policy for Celery tasks.
+
+Provides exponential backoff with full jitter, classification of exceptions into
+retryable and permanent failures, and a Redis-backed circuit breaker per upstream
+service (Mistral, OpenAI, Twilio) so that every worker process backs off together when
+an upstream is down instead of retrying in a thundering herd.
+"""
+
+import random
+import time
+from functools import lru_cache
+from typing import Optional
+
+import redis
+import requests
+from celery.exceptions import Retry
+from celery.utils.log import get_task_logger
+from sqlalchemy.exc import OperationalError, InterfaceError, DisconnectionError
+
+from config.settings import settings
+
+logger = get_task_logger(__name__)
+
+# Upstream names used as circuit breaker keys
+MISTRAL_UPSTREAM = "mistral"
+OPENAI_UPSTREAM = "openai"
+TWILIO_UPSTREAM = "twilio"
+
+# Backoff settings
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 600
+
+
+class TransientUpstreamError(Exception):
+    """Raised when an upstream call fails in a way that is worth retrying."""
+
+    def __init__(self, upstream: str, message: str):
+        super().__init__(f"{upstream}: {message}")
+        self.upstream = upstream
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because the upstream's breaker is open."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"Circuit for {upstream} is open, retry in {retry_after:.0f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+@lru_cache(maxsize=None)
+def _transient_exception_types() -> tuple:
+    """
+    Exception types that indicate a temporary failure (network, rate limit, 5xx, DB connection).
+
+    Built on first use rather than at import: the API imports this module through the
+    task modules it dispatches, and importing openai would add most of a second to its boot.
+    """
+    types = [
+        TransientUpstreamError,
+        CircuitOpenError,
+        requests.ConnectionError,
+        requests.Timeout,
+        ConnectionError,
+        TimeoutError,
+        OperationalError,
+        InterfaceError,
+        DisconnectionError,
+    ]
+    try:
+        import openai
+        types.extend([
+            openai.APIConnectionError,
+            openai.APITimeoutError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+        ])
+    except ImportError:
+        pass
+    try:
+        import httpx
+        types.extend([httpx.TransportError])
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True if the exception is transient and the task should be retried."""
+    return isinstance(exc, _transient_exception_types())
+
+
+def upstream_for_exception(exc: BaseException) -> Optional[str]:
+    """Best-effort mapping of an exception to the upstream that caused it."""
+    if isinstance(exc, (TransientUpstreamError, CircuitOpenError)):
+        return exc.upstream
+    module = type(exc).__module__ or ""
+    if module.startswith("openai"):
+        return OPENAI_UPSTREAM
+    return None
+
+
+def backoff_delay(retries: int, base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_MAX_SECONDS) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Returns a delay drawn uniformly from [0, min(cap, base * 2 ** retries)], which spreads
+    retries of tasks that failed at the same moment across the whole window.
+    """
+    return random.uniform(0, min(cap, base * (2 ** retries)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker shared by all worker processes through Redis.
+
+    After `failure_threshold` failures within `failure_window` seconds the circuit opens
+    for `reset_timeout` seconds. While open, `check()` raises CircuitOpenError. Once the
+    timeout elapses the circuit is half-open: a single caller across all workers claims
+    the probe (a SET NX key that expires after `probe_timeout`) and is let through, while
+    everyone else is still short-circuited. The probe's success closes the circuit; its
+    failure re-opens it straight away. Redis errors never block calls (the breaker fails
+    open).
+    """
+
+    def __init__(self, upstream: str, failure_threshold: int = 5, failure_window: int = 60,
+                 reset_timeout: int = 60, probe_timeout: int = 60):
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self._failures_key = f"circuit:{upstream}:failures"
+        self._open_until_key = f"circuit:{upstream}:open_until"
+        # Set when the circuit opens and kept until a success: open_until expiring with
+        # this still present means half-open
+        self._tripped_key = f"circuit:{upstream}:tripped"
+        self._probe_key = f"circuit:{upstream}:probe"
+        self._redis = None
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.redis_url, socket_timeout=1, socket_connect_timeout=1)
+        return self._redis
+
+    def retry_after(self) -> float:
+        """
+        Seconds until a call may be attempted (0 when it may go ahead).
+
+        In the half-open state this claims the probe: the first caller gets 0 and must
+        report the outcome with record_success() or record_failure().
+        """
+        try:
+            open_until, tripped = self.redis.mget(self._open_until_key, self._tripped_key)
+            if open_until:
+                remaining = float(open_until) - time.time()
+                if remaining > 0:
+                    return remaining
+            if not tripped:
+                return 0.0
+            if self.redis.set(self._probe_key, time.time(), nx=True, ex=self.probe_timeout):
+                logger.info(f"Circuit breaker {self.upstream} half-open, letting a probe call through")
+                return 0.0
+            probe_ttl = self.redis.ttl(self._probe_key)
+        except redis.RedisError as e:
+            logger.warning(f"Circuit breaker {self.upstream}: Redis unavailable ({e}), failing open")
+            return 0.0
+        # Another worker's probe is in flight; wait for its result
+        return float(max(probe_ttl, 1))
+
+    def is_open(self) -> bool:
+        return self.retry_after() > 0
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if calls to the upstream should not be attempted."""
+        remaining = self.retry_after()
+        if remaining > 0:
+            raise CircuitOpenError(self.upstream, remaining)
+
+    def record_success(self) -> None:
+        try:
+            self.redis.delete(self._failures_key, self._open_until_key, self._tripped_key, self._probe_key)
+        except redis.RedisError:
+            pass
+
+    def _open(self) -> None:
+        pipe = self.redis.pipeline()
+        pipe.set(self._open_until_key, time.time() + self.reset_timeout, ex=self.reset_timeout)
+        pipe.set(self._tripped_key, 1)
+        pipe.delete(self._failures_key, self._probe_key)
+        pipe.execute()
+
+    def record_failure(self) -> None:
+        try:
+            if self.redis.exists(self._tripped_key):
+                # The probe (or a call that started before the circuit opened) failed
+                self._open()
+                logger.warning(f"Circuit breaker {self.upstream} re-opened after a failed probe")
+                return
+            pipe = self.redis.pipeline()
+            pipe.incr(self._failures_key)
+            pipe.expire(self._failures_key, self.failure_window)
+            failures, _ = pipe.execute()
+            if int(failures) >= self.failure_threshold:
+                self._open()
+                logger.warning(f"Circuit breaker {self.upstream} opened after {failures} failures")
+        except redis.RedisError:
+            pass
+
+
+_breakers = {}
+
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """Get the (process-wide) circuit breaker for an upstream."""
+    if upstream not in _breakers:
+        _breakers[upstream] = CircuitBreaker(upstream)
+    return _breakers[upstream]
+
+
+def retry_task(task, exc: BaseException, max_retries: Optional[int] = None):
+    """
+    Apply the shared retry policy to a failed bound task.
+
+    Permanent failures are re-raised immediately. Transient failures are retried with
+    jittered exponential backoff; when the upstream's circuit is open the countdown is at
+    least the time until it closes. Failures attributed to an upstream are recorded on
+    its circuit breaker. Always raises (either the original exception or celery.Retry).
+    """
+    if not is_retryable(exc):
+        logger.error(f"Task {task.name} failed permanently: {exc}")
+        raise exc
+
+    upstream = upstream_for_exception(exc)
+    countdown = backoff_delay(task.request.retries)
+    if isinstance(exc, CircuitOpenError):
+        countdown = max(countdown, exc.retry_after + random.uniform(0, BACKOFF_BASE_SECONDS))
+    elif upstream:
+        get_circuit_breaker(upstream).record_failure()
+
+    logger.warning(
+        f"Task {task.name} failed with retryable error ({type(exc).__name__}); "
+        f"retry {task.request.retries + 1} in {countdown:.1f}s"
+    )
+    if max_retries is None:
+        raise task.retry(exc=exc, countdown=countdown)
+    raise task.retry(exc=exc, countdown=countdown, max_retries=max_retries)
+
+
+def retry_task_or_fail(task, exc: BaseException, failure_result: dict, max_retries: Optional[int] = None) -> dict:
+    """
+    Apply the shared retry policy, but return `failure_result` instead of raising once the
+    failure is permanent or the retries are used up.
+
+    For tasks in a chord header: a header task that ends in an exception means the chord
+    callback never runs, so these report the failure as their result instead.
+    """
+    try:
+        retry_task(task, exc, max_retries=max_retries)
+    except Retry:
+        raise
+    except Exception:
+        logger.error(f"Task {task.name} gave up: {exc}")
+    return failure_result
@@ -1,4 +1,7 @@
 # Import all tasks to make them discoverable by Celery
 from .exampletask import * 
 from .whatsapp_processor import *
-from .document_processor import *
\ No newline at end of file
+from .document_processor import *
+from .maintenance import *
+from .message_status import *
+from .message_broadcast import *
@@ -1,72 +1,107 @@
 """Document processing tasks including OCR extraction and document workflow."""
 
-from celery import shared_task
+from celery import shared_task, chain
 from celery.utils.log import get_task_logger
-import pytesseract
-from PIL import Image
-from pdf2image import convert_from_path
+from pdf2image import convert_from_bytes
 import os
 import base64
 import requests
 import PyPDF2
 import fitz  # PyMuPDF for better PDF text extraction
 from io import BytesIO
-from typing import Dict, Any
+from PIL import Image, ImageOps
+from typing import BinaryIO, Dict, Any, List, Tuple
+import asyncio
 from datetime import datetime
 from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
 import uuid
 
 from config.database import get_sync_session
-from db.models import Document, DocumentType, DocumentAgentState
+from db.models import Document, DocumentType, DocumentAgentState, Invoice
+from db.document_text import save_document_text
+from services.document_storage import document_storage_service, SpooledUpload
 from workers.celery_app import celery_app
-from agents.document_processing_agent.document_processing_agent import DocumentProcessingAgent
+from workers.retry_policy import retry_task_or_fail, get_circuit_breaker, MISTRAL_UPSTREAM, OPENAI_UPSTREAM
+from workers.async_runtime import run_async
+from services.realtime_events import publish_event_sync, document_event_data, DOCUMENT_STATE
 
 # Get task logger
 logger = get_task_logger(__name__)
 
-def has_embedded_text(pdf_path: str) -> bool:
+# Maximum Mistral OCR requests in flight per document
+MISTRAL_PAGE_CONCURRENCY = 4
+
+# Scanned PDFs are rasterised at this resolution for OCR
+OCR_RASTER_DPI = 300
+# Longest side in pixels of the JPEGs served by GET /documents/{id}/thumbnail and /preview
+THUMBNAIL_MAX_SIZE = 256
+PREVIEW_MAX_SIZE = 1024
+PREVIEW_JPEG_QUALITY = 80
+# Text PDFs are not rasterised for OCR; their first page is rendered at this resolution for the preview
+PREVIEW_RENDER_DPI = 125
+
+def has_embedded_text(pdf_file: BinaryIO) -> bool:
     """Check if PDF has embedded text or is a scanned document."""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text_content = ""
-            
-            # Check first few pages for text content
-            pages_to_check = min(3, len(pdf_reader.pages))
-            for page_num in range(pages_to_check):
-                page = pdf_reader.pages[page_num]
-                text_content += page.extract_text()
-            
-            # If we have substantial text content, it's likely a text-based PDF
-            return len(text_content.strip()) > 50
+        pdf_file.seek(0)
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        text_content = ""
+        
+        # Check first few pages for text content
+        pages_to_check = min(3, len(pdf_reader.pages))
+        for page_num in range(pages_to_check):
+            page = pdf_reader.pages[page_num]
+            text_content += page.extract_text()
+        
+        # If we have substantial text content, it's likely a text-based PDF
+        return len(text_content.strip()) > 50
     except Exception as e:
         logger.warning(f"Error checking PDF text content: {e}")
         return False
 
-def extract_pdf_text(pdf_path: str) -> str:
-    """Extract embedded text from PDF using PyMuPDF."""
+def extract_pdf_pages(pdf_file: BinaryIO) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Extract embedded text from PDF using PyMuPDF, per page, with each page's layout:
+    its size and text blocks with bounding boxes.
+    """
     try:
-        doc = fitz.open(pdf_path)
-        text_content = ""
-        
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text = page.get_text()
-            text_content += f"\n--- Page {page_num + 1} ---\n{text}"
-        
-        doc.close()
-        return text_content
+        pages, layouts = [], []
+        pdf_file.seek(0)
+        with fitz.open(stream=pdf_file.read(), filetype="pdf") as doc:
+            for page in doc:
+                pages.append(page.get_text())
+                layouts.append({
+                    "width": page.rect.width,
+                    "height": page.rect.height,
+                    "blocks": [
+                        {"bbox": [x0, y0, x1, y1], "text": block_text}
+                        for x0, y0, x1, y1, block_text, _block_no, block_type in page.get_text("blocks")
+                        if block_type == 0  # text, not image
+                    ]
+                })
+        return pages, layouts
     except Exception as e:
         logger.error(f"Error extracting PDF text: {e}")
-        return ""
+        return [], []
 
-def encode_image_to_base64(image_path: str) -> str:
+def encode_image_to_base64(image_file: BinaryIO) -> str:
     """Encode image file to base64 string."""
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode('utf-8')
+    image_file.seek(0)
+    return base64.b64encode(image_file.read()).decode('utf-8')
 
 def call_mistral_ocr(image_base64: str) -> str:
-    """Call Mistral API for OCR processing."""
+    """
+    Call Mistral API for OCR processing.
+
+    Returns an empty string on failure so the caller falls back to Tesseract. While the
+    Mistral circuit breaker is open the API is not called at all.
+    """
+    breaker = get_circuit_breaker(MISTRAL_UPSTREAM)
+    if breaker.is_open():
+        logger.warning("Mistral circuit breaker is open, skipping Mistral OCR")
+        return ""
+    
     try:
         api_key = os.getenv('MISTRAL_OCR')
         if not api_key:
@@ -107,56 +142,94 @@ def call_mistral_ocr(image_base64: str) -> str:
         )
         
         if response.status_code == 200:
+            breaker.record_success()
             result = response.json()
             return result['choices'][0]['message']['content']
         else:
             logger.error(f"Mistral API error: {response.status_code} - {response.text}")
+            # Only rate limiting and server errors count against the upstream
+            if response.status_code == 429 or response.status_code >= 500:
+                breaker.record_failure()
             return ""
             
+    except requests.RequestException as e:
+        logger.error(f"Error calling Mistral OCR: {e}")
+        breaker.record_failure()
+        return ""
     except Exception as e:
         logger.error(f"Error calling Mistral OCR: {e}")
         return ""
 
-def process_scanned_pdf_with_mistral(pdf_path: str) -> str:
-    """Process scanned PDF using Mistral OCR."""
+async def _ocr_pages_with_mistral(pages_base64: List[str]) -> List[str]:
+    """OCR pages concurrently, with at most MISTRAL_PAGE_CONCURRENCY requests in flight."""
+    semaphore = asyncio.Semaphore(MISTRAL_PAGE_CONCURRENCY)
+    
+    async def ocr_page(page_base64: str) -> str:
+        async with semaphore:
+            return await asyncio.to_thread(call_mistral_ocr, page_base64)
+    
+    return await asyncio.gather(*(ocr_page(page) for page in pages_base64))
+
+def rasterise_pdf(pdf_file: BinaryIO) -> List[Image.Image]:
+    """Render each page of a scanned PDF for OCR (CPU-bound)."""
+    pdf_file.seek(0)
+    return convert_from_bytes(pdf_file.read(), dpi=OCR_RASTER_DPI)
+
+def process_scanned_pdf_with_mistral(images: List[Image.Image]) -> List[str]:
+    """Process scanned PDF pages using Mistral OCR, overlapping the per-page API calls. Returns page texts."""
     try:
-        # Convert PDF to images
-        images = convert_from_path(pdf_path, dpi=300)
-        extracted_text = ""
+        # Encode the page images in memory
+        pages_base64 = []
         
-        for i, image in enumerate(images):
-            # Save image temporarily
-            temp_image_path = f"/tmp/temp_page_{i}.jpg"
-            image.save(temp_image_path, 'JPEG', quality=95)
-            
-            try:
-                # Encode image to base64
-                image_base64 = encode_image_to_base64(temp_image_path)
-                
-                # Call Mistral OCR
-                page_text = call_mistral_ocr(image_base64)
-                extracted_text += f"\n--- Page {i+1} ---\n{page_text}"
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_image_path):
-                    os.remove(temp_image_path)
+        for image in images:
+            buffer = BytesIO()
+            image.save(buffer, 'JPEG', quality=95)
+            pages_base64.append(base64.b64encode(buffer.getvalue()).decode('utf-8'))
         
-        return extracted_text
+        # Call Mistral OCR for all pages on the worker's event loop
+        return list(run_async(_ocr_pages_with_mistral(pages_base64)))
         
     except Exception as e:
         logger.error(f"Error processing scanned PDF with Mistral: {e}")
-        return ""
+        return []
 
-def process_image_with_mistral(image_path: str) -> str:
+def process_image_with_mistral(image_file: BinaryIO) -> str:
     """Process image using Mistral OCR."""
     try:
-        image_base64 = encode_image_to_base64(image_path)
+        image_base64 = encode_image_to_base64(image_file)
         return call_mistral_ocr(image_base64)
     except Exception as e:
         logger.error(f"Error processing image with Mistral: {e}")
         return ""
 
+def first_page_image(document: Document, document_file: BinaryIO, page_images: List[Image.Image]) -> Image.Image:
+    """The document's first page as an image, reusing the pages rasterised for OCR when there are any."""
+    if page_images:
+        return page_images[0]
+    document_file.seek(0)
+    if document.document_type == DocumentType.pdf:
+        with fitz.open(stream=document_file.read(), filetype="pdf") as doc:
+            pixmap = doc[0].get_pixmap(dpi=PREVIEW_RENDER_DPI)
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+    # Phone photos are often stored sideways with an EXIF orientation
+    return ImageOps.exif_transpose(Image.open(document_file))
+
+def save_document_previews(db, document: Document, page_image: Image.Image) -> None:
+    """Store a JPEG preview and thumbnail of the first page in document storage."""
+    preview = page_image.copy()
+    preview.thumbnail((PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))
+    preview = preview.convert("RGB")
+    thumbnail = preview.copy()
+    thumbnail.thumbnail((THUMBNAIL_MAX_SIZE, THUMBNAIL_MAX_SIZE))
+    
+    for column, image in (("preview_sha256", preview), ("thumbnail_sha256", thumbnail)):
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=PREVIEW_JPEG_QUALITY, optimize=True)
+        with SpooledUpload() as upload:
+            upload.write(buffer.getvalue())
+            stored_file = document_storage_service.store_sync(db, upload, "image/jpeg")
+        setattr(document, column, stored_file.sha256)
+
 @celery_app.task(bind=True, name='process_document_ocr')
 def process_document_ocr(self, document_id: str) -> Dict[str, Any]:
     """
@@ -170,11 +243,12 @@ def process_document_ocr(self, document_id: str) -> Dict[str, Any]:
         
         # Get sync database session
         db = get_sync_session()
+        document = None
         
         try:
-            # Fetch document from database
+            # Fetch document from database (agent_metadata is read below, the OCR text is not)
             document = db.execute(
-                select(Document).where(Document.id == uuid.UUID(document_id))
+                select(Document).options(undefer_group("agent_blobs")).where(Document.id == uuid.UUID(document_id))
             ).scalar_one_or_none()
             
             if not document:
@@ -185,60 +259,88 @@ def process_document_ocr(self, document_id: str) -> Dict[str, Any]:
                     "document_id": document_id
                 }
             
+            # Idempotency guard: a retry after the OCR result was committed must not OCR again
+            ocr_metadata = (document.agent_metadata or {}).get("ocr_processing", {})
+            if document.extracted_text_length and ocr_metadata.get("status") == "success":
+                logger.info(f"Document {document_id} already has OCR text, skipping OCR")
+                return {
+                    "success": True,
+                    "skipped": True,
+                    "document_id": document_id,
+                    "text_length": document.extracted_text_length
+                }
+            
             # Update document state
             document.agent_state = DocumentAgentState.processing
+            document.agent_processing_started_at = datetime.now()
             db.commit()
+            publish_document_state(document)
             
-            # Get file path from document_url
-            file_path = document.document_url
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"Document file not found at {file_path}")
-            
-            extracted_text = ""
-            processing_method = "unknown"
-            
-            # Process based on document type
-            if document.document_type == DocumentType.pdf:
-                # Check if PDF has embedded text or is scanned
-                if has_embedded_text(file_path):
-                    logger.info(f"PDF has embedded text, extracting directly")
-                    extracted_text = extract_pdf_text(file_path)
-                    processing_method = "embedded_text_extraction"
-                else:
-                    logger.info(f"PDF appears to be scanned, using Mistral OCR")
-                    extracted_text = process_scanned_pdf_with_mistral(file_path)
-                    processing_method = "mistral_ocr_scanned_pdf"
-                    
-            elif document.document_type == DocumentType.image:
-                logger.info(f"Processing image with Mistral OCR")
-                extracted_text = process_image_with_mistral(file_path)
-                processing_method = "mistral_ocr_image"
-                    
-            else:
-                logger.warning(f"Document type {document.document_type} not supported for OCR")
-                return {
-                    "success": False,
-                    "error": f"Document type {document.document_type} not supported for OCR",
-                    "document_id": document_id
-                }
-            
-            # Fallback to Tesseract if Mistral OCR fails
-            if not extracted_text.strip() and processing_method.startswith("mistral_ocr"):
-                logger.warning(f"Mistral OCR failed or returned empty text, falling back to Tesseract")
+            # Read the file from document storage
+            with document_storage_service.open_document(document) as document_file:
+                # Page texts, and page layouts where the extractor provides them
+                pages: List[str] = []
+                layouts: List[Dict[str, Any]] = []
+                processing_method = "unknown"
+                # Pages rasterised for OCR, reused by the Tesseract fallback and for the preview
+                page_images: List[Image.Image] = []
+                
+                # Process based on document type
                 if document.document_type == DocumentType.pdf:
-                    # Convert PDF to images and use Tesseract
-                    images = convert_from_path(file_path)
-                    for i, image in enumerate(images):
-                        page_text = pytesseract.image_to_string(image)
-                        extracted_text += f"\n--- Page {i+1} ---\n{page_text}"
+                    # Check if PDF has embedded text or is scanned
+                    if has_embedded_text(document_file):
+                        logger.info(f"PDF has embedded text, extracting directly")
+                        pages, layouts = extract_pdf_pages(document_file)
+                        processing_method = "embedded_text_extraction"
+                    else:
+                        logger.info(f"PDF appears to be scanned, using Mistral OCR")
+                        page_images = rasterise_pdf(document_file)
+                        pages = process_scanned_pdf_with_mistral(page_images)
+                        processing_method = "mistral_ocr_scanned_pdf"
+                
                 elif document.document_type == DocumentType.image:
-                    # Use Tesseract directly on image
-                    with Image.open(file_path) as image:
-                        extracted_text = pytesseract.image_to_string(image)
-                processing_method += "_fallback_tesseract"
+                    logger.info(f"Processing image with Mistral OCR")
+                    pages = [process_image_with_mistral(document_file)]
+                    processing_method = "mistral_ocr_image"
+                
+                else:
+                    logger.warning(f"Document type {document.document_type} not supported for OCR")
+                    return {
+                        "success": False,
+                        "error": f"Document type {document.document_type} not supported for OCR",
+                        "document_id": document_id
+                    }
+                
+                # Thumbnail and first-page preview for the portal, while the page is rasterised
+                # (kept even if OCR fails below)
+                if not document.thumbnail_sha256:
+                    try:
+                        save_document_previews(db, document, first_page_image(document, document_file, page_images))
+                        # Committed now: the stored_files rows stay locked until the commit,
+                        # and the Tesseract fallback below can take minutes
+                        db.commit()
+                    except Exception as e:
+                        db.rollback()
+                        logger.warning(f"Could not build previews for document {document_id}: {e}")
+                
+                # Fallback to Tesseract if Mistral OCR fails
+                if not "".join(pages).strip() and processing_method.startswith("mistral_ocr"):
+                    logger.warning(f"Mistral OCR failed or returned empty text, falling back to Tesseract")
+                    # pytesseract pulls in pandas, only load it for the fallback
+                    import pytesseract
+                    if document.document_type == DocumentType.pdf:
+                        # Use Tesseract on the pages already rasterised
+                        pages = [pytesseract.image_to_string(image) for image in page_images]
+                    elif document.document_type == DocumentType.image:
+                        # Use Tesseract directly on image
+                        document_file.seek(0)
+                        with Image.open(document_file) as image:
+                            pages = [pytesseract.image_to_string(image)]
+                    processing_method += "_fallback_tesseract"
             
-            # Update document with extracted text
-            document.raw_extracted_text = extracted_text
+            # Store the pages (compressed, in document_text) and the text summary columns
+            save_document_text(db, document, pages, layouts, processing_method)
+            document.agent_processing_notes = None
             document.agent_state = DocumentAgentState.processed
             document.processed_at = datetime.now()
             document.agent_metadata = {
@@ -247,21 +349,21 @@ def process_document_ocr(self, document_id: str) -> Dict[str, Any]:
                     "completed_at": datetime.now().isoformat(),
                     "status": "success",
                     "processing_method": processing_method,
-                    "text_length": len(extracted_text)
+                    "text_length": document.extracted_text_length,
+                    "page_count": len(pages)
                 }
             }
             
             db.commit()
+            publish_document_state(document)
             
             logger.info(f"OCR processing completed for document {document_id}")
             
-            # Trigger document processing workflow
-            process_document_workflow.delay(document_id)
-            
+            # The workflow runs as the next step of the pipeline chain (see build_document_pipeline)
             return {
                 "success": True,
                 "document_id": document_id,
-                "text_length": len(extracted_text),
+                "text_length": document.extracted_text_length,
                 "processed_at": datetime.now().isoformat()
             }
             
@@ -271,6 +373,7 @@ def process_document_ocr(self, document_id: str) -> Dict[str, Any]:
             # Update document state to failed
             if document:
                 document.agent_state = DocumentAgentState.failed
+                document.agent_processing_notes = f"OCR failed: {e}"
                 document.agent_metadata = {
                     **(document.agent_metadata or {}),
                     "ocr_processing": {
@@ -279,6 +382,7 @@ def process_document_ocr(self, document_id: str) -> Dict[str, Any]:
                     }
                 }
                 db.commit()
+                publish_document_state(document)
             
             raise
             
@@ -287,8 +391,13 @@ def process_document_ocr(self, document_id: str) -> Dict[str, Any]:
             
     except Exception as e:
         logger.error(f"OCR task failed for document {document_id}: {str(e)}")
-        # Retry with exponential backoff
-        raise self.retry(exc=e, countdown=60, max_retries=3)
+        # Retry transient failures with jittered exponential backoff; a final failure is
+        # returned rather than raised so the attachment chord's callback still runs
+        return retry_task_or_fail(self, e, {
+            "success": False,
+            "error": str(e),
+            "document_id": document_id
+        }, max_retries=3)
 
 @celery_app.task(bind=True, name='process_document_workflow')
 def process_document_workflow(self, document_id: str) -> Dict[str, Any]:
@@ -301,15 +410,61 @@ def process_document_workflow(self, document_id: str) -> Dict[str, Any]:
     try:
         logger.info(f"Starting document processing workflow for document {document_id}")
         
+        # Don't start LLM work while OpenAI is known to be failing
+        openai_breaker = get_circuit_breaker(OPENAI_UPSTREAM)
+        openai_breaker.check()
+        
         # Get sync database session
         db = get_sync_session()
         
         try:
-            # Initialize document processing agent
+            # When chained after OCR, only run once OCR has produced text
+            document = db.execute(
+                select(Document).options(undefer_group("agent_blobs")).where(Document.id == uuid.UUID(document_id))
+            ).scalar_one_or_none()
+            
+            if not document:
+                logger.error(f"Document {document_id} not found in database")
+                return {
+                    "success": False,
+                    "error": "Document not found",
+                    "document_id": document_id
+                }
+            
+            ocr_metadata = (document.agent_metadata or {}).get("ocr_processing", {})
+            if ocr_metadata.get("status") != "success":
+                logger.warning(f"Document {document_id} has no successful OCR result, skipping workflow")
+                return {
+                    "success": False,
+                    "skipped": True,
+                    "error": "OCR not completed",
+                    "document_id": document_id
+                }
+            
+            # Idempotency guard: a retry after the invoice was committed must not create another one
+            existing_invoice = db.execute(
+                select(Invoice).where(Invoice.document_id == uuid.UUID(document_id))
+            ).scalars().first()
+            if existing_invoice:
+                logger.info(f"Document {document_id} already has invoice {existing_invoice.id}, skipping workflow")
+                return {
+                    "success": True,
+                    "skipped": True,
+                    "document_id": document_id,
+                    "invoice_id": str(existing_invoice.id)
+                }
+            
+            # Initialize document processing agent (imported here, see whatsapp_processor)
+            from agents.document_processing_agent.document_processing_agent import DocumentProcessingAgent
             agent = DocumentProcessingAgent(db, uuid.UUID(document_id))
             
             # Run the processing workflow
             result = agent.process_document()
+            openai_breaker.record_success()
+            
+            # The agent commits the document's final state (processed, awaiting client, rejected...)
+            db.refresh(document)
+            publish_document_state(document)
             
             logger.info(f"Document processing workflow completed for document {document_id}")
             return {
@@ -328,5 +483,26 @@ def process_document_workflow(self, document_id: str) -> Dict[str, Any]:
             
     except Exception as e:
         logger.error(f"Document processing workflow failed for {document_id}: {str(e)}")
-        # Retry with exponential backoff
-        raise self.retry(exc=e, countdown=60, max_retries=3) 
\ No newline at end of file
+        # Retry transient failures with jittered exponential backoff (see process_document_ocr)
+        return retry_task_or_fail(self, e, {
+            "success": False,
+            "error": str(e),
+            "document_id": document_id
+        }, max_retries=3)
+
+def publish_document_state(document: Document) -> None:
+    """Push the document's agent_state to the practice portal."""
+    publish_event_sync(document.practice_id, DOCUMENT_STATE, document_event_data(document))
+
+def build_document_pipeline(document_id: str):
+    """
+    Build the OCR → workflow pipeline for a single document as a Celery chain.
+    
+    Both steps use immutable signatures, each task loads the document itself. Neither
+    step ends in an exception once its retries are used up (the workflow skips a document
+    whose OCR failed), so a chord over these chains always reaches its callback.
+    """
+    return chain(
+        process_document_ocr.si(document_id),
+        process_document_workflow.si(document_id)
+    )
@@ -0,0 +1,35 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from typing import Dict, Any
+
+from config.database import sync_engine
+from db.message_partitions import is_messages_partitioned, ensure_message_partitions
+from db.dashboard_summary import refresh_dashboard_summary
+
+# Get task logger
+logger = get_task_logger(__name__)
+
+
+@shared_task(name="ensure_message_partitions")
+def ensure_message_partitions_task(months_ahead: int = 3) -> Dict[str, Any]:
+    """
+    Keep monthly partitions of the messages table created ahead of time.
+    Does nothing unless the table has been converted (see db/message_partitions.py).
+    """
+    with sync_engine.begin() as conn:
+        if not is_messages_partitioned(conn):
+            return {"status": "skipped", "reason": "messages table is not partitioned"}
+        partitions = ensure_message_partitions(conn, months_ahead)
+
+    logger.info(f"Message partitions up to date: {', '.join(partitions)}")
+    return {"status": "completed", "partitions": partitions}
+
+
+@shared_task(name="refresh_dashboard_summary")
+def refresh_dashboard_summary_task() -> Dict[str, Any]:
+    """Recompute the per-practice dashboard aggregates (see db/dashboard_summary.py)."""
+    with sync_engine.begin() as conn:
+        refreshed_at = refresh_dashboard_summary(conn)
+
+    logger.info(f"Dashboard summary refreshed at {refreshed_at}")
+    return {"status": "completed", "refreshed_at": refreshed_at.isoformat() if refreshed_at else None}
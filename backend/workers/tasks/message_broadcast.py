@@ -0,0 +1,200 @@
+from celery.utils.log import get_task_logger
+from sqlalchemy import select, update, and_, func
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+import time
+import uuid
+
+from config.database import get_sync_session
+from config.settings import settings
+from db.models import Message, MessageStatus, MessageBroadcast, BroadcastStatus
+from services.realtime_events import publish_event_sync, message_event_data, MESSAGE_STATUS
+from services.twilio_service import twilio_service
+from workers.async_runtime import run_async
+from workers.celery_app import celery_app
+from workers.rate_limit import TokenBucket
+from workers.retry_policy import retry_task_or_fail, get_circuit_breaker, TransientUpstreamError, TWILIO_UPSTREAM
+
+# Get task logger
+logger = get_task_logger(__name__)
+
+# A run hands over to a fresh task after this long so one broadcast does not hold a worker
+DISPATCH_TIME_BUDGET_SECONDS = 240
+
+
+def sender_rate_limiter(from_address: str) -> TokenBucket:
+    """Token bucket for a sending WhatsApp number, shared by every worker."""
+    return TokenBucket(
+        f"whatsapp:{from_address.replace('whatsapp:', '')}",
+        rate=settings.whatsapp_sender_rate_per_second,
+        capacity=settings.whatsapp_sender_burst,
+    )
+
+
+def is_retryable_send_failure(twilio_response: Dict[str, Any]) -> bool:
+    """Twilio rate limiting and server errors are worth retrying; other failures are final."""
+    http_status = twilio_response.get("http_status")
+    return http_status is not None and (http_status == 429 or http_status >= 500)
+
+
+def send_broadcast_message(db: Session, broadcast_id: uuid.UUID) -> Optional[MessageStatus]:
+    """
+    Claim one pending message of a broadcast, send it through Twilio and commit the result.
+
+    The message is claimed with FOR UPDATE SKIP LOCKED, so concurrent runs never pick up
+    the same one, and its lock and transaction last for this one send only. The sid is
+    committed straight after the Twilio call, so nothing that fails later can put a sent
+    message back to pending to be sent again.
+
+    Returns the message's new status, or None when no unclaimed pending message is left.
+    Rate limiting and Twilio server errors leave the message pending and raise
+    TransientUpstreamError.
+    """
+    message = db.execute(
+        select(Message).where(
+            and_(Message.broadcast_id == broadcast_id, Message.status == MessageStatus.pending)
+        ).order_by(Message.id).limit(1).with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if message is None:
+        db.rollback()
+        return None
+
+    twilio_response = run_async(twilio_service.send_whatsapp_message(
+        to_phone=message.to_address,
+        from_whatsapp_number=message.from_address,
+        message_body=message.body
+    ))
+    if twilio_response["success"]:
+        message.twilio_sid = twilio_response["sid"]
+        message.status = MessageStatus.sent
+        message.message_metadata = {
+            "twilio_status": twilio_response["status"],
+            "sent_at": datetime.utcnow().isoformat()
+        }
+    elif is_retryable_send_failure(twilio_response):
+        db.rollback()
+        raise TransientUpstreamError(TWILIO_UPSTREAM, twilio_response.get("error", "Unknown error"))
+    else:
+        message.status = MessageStatus.failed
+        message.error_message = twilio_response.get("error", "Unknown error")
+        message.message_metadata = {
+            "error_code": twilio_response.get("error_code"),
+            "error_message": twilio_response.get("error_message")
+        }
+    # Built before the commit expires the row
+    practice_id, status, event = message.practice_id, message.status, message_event_data(message)
+    db.commit()
+
+    publish_event_sync(practice_id, MESSAGE_STATUS, event)
+    return status
+
+
+def fail_broadcast(db: Session, broadcast_id: uuid.UUID, error: str) -> int:
+    """
+    Mark a broadcast failed along with its messages that are still pending, so a broadcast
+    the dispatcher gave up on does not stay `sending`. Returns how many messages failed.
+    """
+    result = db.execute(
+        update(Message).where(
+            and_(Message.broadcast_id == broadcast_id, Message.status == MessageStatus.pending)
+        ).values(status=MessageStatus.failed, error_message=f"Broadcast failed: {error}")
+    )
+    db.execute(
+        update(MessageBroadcast).where(
+            and_(
+                MessageBroadcast.id == broadcast_id,
+                MessageBroadcast.status.in_([BroadcastStatus.queued, BroadcastStatus.sending])
+            )
+        ).values(status=BroadcastStatus.failed, completed_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+    return result.rowcount
+
+
+@celery_app.task(bind=True, name='dispatch_message_broadcast')
+def dispatch_message_broadcast_task(self, broadcast_id: str) -> Dict[str, Any]:
+    """
+    Send the pending messages of a broadcast through Twilio within the sending number's
+    rate limit, one message per transaction (see send_broadcast_message).
+
+    After DISPATCH_TIME_BUDGET_SECONDS the task re-queues itself for the rest of the
+    broadcast. When Twilio rate-limits or fails server-side the task is retried with
+    backoff; messages already sent stay sent. When the failure is permanent or the
+    retries are used up, the broadcast and its pending messages are marked failed.
+    """
+    db = get_sync_session()
+    try:
+        broadcast = db.get(MessageBroadcast, uuid.UUID(broadcast_id))
+        if not broadcast:
+            logger.error(f"Broadcast {broadcast_id} not found")
+            return {"status": "not_found", "broadcast_id": broadcast_id}
+        if broadcast.status in (BroadcastStatus.completed, BroadcastStatus.cancelled, BroadcastStatus.failed):
+            return {"status": broadcast.status.value, "broadcast_id": broadcast_id}
+
+        if broadcast.status == BroadcastStatus.queued:
+            broadcast.status = BroadcastStatus.sending
+            broadcast.started_at = datetime.now(timezone.utc)
+            db.commit()
+
+        # Don't start sending while Twilio is known to be rejecting sends
+        breaker = get_circuit_breaker(TWILIO_UPSTREAM)
+        breaker.check()
+
+        # Every message of a broadcast is sent from the practice's number (None: no messages)
+        from_address = db.scalar(select(Message.from_address).where(Message.broadcast_id == broadcast.id).limit(1))
+        limiter = sender_rate_limiter(from_address) if from_address else None
+        deadline = time.monotonic() + DISPATCH_TIME_BUDGET_SECONDS
+        sent = failed = 0
+        while limiter is not None:
+            db.refresh(broadcast)
+            if broadcast.status in (BroadcastStatus.cancelled, BroadcastStatus.failed):
+                logger.info(f"Broadcast {broadcast_id} {broadcast.status.value}, stopping")
+                return {"status": broadcast.status.value, "broadcast_id": broadcast_id, "sent": sent, "failed": failed}
+
+            # Wait for the token before claiming a message, so no row is locked meanwhile
+            limiter.acquire()
+            status = send_broadcast_message(db, broadcast.id)
+            if status is None:
+                break
+            if status == MessageStatus.sent:
+                if not sent:
+                    breaker.record_success()
+                sent += 1
+            else:
+                failed += 1
+
+            if time.monotonic() > deadline:
+                dispatch_message_broadcast_task.delay(broadcast_id)
+                logger.info(f"Broadcast {broadcast_id}: {sent} sent, {failed} failed, continuing in a new task")
+                return {"status": "continuing", "broadcast_id": broadcast_id, "sent": sent, "failed": failed}
+
+        # Rows locked by another run are skipped above; only finish when none are left
+        remaining = db.scalar(
+            select(func.count()).select_from(Message).where(
+                and_(Message.broadcast_id == broadcast.id, Message.status == MessageStatus.pending)
+            )
+        )
+        if not remaining and broadcast.status == BroadcastStatus.sending:
+            broadcast.status = BroadcastStatus.completed
+            broadcast.completed_at = datetime.now(timezone.utc)
+            db.commit()
+
+        logger.info(f"Broadcast {broadcast_id}: {sent} sent, {failed} failed")
+        return {"status": "completed" if not remaining else "sending", "broadcast_id": broadcast_id, "sent": sent, "failed": failed}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Broadcast dispatch failed for {broadcast_id}: {str(e)}")
+        result = retry_task_or_fail(
+            self, e, {"status": "failed", "broadcast_id": broadcast_id, "error": str(e)}, max_retries=5
+        )
+        # Giving up: nothing would pick the broadcast up again
+        try:
+            result["failed"] = fail_broadcast(db, uuid.UUID(broadcast_id), str(e))
+        except Exception as fail_error:
+            db.rollback()
+            logger.error(f"Could not mark broadcast {broadcast_id} failed: {str(fail_error)}")
+        return result
+    finally:
+        db.close()
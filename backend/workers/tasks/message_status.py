@@ -0,0 +1,47 @@
+from celery.utils.log import get_task_logger
+from typing import Dict, Any
+
+from config.database import get_sync_session
+from services.message_status_sink import take_buffered_updates, release_buffered_updates, apply_status_updates
+from services.realtime_events import publish_event_sync, MESSAGE_STATUS
+from workers.celery_app import celery_app
+from workers.retry_policy import retry_task
+
+# Get task logger
+logger = get_task_logger(__name__)
+
+
+@celery_app.task(bind=True, name='flush_message_status_updates')
+def flush_message_status_updates_task(self) -> Dict[str, Any]:
+    """
+    Write the Twilio status callbacks buffered by services/message_status_sink.py
+    with one bulk UPDATE and notify the portal of the messages that changed.
+    """
+    try:
+        # The task id stays the same across retries, so a retry re-reads the same entries
+        updates = take_buffered_updates(self.request.id)
+        if not updates:
+            return {"status": "empty", "updated": 0}
+
+        db = get_sync_session()
+        try:
+            updated = apply_status_updates(db, updates)
+        finally:
+            db.close()
+        release_buffered_updates(self.request.id)
+
+        for row in updated:
+            publish_event_sync(row["practice_id"], MESSAGE_STATUS, {
+                "message_id": str(row["id"]),
+                "individual_id": str(row["individual_id"]),
+                "direction": row["direction"],
+                "sender": row["sender"],
+                "status": row["status"],
+            })
+
+        logger.info(f"Flushed {len(updates)} status callbacks, {len(updated)} messages updated")
+        return {"status": "completed", "callbacks": len(updates), "updated": len(updated)}
+
+    except Exception as e:
+        logger.error(f"Status flush failed: {str(e)}")
+        retry_task(self, e, max_retries=5)
@@ -1,13 +1,19 @@
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select
+from sqlalchemy import select, update, and_, cast, func, literal
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import JSON
+from celery import chord, group
+from typing import List
 import uuid
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 
 from config.database import get_sync_session
 from db.models import Message, Individual, Practice, Document
-from agents.max_client_whatsapp.agent import MaxClientWhatsAppAgent
 from workers.celery_app import celery_app
+from workers.retry_policy import retry_task, is_retryable, upstream_for_exception, get_circuit_breaker, OPENAI_UPSTREAM
+from workers.async_runtime import async_task, get_async_session
+from workers.tasks.document_processor import build_document_pipeline
 
 @celery_app.task(bind=True, name='process_whatsapp_message')
 def process_whatsapp_message_task(self, message_id: str, individual_id: str, practice_id: str):
@@ -20,6 +26,9 @@ def process_whatsapp_message_task(self, message_id: str, individual_id: str, pra
         practice_id: UUID of the practice receiving the message
     """
     try:
+        # Don't call the agent while OpenAI is known to be failing
+        get_circuit_breaker(OPENAI_UPSTREAM).check()
+        
         # Run the sync processing function
         return _process_whatsapp_message_sync(
             message_id=message_id,
@@ -30,8 +39,40 @@ def process_whatsapp_message_task(self, message_id: str, individual_id: str, pra
         print(f"Error in Celery task process_whatsapp_message: {str(e)}")
         import traceback
         print(f"Traceback: {traceback.format_exc()}")
-        # Retry the task with exponential backoff
-        raise self.retry(exc=e, countdown=60, max_retries=3)
+        # Retry transient failures with jittered exponential backoff
+        retry_task(self, e, max_retries=3)
+
+def claim_message_for_agent(db: Session, message_id: uuid.UUID) -> bool:
+    """
+    Record that the agent has started on a message (agent_started_at in its metadata) and
+    commit, unless a run already has. Returns False when the message was claimed before.
+
+    The agent sends its reply itself, so the claim is committed before it is called: a run
+    that fails or crashes after the send can never lead to a second reply. The price is
+    that a run failing after the claim is not retried.
+    """
+    merged = func.coalesce(cast(Message.message_metadata, JSONB), cast(literal("{}"), JSONB)).op("||")(
+        func.jsonb_build_object("agent_started_at", datetime.now().isoformat())
+    )
+    result = db.execute(
+        update(Message).where(
+            and_(
+                Message.id == message_id,
+                Message.message_metadata["agent_started_at"].as_string().is_(None),
+                # Processed before claims were recorded
+                Message.message_metadata["agent_processed_at"].as_string().is_(None),
+            )
+        ).values(message_metadata=cast(merged, JSON)).execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _record_agent_outcome(db: Session, message_id: uuid.UUID, outcome: dict) -> None:
+    message = db.get(Message, message_id, populate_existing=True)
+    message.message_metadata = {**(message.message_metadata or {}), **outcome}
+    db.commit()
+
 
 def _process_whatsapp_message_sync(message_id: str, individual_id: str, practice_id: str):
     """
@@ -41,6 +82,7 @@ def _process_whatsapp_message_sync(message_id: str, individual_id: str, practice
     
     # Create sync database session
     db = get_sync_session()
+    claimed = False
     try:
         # Fetch message from database
         message = db.execute(
@@ -78,7 +120,15 @@ def _process_whatsapp_message_sync(message_id: str, individual_id: str, practice
         print(f"📄 Found {len(documents)} documents attached to this message")
         print(f"💬 Message body: {message.body}")
         
-        # Initialize the Max Client WhatsApp Agent
+        # Idempotency guard: a retried or duplicate task must not reply to the same message twice
+        if not claim_message_for_agent(db, message.id):
+            print(f"⏭️ Message {message_id} already taken by the agent, skipping")
+            return {"success": True, "skipped": True, "message_id": message_id}
+        claimed = True
+        
+        # Initialize the Max Client WhatsApp Agent (imported here so the API, which only
+        # dispatches these tasks, does not load LangChain; workers preload it, see celery_app)
+        from agents.max_client_whatsapp.agent import MaxClientWhatsAppAgent
         agent = MaxClientWhatsAppAgent(
             practice=practice,
             individual=individual,
@@ -94,6 +144,13 @@ def _process_whatsapp_message_sync(message_id: str, individual_id: str, practice
         print(f"✅ Agent processing completed for message {message_id}")
         print(f"🤖 Agent response: {agent_response}")
         
+        if agent_response.get("success"):
+            get_circuit_breaker(OPENAI_UPSTREAM).record_success()
+        _record_agent_outcome(db, message.id, {
+            "agent_processed_at": datetime.now().isoformat(),
+            "agent_success": bool(agent_response.get("success"))
+        })
+        
         return {
             "success": True,
             "message_id": message_id,
@@ -105,6 +162,22 @@ def _process_whatsapp_message_sync(message_id: str, individual_id: str, practice
         print(f"❌ Error processing WhatsApp message {message_id}: {str(e)}")
         import traceback
         print(f"Traceback: {traceback.format_exc()}")
+        # Let transient errors reach the task so it is retried, unless the agent may already
+        # have replied
+        if is_retryable(e) and not claimed:
+            raise
+        if claimed:
+            db.rollback()
+            if is_retryable(e) and upstream_for_exception(e) == OPENAI_UPSTREAM:
+                get_circuit_breaker(OPENAI_UPSTREAM).record_failure()
+            try:
+                _record_agent_outcome(db, uuid.UUID(message_id), {
+                    "agent_failed_at": datetime.now().isoformat(),
+                    "agent_error": str(e)
+                })
+            except Exception as record_error:
+                db.rollback()
+                print(f"❌ Could not record the agent failure for message {message_id}: {str(record_error)}")
         return {
             "success": False,
             "error": str(e),
@@ -135,4 +208,104 @@ def trigger_whatsapp_processing(message_id: str, individual_id: str, practice_id
         
     except Exception as e:
         print(f"❌ Failed to trigger WhatsApp processing task: {str(e)}")
-        return {"error": str(e), "status": "failed"} 
\ No newline at end of file
+        return {"error": str(e), "status": "failed"} 
+
+@async_task(bind=True, name='process_whatsapp_attachments_complete')
+async def process_whatsapp_attachments_complete_task(
+    self,
+    results: List[dict],
+    message_id: str,
+    individual_id: str,
+    practice_id: str,
+    notify_agent: bool = True
+):
+    """
+    Chord callback run once every attachment of a WhatsApp message has been through OCR and the workflow.
+    
+    Records the pipeline outcome and end-to-end latency on the message and, if the message
+    has text for the agent to answer, hands it to the WhatsApp agent.
+    
+    Args:
+        results: Results of the last pipeline step for each attachment
+        message_id: UUID of the message the attachments belong to
+        individual_id: UUID of the individual who sent the message
+        practice_id: UUID of the practice receiving the message
+        notify_agent: Whether to trigger the WhatsApp agent for the message
+    """
+    async with get_async_session() as db:
+        message_result = await db.execute(
+            select(Message).where(Message.id == uuid.UUID(message_id))
+        )
+        message = message_result.scalar_one_or_none()
+        
+        if not message:
+            print(f"❌ Message {message_id} not found in database")
+            return {"success": False, "error": "Message not found"}
+        
+        completed_at = datetime.now(timezone.utc)
+        latency_seconds = (completed_at - message.created_at).total_seconds() if message.created_at else None
+        succeeded = sum(1 for result in results if result and result.get("success"))
+        
+        message.message_metadata = {
+            **(message.message_metadata or {}),
+            "attachment_pipeline": {
+                "documents": len(results),
+                "succeeded": succeeded,
+                "completed_at": completed_at.isoformat(),
+                "latency_seconds": latency_seconds
+            }
+        }
+        await db.commit()
+        has_text = bool((message.body or "").strip())
+    
+    print(f"✅ Attachment pipeline for message {message_id} completed: {succeeded}/{len(results)} documents in {latency_seconds}s")
+    
+    if notify_agent and has_text:
+        process_whatsapp_message_task.delay(
+            message_id=message_id,
+            individual_id=individual_id,
+            practice_id=practice_id
+        )
+    
+    return {
+        "success": True,
+        "message_id": message_id,
+        "documents": len(results),
+        "succeeded": succeeded,
+        "latency_seconds": latency_seconds
+    }
+
+def dispatch_attachment_pipeline(
+    document_ids: List[str],
+    message_id: str,
+    individual_id: str,
+    practice_id: str,
+    notify_agent: bool = True
+):
+    """
+    Run the OCR → workflow chain for every attachment of a message in parallel (a chord),
+    followed by a single callback once all of them have finished.
+    
+    Args:
+        document_ids: UUID strings of the documents to process
+        message_id: UUID string of the message
+        individual_id: UUID string of the individual
+        practice_id: UUID string of the practice
+        notify_agent: Whether the callback should trigger the WhatsApp agent
+    
+    Returns:
+        The AsyncResult of the chord callback, or None if there is nothing to process
+    """
+    if not document_ids:
+        return None
+    
+    header = group(build_document_pipeline(document_id) for document_id in document_ids)
+    callback = process_whatsapp_attachments_complete_task.s(
+        message_id=message_id,
+        individual_id=individual_id,
+        practice_id=practice_id,
+        notify_agent=notify_agent
+    )
+    result = chord(header)(callback)
+    print(f"🚀 Dispatched attachment pipeline {result.id} for {len(document_ids)} documents of message {message_id}")
+    return result
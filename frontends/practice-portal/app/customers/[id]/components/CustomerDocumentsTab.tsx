@@ -16,19 +16,27 @@ import {
 } from '@heroicons/react/24/outline'
 import { CustomerDocumentsTabResponse } from '../../../../lib/customers/types'
 import { getCustomerDocuments } from '../../../../lib/customers/service'
+import { getDocumentFileUrl, useUrlToken } from '../../../../lib/documents/service'
 
 interface CustomerDocumentsTabProps {
   customerId: string
+  initialData?: CustomerDocumentsTabResponse  // Preloaded by the customer overview; skips the first fetch
 }
 
-export default function CustomerDocumentsTab({ customerId }: CustomerDocumentsTabProps) {
+export default function CustomerDocumentsTab({ customerId, initialData }: CustomerDocumentsTabProps) {
   const [documentsData, setDocumentsData] = useState<CustomerDocumentsTabResponse | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [searchTerm, setSearchTerm] = useState('')
+  const urlToken = useUrlToken()
 
   useEffect(() => {
-    loadDocumentsData()
+    if (initialData) {
+      setDocumentsData(initialData)
+      setLoading(false)
+    } else {
+      loadDocumentsData()
+    }
   }, [customerId])
 
   const loadDocumentsData = async () => {
@@ -151,7 +159,7 @@ export default function CustomerDocumentsTab({ customerId }: CustomerDocumentsTa
       <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
         <div className="bg-white border border-gray-200 rounded-lg p-4 text-center">
           <div className="text-2xl font-bold text-blue-600 mb-1">
-            {documentsData.documents.length}
+            {documentsData.total_count ?? documentsData.documents.length}
           </div>
           <div className="text-sm text-gray-500">Total Documents</div>
         </div>
@@ -200,9 +208,18 @@ export default function CustomerDocumentsTab({ customerId }: CustomerDocumentsTa
               <div key={document.id} className="px-6 py-4 hover:bg-gray-50">
                 <div className="flex items-center justify-between">
                   <div className="flex items-center space-x-4">
-                    <div className="p-2 bg-blue-100 rounded-lg">
-                      <DocumentTextIcon className="h-5 w-5 text-blue-600" />
-                    </div>
+                    {document.thumbnail_sha256 && urlToken ? (
+                      <img
+                        src={getDocumentFileUrl(document.id, urlToken, 'thumbnail')}
+                        alt=""
+                        loading="lazy"
+                        className="h-12 w-12 rounded-lg object-cover border border-gray-200"
+                      />
+                    ) : (
+                      <div className="p-2 bg-blue-100 rounded-lg">
+                        <DocumentTextIcon className="h-5 w-5 text-blue-600" />
+                      </div>
+                    )}
                     <div className="flex-1">
                       <div className="flex items-center space-x-2">
                         <h4 className="text-sm font-medium text-gray-900">
@@ -246,14 +263,14 @@ export default function CustomerDocumentsTab({ customerId }: CustomerDocumentsTa
                   </div>
                   <div className="flex items-center space-x-2">
                     <button
-                      onClick={() => window.open(document.document_url, '_blank')}
+                      onClick={() => urlToken && window.open(getDocumentFileUrl(document.id, urlToken, 'download', true), '_blank')}
                       className="inline-flex items-center p-1 text-gray-400 hover:text-gray-600"
                       title="View document"
                     >
                       <EyeIcon className="h-4 w-4" />
                     </button>
                     <button
-                      onClick={() => {/* TODO: Download document */}}
+                      onClick={() => urlToken && window.location.assign(getDocumentFileUrl(document.id, urlToken))}
                       className="inline-flex items-center p-1 text-gray-400 hover:text-gray-600"
                       title="Download document"
                     >
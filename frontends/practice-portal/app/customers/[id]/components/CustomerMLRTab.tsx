@@ -19,6 +19,7 @@ import { getCustomerMLR, updateCustomerMLRInfo } from '../../../../lib/customers
 
 interface CustomerMLRTabProps {
   customerId: string
+  initialData?: CustomerMLRTabResponse  // Preloaded by the customer overview; skips the first fetch
 }
 
 const MLR_STATUS_CONFIG = {
@@ -48,7 +49,7 @@ const MLR_STATUS_CONFIG = {
   }
 }
 
-export default function CustomerMLRTab({ customerId }: CustomerMLRTabProps) {
+export default function CustomerMLRTab({ customerId, initialData }: CustomerMLRTabProps) {
   const [mlrData, setMLRData] = useState<CustomerMLRTabResponse | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
@@ -57,7 +58,13 @@ export default function CustomerMLRTab({ customerId }: CustomerMLRTabProps) {
   const [saving, setSaving] = useState(false)
 
   useEffect(() => {
-    loadMLRData()
+    if (initialData) {
+      setMLRData(initialData)
+      setEditData(initialData)
+      setLoading(false)
+    } else {
+      loadMLRData()
+    }
   }, [customerId])
 
   const loadMLRData = async () => {
@@ -26,9 +26,10 @@ import { ClientAssociationModal, IndividualRelationshipModal } from './modals'
 
 interface CustomerRelationshipsTabProps {
   customerId: string
+  initialData?: CustomerRelationshipsTabResponse  // Preloaded by the customer overview; skips the first fetch
 }
 
-export default function CustomerRelationshipsTab({ customerId }: CustomerRelationshipsTabProps) {
+export default function CustomerRelationshipsTab({ customerId, initialData }: CustomerRelationshipsTabProps) {
   const [relationshipsData, setRelationshipsData] = useState<CustomerRelationshipsTabResponse | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
@@ -40,7 +41,12 @@ export default function CustomerRelationshipsTab({ customerId }: CustomerRelatio
   const [editingIndividualRelationship, setEditingIndividualRelationship] = useState<any>(null)
 
   useEffect(() => {
-    loadRelationshipsData()
+    if (initialData) {
+      setRelationshipsData(initialData)
+      setLoading(false)
+    } else {
+      loadRelationshipsData()
+    }
   }, [customerId])
 
   const loadRelationshipsData = async () => {
@@ -49,6 +49,9 @@ export default function ClientAssociationModal({
     notes: ''
   })
   const [availableClients, setAvailableClients] = useState<AvailableClient[]>([])
+  const [clientQuery, setClientQuery] = useState('')
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [searching, setSearching] = useState(false)
   const [relationshipTypes, setRelationshipTypes] = useState<EnumOption[]>([])
   const [loading, setLoading] = useState(false)
   const [saving, setSaving] = useState(false)
@@ -82,14 +85,23 @@ export default function ClientAssociationModal({
     }
   }, [isOpen, editData])
 
+  // Refetch the first page of candidates as the user types (debounced)
+  useEffect(() => {
+    if (!isOpen || editData) return
+    const timeoutId = setTimeout(() => searchClients(clientQuery), 250)
+    return () => clearTimeout(timeoutId)
+  }, [clientQuery])
+
   const loadDropdownData = async () => {
     try {
       setLoading(true)
-      const [clients, types] = await Promise.all([
+      setClientQuery('')
+      const [clientsPage, types] = await Promise.all([
         getAvailableClientsForCustomer(customerId),
         getClientRelationshipTypes()
       ])
-      setAvailableClients(clients)
+      setAvailableClients(clientsPage.items)
+      setNextCursor(clientsPage.next_cursor || null)
       setRelationshipTypes(types)
     } catch (err) {
       console.error('Error loading dropdown data:', err)
@@ -99,6 +111,20 @@ export default function ClientAssociationModal({
     }
   }
 
+  const searchClients = async (query: string, cursor?: string | null) => {
+    try {
+      setSearching(true)
+      const page = await getAvailableClientsForCustomer(customerId, { q: query, cursor })
+      setAvailableClients(prev => cursor ? [...prev, ...page.items] : page.items)
+      setNextCursor(page.next_cursor || null)
+    } catch (err) {
+      console.error('Error searching clients:', err)
+      setError('Failed to load clients')
+    } finally {
+      setSearching(false)
+    }
+  }
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault()
     
@@ -163,6 +189,13 @@ export default function ClientAssociationModal({
               <label className="block text-sm font-medium text-gray-700 mb-2">
                 Client *
               </label>
+              <input
+                type="text"
+                value={clientQuery}
+                onChange={(e) => setClientQuery(e.target.value)}
+                placeholder="Search by business name..."
+                className="block w-full mb-2 rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring-blue-500"
+              />
               <select
                 value={('client_id' in formData) ? formData.client_id : ''}
                 onChange={(e) => handleInputChange('client_id', e.target.value)}
@@ -176,6 +209,16 @@ export default function ClientAssociationModal({
                   </option>
                 ))}
               </select>
+              {nextCursor && (
+                <button
+                  type="button"
+                  onClick={() => searchClients(clientQuery, nextCursor)}
+                  disabled={searching}
+                  className="mt-1 text-sm text-blue-600 hover:text-blue-800 disabled:opacity-50"
+                >
+                  {searching ? 'Loading...' : 'Load more clients'}
+                </button>
+              )}
             </div>
           )}
 
@@ -39,6 +39,9 @@ export default function IndividualRelationshipModal({
     description: ''
   })
   const [availableIndividuals, setAvailableIndividuals] = useState<AvailableIndividual[]>([])
+  const [individualQuery, setIndividualQuery] = useState('')
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [searching, setSearching] = useState(false)
   const [relationshipTypes, setRelationshipTypes] = useState<EnumOption[]>([])
   const [loading, setLoading] = useState(false)
   const [saving, setSaving] = useState(false)
@@ -62,14 +65,23 @@ export default function IndividualRelationshipModal({
     }
   }, [isOpen, editData])
 
+  // Refetch the first page of candidates as the user types (debounced)
+  useEffect(() => {
+    if (!isOpen || editData) return
+    const timeoutId = setTimeout(() => searchIndividuals(individualQuery), 250)
+    return () => clearTimeout(timeoutId)
+  }, [individualQuery])
+
   const loadDropdownData = async () => {
     try {
       setLoading(true)
-      const [individuals, types] = await Promise.all([
+      setIndividualQuery('')
+      const [individualsPage, types] = await Promise.all([
         getAvailableIndividualsForCustomer(customerId),
         getIndividualRelationshipTypes()
       ])
-      setAvailableIndividuals(individuals)
+      setAvailableIndividuals(individualsPage.items)
+      setNextCursor(individualsPage.next_cursor || null)
       setRelationshipTypes(types)
     } catch (err) {
       console.error('Error loading dropdown data:', err)
@@ -79,6 +91,20 @@ export default function IndividualRelationshipModal({
     }
   }
 
+  const searchIndividuals = async (query: string, cursor?: string | null) => {
+    try {
+      setSearching(true)
+      const page = await getAvailableIndividualsForCustomer(customerId, { q: query, cursor })
+      setAvailableIndividuals(prev => cursor ? [...prev, ...page.items] : page.items)
+      setNextCursor(page.next_cursor || null)
+    } catch (err) {
+      console.error('Error searching individuals:', err)
+      setError('Failed to load individuals')
+    } finally {
+      setSearching(false)
+    }
+  }
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault()
     
@@ -140,6 +166,13 @@ export default function IndividualRelationshipModal({
               <label className="block text-sm font-medium text-gray-700 mb-2">
                 Individual *
               </label>
+              <input
+                type="text"
+                value={individualQuery}
+                onChange={(e) => setIndividualQuery(e.target.value)}
+                placeholder="Search by first or last name..."
+                className="block w-full mb-2 rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring-blue-500"
+              />
               <select
                 value={('to_individual_id' in formData) ? formData.to_individual_id : ''}
                 onChange={(e) => handleInputChange('to_individual_id', e.target.value)}
@@ -153,9 +186,21 @@ export default function IndividualRelationshipModal({
                   </option>
                 ))}
               </select>
-              {availableIndividuals.length === 0 && (
+              {nextCursor && (
+                <button
+                  type="button"
+                  onClick={() => searchIndividuals(individualQuery, nextCursor)}
+                  disabled={searching}
+                  className="mt-1 text-sm text-blue-600 hover:text-blue-800 disabled:opacity-50"
+                >
+                  {searching ? 'Loading...' : 'Load more individuals'}
+                </button>
+              )}
+              {availableIndividuals.length === 0 && !searching && (
                 <p className="text-sm text-gray-500 mt-1">
-                  No available individuals to create relationships with.
+                  {individualQuery.trim()
+                    ? 'No available individuals match your search.'
+                    : 'No available individuals to create relationships with.'}
                 </p>
               )}
             </div>
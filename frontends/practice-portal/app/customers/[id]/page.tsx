@@ -20,8 +20,20 @@ import {
 } from '@heroicons/react/24/outline'
 
 // Import customer service
-import { getCustomerInfo, updateCustomer } from '../../../lib/customers/service'
-import { CustomerInfoTabResponse } from '../../../lib/customers/types'
+import { getCustomerInfo, updateCustomer, streamCustomerOverview } from '../../../lib/customers/service'
+import {
+  CustomerInfoTabResponse,
+  CustomerMLRTabResponse,
+  CustomerRelationshipsTabResponse,
+  CustomerDocumentsTabResponse
+} from '../../../lib/customers/types'
+
+// Tab data preloaded by the customer overview, handed to each tab the first time it opens
+interface PreloadedTabs {
+  mlr?: CustomerMLRTabResponse
+  relationships?: CustomerRelationshipsTabResponse
+  documents?: CustomerDocumentsTabResponse
+}
 
 // Helper function to capitalize strings
 const capitalize = (str?: string) => {
@@ -41,10 +53,11 @@ export default function CustomerDetailPage() {
   const [activeTab, setActiveTab] = useState('information')
   const [isEditing, setIsEditing] = useState(false)
   const [editedCustomer, setEditedCustomer] = useState<CustomerInfoTabResponse | null>(null)
+  const [preloadedTabs, setPreloadedTabs] = useState<PreloadedTabs>({})
 
   useEffect(() => {
     if (customerId) {
-      fetchCustomer()
+      loadOverview()
     }
   }, [customerId])
 
@@ -68,6 +81,32 @@ export default function CustomerDetailPage() {
     }
   }, [customer])
 
+  // One request for the customer and every tab; the info section arrives first in most cases
+  const loadOverview = async () => {
+    try {
+      setLoading(true)
+      setError(null)
+      setPreloadedTabs({})
+      await streamCustomerOverview(customerId, (section) => {
+        if (section.section === 'info') {
+          if (section.data) {
+            setCustomer(section.data)
+          } else {
+            setError(section.error || 'Failed to fetch customer')
+          }
+          setLoading(false)
+        } else if (section.data) {
+          setPreloadedTabs(prev => ({ ...prev, [section.section]: section.data }))
+        }
+      })
+    } catch (err) {
+      console.error('Error fetching customer:', err)
+      setError(err instanceof Error ? err.message : 'Failed to fetch customer')
+    } finally {
+      setLoading(false)
+    }
+  }
+
   const fetchCustomer = async () => {
     try {
       setLoading(true)
@@ -129,6 +168,8 @@ export default function CustomerDetailPage() {
   }
 
   const handleTabChange = (tabId: string) => {
+    // A tab opened again fetches fresh data, as it may have been edited since the overview loaded
+    setPreloadedTabs(prev => ({ ...prev, [activeTab]: undefined }))
     setActiveTab(tabId)
   }
 
@@ -148,11 +189,11 @@ export default function CustomerDetailPage() {
       case 'tasks':
         return <CustomerTasksTab customerId={customerId} />
       case 'documents':
-        return <CustomerDocumentsTab customerId={customerId} />
+        return <CustomerDocumentsTab customerId={customerId} initialData={preloadedTabs.documents} />
       case 'mlr':
-        return <CustomerMLRTab customerId={customerId} />
+        return <CustomerMLRTab customerId={customerId} initialData={preloadedTabs.mlr} />
       case 'relationships':
-        return <CustomerRelationshipsTab customerId={customerId} />
+        return <CustomerRelationshipsTab customerId={customerId} initialData={preloadedTabs.relationships} />
       default:
         return (
           <CustomerInformationDisplay
@@ -196,7 +237,7 @@ export default function CustomerDetailPage() {
                 </div>
                 <div className="mt-4 flex space-x-3">
                   <button
-                    onClick={fetchCustomer}
+                    onClick={loadOverview}
                     className="bg-red-100 px-3 py-2 rounded-md text-sm font-medium text-red-800 hover:bg-red-200 transition-colors"
                   >
                     Try Again
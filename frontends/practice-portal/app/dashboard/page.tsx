@@ -1,9 +1,10 @@
 'use client'
 
-import React from 'react'
+import React, { useEffect, useState } from 'react'
 import AppLayout from '../../components/layout/AppLayout'
 import { useAuth } from '../../hooks/useAuth'
 import { usePermissions } from '../../hooks/usePermissions'
+import { getDashboardSummary, DashboardSummary } from '../../lib/dashboard'
 
 export default function DashboardPage() {
   return (
@@ -16,6 +17,14 @@ export default function DashboardPage() {
 function DashboardContent() {
   const { user } = useAuth()
   const permissions = usePermissions(user?.role!)
+  const [summary, setSummary] = useState<DashboardSummary | null>(null)
+
+  useEffect(() => {
+    if (!user) return
+    getDashboardSummary()
+      .then(setSummary)
+      .catch(error => console.error('Error loading dashboard summary:', error))
+  }, [user])
 
   if (!user) return null
 
@@ -62,7 +71,7 @@ function DashboardContent() {
                       Active Clients
                     </dt>
                     <dd className="text-lg font-medium text-gray-900">
-                      {user.clientIds?.length || 0}
+                      {summary ? summary.customers_by_status.active ?? 0 : '—'}
                     </dd>
                   </dl>
                 </div>
@@ -151,6 +160,48 @@ function DashboardContent() {
         )}
       </div>
 
+      {/* Practice Summary - Visible to all except payroll */}
+      {permissions.canViewClients && summary && (
+        <div className="bg-white shadow rounded-lg mb-8">
+          <div className="px-4 py-5 sm:p-6">
+            <h3 className="text-lg leading-6 font-medium text-gray-900 mb-4">
+              Practice Summary
+            </h3>
+            <dl className="grid grid-cols-2 gap-4 sm:grid-cols-5">
+              <div>
+                <dt className="text-sm text-gray-500">Customers</dt>
+                <dd className="text-lg font-medium text-gray-900">{summary.customers_total}</dd>
+              </div>
+              <div>
+                <dt className="text-sm text-gray-500">Client Businesses</dt>
+                <dd className="text-lg font-medium text-gray-900">{summary.clients_total}</dd>
+              </div>
+              <div>
+                <dt className="text-sm text-gray-500">Rental Properties</dt>
+                <dd className="text-lg font-medium text-gray-900">{summary.rental_income.properties}</dd>
+              </div>
+              <div>
+                <dt className="text-sm text-gray-500">Annual Rental Income</dt>
+                <dd className="text-lg font-medium text-gray-900">
+                  £{Number(summary.rental_income.annual_total).toLocaleString('en-GB', { minimumFractionDigits: 2 })}
+                </dd>
+              </div>
+              <div>
+                <dt className="text-sm text-gray-500">Overdue Filings</dt>
+                <dd className={`text-lg font-medium ${summary.overdue_filings.any > 0 ? 'text-red-600' : 'text-gray-900'}`}>
+                  {summary.overdue_filings.any}
+                </dd>
+              </div>
+            </dl>
+            {summary.refreshed_at && (
+              <p className="mt-4 text-xs text-gray-400">
+                Updated {new Date(summary.refreshed_at).toLocaleTimeString()}
+              </p>
+            )}
+          </div>
+        </div>
+      )}
+
       {/* Role-specific content */}
       <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
         
@@ -117,4 +117,90 @@ export const api = {
 
   delete: <T>(endpoint: string) =>
     fetchFromBackend<T>(endpoint, { method: 'DELETE' }),
-} 
\ No newline at end of file
+} 
+
+// Read a newline-delimited JSON (NDJSON) response, calling onItem for each line as it arrives.
+// Errors are handled like fetchFromBackend.
+export async function fetchNdjson<T>(
+  endpoint: string,
+  onItem: (item: T) => void
+): Promise<void> {
+  const token = getAuthToken()
+  const response = await fetch(`${BACKEND_URL}${endpoint}`, {
+    headers: token ? { 'Authorization': `Bearer ${token}` } : {},
+  })
+
+  if (response.status === 401) {
+    localStorage.removeItem('authToken')
+    window.location.href = 'http://localhost:3000?error=session_expired'
+    throw new ApiError('Authentication required', 401)
+  }
+
+  if (!response.ok || !response.body) {
+    let errorMessage = `HTTP ${response.status}: ${response.statusText}`
+    let errorData = null
+    try {
+      errorData = await response.json()
+      errorMessage = errorData.message || errorData.detail || errorMessage
+    } catch {
+      // Response isn't JSON, use status text
+    }
+    throw new ApiError(errorMessage, response.status, errorData)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  while (true) {
+    const { done, value } = await reader.read()
+    buffer += decoder.decode(value, { stream: !done })
+    const lines = buffer.split('\n')
+    buffer = lines.pop() || ''
+    for (const line of lines) {
+      if (line.trim()) {
+        onItem(JSON.parse(line) as T)
+      }
+    }
+    if (done) break
+  }
+  if (buffer.trim()) {
+    onItem(JSON.parse(buffer) as T)
+  }
+}
+
+// Short-lived token for requests the browser makes itself (EventSource, <img>, links), which cannot
+// send headers. It only works on those endpoints, so the access token never goes in a URL.
+// Backend: POST /auth/url-token
+let urlToken: { token: string; expiresAt: number } | null = null
+let urlTokenRequest: Promise<string> | null = null
+
+export function getUrlToken(): Promise<string> {
+  // Renewed a minute early so URLs handed out stay usable for a while
+  if (urlToken && urlToken.expiresAt - Date.now() > 60_000) {
+    return Promise.resolve(urlToken.token)
+  }
+  if (!urlTokenRequest) {
+    urlTokenRequest = api.post<{ token: string; expires_in: number }>('/auth/url-token')
+      .then((response) => {
+        urlToken = { token: response.token, expiresAt: Date.now() + response.expires_in * 1000 }
+        return response.token
+      })
+      .finally(() => {
+        urlTokenRequest = null
+      })
+  }
+  return urlTokenRequest
+}
+
+// Backend URL for requests the browser makes itself, with a token from getUrlToken
+export function authenticatedUrl(endpoint: string, token: string): string {
+  const separator = endpoint.includes('?') ? '&' : '?'
+  return `${BACKEND_URL}${endpoint}${separator}token=${encodeURIComponent(token)}`
+}
+
+// Open a Server-Sent Events stream.
+// EventSource reconnects by itself and resumes from the last event id it received; once the URL
+// token has expired it gives up (readyState CLOSED) and the caller opens a new stream.
+export async function createEventSource(endpoint: string): Promise<EventSource> {
+  return new EventSource(authenticatedUrl(endpoint, await getUrlToken()))
+}
@@ -61,6 +61,24 @@ export async function getClient(id: string): Promise<DetailedClientResponse> {
   return api.get<DetailedClientResponse>(`/clients/${id}`)
 }
 
+/**
+ * GET CLIENT'S FULL COMPANIES HOUSE DATA
+ * Retrieves the complete stored Companies House response (client details only carry a summary)
+ * 📋 Use this for: the Companies House raw data tab
+ * 👥 Who can use: Practice owners, accountants, bookkeepers
+ * 
+ * @param id - The unique identifier of the client
+ * @returns The stored Companies House data with its sync metadata
+ */
+export async function getClientCompaniesHouseData(id: string): Promise<{
+  profile_id: string
+  last_synced?: string
+  sync_status?: string
+  companies_house_data: any
+}> {
+  return api.get(`/clients/${id}/companies-house`)
+}
+
 /**
  * CREATE NEW CLIENT
  * Adds a new business client to the system
@@ -222,5 +222,5 @@ export interface DetailedClientResponse {
     is_primary_contact: boolean
   }>
   services: ClientService[]
-  companies_house_profile?: any  // Official government data (if available)
+  companies_house_profile?: any  // Summary of official government data (full data: getClientCompaniesHouseData)
 } 
\ No newline at end of file
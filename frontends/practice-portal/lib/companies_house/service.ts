@@ -10,7 +10,9 @@ import { api } from '../api-client'
 import { 
   CompaniesHouseSearchResponse,
   CompaniesHouseSearchParams,
-  CompaniesHouseAutoFillResponse
+  CompaniesHouseAutoFillResponse,
+  FilingDeadlineParams,
+  FilingDeadlinesPage
 } from './types'
 
 // ==========================================
@@ -90,6 +92,35 @@ export async function triggerCompaniesHouseAutoFill(
   return api.post<CompaniesHouseAutoFillResponse>(`/companies-house/clients/${clientId}/auto-fill`)
 }
 
+// ==========================================
+// FILING DEADLINE FUNCTIONS
+// ==========================================
+
+/**
+ * GET FILING DEADLINES
+ * Clients whose accounts or confirmation statement are due soon (or overdue)
+ * 📋 Use this for: deadline lists and reminders, earliest deadline first
+ * 👥 Who can use: Practice owners, accountants, bookkeepers
+ * 
+ * Uses the deadlines stored at the last Companies House sync of each client,
+ * so it is fast however many clients the practice has.
+ * 
+ * @param params - Window in days, filing kind, overdue filter and paging
+ * @returns One page of clients with their next deadlines
+ */
+export async function getFilingDeadlines(
+  params: FilingDeadlineParams = {}
+): Promise<FilingDeadlinesPage> {
+  const query = new URLSearchParams()
+  if (params.within_days !== undefined) query.set('within_days', params.within_days.toString())
+  if (params.filing) query.set('filing', params.filing)
+  if (params.include_overdue !== undefined) query.set('include_overdue', String(params.include_overdue))
+  if (params.limit !== undefined) query.set('limit', params.limit.toString())
+  if (params.offset !== undefined) query.set('offset', params.offset.toString())
+  
+  return api.get<FilingDeadlinesPage>(`/companies-house/deadlines?${query}`)
+}
+
 // ==========================================
 // UTILITY FUNCTIONS
 // ==========================================
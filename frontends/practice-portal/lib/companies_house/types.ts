@@ -128,4 +128,44 @@ export interface CompanySelectionData extends CompaniesHouseSearchResult {
   // All the fields from CompaniesHouseSearchResult, plus any additional processing
   selected_at?: string        // When this company was selected
   auto_fill_requested?: boolean  // Whether user wants to auto-fill from this data
-}
\ No newline at end of file
+}
+
+/**
+ * FILING DEADLINE PARAMS
+ * Parameters for GET /companies-house/deadlines
+ */
+export interface FilingDeadlineParams {
+  within_days?: number        // Deadlines up to this many days from today (default: 30)
+  filing?: 'accounts' | 'confirmation_statement' | 'any'  // Which filings (default: any)
+  include_overdue?: boolean   // Also return overdue filings (default: true)
+  limit?: number              // Page size (default: 100, max: 1000)
+  offset?: number
+}
+
+/**
+ * FILING DEADLINE
+ * A client's next Companies House deadlines, as of its last sync
+ */
+export interface FilingDeadline {
+  client_id: string
+  client_code: string
+  business_name: string
+  company_number: string
+  company_status: string | null
+  next_accounts_due: string | null       // YYYY-MM-DD
+  next_confirmation_due: string | null   // YYYY-MM-DD
+  accounts_overdue: boolean
+  confirmation_overdue: boolean
+  next_deadline: string | null           // Earliest of the requested deadlines
+  last_synced: string | null
+}
+
+/**
+ * FILING DEADLINES PAGE
+ * One page of deadlines, earliest first
+ */
+export interface FilingDeadlinesPage {
+  due_before: string
+  items: FilingDeadline[]
+  has_more: boolean
+}
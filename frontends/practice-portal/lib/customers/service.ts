@@ -4,7 +4,7 @@
 // Direct calls to backend customer endpoints
 // ==========================================
 
-import { api } from '../api-client'
+import { api, fetchNdjson } from '../api-client'
 import { PaginatedResponse } from '../shared/types'
 import { 
   Customer, 
@@ -14,6 +14,8 @@ import {
   CustomerMLRTabResponse,
   CustomerRelationshipsTabResponse,
   CustomerDocumentsTabResponse,
+  CustomerOverviewSection,
+  CustomerOverviewSectionName,
   CustomerAccountingInfoUpdate,
   CustomerMLRInfoUpdate,
   CustomerClientAssociationCreate,
@@ -22,8 +24,9 @@ import {
   IndividualRelationshipCreate,
   IndividualRelationshipUpdate,
   IndividualRelationshipResponse,
-  AvailableClient,
-  AvailableIndividual,
+  AvailableClientsPage,
+  AvailableIndividualsPage,
+  TypeaheadParams,
   EnumOption
 } from './types'
 
@@ -115,10 +118,31 @@ export async function getCustomerRelationships(id: string): Promise<CustomerRela
 }
 
 /**
- * Get customer documents tab data
+ * Get customer documents tab data (newest first, `limit` per page, with `total_count`)
  */
-export async function getCustomerDocuments(id: string): Promise<CustomerDocumentsTabResponse> {
-  return api.get<CustomerDocumentsTabResponse>(`/customers/${id}/documents`)
+export async function getCustomerDocuments(
+  id: string,
+  limit: number = 100,
+  offset: number = 0
+): Promise<CustomerDocumentsTabResponse> {
+  return api.get<CustomerDocumentsTabResponse>(`/customers/${id}/documents?limit=${limit}&offset=${offset}`)
+}
+
+/**
+ * Load the customer screen's tabs in one request. onSection is called for each tab as soon as the
+ * backend has loaded it; the promise resolves once every section has arrived.
+ * Backend: GET /customers/{customer_id}/overview
+ */
+export async function streamCustomerOverview(
+  id: string,
+  onSection: (section: CustomerOverviewSection) => void,
+  sections?: CustomerOverviewSectionName[]
+): Promise<void> {
+  const params = new URLSearchParams()
+  if (sections && sections.length) {
+    params.append('sections', sections.join(','))
+  }
+  return fetchNdjson<CustomerOverviewSection>(`/customers/${id}/overview?${params}`, onSection)
 }
 
 /**
@@ -215,18 +239,40 @@ export async function deleteCustomerIndividualRelationship(
 // HELPER FUNCTIONS FOR DROPDOWNS
 // ==========================================
 
+function typeaheadQuery(params: TypeaheadParams = {}): string {
+  const searchParams = new URLSearchParams()
+  if (params.q && params.q.trim()) {
+    searchParams.append('q', params.q.trim())
+  }
+  if (params.limit) {
+    searchParams.append('limit', params.limit.toString())
+  }
+  if (params.cursor) {
+    searchParams.append('cursor', params.cursor)
+  }
+  return searchParams.toString()
+}
+
 /**
- * Get available clients for customer association
+ * Get a page of clients available for customer association, filtered by business name prefix
+ * Backend: GET /customers/{customer_id}/available-clients
  */
-export async function getAvailableClientsForCustomer(customerId: string): Promise<AvailableClient[]> {
-  return api.get<AvailableClient[]>(`/customers/${customerId}/available-clients`)
+export async function getAvailableClientsForCustomer(
+  customerId: string,
+  params?: TypeaheadParams
+): Promise<AvailableClientsPage> {
+  return api.get<AvailableClientsPage>(`/customers/${customerId}/available-clients?${typeaheadQuery(params)}`)
 }
 
 /**
- * Get available individuals for relationship
+ * Get a page of individuals available for relationship, filtered by first or last name prefix
+ * Backend: GET /customers/{customer_id}/available-individuals
  */
-export async function getAvailableIndividualsForCustomer(customerId: string): Promise<AvailableIndividual[]> {
-  return api.get<AvailableIndividual[]>(`/customers/${customerId}/available-individuals`)
+export async function getAvailableIndividualsForCustomer(
+  customerId: string,
+  params?: TypeaheadParams
+): Promise<AvailableIndividualsPage> {
+  return api.get<AvailableIndividualsPage>(`/customers/${customerId}/available-individuals?${typeaheadQuery(params)}`)
 }
 
 /**
@@ -245,6 +245,14 @@ export interface DocumentResponse {
   description?: string
   tags?: string[]
   agent_state: string
+  agent_processing_started_at?: string
+  processed_at?: string
+  agent_confidence_score?: number  // Classification confidence, 0-1
+  extracted_text_length?: number
+  extracted_page_count?: number
+  thumbnail_sha256?: string  // Set once the OCR worker has made a thumbnail
+  is_validated: boolean
+  is_archived: boolean
   created_at: string
   updated_at?: string
   uploaded_by_user_id?: string
@@ -385,8 +393,20 @@ export interface CustomerRelationshipsTabResponse {
 export interface CustomerDocumentsTabResponse {
   id: string
   documents: DocumentResponse[]
+  total_count: number
 }
 
+export type CustomerOverviewSectionName = 'info' | 'mlr' | 'relationships' | 'documents'
+
+/**
+ * One line of GET /customers/{id}/overview: a tab's data, or an error if that section failed or timed out
+ */
+export type CustomerOverviewSection =
+  | { section: 'info'; data?: CustomerInfoTabResponse; error?: string }
+  | { section: 'mlr'; data?: CustomerMLRTabResponse; error?: string }
+  | { section: 'relationships'; data?: CustomerRelationshipsTabResponse; error?: string }
+  | { section: 'documents'; data?: CustomerDocumentsTabResponse; error?: string }
+
 // ==========================================
 // CUSTOMER-CLIENT ASSOCIATION TYPES
 // ==========================================
@@ -464,6 +484,28 @@ export interface AvailableIndividual {
   email?: string
 }
 
+/**
+ * Query for the available-clients / available-individuals typeahead: `q` is a name prefix,
+ * `cursor` the `next_cursor` of the previous page.
+ */
+export interface TypeaheadParams {
+  q?: string
+  limit?: number
+  cursor?: string | null
+}
+
+export interface AvailableClientsPage {
+  items: AvailableClient[]
+  has_more: boolean
+  next_cursor?: string | null
+}
+
+export interface AvailableIndividualsPage {
+  items: AvailableIndividual[]
+  has_more: boolean
+  next_cursor?: string | null
+}
+
 export interface EnumOption {
   value: string
   label: string
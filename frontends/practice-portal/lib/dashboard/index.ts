@@ -0,0 +1,10 @@
+// lib/dashboard/index.ts
+// ==========================================
+// DASHBOARD MODULE EXPORTS
+// ==========================================
+
+// Export all types
+export * from './types'
+
+// Export all service functions
+export * from './service' 
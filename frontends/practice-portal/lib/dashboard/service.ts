@@ -0,0 +1,23 @@
+// lib/dashboard/service.ts
+// ==========================================
+// DASHBOARD SERVICE FUNCTIONS
+// Direct calls to backend dashboard endpoints
+// ==========================================
+
+import { api } from '../api-client'
+import { DashboardSummary } from './types'
+
+/**
+ * GET DASHBOARD SUMMARY
+ * Customer, client, income and overdue filing figures for the whole practice
+ * 📋 Use this for: dashboard cards, instead of loading full customer and client lists
+ * 👥 Who can use: Practice staff
+ *
+ * The figures are precomputed on the server and refreshed every few minutes,
+ * so this is cheap to call however large the practice is.
+ *
+ * @returns Practice dashboard summary
+ */
+export async function getDashboardSummary(): Promise<DashboardSummary> {
+  return api.get<DashboardSummary>('/dashboard/summary')
+}
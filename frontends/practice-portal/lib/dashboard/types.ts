@@ -0,0 +1,30 @@
+// lib/dashboard/types.ts
+// ==========================================
+// DASHBOARD SERVICE TYPES
+// ==========================================
+
+// Count and total of one income type
+export interface IncomeTypeSummary {
+  count: number
+  total: string // Decimal, serialised as a string
+}
+
+// Practice-wide dashboard figures (GET /dashboard/summary)
+// The records are keyed by enum value and list every value, zero when there are none
+export interface DashboardSummary {
+  customers_total: number
+  customers_by_status: Record<string, number>
+  clients_total: number
+  clients_by_business_type: Record<string, number>
+  income_by_type: Record<string, IncomeTypeSummary>
+  rental_income: {
+    properties: number
+    annual_total: string
+  }
+  overdue_filings: {
+    accounts: number
+    confirmation_statement: number
+    any: number
+  }
+  refreshed_at: string | null // figures are as of this time (refreshed every few minutes)
+}
@@ -0,0 +1,10 @@
+// lib/documents/index.ts
+// ==========================================
+// DOCUMENTS MODULE EXPORTS
+// ==========================================
+
+// Export all types
+export * from './types'
+
+// Export all service functions
+export * from './service' 
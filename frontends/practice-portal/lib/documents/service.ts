@@ -0,0 +1,57 @@
+// lib/documents/service.ts
+// ==========================================
+// DOCUMENT SERVICE FUNCTIONS
+// URLs of document files on the backend
+// ==========================================
+
+import { useEffect, useState } from 'react'
+import { authenticatedUrl, getUrlToken } from '../api-client'
+import { DocumentFile } from './types'
+
+/**
+ * GET DOCUMENT FILE URL
+ * URL of a document's file, thumbnail (256px) or first-page preview (1024px)
+ * 📋 Use this for: <img src>, download links and window.open
+ * 👥 Who can use: Practice staff
+ *
+ * Browsers send no headers for these, so the URL carries a short-lived URL token (getUrlToken
+ * in api-client, or useUrlToken in components) rather than the access token.
+ * Thumbnails and previews exist once the document has been OCR'd (thumbnail_sha256 is set).
+ * Files are cached by the browser and revalidated with their ETag.
+ *
+ * @param documentId - Document ID
+ * @param token - URL token from getUrlToken
+ * @param file - 'download' (the original file), 'thumbnail' or 'preview'
+ * @param inline - Show the original in the browser instead of saving it
+ * @returns URL including the URL token
+ */
+export function getDocumentFileUrl(
+  documentId: string,
+  token: string,
+  file: DocumentFile = 'download',
+  inline: boolean = false
+): string {
+  const query = file === 'download' && inline ? '?inline=true' : ''
+  return authenticatedUrl(`/documents/${documentId}/${file}${query}`, token)
+}
+
+/**
+ * A URL token for getDocumentFileUrl, renewed before it expires (null until the first one arrives)
+ */
+export function useUrlToken(): string | null {
+  const [token, setToken] = useState<string | null>(null)
+  
+  useEffect(() => {
+    let cancelled = false
+    const refresh = () => getUrlToken().then((next) => !cancelled && setToken(next)).catch(console.error)
+    refresh()
+    // Well inside the token's lifetime, so rendered URLs keep working
+    const interval = setInterval(refresh, 2 * 60 * 1000)
+    return () => {
+      cancelled = true
+      clearInterval(interval)
+    }
+  }, [])
+  
+  return token
+}
@@ -0,0 +1,7 @@
+// lib/documents/types.ts
+// ==========================================
+// DOCUMENT SERVICE TYPES
+// ==========================================
+
+// Files served for a document: the original, or a JPEG of its first page made during OCR
+export type DocumentFile = 'download' | 'thumbnail' | 'preview'
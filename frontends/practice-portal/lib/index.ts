@@ -16,6 +16,8 @@ export * from './clients'
 export * from './customers'
 export * from './associations'
 export * from './users'
+export * from './dashboard'
+export * from './documents'
 
 // For convenience, also provide namespaced exports
 import * as Search from './search'
@@ -23,5 +25,7 @@ import * as Clients from './clients'
 import * as Customers from './customers'
 import * as Associations from './associations'
 import * as Users from './users'
+import * as Dashboard from './dashboard'
+import * as Documents from './documents'
 
-export { Search, Clients, Customers, Associations, Users } 
\ No newline at end of file
+export { Search, Clients, Customers, Associations, Users, Dashboard, Documents } 
\ No newline at end of file
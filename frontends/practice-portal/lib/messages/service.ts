@@ -4,14 +4,19 @@
 // Direct calls to backend message endpoints
 // ==========================================
 
-import { api } from '../api-client'
+import { api, createEventSource } from '../api-client'
 import { 
   Message, 
   MessageListItem, 
   MessageSendData, 
   MessageUpdateData, 
   ConversationResponse,
+  ConversationDeltaResponse,
+  PracticeEvent,
+  PracticeEventType,
   MessageResponse,
+  MessageBroadcastCreateData,
+  MessageBroadcastProgress,
   MessagingStats,
   PhoneValidationResponse,
   TwilioSandboxResponse,
@@ -62,6 +67,78 @@ export async function getIndividualMessages(
   return api.get<ConversationResponse>(`/messages/individual/${individualId}?${params}`)
 }
 
+/**
+ * Get older messages of a conversation using the `next_cursor` of the previous page
+ * Backend: GET /messages/individual/{individual_id}?before={cursor}
+ */
+export async function getOlderIndividualMessages(
+  individualId: string,
+  before: string,
+  limit: number = 50
+): Promise<ConversationResponse> {
+  const params = new URLSearchParams({ before, limit: limit.toString() })
+  return api.get<ConversationResponse>(`/messages/individual/${individualId}?${params}`)
+}
+
+/**
+ * Poll a conversation for new messages and status changes only
+ * Pass the conversation's `latest_cursor` first, then the `cursor` of the previous poll.
+ * Backend: GET /messages/individual/{individual_id}/since
+ */
+export async function getIndividualMessagesSince(
+  individualId: string,
+  cursor?: string | null
+): Promise<ConversationDeltaResponse> {
+  const params = new URLSearchParams()
+  if (cursor) {
+    params.append('cursor', cursor)
+  }
+  return api.get<ConversationDeltaResponse>(`/messages/individual/${individualId}/since?${params}`)
+}
+
+/**
+ * Subscribe to new messages, message status changes and document state changes for the practice.
+ * On 'message.*' events fetch the conversation delta with getIndividualMessagesSince; on 'resync'
+ * reload whatever is on screen. Returns a function that closes the stream.
+ * Backend: GET /events/stream
+ */
+export function subscribeToPracticeEvents(onEvent: (event: PracticeEvent) => void): () => void {
+  const eventTypes: PracticeEventType[] = ['message.created', 'message.status', 'document.state', 'resync']
+  let source: EventSource | null = null
+  let lastEventId: string | undefined
+  let closed = false
+  
+  const open = async () => {
+    const query = lastEventId ? `?last_event_id=${encodeURIComponent(lastEventId)}` : ''
+    const next = await createEventSource(`/events/stream${query}`)
+    if (closed) {
+      next.close()
+      return
+    }
+    source = next
+    for (const type of eventTypes) {
+      next.addEventListener(type, (event) => {
+        const message = event as MessageEvent
+        lastEventId = message.lastEventId || lastEventId
+        onEvent({ type, id: message.lastEventId || undefined, data: JSON.parse(message.data) })
+      })
+    }
+    // EventSource stops retrying once a reconnect is refused (e.g. its URL token expired):
+    // open a new stream with a fresh token, resuming after the last event
+    next.onerror = () => {
+      if (next.readyState === EventSource.CLOSED && !closed) {
+        setTimeout(() => open().catch(console.error), 1000)
+      }
+    }
+  }
+  open().catch(console.error)
+  
+  return () => {
+    closed = true
+    source?.close()
+  }
+}
+
 /**
  * Get WhatsApp messages for a specific individual (customer)
  * Backend: GET /messages/individual/{individual_id}/whatsapp
@@ -97,6 +174,27 @@ export async function getCustomerWhatsAppMessages(
   return getIndividualWhatsAppMessages(customerId, limit, offset)
 }
 
+/**
+ * Send a templated WhatsApp message to many individuals (delivered in the background)
+ */
+export async function createBroadcast(data: MessageBroadcastCreateData): Promise<MessageBroadcastProgress> {
+  return api.post<MessageBroadcastProgress>('/messages/broadcasts', data)
+}
+
+/**
+ * Get a broadcast's progress
+ */
+export async function getBroadcastProgress(broadcastId: string): Promise<MessageBroadcastProgress> {
+  return api.get<MessageBroadcastProgress>(`/messages/broadcasts/${broadcastId}`)
+}
+
+/**
+ * Cancel a broadcast; messages already sent are not affected
+ */
+export async function cancelBroadcast(broadcastId: string): Promise<MessageBroadcastProgress> {
+  return api.post<MessageBroadcastProgress>(`/messages/broadcasts/${broadcastId}/cancel`)
+}
+
 /**
  * Get a specific message by ID
  */
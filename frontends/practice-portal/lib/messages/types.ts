@@ -109,7 +109,58 @@ export interface ConversationResponse {
   individual_id: string
   individual_name: string
   messages: MessageListItem[]
-  total_count: number
+  total_count: number | null  // null for cursor pages
+  has_more: boolean
+  next_cursor: string | null    // pass as `before` to load older messages
+  latest_cursor: string | null  // pass to getIndividualMessagesSince to poll for new ones
+}
+
+// Status change of a message the portal has already loaded
+export interface MessageStatusChange {
+  id: string
+  status: MessageStatus
+  updated_at?: string
+  delivered_at?: string
+  read_at?: string
+  error_message?: string
+}
+
+// Delta of a conversation since a cursor
+export interface ConversationDeltaResponse {
+  individual_id: string
+  messages: MessageListItem[]
+  updated: MessageStatusChange[]
+  cursor: string | null
+  has_more: boolean
+}
+
+// Recipients of a broadcast: individual_ids and/or customer filters (combined with AND)
+export interface BroadcastAudience {
+  individual_ids?: string[]
+  self_assessment?: boolean  // customers with an SA return
+  customer_status?: string
+  service_code?: string      // customers linked to a client with this service enabled
+}
+
+// Bulk WhatsApp broadcast; body placeholders: {first_name}, {last_name}, {full_name}, {practice_name}
+export interface MessageBroadcastCreateData {
+  body: string
+  audience: BroadcastAudience
+}
+
+export type BroadcastStatus = 'queued' | 'sending' | 'completed' | 'cancelled'
+
+// Broadcast progress
+export interface MessageBroadcastProgress {
+  id: string
+  status: BroadcastStatus
+  body_template: string
+  total_recipients: number
+  skipped_recipients: number
+  status_counts: Record<MessageStatus, number>
+  created_at: string
+  started_at?: string
+  completed_at?: string
 }
 
 // Message response wrapper
@@ -180,3 +231,22 @@ export interface CustomerWithMessages {
   companies?: string[]
   avatar?: string
 }
+
+// Real-time practice events (GET /events/stream)
+export type PracticeEventType = 'message.created' | 'message.status' | 'document.state' | 'resync'
+
+export interface PracticeEvent {
+  type: PracticeEventType
+  id?: string
+  data: {
+    message_id?: string
+    individual_id?: string | null
+    direction?: MessageDirection
+    sender?: string
+    status?: MessageStatus
+    document_id?: string
+    agent_state?: string | null
+    client_id?: string | null
+    reason?: string
+  }
+}